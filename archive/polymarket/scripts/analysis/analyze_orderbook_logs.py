@@ -5,6 +5,9 @@ Order Book Log Analyzer
 Parses and analyzes Polymarket order book logs captured from EC2 instances.
 Used to understand order book patterns and correlate with Account88888's trades.
 
+Logs are converted once into a columnar per-market cache
+(src/storage/orderbook_cache.py); later runs only ingest new lines.
+
 Usage:
     python scripts/analysis/analyze_orderbook_logs.py
     python scripts/analysis/analyze_orderbook_logs.py --market eth-updown-15m-1767648600
@@ -12,231 +15,178 @@ Usage:
 """
 
 import argparse
-import gzip
 import json
-import os
-from collections import defaultdict
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence
 
+import numpy as np
 
-def load_orderbook_logs(log_dir: str, hours: Optional[List[int]] = None) -> List[dict]:
-    """Load order book logs from directory."""
-    records = []
-    log_path = Path(log_dir)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-    # Find all log files
-    files = list(log_path.glob("polymarket_books_*.jsonl*"))
-    files.sort()
+from src.storage.orderbook_cache import UNKNOWN_SLUG, OrderbookLogCache
 
-    for file_path in files:
-        # Filter by hour if specified
-        if hours:
-            hour_str = file_path.stem.split("_")[-1].replace(".jsonl", "")
-            try:
-                hour = int(hour_str)
-                if hour not in hours:
-                    continue
-            except ValueError:
-                pass
 
-        print(f"Loading {file_path.name}...")
+def _imbalance(rows: np.ndarray) -> np.ndarray:
+    """Depth imbalance of rows with any depth (positive = more bids)."""
+    bid_depth = rows["bid_depth"].astype(np.float64)
+    ask_depth = rows["ask_depth"].astype(np.float64)
+    total = bid_depth + ask_depth
+    has_depth = total > 0
+    return (bid_depth[has_depth] - ask_depth[has_depth]) / total[has_depth]
 
-        opener = gzip.open if file_path.suffix == ".gz" else open
-        mode = "rt" if file_path.suffix == ".gz" else "r"
 
-        with opener(file_path, mode) as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    records.append(record)
-                except json.JSONDecodeError:
-                    continue
+def analyze_market_coverage(cache: OrderbookLogCache, regions: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    """Analyze which markets are covered in the logs."""
+    markets = {}
 
-    return records
+    for slug in cache.markets():
+        rows = cache.load(slug)
+        rows = rows[cache.region_mask(rows, regions)] if regions is not None else rows
+        if len(rows) == 0:
+            continue
 
+        first_ts = int(rows["ts_received"].min())
+        last_ts = int(rows["ts_received"].max())
+        markets[slug] = {
+            "count": len(rows),
+            "first_ts": first_ts,
+            "last_ts": last_ts,
+            "token_ids": len(np.unique(rows["token"])),
+            "first_dt": datetime.fromtimestamp(first_ts / 1000, tz=timezone.utc).isoformat(),
+            "last_dt": datetime.fromtimestamp(last_ts / 1000, tz=timezone.utc).isoformat(),
+        }
 
-def analyze_market_coverage(records: List[dict]) -> Dict[str, dict]:
-    """Analyze which markets are covered in the logs."""
-    markets = defaultdict(lambda: {
-        "count": 0,
-        "first_ts": float("inf"),
-        "last_ts": 0,
-        "token_ids": set()
-    })
-
-    for r in records:
-        slug = r.get("slug", "unknown")
-        ts = r.get("ts_received", 0)
-        token_id = r.get("token_id", "")
-
-        markets[slug]["count"] += 1
-        markets[slug]["first_ts"] = min(markets[slug]["first_ts"], ts)
-        markets[slug]["last_ts"] = max(markets[slug]["last_ts"], ts)
-        markets[slug]["token_ids"].add(token_id)
-
-    # Convert sets to counts for JSON serialization
-    for slug in markets:
-        markets[slug]["token_ids"] = len(markets[slug]["token_ids"])
-        if markets[slug]["first_ts"] < float("inf"):
-            markets[slug]["first_dt"] = datetime.fromtimestamp(
-                markets[slug]["first_ts"] / 1000, tz=timezone.utc
-            ).isoformat()
-            markets[slug]["last_dt"] = datetime.fromtimestamp(
-                markets[slug]["last_ts"] / 1000, tz=timezone.utc
-            ).isoformat()
-
-    return dict(markets)
-
-
-def analyze_time_coverage(records: List[dict]) -> dict:
+    return markets
+
+
+def analyze_time_coverage(cache: OrderbookLogCache, regions: Optional[Sequence[str]] = None) -> dict:
     """Analyze time coverage of the logs."""
-    if not records:
+    timestamps = np.sort(cache.column("ts_received", regions=regions))
+    if len(timestamps) == 0:
         return {}
 
-    timestamps = [r.get("ts_received", 0) for r in records]
-    min_ts = min(timestamps)
-    max_ts = max(timestamps)
+    min_ts = int(timestamps[0])
+    max_ts = int(timestamps[-1])
 
     # Calculate gaps (periods > 5 seconds without data)
-    timestamps.sort()
-    gaps = []
-    for i in range(1, len(timestamps)):
-        gap = timestamps[i] - timestamps[i-1]
-        if gap > 5000:  # 5 second gap
-            gaps.append({
-                "start": timestamps[i-1],
-                "end": timestamps[i],
-                "duration_sec": gap / 1000
-            })
+    gaps = np.diff(timestamps)
+    gaps = gaps[gaps > 5000] / 1000
 
     return {
-        "total_records": len(records),
+        "total_records": len(timestamps),
         "start_ts": min_ts,
         "end_ts": max_ts,
         "start_dt": datetime.fromtimestamp(min_ts / 1000, tz=timezone.utc).isoformat(),
         "end_dt": datetime.fromtimestamp(max_ts / 1000, tz=timezone.utc).isoformat(),
         "duration_sec": (max_ts - min_ts) / 1000,
-        "avg_interval_ms": (max_ts - min_ts) / len(records) if records else 0,
+        "avg_interval_ms": (max_ts - min_ts) / len(timestamps),
         "gaps_over_5sec": len(gaps),
-        "largest_gap_sec": max([g["duration_sec"] for g in gaps]) if gaps else 0
+        "largest_gap_sec": float(gaps.max()) if len(gaps) else 0
     }
 
 
-def analyze_spread_distribution(records: List[dict]) -> dict:
+def analyze_spread_distribution(cache: OrderbookLogCache, regions: Optional[Sequence[str]] = None) -> dict:
     """Analyze bid-ask spread distribution."""
-    spreads = [r.get("spread", 0) for r in records if "spread" in r]
+    spreads = cache.column("spread", regions=regions)
+    spreads = np.sort(spreads[~np.isnan(spreads)])
 
-    if not spreads:
+    if len(spreads) == 0:
         return {}
 
-    spreads.sort()
     n = len(spreads)
 
     return {
         "count": n,
-        "min": spreads[0],
-        "max": spreads[-1],
-        "median": spreads[n // 2],
-        "p10": spreads[n // 10],
-        "p90": spreads[9 * n // 10],
-        "avg": sum(spreads) / n
+        "min": float(spreads[0]),
+        "max": float(spreads[-1]),
+        "median": float(spreads[n // 2]),
+        "p10": float(spreads[n // 10]),
+        "p90": float(spreads[9 * n // 10]),
+        "avg": float(spreads.mean())
     }
 
 
-def analyze_imbalance_distribution(records: List[dict]) -> dict:
+def analyze_imbalance_distribution(cache: OrderbookLogCache, regions: Optional[Sequence[str]] = None) -> dict:
     """Analyze bid/ask depth imbalance distribution."""
-    imbalances = []
-
-    for r in records:
-        bid_depth = r.get("bid_depth", 0)
-        ask_depth = r.get("ask_depth", 0)
-        total = bid_depth + ask_depth
-        if total > 0:
-            # Positive = more bids, negative = more asks
-            imbalance = (bid_depth - ask_depth) / total
-            imbalances.append(imbalance)
-
-    if not imbalances:
+    parts = [_imbalance(chunk) for _, chunk in cache.iter_chunks(regions=regions)]
+    if not parts:
         return {}
 
-    imbalances.sort()
+    imbalances = np.sort(np.concatenate(parts))
     n = len(imbalances)
+    if n == 0:
+        return {}
 
     # Count strongly imbalanced snapshots
-    strong_bid = sum(1 for i in imbalances if i > 0.3)
-    strong_ask = sum(1 for i in imbalances if i < -0.3)
+    strong_bid = int((imbalances > 0.3).sum())
+    strong_ask = int((imbalances < -0.3).sum())
 
     return {
         "count": n,
-        "min": imbalances[0],
-        "max": imbalances[-1],
-        "median": imbalances[n // 2],
-        "p10": imbalances[n // 10],
-        "p90": imbalances[9 * n // 10],
-        "avg": sum(imbalances) / n,
+        "min": float(imbalances[0]),
+        "max": float(imbalances[-1]),
+        "median": float(imbalances[n // 2]),
+        "p10": float(imbalances[n // 10]),
+        "p90": float(imbalances[9 * n // 10]),
+        "avg": float(imbalances.mean()),
         "strong_bid_side": strong_bid,
         "strong_ask_side": strong_ask,
         "strong_imbalance_pct": (strong_bid + strong_ask) / n * 100
     }
 
 
-def get_orderbook_at_time(records: List[dict], target_ts: int, market_slug: Optional[str] = None) -> List[dict]:
+def get_orderbook_at_time(
+    cache: OrderbookLogCache,
+    target_ts: int,
+    market_slug: Optional[str] = None,
+    regions: Optional[Sequence[str]] = None,
+) -> List[dict]:
     """Get order book snapshots closest to a specific timestamp."""
-    # Filter by market if specified
-    if market_slug:
-        records = [r for r in records if r.get("slug") == market_slug]
+    slugs = [market_slug] if market_slug else cache.markets()
 
-    # Find records within 5 seconds of target
+    # Records within 5 seconds of target (a binary-searched slice per market)
     window_ms = 5000
-    nearby = [r for r in records if abs(r.get("ts_received", 0) - target_ts) <= window_ms]
+    nearby = []
+    for slug in slugs:
+        rows = cache.load(slug, target_ts - window_ms, target_ts + window_ms)
+        if regions is not None:
+            rows = rows[cache.region_mask(rows, regions)]
+        nearby.extend(cache.record(slug, row) for row in rows)
 
     # Sort by proximity to target
-    nearby.sort(key=lambda r: abs(r.get("ts_received", 0) - target_ts))
+    nearby.sort(key=lambda r: abs(r["ts_received"] - target_ts))
 
     return nearby[:10]  # Return up to 10 closest
 
 
-def analyze_final_30_seconds(records: List[dict]) -> dict:
+def analyze_final_30_seconds(cache: OrderbookLogCache, regions: Optional[Sequence[str]] = None) -> dict:
     """Analyze order book patterns in the final 30 seconds before market close."""
-    # Group by market slug (which contains resolution timestamp)
-    markets = defaultdict(list)
-    for r in records:
-        slug = r.get("slug", "")
-        if slug:
-            markets[slug].append(r)
-
     results = []
 
-    for slug, market_records in markets.items():
+    for slug in cache.markets():
+        if slug == UNKNOWN_SLUG:
+            continue
+
         # Extract resolution timestamp from slug (format: xxx-15m-{timestamp})
         try:
             resolution_ts = int(slug.split("-")[-1]) * 1000  # Convert to ms
         except (ValueError, IndexError):
             continue
 
-        # Find records in final 30 seconds
-        final_30s = [
-            r for r in market_records
-            if resolution_ts - 30000 <= r.get("ts_received", 0) <= resolution_ts
-        ]
+        # Records in final 30 seconds, already time-sorted
+        final_30s = cache.load(slug, resolution_ts - 30000, resolution_ts)
+        if regions is not None:
+            final_30s = final_30s[cache.region_mask(final_30s, regions)]
 
         if len(final_30s) < 5:
             continue
 
         # Analyze imbalance trend in final 30 seconds
-        final_30s.sort(key=lambda r: r.get("ts_received", 0))
-
-        imbalances = []
-        for r in final_30s:
-            bid_depth = r.get("bid_depth", 0)
-            ask_depth = r.get("ask_depth", 0)
-            total = bid_depth + ask_depth
-            if total > 0:
-                imbalances.append((bid_depth - ask_depth) / total)
+        imbalances = _imbalance(final_30s)
 
-        if imbalances:
+        if len(imbalances):
             first_half = imbalances[:len(imbalances)//2]
             second_half = imbalances[len(imbalances)//2:]
 
@@ -244,9 +194,9 @@ def analyze_final_30_seconds(records: List[dict]) -> dict:
                 "slug": slug,
                 "resolution_ts": resolution_ts,
                 "records_in_final_30s": len(final_30s),
-                "avg_imbalance_first_15s": sum(first_half) / len(first_half) if first_half else 0,
-                "avg_imbalance_last_15s": sum(second_half) / len(second_half) if second_half else 0,
-                "imbalance_trend": (sum(second_half) / len(second_half) - sum(first_half) / len(first_half)) if first_half and second_half else 0
+                "avg_imbalance_first_15s": float(first_half.mean()) if len(first_half) else 0,
+                "avg_imbalance_last_15s": float(second_half.mean()) if len(second_half) else 0,
+                "imbalance_trend": float(second_half.mean() - first_half.mean()) if len(first_half) and len(second_half) else 0
             })
 
     return {
@@ -263,6 +213,12 @@ def main():
         default="data/orderbook_logs",
         help="Directory containing order book logs"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="data/orderbook_cache",
+        help="Directory for the columnar order book cache"
+    )
     parser.add_argument(
         "--region",
         type=str,
@@ -294,26 +250,25 @@ def main():
         dirs = [base_dir / "tokyo", base_dir / "us_east"]
     else:
         dirs = [base_dir / args.region]
+    regions = [d.name for d in dirs]
 
-    # Load all records
-    all_records = []
-    for d in dirs:
-        if d.exists():
-            print(f"\n=== Loading from {d} ===")
-            records = load_orderbook_logs(str(d))
-            print(f"Loaded {len(records):,} records")
-            all_records.extend(records)
+    # Convert any new log lines into the cache
+    cache = OrderbookLogCache(args.cache_dir)
+    print(f"\n=== Syncing cache {args.cache_dir} ===")
+    added = cache.sync([str(d) for d in dirs])
+    print(f"Ingested {added:,} new records")
 
-    if not all_records:
+    total = sum(len(chunk) for _, chunk in cache.iter_chunks(regions=regions))
+    if not total:
         print("No records found!")
         return
 
-    print(f"\nTotal records: {len(all_records):,}")
+    print(f"\nTotal records: {total:,}")
 
     # If specific time requested, show order book at that time
     if args.time:
         print(f"\n=== Order Book at {args.time} ===")
-        nearby = get_orderbook_at_time(all_records, args.time, args.market)
+        nearby = get_orderbook_at_time(cache, args.time, args.market, regions)
         for r in nearby:
             dt = datetime.fromtimestamp(r["ts_received"] / 1000, tz=timezone.utc)
             print(f"  {dt.strftime('%H:%M:%S.%f')[:-3]} | "
@@ -326,7 +281,7 @@ def main():
     results = {}
 
     print("\n=== Time Coverage ===")
-    time_cov = analyze_time_coverage(all_records)
+    time_cov = analyze_time_coverage(cache, regions)
     results["time_coverage"] = time_cov
     print(f"  Duration: {time_cov.get('duration_sec', 0):.0f} seconds")
     print(f"  Records: {time_cov.get('total_records', 0):,}")
@@ -334,26 +289,26 @@ def main():
     print(f"  Gaps > 5s: {time_cov.get('gaps_over_5sec', 0)}")
 
     print("\n=== Market Coverage ===")
-    market_cov = analyze_market_coverage(all_records)
+    market_cov = analyze_market_coverage(cache, regions)
     results["market_coverage"] = market_cov
     for slug, info in sorted(market_cov.items(), key=lambda x: -x[1]["count"])[:10]:
         print(f"  {slug}: {info['count']:,} records, {info['token_ids']} tokens")
 
     print("\n=== Spread Distribution ===")
-    spread_dist = analyze_spread_distribution(all_records)
+    spread_dist = analyze_spread_distribution(cache, regions)
     results["spread_distribution"] = spread_dist
     print(f"  Median: {spread_dist.get('median', 0):.4f}")
     print(f"  P10-P90: {spread_dist.get('p10', 0):.4f} - {spread_dist.get('p90', 0):.4f}")
 
     print("\n=== Imbalance Distribution ===")
-    imbalance_dist = analyze_imbalance_distribution(all_records)
+    imbalance_dist = analyze_imbalance_distribution(cache, regions)
     results["imbalance_distribution"] = imbalance_dist
     print(f"  Median: {imbalance_dist.get('median', 0):.3f}")
     print(f"  P10-P90: {imbalance_dist.get('p10', 0):.3f} - {imbalance_dist.get('p90', 0):.3f}")
     print(f"  Strong imbalance: {imbalance_dist.get('strong_imbalance_pct', 0):.1f}%")
 
     print("\n=== Final 30 Seconds Analysis ===")
-    final_30s = analyze_final_30_seconds(all_records)
+    final_30s = analyze_final_30_seconds(cache, regions)
     results["final_30_seconds"] = final_30s
     print(f"  Markets analyzed: {final_30s.get('markets_analyzed', 0)}")
 
@@ -7,19 +7,29 @@ with order book snapshots captured at the same time.
 
 Goal: Understand what order book signals might be driving trade decisions.
 
+Order book logs are read through the columnar cache
+(src/storage/orderbook_cache.py) and trades are matched to snapshots with
+a vectorized as-of join per market.
+
 Usage:
     python scripts/analysis/correlate_trades_orderbook.py
     python scripts/analysis/correlate_trades_orderbook.py --output reports/trade_orderbook_correlation.json
 """
 
 import argparse
-import gzip
 import json
 import sqlite3
+import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.storage.orderbook_cache import OrderbookLogCache
 
 
 def load_trades_from_tracker(db_path: str) -> List[dict]:
@@ -40,72 +50,24 @@ def load_trades_from_tracker(db_path: str) -> List[dict]:
     return trades
 
 
-def load_orderbook_logs(log_dir: str) -> Dict[str, List[dict]]:
-    """Load order book logs indexed by market slug."""
-    records_by_slug = defaultdict(list)
+def load_orderbook_logs(log_dir: str, cache_dir: str) -> OrderbookLogCache:
+    """Sync order book logs into the columnar cache and return it."""
     log_path = Path(log_dir)
+    cache = OrderbookLogCache(cache_dir)
+    cache.sync([str(log_path / subdir) for subdir in ["tokyo", "us_east"]])
+    return cache
 
-    for subdir in ["tokyo", "us_east"]:
-        dir_path = log_path / subdir
-        if not dir_path.exists():
-            continue
-
-        for file_path in dir_path.glob("polymarket_books_*.jsonl*"):
-            opener = gzip.open if file_path.suffix == ".gz" else open
-            mode = "rt" if file_path.suffix == ".gz" else "r"
-
-            with opener(file_path, mode) as f:
-                for line in f:
-                    try:
-                        record = json.loads(line.strip())
-                        slug = record.get("slug", "")
-                        if slug:
-                            records_by_slug[slug].append(record)
-                    except json.JSONDecodeError:
-                        continue
-
-    # Sort each market's records by timestamp
-    for slug in records_by_slug:
-        records_by_slug[slug].sort(key=lambda r: r.get("ts_received", 0))
-
-    return dict(records_by_slug)
 
-
-def find_orderbook_at_trade(
-    trade_ts_ms: int,
-    orderbook_records: List[dict],
+def find_orderbooks_at_trades(
+    cache: OrderbookLogCache,
+    slug: str,
+    trade_ts_ms: List[int],
     window_ms: int = 5000
-) -> Optional[dict]:
-    """Find the order book snapshot closest to trade time."""
-    if not orderbook_records:
-        return None
-
-    # Binary search for closest record
-    target = trade_ts_ms
-    left, right = 0, len(orderbook_records) - 1
-
-    while left < right:
-        mid = (left + right) // 2
-        if orderbook_records[mid].get("ts_received", 0) < target:
-            left = mid + 1
-        else:
-            right = mid
-
-    # Check if within window
-    closest = orderbook_records[left]
-    if abs(closest.get("ts_received", 0) - target) <= window_ms:
-        return closest
-
-    # Check neighbor
-    if left > 0:
-        prev = orderbook_records[left - 1]
-        if abs(prev.get("ts_received", 0) - target) < abs(closest.get("ts_received", 0) - target):
-            closest = prev
-
-    if abs(closest.get("ts_received", 0) - target) <= window_ms:
-        return closest
-
-    return None
+) -> List[Optional[dict]]:
+    """Find the order book snapshot closest to each trade time in one market."""
+    indices = cache.asof(slug, np.asarray(trade_ts_ms, dtype=np.int64), tolerance_ms=window_ms)
+    rows = cache.open_market(slug)
+    return [cache.record(slug, rows[i]) if i >= 0 else None for i in indices]
 
 
 def calculate_imbalance(orderbook: dict) -> float:
@@ -120,14 +82,11 @@ def calculate_imbalance(orderbook: dict) -> float:
 
 def correlate_trade_with_orderbook(
     trade: dict,
-    orderbook_records: List[dict]
+    ob_at_trade: Optional[dict]
 ) -> Optional[dict]:
-    """Correlate a single trade with order book state."""
+    """Correlate a single trade with the order book state at its time."""
     trade_ts_ms = trade["timestamp"] * 1000  # Convert to ms
 
-    # Find order book at trade time
-    ob_at_trade = find_orderbook_at_trade(trade_ts_ms, orderbook_records)
-
     if not ob_at_trade:
         return None
 
@@ -171,6 +130,25 @@ def correlate_trade_with_orderbook(
     }
 
 
+def correlate_trades(trades: List[dict], cache: OrderbookLogCache) -> List[dict]:
+    """Correlate trades with order book state, one as-of join per market."""
+    by_slug = defaultdict(list)
+    for i, trade in enumerate(trades):
+        slug = trade.get("slug")
+        if slug:
+            by_slug[slug].append(i)
+
+    correlations: List[Optional[dict]] = [None] * len(trades)
+    for slug, positions in by_slug.items():
+        trade_ts_ms = [trades[i]["timestamp"] * 1000 for i in positions]
+        orderbooks = find_orderbooks_at_trades(cache, slug, trade_ts_ms)
+        for i, ob_at_trade in zip(positions, orderbooks):
+            correlations[i] = correlate_trade_with_orderbook(trades[i], ob_at_trade)
+
+    # Keep the trades' original order
+    return [c for c in correlations if c]
+
+
 def analyze_correlations(correlations: List[dict]) -> dict:
     """Analyze patterns in trade-orderbook correlations."""
     if not correlations:
@@ -241,6 +219,12 @@ def main():
         default="data/orderbook_logs",
         help="Directory containing order book logs"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="data/orderbook_cache",
+        help="Directory for the columnar order book cache"
+    )
     parser.add_argument(
         "--output",
         type=str,
@@ -261,13 +245,12 @@ def main():
     print(f"  Loaded {len(trades):,} trades")
 
     print("\nLoading order book logs...")
-    orderbooks = load_orderbook_logs(args.orderbook_dir)
-    total_records = sum(len(v) for v in orderbooks.values())
-    print(f"  Loaded {total_records:,} records across {len(orderbooks)} markets")
+    cache = load_orderbook_logs(args.orderbook_dir, args.cache_dir)
+    print(f"  Cached {len(cache):,} records across {len(cache.markets())} markets")
 
     # Find overlapping data
     trade_slugs = set(t.get("slug") for t in trades if t.get("slug"))
-    ob_slugs = set(orderbooks.keys())
+    ob_slugs = set(cache.markets())
     overlap = trade_slugs & ob_slugs
     print(f"\n  Trade markets: {len(trade_slugs)}")
     print(f"  Order book markets: {len(ob_slugs)}")
@@ -275,19 +258,10 @@ def main():
 
     # Correlate trades with order books
     print("\nCorrelating trades with order book state...")
-    correlations = []
-
-    for i, trade in enumerate(trades[:args.limit]):
-        slug = trade.get("slug")
-        if not slug or slug not in orderbooks:
-            continue
-
-        correlation = correlate_trade_with_orderbook(trade, orderbooks[slug])
-        if correlation:
-            correlations.append(correlation)
-
-        if (i + 1) % 100 == 0:
-            print(f"  Processed {i + 1} trades, {len(correlations)} correlated")
+    correlations = correlate_trades(
+        [t for t in trades[:args.limit] if t.get("slug") in ob_slugs],
+        cache,
+    )
 
     print(f"\nSuccessfully correlated {len(correlations)} trades")
 
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Concurrent Binance Kline Backfill into the Columnar Cache
+
+Fills data/klines/{SYMBOL}/{interval}/{YYYY-MM-DD}.npy with historical
+klines. Only days missing from the cache are fetched, many at once under
+a weight-aware rate limit, so re-running after a crash or extending the
+range only fills gaps. Analysis scripts then memory-map the cache
+instead of re-parsing CSV dumps (see src/storage/kline_cache.py).
+
+Usage:
+    python backfill_klines.py --start 2025-12-01 --end 2025-12-31
+    python backfill_klines.py --start 2025-12-01 --end 2025-12-31 --symbols BTCUSDT ETHUSDT SOLUSDT
+    python backfill_klines.py --start 2025-12-01 --end 2025-12-31 --interval 1s --concurrency 16
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.feeds.kline_backfill import KlineBackfiller
+from src.storage.kline_cache import KlineCache
+
+from fetch_historical_binance import parse_timestamp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill Binance klines into the columnar cache")
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument("--symbols", nargs="+", default=["BTCUSDT", "ETHUSDT"], help="Symbols to fetch")
+    parser.add_argument("--interval", default="1m", help="Kline interval (default: 1m)")
+    parser.add_argument("--cache", default="data/klines", help="Cache directory (default: data/klines)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Days fetched at once")
+    parser.add_argument("--weight", type=int, default=6000, help="Request weight budget per minute")
+
+    args = parser.parse_args()
+
+    start_ms = parse_timestamp(args.start)
+    end_ms = parse_timestamp(args.end)
+
+    cache = KlineCache(args.cache)
+    backfiller = KlineBackfiller(cache, weight_per_minute=args.weight, concurrency=args.concurrency)
+
+    print(f"Backfilling {', '.join(args.symbols)} {args.interval} into {args.cache}...")
+    started = time.time()
+    summary = backfiller.backfill(args.symbols, start_ms, end_ms, interval=args.interval)
+    elapsed = time.time() - started
+
+    print(f"\nDays: {summary['days']} ({summary['cached']} already cached, {summary['fetched']} fetched)")
+    print(f"Klines: {summary['klines']:,} in {elapsed:.1f}s ({backfiller.stats['requests']:,} requests)")
+    if summary["skipped_open"]:
+        print(f"Skipped {summary['skipped_open']} day(s) that haven't closed yet")
+    if summary["failed"]:
+        print(f"Failed (re-run to retry): {summary['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,8 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.risk.lockstep import LockstepRunner, TradeArrays, standard_variants
+
 
 @dataclass
 class BacktestResult:
@@ -59,6 +61,7 @@ class BacktestResult:
     avg_loss: float
     equity_curve: List[float] = field(default_factory=list)
     timestamps: List[int] = field(default_factory=list)
+    ruin_probability: float = 0.0
 
 
 def kelly_fraction(win_prob: float, odds: float) -> float:
@@ -279,39 +282,67 @@ def run_backtest(
     )
 
 
-def run_all_backtests(trades_df: pd.DataFrame, initial_capital: float = 300.0) -> Dict[str, BacktestResult]:
-    """Run all backtest configurations."""
-    strategies = [
-        "fixed_1pct",
-        "fixed_2pct",
-        "fixed_5pct",
-        "quarter_kelly",
-        "half_kelly",
-        "kelly",
-    ]
-    thresholds = [0.4, 0.5, 0.6]
-
-    results = {}
-
+def run_all_backtests(
+    trades_df: pd.DataFrame,
+    initial_capital: float = 300.0,
+    ruin_paths: int = 1000,
+) -> Dict[str, BacktestResult]:
+    """
+    Run all backtest configurations in one pass.
+
+    Every strategy x threshold bankroll advances in lockstep over the same
+    trade arrays (see src/risk/lockstep.py), which matches run_backtest
+    per configuration. Ruin probabilities come from `ruin_paths`
+    bootstrap-resampled trade sequences.
+    """
     print("\n" + "=" * 70)
     print("RUNNING BACKTESTS")
     print("=" * 70)
 
-    for strategy in strategies:
-        for threshold in thresholds:
-            name = f"{strategy}_conf{int(threshold * 100)}"
-            print(f"\nRunning: {name}...")
+    trades = TradeArrays(
+        timestamp=trades_df["timestamp"].to_numpy(),
+        price=trades_df["market_price"].to_numpy(),
+        confidence=trades_df["confidence"].to_numpy(),
+        won=trades_df["outcome"].to_numpy() == 1,
+    )
+    variants = standard_variants()
+    runner = LockstepRunner(trades, variants, initial_capital=initial_capital)
+
+    print(f"\nRunning {len(variants)} configurations over {len(trades):,} trades...")
+    runs = runner.run()
+
+    ruin = np.zeros(len(variants))
+    if ruin_paths > 0:
+        print(f"Estimating ruin probability ({ruin_paths:,} bootstrap paths)...")
+        ruin = runner.ruin_probability(n_paths=ruin_paths)
 
-            result = run_backtest(
-                trades_df.copy(),
-                strategy=strategy,
-                confidence_threshold=threshold,
-                initial_capital=initial_capital,
-            )
-            results[name] = result
+    results = {}
+    for run, ruin_prob in zip(runs, ruin):
+        variant = run.variant
+        result = BacktestResult(
+            strategy=variant.name.rsplit("_conf", 1)[0],
+            confidence_threshold=variant.confidence_threshold,
+            initial_capital=run.initial_capital,
+            final_capital=run.final_capital,
+            total_return=run.total_return,
+            trades=run.trades,
+            wins=run.wins,
+            win_rate=run.win_rate,
+            max_drawdown=run.max_drawdown,
+            max_drawdown_pct=run.max_drawdown_pct,
+            sharpe_ratio=run.sharpe_ratio,
+            profit_factor=run.profit_factor,
+            avg_win=run.avg_win,
+            avg_loss=run.avg_loss,
+            equity_curve=run.equity_curve.tolist(),
+            timestamps=run.timestamps.tolist(),
+            ruin_probability=float(ruin_prob),
+        )
+        results[variant.name] = result
 
-            print(f"  Trades: {result.trades}, Return: {result.total_return:+.1%}, "
-                  f"Max DD: {result.max_drawdown_pct:.1%}, Win Rate: {result.win_rate:.1%}")
+        print(f"  {variant.name:<22} Trades: {result.trades}, Return: {result.total_return:+.1%}, "
+              f"Max DD: {result.max_drawdown_pct:.1%}, Win Rate: {result.win_rate:.1%}, "
+              f"Ruin: {result.ruin_probability:.1%}")
 
     return results
 
@@ -446,18 +477,20 @@ def generate_report(results: Dict[str, BacktestResult], initial_capital: float)
         "",
         "### Drawdown Distribution",
         "",
-        "| Strategy | Max Drawdown | Recovery Factor* |",
-        "|----------|--------------|------------------|",
+        "| Strategy | Max Drawdown | Recovery Factor* | Ruin Probability** |",
+        "|----------|--------------|------------------|--------------------|",
     ])
 
     for name, r in sorted(results.items(), key=lambda x: x[1].max_drawdown_pct):
         recovery = r.total_return / r.max_drawdown_pct if r.max_drawdown_pct > 0 else 0
-        lines.append(f"| {name} | {r.max_drawdown_pct:.1%} | {recovery:.2f} |")
+        lines.append(f"| {name} | {r.max_drawdown_pct:.1%} | {recovery:.2f} | {r.ruin_probability:.1%} |")
 
     lines.extend([
         "",
         "*Recovery Factor = Total Return / Max Drawdown (higher is better)",
         "",
+        "**Share of bootstrap-resampled trade sequences where capital fell below $10",
+        "",
         "---",
         "",
         "## Recommendations",
@@ -547,6 +580,7 @@ def save_results_json(results: Dict[str, BacktestResult], output_path: Path):
             "profit_factor": r.profit_factor,
             "avg_win": r.avg_win,
             "avg_loss": r.avg_loss,
+            "ruin_probability": r.ruin_probability,
             "equity_curve": r.equity_curve,
         }
 
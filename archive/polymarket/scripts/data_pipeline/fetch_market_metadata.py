@@ -23,6 +23,8 @@ import requests
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.api.gamma_bulk import GammaTokenFetcher
+
 
 class GammaMarketFetcher:
     """Fetches market metadata from Polymarket Gamma API."""
@@ -126,6 +128,42 @@ class GammaMarketFetcher:
         print(f"  Final: {total}/{total} ({len(results)} found, {errors} errors)")
         return results
 
+    def get_markets_batched(
+        self,
+        token_ids: List[str],
+        cache_path: str = None,
+        batch_size: int = 20,
+        concurrency: int = 8,
+        rate: float = 20.0,
+    ) -> Dict[str, dict]:
+        """
+        Fetch markets with many token IDs per request, concurrently.
+
+        Args:
+            token_ids: List of CLOB token IDs
+            cache_path: Optional append-only JSONL checkpoint file
+            batch_size: Token IDs per request
+            concurrency: Max in-flight requests
+            rate: Requests/sec ceiling (backs off on 429s)
+
+        Returns:
+            Dict mapping token_id to market data
+        """
+        fetcher = GammaTokenFetcher(
+            base_url=self.BASE_URL,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            rate=rate,
+            cache_path=cache_path,
+        )
+        fetcher.cache.put_many(self.cache)
+
+        results = fetcher.fetch(token_ids, progress_every=500)
+        self.cache.update(results)
+
+        print(f"  Final: {len(token_ids)} tokens ({len(results)} found, {fetcher.stats})")
+        return results
+
 
 def load_trades(trades_file: str) -> List[dict]:
     """Load trades from JSON file."""
@@ -228,17 +266,16 @@ def main():
     print(f"Found {len(token_ids)} unique token IDs")
     print()
 
-    # Fetch market metadata (one by one with progress saving)
+    # Fetch market metadata (batched, concurrent, checkpointed)
     print("Fetching market metadata from Gamma API...")
-    print("(This may take a few minutes for many tokens)")
     print()
 
-    fetcher = GammaMarketFetcher(rate_limit=0.15)  # ~7 requests/sec
+    fetcher = GammaMarketFetcher()
 
     token_ids_list = list(token_ids)
-    results = fetcher.get_markets_one_by_one(
+    results = fetcher.get_markets_batched(
         token_ids_list,
-        save_progress_file=str(output_file)
+        cache_path=str(output_file.with_suffix(".cache.jsonl"))
     )
 
     print()
@@ -3,24 +3,40 @@
 Fast Market Metadata Fetcher
 
 Fetches market metadata for unique token_ids using Gamma API.
-Uses existing cache and saves progress incrementally.
+Packs many token_ids per request and runs a bounded pool of concurrent
+requests under a shared token-bucket limiter. Progress is checkpointed
+to an append-only cache, so an interrupted run resumes where it stopped.
 """
 
+import argparse
 import json
 import os
 import sys
 import time
 from pathlib import Path
-import requests
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.gamma_bulk import GammaTokenFetcher
+
 CACHE_FILE = PROJECT_ROOT / "data/token_to_market_full.json"
+APPEND_CACHE_FILE = PROJECT_ROOT / "data/token_market_cache.jsonl"
 TOKEN_IDS_FILE = PROJECT_ROOT / "data/unique_token_ids.json"
-GAMMA_URL = "https://gamma-api.polymarket.com/markets"
-RATE_LIMIT = 0.12  # ~8 requests/sec
+GAMMA_URL = "https://gamma-api.polymarket.com"
+BATCH_SIZE = 20  # token_ids per request
+CONCURRENCY = 8  # in-flight requests
+RATE_LIMIT = 20.0  # requests/sec ceiling (adapts down on 429s)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fast Market Metadata Fetcher")
+    parser.add_argument("--base-url", default=GAMMA_URL, help="Gamma API base URL")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT)
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Fast Market Metadata Fetcher")
     print("=" * 60)
@@ -30,64 +46,49 @@ def main():
         all_token_ids = set(json.load(f))
     print(f"Total unique token_ids: {len(all_token_ids):,}")
 
-    # Load existing cache
-    cache = {}
-    if CACHE_FILE.exists():
+    fetcher = GammaTokenFetcher(
+        base_url=args.base_url,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        cache_path=str(APPEND_CACHE_FILE),
+    )
+
+    # Seed the append-only cache from a legacy JSON cache
+    if CACHE_FILE.exists() and len(fetcher.cache) == 0:
         with open(CACHE_FILE) as f:
             data = json.load(f)
-            cache = data.get("token_to_market", {})
-    print(f"Existing cache: {len(cache):,} tokens")
+            fetcher.cache.put_many(data.get("token_to_market", {}))
+    print(f"Existing cache: {len(fetcher.cache):,} tokens")
 
     # Find tokens to fetch
-    to_fetch = all_token_ids - set(cache.keys())
+    to_fetch = [t for t in all_token_ids if t not in fetcher.cache]
     print(f"Tokens to fetch: {len(to_fetch):,}")
     print()
 
-    if not to_fetch:
+    start = time.time()
+    if to_fetch:
+        fetcher.fetch(to_fetch, progress_every=1000)
+    else:
         print("All tokens already cached!")
-        return
-
-    # Fetch in batches
-    session = requests.Session()
-    to_fetch_list = list(to_fetch)
-    errors = 0
-
-    for i, token_id in enumerate(to_fetch_list):
-        try:
-            resp = session.get(GAMMA_URL, params={"clob_token_ids": token_id}, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data and len(data) > 0:
-                    cache[token_id] = data[0]
-        except Exception as e:
-            errors += 1
-            if errors < 5:
-                print(f"Error fetching {token_id[:20]}...: {e}")
-
-        # Progress every 100
-        if (i + 1) % 100 == 0:
-            print(f"Progress: {i+1:,}/{len(to_fetch_list):,} (found: {len(cache):,}, errors: {errors})")
-
-            # Save checkpoint every 500
-            if (i + 1) % 500 == 0:
-                with open(CACHE_FILE, 'w') as f:
-                    json.dump({"token_to_market": cache}, f)
-
-        time.sleep(RATE_LIMIT)
-
-    # Final save
+
+    cache = fetcher.cache.found()
+
+    # Final save (consolidated JSON read by the downstream analyzers)
     with open(CACHE_FILE, 'w') as f:
         json.dump({
             "token_to_market": cache,
             "metadata": {
                 "total_tokens": len(all_token_ids),
                 "fetched": len(cache),
-                "errors": errors
+                "errors": fetcher.stats["errors"],
+                "rate_limited": fetcher.stats["rate_limited"],
             }
         }, f)
 
     print()
-    print(f"Complete! Cached {len(cache):,} tokens to {CACHE_FILE}")
+    print(f"Complete in {time.time() - start:.1f}s! Cached {len(cache):,} tokens to {CACHE_FILE}")
+    print(f"Stats: {fetcher.stats}")
 
 
 if __name__ == "__main__":
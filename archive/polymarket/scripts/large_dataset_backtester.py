@@ -18,8 +18,31 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timezone
 import re
+import sys
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.risk.kelly_grid import (
+    ASSETS,
+    TRADE_DTYPE,
+    SimulationGrid,
+    load_trade_columns,
+    save_trade_columns,
+    simulate_grid,
+)
+
+WINDOWS_CACHE = PROJECT_ROOT / "data" / "cache" / "account88888_windows.npy"
+
+# Named strategies from run_backtest, as (sizing, fraction) grid entries
+STRATEGIES = {
+    'fixed_1pct': ('fixed', 0.01),
+    'fixed_2pct': ('fixed', 0.02),
+    'fixed_5pct': ('fixed', 0.05),
+    'quarter_kelly': ('kelly', 0.25),
+    'half_kelly': ('kelly', 0.5),
+    'kelly': ('kelly', 1.0),
+}
 
 
 @dataclass
@@ -200,6 +223,56 @@ def load_trades_with_outcomes() -> pd.DataFrame:
     return df
 
 
+def to_backtest_result(strategy: str, result, days: float) -> BacktestResult:
+    """Convert a simulate_grid result into the report's BacktestResult."""
+    n = result.total_trades
+    se = np.sqrt(result.win_rate * (1 - result.win_rate) / n) if n > 0 else 0
+    return BacktestResult(
+        strategy=strategy,
+        initial_capital=result.initial_capital,
+        final_capital=result.final_capital,
+        total_return_pct=result.total_return_pct,
+        total_trades=n,
+        wins=result.wins,
+        losses=result.losses,
+        win_rate=result.win_rate,
+        max_drawdown_pct=result.max_drawdown_pct,
+        sharpe_ratio=result.sharpe_ratio,
+        profit_factor=result.profit_factor,
+        avg_trade_return=result.total_return_pct / n if n > 0 else 0,
+        trades_per_day=n / days if days > 0 else 0,
+        confidence_interval_95=(result.win_rate - 1.96 * se, result.win_rate + 1.96 * se) if n > 0 else (0, 0),
+    )
+
+
+def load_window_columns(rebuild: bool = False) -> np.ndarray:
+    """
+    Load one-trade-per-window data from the columnar cache.
+
+    The first run (or `rebuild`) parses the trade JSON via
+    load_trades_with_outcomes and writes the cache; later runs just
+    memory-map it.
+    """
+    if WINDOWS_CACHE.exists() and not rebuild:
+        trades = load_trade_columns(str(WINDOWS_CACHE))
+        print(f"Loaded {len(trades):,} market windows from {WINDOWS_CACHE}")
+        return trades
+
+    df = load_trades_with_outcomes()
+    if len(df) == 0:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    save_trade_columns(
+        str(WINDOWS_CACHE),
+        df['timestamp'].astype('int64').values,
+        df['price'].astype('float64').values,
+        df['won'].astype(bool).values,
+        df['asset'].values,
+    )
+    print(f"  Cached windows to {WINDOWS_CACHE}")
+    return load_trade_columns(str(WINDOWS_CACHE))
+
+
 def estimate_fee(price: float) -> float:
     """Estimate taker fee based on market price."""
     distance = abs(price - 0.50)
@@ -344,10 +417,16 @@ def main():
     print("=" * 60)
     print()
 
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Large dataset compound growth backtester")
+    parser.add_argument("--rebuild-cache", action="store_true", help="Re-parse trades and rewrite the window cache")
+    args = parser.parse_args()
+
     # Load data
-    trades_df = load_trades_with_outcomes()
+    trades = load_window_columns(rebuild=args.rebuild_cache)
 
-    if len(trades_df) == 0:
+    if len(trades) == 0:
         print("ERROR: No trades with outcomes found!")
         return
 
@@ -356,20 +435,37 @@ def main():
     print("RUNNING BACKTESTS")
     print("=" * 60)
 
-    strategies = ['fixed_1pct', 'fixed_2pct', 'fixed_5pct', 'quarter_kelly', 'half_kelly', 'kelly']
-    results = []
-
     # Use actual win rate from data
-    actual_win_rate = trades_df['won'].mean()
+    actual_win_rate = float(np.mean(trades['won']))
+    n_windows = len(trades)
+    days = (int(trades['timestamp'].max()) - int(trades['timestamp'].min())) / 86400
 
-    for strategy in strategies:
-        result = run_backtest(trades_df, strategy, expected_win_rate=actual_win_rate)
+    grid = SimulationGrid(
+        kelly_fractions=[f for kind, f in STRATEGIES.values() if kind == 'kelly'],
+        fixed_fractions=[f for kind, f in STRATEGIES.values() if kind == 'fixed'],
+    )
+    by_config = {
+        (r.sizing, r.fraction): r
+        for r in simulate_grid(trades, grid, expected_win_rate=actual_win_rate)
+    }
+
+    results = []
+    for strategy, config in STRATEGIES.items():
+        result = to_backtest_result(strategy, by_config[config], days)
         results.append(result)
         print(f"\n{strategy}:")
         print(f"  Final: ${result.final_capital:.2f} ({result.total_return_pct:+.1f}%)")
         print(f"  Trades: {result.total_trades}, Win Rate: {result.win_rate:.1%}")
         print(f"  Max DD: {result.max_drawdown_pct:.1f}%, Sharpe: {result.sharpe_ratio:.2f}")
 
+    # Sweep Kelly fraction x price band x fee assumption in one pass
+    sweep = simulate_grid(trades, SimulationGrid(
+        kelly_fractions=[0.1, 0.25, 0.5, 0.75, 1.0],
+        price_bands=[(0.0, 1.0), (0.2, 0.8), (0.4, 0.6), (0.5, 0.95)],
+        max_fees=[0.0, 0.015, 0.03],
+    ), expected_win_rate=actual_win_rate)
+    sweep.sort(key=lambda r: r.sharpe_ratio, reverse=True)
+
     # Generate report
     print()
     print("=" * 60)
@@ -379,7 +475,7 @@ def main():
     report = f"""# Large Dataset Backtest Results
 
 **Generated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}
-**Dataset:** account88888 trades (2.9M total, {len(trades_df):,} unique windows with outcomes)
+**Dataset:** account88888 trades (2.9M total, {n_windows:,} unique windows with outcomes)
 **Initial Capital:** $300
 
 ---
@@ -388,12 +484,12 @@ def main():
 
 | Metric | Value |
 |--------|-------|
-| Total Trades in Dataset | {len(trades_df):,} |
+| Total Trades in Dataset | {n_windows:,} |
 | Actual Win Rate | {actual_win_rate:.1%} |
-| 95% Confidence Interval | {actual_win_rate - 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/len(trades_df)):.1%} - {actual_win_rate + 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/len(trades_df)):.1%} |
-| Time Span | {(trades_df['timestamp'].max() - trades_df['timestamp'].min()) / 86400:.1f} days |
-| BTC Trades | {len(trades_df[trades_df['asset']=='BTC']):,} |
-| ETH Trades | {len(trades_df[trades_df['asset']=='ETH']):,} |
+| 95% Confidence Interval | {actual_win_rate - 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/n_windows):.1%} - {actual_win_rate + 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/n_windows):.1%} |
+| Time Span | {days:.1f} days |
+| BTC Trades | {int(np.sum(trades['asset'] == ASSETS.index('BTC'))):,} |
+| ETH Trades | {int(np.sum(trades['asset'] == ASSETS.index('ETH'))):,} |
 
 ---
 
@@ -414,8 +510,8 @@ def main():
 ### 1. Actual Win Rate: {actual_win_rate:.1%}
 
 This is the **real** win rate from Account88888's trades on BTC/ETH 15-minute markets.
-- Sample size: {len(trades_df):,} unique market windows
-- Statistically significant (95% CI: {actual_win_rate - 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/len(trades_df)):.1%} - {actual_win_rate + 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/len(trades_df)):.1%})
+- Sample size: {n_windows:,} unique market windows
+- Statistically significant (95% CI: {actual_win_rate - 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/n_windows):.1%} - {actual_win_rate + 1.96*np.sqrt(actual_win_rate*(1-actual_win_rate)/n_windows):.1%})
 
 ### 2. Best Strategy by Return
 
@@ -442,6 +538,20 @@ Based on this large-sample backtest:
 
 ---
 
+## Parameter Sweep (Top 10 by Sharpe)
+
+{len(sweep)} combinations of Kelly fraction, price band and peak fee.
+
+| Kelly | Price Band | Peak Fee | Final $ | Trades | Win Rate | Max DD | Sharpe |
+|-------|------------|----------|---------|--------|----------|--------|--------|
+"""
+
+    for r in sweep[:10]:
+        report += f"| {r.fraction:g} | {r.price_band[0]:.2f}-{r.price_band[1]:.2f} | {r.max_fee:.1%} | ${r.final_capital:.0f} | {r.total_trades:,} | {r.win_rate:.1%} | {r.max_drawdown_pct:.1f}% | {r.sharpe_ratio:.2f} |\n"
+
+    report += f"""
+---
+
 ## Statistical Notes
 
 - This backtest uses **actual resolved outcomes** from Polymarket
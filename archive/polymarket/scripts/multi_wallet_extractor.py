@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Concurrent Multi-Wallet Transfer Extractor for Polymarket
+
+Extracts ERC1155 and ERC20 transfers for a whole wallet list at once,
+sharing one Etherscan API budget across all wallets (instead of
+batch_streaming_extractor.py's one-wallet-at-a-time loop):
+- Wallets x block ranges scheduled on one worker pool
+- Dense ranges split automatically when the 10k result window is hit
+- Transfers deduplicated across wallets
+- Output: one Parquet store partitioned by transfer type and block
+- Completed ranges checkpointed; re-running resumes
+
+Usage:
+    export ETHERSCAN_API_KEY="your-key"
+    python multi_wallet_extractor.py --input data/top_50_for_extraction.json
+    python multi_wallet_extractor.py --input wallets.json --rate 10 --concurrency 16
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.api.etherscan import EtherscanExtractor, ParquetTransferStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def load_wallets(input_file: str) -> list:
+    """Load wallet addresses from a JSON list of addresses or {"wallet": ...} dicts."""
+    input_path = Path(input_file)
+    if not input_path.exists():
+        input_path = Path(__file__).parent.parent / input_file
+
+    with open(input_path) as f:
+        entries = json.load(f)
+
+    return [e["wallet"] if isinstance(e, dict) else e for e in entries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent multi-wallet Etherscan extractor")
+    parser.add_argument("--input", default="data/top_50_for_extraction.json", help="JSON file with wallet list")
+    parser.add_argument("--output", default=str(DATA_DIR / "transfers"), help="Parquet store directory")
+    parser.add_argument("--checkpoint", default=str(DATA_DIR / "multi_wallet.ckpt.jsonl"), help="Range checkpoint log")
+    parser.add_argument("--rate", type=float, default=5.0, help="API key limit in requests/sec")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--start-block", type=int, default=0)
+    parser.add_argument("--end-block", type=int, default=99999999)
+    parser.add_argument("--fresh", action="store_true", help="Delete the checkpoint and start over")
+
+    args = parser.parse_args()
+
+    api_key = os.environ.get("ETHERSCAN_API_KEY", "")
+    if not api_key:
+        logger.error("ETHERSCAN_API_KEY not set!")
+        sys.exit(1)
+
+    if args.fresh and Path(args.checkpoint).exists():
+        Path(args.checkpoint).unlink()
+        logger.info(f"Deleted: {args.checkpoint}")
+
+    wallets = load_wallets(args.input)
+    logger.info(f"Extracting {len(wallets)} wallets at {args.rate}/s, {args.concurrency} in flight")
+
+    extractor = EtherscanExtractor(
+        api_key,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+    )
+    with ParquetTransferStore(args.output) as store:
+        summary = extractor.extract(
+            wallets, store, start_block=args.start_block, end_block=args.end_block
+        )
+
+    logger.info("=" * 60)
+    logger.info(f"Ranges: {summary['completed']}/{summary['ranges']} complete")
+    logger.info(f"Transfers: {summary['transfers']:,} ({extractor.stats['duplicates']:,} duplicates dropped)")
+    logger.info(f"Requests: {extractor.stats['requests']:,}, splits: {extractor.stats['splits']:,}")
+    logger.info(f"Elapsed: {summary['elapsed_sec'] / 60:.1f} min")
+    if summary["failed"]:
+        logger.warning(f"Failed ranges (re-run to retry): {summary['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,54 +6,56 @@ This script analyzes the collected final minute data to discover:
 1. Price movement patterns in the last 60 seconds
 2. Orderbook imbalance signals
 3. Whether the direction is predictable from sub-minute data
+
+Captures are compiled once into a columnar cache (src/storage/final_minute_cache.py)
+under {data_dir}/.cache; each run only parses files added since the last one.
 """
 
-import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional
 import statistics
 
-def load_final_minute_files(directory: str) -> List[Dict]:
-    """Load all JSON files from the directory."""
-    files = []
-    for filename in sorted(os.listdir(directory)):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    data['_filename'] = filename
-                    files.append(data)
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-    return files
-
-def analyze_price_movement(data: Dict) -> Dict:
-    """Analyze price movement within a single window."""
-    binance_prices = data.get('binance_prices', [])
-    orderbook = data.get('orderbook_snapshots', [])
-
-    if not binance_prices:
-        return None
-
-    # Get prices at different time points
-    prices = [(p['timestamp'], p['price']) for p in binance_prices]
-    prices.sort(key=lambda x: x[0])
-
-    if len(prices) < 10:
-        return None
-
-    start_price = prices[0][1]
-    end_price = prices[-1][1]
-
-    # Calculate returns at different intervals
-    mid_idx = len(prices) // 2
-    mid_price = prices[mid_idx][1]
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.storage.final_minute_cache import (
+    OUTCOMES,
+    FinalMinuteCache,
+    book_imbalance,
+    group_mean,
+    group_std,
+)
+
+def load_final_minute_cache(directory: str, cache_dir: Optional[str] = None) -> FinalMinuteCache:
+    """Compile new capture files into the columnar cache and return it."""
+    cache = FinalMinuteCache(cache_dir or os.path.join(directory, ".cache"))
+    added = cache.ingest(directory)
+    if added:
+        print(f"Cached {added} new captures")
+    return cache
+
+def analyze_price_movement(cache: FinalMinuteCache) -> List[Dict]:
+    """Analyze price movement within every window with enough ticks."""
+    windows = cache.windows
+    prices = np.asarray(cache.ticks["price"])
+    orderbooks = analyze_orderbook(cache)
+
+    tick_start = np.asarray(windows["tick_start"])
+    num_prices = np.asarray(windows["tick_end"]) - tick_start
+    valid = np.flatnonzero(num_prices >= 10)
+    if len(valid) == 0:
+        return []
+
+    # Prices at start, midpoint and end of each window (ticks are time-sorted)
+    start_price = prices[tick_start[valid]]
+    mid_price = prices[tick_start[valid] + num_prices[valid] // 2]
+    end_price = prices[tick_start[valid] + num_prices[valid] - 1]
 
     # Direction (UP if end > start for BTC/ETH)
-    outcome = "UP" if end_price > start_price else "DOWN"
+    outcome = np.where(end_price > start_price, "UP", "DOWN")
     price_change_pct = (end_price - start_price) / start_price * 100
 
     # Early momentum (first half)
@@ -63,58 +65,57 @@ def analyze_price_movement(data: Dict) -> Dict:
     late_change = (end_price - mid_price) / mid_price * 100
 
     # Momentum consistency
-    momentum_consistent = (early_change > 0 and late_change > 0) or (early_change < 0 and late_change < 0)
-
-    # Orderbook analysis
-    ob_analysis = analyze_orderbook(orderbook)
-
-    return {
-        'asset': data.get('asset', 'Unknown'),
-        'window_start': data.get('window_start'),
-        'start_price': start_price,
-        'end_price': end_price,
-        'outcome': outcome,
-        'price_change_pct': price_change_pct,
-        'early_change_pct': early_change,
-        'late_change_pct': late_change,
-        'momentum_consistent': momentum_consistent,
-        'num_price_points': len(prices),
-        'orderbook': ob_analysis
-    }
-
-def analyze_orderbook(orderbook: List[Dict]) -> Dict:
-    """Analyze orderbook patterns."""
-    if not orderbook:
-        return {'available': False}
+    momentum_consistent = ((early_change > 0) & (late_change > 0)) | ((early_change < 0) & (late_change < 0))
+
+    assets = cache.assets
+    results = []
+    for j, i in enumerate(valid):
+        results.append({
+            'asset': assets[windows['asset'][i]],
+            'window_start': int(windows['window_start'][i]),
+            'start_price': float(start_price[j]),
+            'end_price': float(end_price[j]),
+            'outcome': str(outcome[j]),
+            'price_change_pct': float(price_change_pct[j]),
+            'early_change_pct': float(early_change[j]),
+            'late_change_pct': float(late_change[j]),
+            'momentum_consistent': bool(momentum_consistent[j]),
+            'num_price_points': int(num_prices[i]),
+            'orderbook': orderbooks[i]
+        })
+    return results
+
+def analyze_orderbook(cache: FinalMinuteCache) -> List[Dict]:
+    """Analyze orderbook patterns of every window (UP token snapshots)."""
+    books = cache.books
+    n = len(cache)
+    groups = np.asarray(books['window'])
 
     # Get UP token orderbook (to analyze betting on UP)
-    up_obs = [ob for ob in orderbook if ob.get('outcome') == 'up']
-
-    if not up_obs:
-        return {'available': False}
-
-    # Calculate average imbalance
-    imbalances = []
-    spreads = []
-    for ob in up_obs:
-        bid_depth = ob.get('bid_depth', 0)
-        ask_depth = ob.get('ask_depth', 0)
-        if bid_depth + ask_depth > 0:
-            imbalance = (bid_depth - ask_depth) / (bid_depth + ask_depth)
-            imbalances.append(imbalance)
-        if ob.get('spread'):
-            spreads.append(ob['spread'])
-
-    if not imbalances:
-        return {'available': False}
-
-    return {
-        'available': True,
-        'avg_imbalance': statistics.mean(imbalances),
-        'imbalance_std': statistics.stdev(imbalances) if len(imbalances) > 1 else 0,
-        'avg_spread': statistics.mean(spreads) if spreads else None,
-        'num_snapshots': len(up_obs)
-    }
+    up = np.asarray(books['outcome']) == OUTCOMES.index('up')
+    num_snapshots = np.bincount(groups[up], minlength=n)
+
+    # Average imbalance over snapshots with depth
+    imbalance = book_imbalance(books)
+    avg_imbalance, count = group_mean(imbalance, groups, n, up)
+    imbalance_std = group_std(imbalance, groups, n, up)
+
+    spread = np.asarray(books['spread'])
+    avg_spread, spread_count = group_mean(spread, groups, n, up & (spread != 0))
+
+    results = []
+    for i in range(n):
+        if count[i] == 0:
+            results.append({'available': False})
+            continue
+        results.append({
+            'available': True,
+            'avg_imbalance': float(avg_imbalance[i]),
+            'imbalance_std': float(imbalance_std[i]),
+            'avg_spread': float(avg_spread[i]) if spread_count[i] else None,
+            'num_snapshots': int(num_snapshots[i])
+        })
+    return results
 
 def main(data_dir: str):
     print(f"\n{'='*60}")
@@ -122,19 +123,15 @@ def main(data_dir: str):
     print(f"{'='*60}\n")
 
     # Load data
-    files = load_final_minute_files(data_dir)
-    print(f"Loaded {len(files)} final minute captures\n")
+    cache = load_final_minute_cache(data_dir)
+    print(f"Loaded {len(cache)} final minute captures\n")
 
-    if not files:
+    if not len(cache):
         print("No data files found!")
         return
 
-    # Analyze each file
-    results = []
-    for data in files:
-        analysis = analyze_price_movement(data)
-        if analysis:
-            results.append(analysis)
+    # Analyze every window
+    results = analyze_price_movement(cache)
 
     print(f"Successfully analyzed {len(results)} windows\n")
 
@@ -13,12 +13,12 @@ This helps understand if they use MEV or priority gas to get better execution.
 Usage:
     python scripts/reverse_engineer/block_position_analyzer.py
 
-Note: Requires fetching transaction receipts which may take time.
+Note: Requires fetching transaction receipts. They are fetched in JSON-RPC
+batches (src/api/polygon_rpc.py) and cached under data/rpc_cache.
 """
 
 import json
 import time
-import requests
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -29,6 +29,8 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.api.polygon_rpc import PolygonRPC
+
 
 @dataclass
 class TxAnalysis:
@@ -62,50 +64,19 @@ class BlockPositionAnalyzer:
         "https://polygon-mainnet.public.blastapi.io",
     ]
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, rpc: Optional[PolygonRPC] = None):
         self.output_dir = output_dir or PROJECT_ROOT / "data" / "analysis"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.rpc_index = 0
+        self.rpc = rpc or PolygonRPC(
+            endpoints=self.RPC_ENDPOINTS,
+            cache_dir=str(PROJECT_ROOT / "data" / "rpc_cache"),
+        )
         self.tx_analyses: List[TxAnalysis] = []
-        self.block_cache: Dict[int, dict] = {}
-
-    def get_rpc(self) -> str:
-        """Get current RPC endpoint with rotation."""
-        return self.RPC_ENDPOINTS[self.rpc_index % len(self.RPC_ENDPOINTS)]
-
-    def rotate_rpc(self):
-        """Switch to next RPC endpoint."""
-        self.rpc_index += 1
-        print(f"Rotating to RPC: {self.get_rpc()}")
 
     def eth_call(self, method: str, params: list) -> Optional[dict]:
-        """Make an RPC call with retry logic."""
-        for attempt in range(3):
-            try:
-                response = requests.post(
-                    self.get_rpc(),
-                    json={
-                        "jsonrpc": "2.0",
-                        "method": method,
-                        "params": params,
-                        "id": 1
-                    },
-                    timeout=10
-                )
-                if response.ok:
-                    data = response.json()
-                    if "result" in data:
-                        return data["result"]
-                    elif "error" in data:
-                        print(f"RPC error: {data['error']}")
-            except Exception as e:
-                print(f"RPC call failed: {e}")
-
-            self.rotate_rpc()
-            time.sleep(0.5)
-
-        return None
+        """Make an RPC call with retry logic (cached)."""
+        return self.rpc.call(method, params)
 
     def get_tx_receipt(self, tx_hash: str) -> Optional[dict]:
         """Get transaction receipt."""
@@ -113,34 +84,34 @@ class BlockPositionAnalyzer:
 
     def get_block(self, block_number: int) -> Optional[dict]:
         """Get block data (cached)."""
-        if block_number in self.block_cache:
-            return self.block_cache[block_number]
-
-        block_hex = hex(block_number)
-        result = self.eth_call("eth_getBlockByNumber", [block_hex, False])
-
-        if result:
-            self.block_cache[block_number] = result
-
-        return result
-
-    def analyze_transaction(self, trade: dict) -> Optional[TxAnalysis]:
-        """Analyze a single transaction's block position."""
+        return self.rpc.get_blocks([block_number]).get(block_number)
+
+    def analyze_transaction(
+        self,
+        trade: dict,
+        context: Optional[Tuple[Optional[dict], dict, Optional[dict]]] = None,
+    ) -> Optional[TxAnalysis]:
+        """
+        Analyze a single transaction's block position.
+
+        `context` is the prefetched (tx, receipt, block); fetched here if omitted.
+        """
         tx_hash = trade.get("tx_hash")
         if not tx_hash:
             return None
 
-        # Get receipt
-        receipt = self.get_tx_receipt(tx_hash)
-        if not receipt:
+        if context is None:
+            context = self.rpc.fetch_tx_context([tx_hash], transactions=False).get(tx_hash)
+        if not context:
             return None
 
+        _, receipt, block = context
+
         block_number = int(receipt.get("blockNumber", "0x0"), 16)
         tx_index = int(receipt.get("transactionIndex", "0x0"), 16)
         gas_used = int(receipt.get("gasUsed", "0x0"), 16)
 
-        # Get block for context
-        block = self.get_block(block_number)
+        # Block for context (fetched once per block for all trades)
         if not block:
             return None
 
@@ -202,19 +173,22 @@ class BlockPositionAnalyzer:
     def analyze_trades(self, trades: List[dict]):
         """Analyze all trades."""
         print(f"\nAnalyzing {len(trades)} transactions...")
-        print("This requires RPC calls and may take several minutes...")
+        print("Fetching receipts and blocks in batched RPC calls...")
 
-        for i, trade in enumerate(trades):
-            if i % 50 == 0:
-                print(f"  Progress: {i}/{len(trades)} ({100*i/len(trades):.1f}%)")
+        contexts = self.rpc.fetch_tx_context(
+            (t["tx_hash"] for t in trades if t.get("tx_hash")),
+            transactions=False,
+        )
+        print(f"  Fetched: {len(contexts)} receipts ({self.rpc.stats})")
 
-            analysis = self.analyze_transaction(trade)
+        for trade in trades:
+            context = contexts.get(trade.get("tx_hash"))
+            if not context:
+                continue
+            analysis = self.analyze_transaction(trade, context)
             if analysis:
                 self.tx_analyses.append(analysis)
 
-            # Rate limiting
-            time.sleep(0.1)
-
         print(f"  Analyzed: {len(self.tx_analyses)} transactions")
 
     def compute_statistics(self) -> Dict:
@@ -376,10 +350,28 @@ def main():
         default=500,
         help="Number of transactions to analyze (default: 500)"
     )
+    parser.add_argument(
+        "--rpc-url",
+        action="append",
+        help="RPC endpoint (repeatable; default: public Polygon endpoints)"
+    )
+    parser.add_argument(
+        "--rpc-cache",
+        default="data/rpc_cache",
+        help="RPC result cache directory"
+    )
+    parser.add_argument("--batch-size", type=int, default=50, help="Calls per JSON-RPC batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent batches")
 
     args = parser.parse_args()
 
-    analyzer = BlockPositionAnalyzer()
+    rpc = PolygonRPC(
+        endpoints=args.rpc_url or BlockPositionAnalyzer.RPC_ENDPOINTS,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        cache_dir=str(PROJECT_ROOT / args.rpc_cache),
+    )
+    analyzer = BlockPositionAnalyzer(rpc=rpc)
     trades_file = PROJECT_ROOT / args.trades
     analyzer.run(str(trades_file), args.sample)
 
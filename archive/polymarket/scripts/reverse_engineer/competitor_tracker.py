@@ -11,20 +11,23 @@ Tracks other large traders in the same Polymarket 15-minute markets to:
 Usage:
     python scripts/reverse_engineer/competitor_tracker.py
 
-Uses existing ERC1155 transfer data to identify other traders.
+Uses existing ERC1155 transfer data to identify other traders. Transfers
+(and optional trade exports) are ingested into an indexed wallet activity
+store (src/storage/wallet_activity.py); reruns only read what was appended
+since the last run.
 """
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from dataclasses import dataclass
-from collections import defaultdict
-import statistics
 import sys
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.storage.wallet_activity import WalletActivityStore
+
 
 ACCOUNT_88888 = "0x7f69983eb28245bba0d5083502a78744a8f66162"
 
@@ -46,42 +49,14 @@ class TraderProfile:
     avg_seconds_diff: float = 0
 
 
-@dataclass
-class MarketActivity:
-    """Activity in a single market."""
-    slug: str
-    token_id: str
-    traders: Dict[str, List[dict]]  # address -> list of trades
-
-
 class CompetitorTracker:
     """Tracks competitor activity."""
 
-    def __init__(self):
+    def __init__(self, store: Optional[WalletActivityStore] = None):
+        if store is None:
+            store = WalletActivityStore(str(PROJECT_ROOT / "data" / "wallet_activity.db"))
+        self.store = store
         self.traders: Dict[str, TraderProfile] = {}
-        self.market_activity: Dict[str, MarketActivity] = {}
-        self.account88888_trades: Dict[str, List[dict]] = {}  # slug -> trades
-
-    def load_erc1155_transfers(self, transfers_file: str, limit: int = 500000) -> List[dict]:
-        """Load ERC1155 transfers (trades)."""
-        print(f"Loading ERC1155 transfers from {transfers_file}...")
-
-        transfers = []
-        count = 0
-
-        with open(transfers_file) as f:
-            for line in f:
-                if count >= limit:
-                    break
-                try:
-                    transfer = json.loads(line.strip())
-                    transfers.append(transfer)
-                    count += 1
-                except:
-                    continue
-
-        print(f"  Loaded {len(transfers):,} transfers")
-        return transfers
 
     def load_token_mapping(self, mapping_file: str) -> Dict:
         """Load token to market mapping."""
@@ -96,127 +71,59 @@ class CompetitorTracker:
             print(f"  Error: {e}")
             return {}
 
-    def process_transfers(self, transfers: List[dict], token_mapping: Dict):
-        """Process transfers to identify traders."""
-        print("\nProcessing transfers...")
-
-        trader_stats = defaultdict(lambda: {
-            "trades": 0,
-            "volume": 0,
-            "markets": set(),
-            "first": float('inf'),
-            "last": 0,
-        })
-
-        for transfer in transfers:
-            from_addr = transfer.get("from_address", "").lower()
-            to_addr = transfer.get("to_address", "").lower()
-            token_id = str(transfer.get("token_id", ""))
-            value = float(transfer.get("value", 0))
-            timestamp = int(transfer.get("block_timestamp", 0))
-
-            market_info = token_mapping.get(token_id, {})
-            slug = market_info.get("slug", "")
-
-            # Skip non-market transfers
-            if not slug or "updown" not in slug:
-                continue
-
-            # Identify traders (exclude null address and contracts)
-            for addr in [from_addr, to_addr]:
-                if addr and addr != "0x0000000000000000000000000000000000000000":
-                    stats = trader_stats[addr]
-                    stats["trades"] += 1
-                    stats["volume"] += value
-                    stats["markets"].add(slug)
-                    stats["first"] = min(stats["first"], timestamp)
-                    stats["last"] = max(stats["last"], timestamp)
-
-            # Track market activity
-            if slug not in self.market_activity:
-                self.market_activity[slug] = MarketActivity(
-                    slug=slug,
-                    token_id=token_id,
-                    traders=defaultdict(list)
-                )
-
-            trade_info = {
-                "timestamp": timestamp,
-                "from": from_addr,
-                "to": to_addr,
-                "value": value,
-                "token_id": token_id,
-            }
-
-            # Track by to_address (buyer)
-            if to_addr:
-                self.market_activity[slug].traders[to_addr].append(trade_info)
-
-                # Track 88888 specifically
-                if to_addr == ACCOUNT_88888:
-                    if slug not in self.account88888_trades:
-                        self.account88888_trades[slug] = []
-                    self.account88888_trades[slug].append(trade_info)
-
-        # Convert to profiles
-        for addr, stats in trader_stats.items():
-            if stats["trades"] >= 5:  # Only track active traders
-                self.traders[addr] = TraderProfile(
-                    address=addr,
-                    total_trades=stats["trades"],
-                    total_volume=stats["volume"],
-                    markets_traded=len(stats["markets"]),
-                    first_seen=stats["first"] if stats["first"] != float('inf') else 0,
-                    last_seen=stats["last"],
-                )
+    def ingest(
+        self,
+        transfers_file: str,
+        token_mapping: Dict,
+        limit: int = 500000,
+        trades_files: Optional[List[str]] = None,
+    ):
+        """Ingest new transfers (and trade exports) for updown markets into the store."""
+        print("\nIngesting new activity...")
+
+        # Skip non-market transfers; unmapped tokens wait in the store for a newer mapping
+        def updown(slug: str) -> bool:
+            return "updown" in slug
+
+        read = self.store.ingest_transfers(transfers_file, token_mapping, limit, include=updown)
+        print(f"  New transfers: {read:,}")
+        for trades_file in trades_files or []:
+            read = self.store.ingest_trades(trades_file, token_mapping, include=updown)
+            print(f"  New trades from {Path(trades_file).name}: {read:,}")
+        print(f"  Activity rows in store: {len(self.store):,}")
+        print(f"  Waiting for token mapping: {self.store.unresolved():,}")
+
+    def process_transfers(self, min_trades: int = 5):
+        """Build profiles of active traders from the store's running totals."""
+        print("\nBuilding trader profiles...")
+
+        for row in self.store.top_wallets(None, min_trades=min_trades):
+            self.traders[row["wallet"]] = TraderProfile(
+                address=row["wallet"],
+                total_trades=row["trades"],
+                total_volume=row["volume"],
+                markets_traded=row["markets"],
+                first_seen=row["first_seen"],
+                last_seen=row["last_seen"],
+            )
 
         print(f"  Identified {len(self.traders):,} active traders")
-        print(f"  Markets with activity: {len(self.market_activity):,}")
 
     def analyze_competitor_timing(self):
         """Analyze timing relationship with Account88888."""
         print("\nAnalyzing competitor timing vs Account88888...")
 
+        # Buys (>10s apart) relative to 88888's first buy in each shared market
+        timing = self.store.relative_timing(ACCOUNT_88888, threshold_s=10, side="buy")
+
         for addr, profile in self.traders.items():
-            if addr == ACCOUNT_88888:
+            if addr == ACCOUNT_88888 or addr not in timing:
                 continue
 
-            shared_markets = 0
-            before_count = 0
-            after_count = 0
-            time_diffs = []
-
-            for slug, activity in self.market_activity.items():
-                if addr not in activity.traders:
-                    continue
-
-                if slug not in self.account88888_trades:
-                    continue
-
-                shared_markets += 1
-
-                # Get 88888's first trade in this market
-                t88888_trades = self.account88888_trades[slug]
-                t88888_first = min(t["timestamp"] for t in t88888_trades)
-
-                # Get competitor's trades
-                competitor_trades = activity.traders[addr]
-
-                for trade in competitor_trades:
-                    diff = trade["timestamp"] - t88888_first
-                    time_diffs.append(diff)
-
-                    if diff < -10:  # Traded >10s before 88888
-                        before_count += 1
-                    elif diff > 10:  # Traded >10s after 88888
-                        after_count += 1
-
-            if shared_markets > 0:
-                profile.shared_markets = shared_markets
-                profile.trades_before_88888 = before_count
-                profile.trades_after_88888 = after_count
-                if time_diffs:
-                    profile.avg_seconds_diff = statistics.mean(time_diffs)
+            profile.shared_markets = timing[addr]["shared_markets"]
+            profile.trades_before_88888 = timing[addr]["before"]
+            profile.trades_after_88888 = timing[addr]["after"]
+            profile.avg_seconds_diff = timing[addr]["avg_seconds_diff"]
 
     def get_top_competitors(self, n: int = 10) -> List[TraderProfile]:
         """Get top N competitors by volume."""
@@ -311,7 +218,13 @@ class CompetitorTracker:
 
         print(f"\nSaved results to: {filepath}")
 
-    def run(self, transfers_file: str, mapping_file: str, limit: int = 500000):
+    def run(
+        self,
+        transfers_file: str,
+        mapping_file: str,
+        limit: int = 500000,
+        trades_files: Optional[List[str]] = None,
+    ):
         """Run competitor analysis."""
         print("=" * 70)
         print("COMPETITOR TRACKER")
@@ -321,11 +234,11 @@ class CompetitorTracker:
         print()
 
         # Load data
-        transfers = self.load_erc1155_transfers(transfers_file, limit)
         token_mapping = self.load_token_mapping(mapping_file)
+        self.ingest(transfers_file, token_mapping, limit, trades_files)
 
         # Process
-        self.process_transfers(transfers, token_mapping)
+        self.process_transfers()
         self.analyze_competitor_timing()
 
         # Output
@@ -352,16 +265,28 @@ def main():
         "--limit",
         type=int,
         default=500000,
-        help="Max transfers to process"
+        help="Max new transfers to ingest this run"
+    )
+    parser.add_argument(
+        "--trades",
+        action="append",
+        default=[],
+        help="Trade export JSON to ingest as well (repeatable)"
+    )
+    parser.add_argument(
+        "--db",
+        default="data/wallet_activity.db",
+        help="Wallet activity store"
     )
 
     args = parser.parse_args()
 
-    tracker = CompetitorTracker()
+    tracker = CompetitorTracker(WalletActivityStore(str(PROJECT_ROOT / args.db)))
     tracker.run(
         str(PROJECT_ROOT / args.transfers),
         str(PROJECT_ROOT / args.mapping),
-        args.limit
+        args.limit,
+        [str(PROJECT_ROOT / t) for t in args.trades],
     )
 
 
@@ -7,232 +7,232 @@ Analyzes the 77.8% accurate orderbook imbalance signal to:
 2. Threshold analysis - does higher |imbalance| = better accuracy?
 3. Combined signals - orderbook + momentum together
 4. Spread analysis - does spread correlate with reliability?
+
+Captures are compiled once into a columnar cache (src/storage/final_minute_cache.py)
+under {data_dir}/.cache; each run only parses files added since the last one, and
+per-window statistics are grouped array reductions.
 """
 
-import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional
 import statistics
-from collections import defaultdict
-
-def load_final_minute_files(directory: str) -> List[Dict]:
-    """Load all JSON files from the directory."""
-    files = []
-    for filename in sorted(os.listdir(directory)):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    data['_filename'] = filename
-                    files.append(data)
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-    return files
-
-
-def get_actual_outcome(data: Dict) -> str:
-    """Determine the actual outcome from price data."""
-    return "UP" if data['end_price'] > data['start_price'] else "DOWN"
-
-
-def calculate_imbalance(orderbook_snapshots: List[Dict], outcome_filter: str = "up") -> List[Tuple[float, float]]:
-    """
-    Calculate imbalance values with timestamps for a specific outcome token.
-    Returns list of (seconds_before_end, imbalance) tuples.
-    """
-    imbalances = []
-    for ob in orderbook_snapshots:
-        if ob.get('outcome') != outcome_filter:
-            continue
-        bid_depth = ob.get('bid_depth', 0) or 0
-        ask_depth = ob.get('ask_depth', 0) or 0
-        if bid_depth + ask_depth > 0:
-            imbalance = (bid_depth - ask_depth) / (bid_depth + ask_depth)
-            imbalances.append((ob['timestamp'], imbalance, bid_depth, ask_depth))
-    return imbalances
 
+import numpy as np
 
-def analyze_time_weighted(data: Dict, window_end: int) -> Dict:
-    """
-    Analyze imbalance at different time windows before resolution.
-    """
-    orderbook = data.get('orderbook_snapshots', [])
-    if not orderbook:
-        return None
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-    imbalances = calculate_imbalance(orderbook, "up")
-    if not imbalances:
-        return None
+from src.storage.final_minute_cache import (
+    OUTCOMES,
+    FinalMinuteCache,
+    book_imbalance,
+    group_mean,
+    group_std,
+)
 
-    result = {
-        'actual_outcome': get_actual_outcome(data),
-        'time_windows': {}
-    }
+TIME_WINDOWS = [('60s', 60), ('30s', 30), ('15s', 15), ('10s', 10), ('5s', 5)]
+THRESHOLDS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
 
-    # Analyze at different time windows: 60s, 30s, 15s, 10s, 5s before end
-    for window_name, seconds_before in [('60s', 60), ('30s', 30), ('15s', 15), ('10s', 10), ('5s', 5)]:
-        cutoff_time = window_end - seconds_before
-        window_imbalances = [imb for ts, imb, _, _ in imbalances if ts >= cutoff_time]
 
-        if window_imbalances:
-            avg_imbalance = statistics.mean(window_imbalances)
-            result['time_windows'][window_name] = {
-                'avg_imbalance': avg_imbalance,
-                'num_snapshots': len(window_imbalances),
-                'predicted_outcome': 'UP' if avg_imbalance > 0 else 'DOWN'
-            }
+def load_final_minute_cache(directory: str, cache_dir: Optional[str] = None) -> FinalMinuteCache:
+    """Compile new capture files into the columnar cache and return it."""
+    cache = FinalMinuteCache(cache_dir or os.path.join(directory, ".cache"))
+    added = cache.ingest(directory)
+    if added:
+        print(f"Cached {added} new captures")
+    return cache
 
-    return result
 
+def get_actual_outcome(cache: FinalMinuteCache) -> np.ndarray:
+    """Actual outcome ("UP"/"DOWN") of every window from its start/end prices."""
+    windows = cache.windows
+    return np.where(windows['end_price'] > windows['start_price'], "UP", "DOWN")
 
-def analyze_threshold(data: Dict) -> Dict:
+
+def calculate_imbalance(cache: FinalMinuteCache, outcome_filter: str = "up") -> np.ndarray:
     """
-    Analyze if higher absolute imbalance thresholds improve accuracy.
+    Imbalance of every book snapshot for a specific outcome token.
+    Snapshots of other tokens, or with no depth, are NaN.
     """
-    orderbook = data.get('orderbook_snapshots', [])
-    if not orderbook:
-        return None
-
-    imbalances = calculate_imbalance(orderbook, "up")
-    if not imbalances:
-        return None
-
-    avg_imbalance = statistics.mean([imb for _, imb, _, _ in imbalances])
-    actual_outcome = get_actual_outcome(data)
-
-    result = {
-        'actual_outcome': actual_outcome,
-        'avg_imbalance': avg_imbalance,
-        'abs_imbalance': abs(avg_imbalance),
-        'predicted_outcome': 'UP' if avg_imbalance > 0 else 'DOWN',
-        'thresholds': {}
-    }
-
-    # Test different thresholds
-    for threshold in [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]:
-        if abs(avg_imbalance) >= threshold:
-            result['thresholds'][f't{threshold}'] = {
-                'qualifies': True,
-                'predicted': 'UP' if avg_imbalance > 0 else 'DOWN',
-                'correct': (avg_imbalance > 0 and actual_outcome == 'UP') or
-                          (avg_imbalance < 0 and actual_outcome == 'DOWN')
-            }
-        else:
-            result['thresholds'][f't{threshold}'] = {'qualifies': False}
-
-    return result
+    books = cache.books
+    imbalance = book_imbalance(books)
+    imbalance[np.asarray(books['outcome']) != OUTCOMES.index(outcome_filter)] = np.nan
+    return imbalance
 
 
-def analyze_combined_signals(data: Dict) -> Dict:
+def analyze_time_weighted(cache: FinalMinuteCache) -> List[Optional[Dict]]:
     """
-    Analyze combined orderbook + momentum signals.
+    Analyze imbalance at different time windows before resolution, per window.
     """
-    orderbook = data.get('orderbook_snapshots', [])
-    binance_prices = data.get('binance_prices', [])
-
-    if not orderbook or not binance_prices:
-        return None
-
-    imbalances = calculate_imbalance(orderbook, "up")
-    if not imbalances:
-        return None
-
-    # Calculate orderbook signal
-    avg_imbalance = statistics.mean([imb for _, imb, _, _ in imbalances])
-    ob_signal = 'UP' if avg_imbalance > 0 else 'DOWN'
-
-    # Calculate momentum signals
-    prices = sorted([(p['timestamp'], p['price']) for p in binance_prices], key=lambda x: x[0])
-    if len(prices) < 10:
-        return None
-
-    start_price = prices[0][1]
-    end_price = prices[-1][1]
-    mid_idx = len(prices) // 2
-    mid_price = prices[mid_idx][1]
-
-    # Early momentum (first half)
-    early_change = mid_price - start_price
-    early_signal = 'UP' if early_change > 0 else 'DOWN'
+    n = len(cache)
+    books = cache.books
+    groups = np.asarray(books['window'])
+    imbalance = calculate_imbalance(cache, "up")
+    _, count = group_mean(imbalance, groups, n)
+    actual = get_actual_outcome(cache)
+    window_end = np.asarray(cache.windows['window_end'])
+    timestamps = np.asarray(books['timestamp'])
 
-    # Late momentum (last 30%)
-    late_idx = int(len(prices) * 0.7)
-    late_price = prices[late_idx][1]
-    late_change = end_price - late_price
-    late_signal = 'UP' if late_change > 0 else 'DOWN'
-
-    actual_outcome = get_actual_outcome(data)
-
-    return {
-        'actual_outcome': actual_outcome,
-        'ob_signal': ob_signal,
-        'ob_imbalance': avg_imbalance,
-        'early_momentum_signal': early_signal,
-        'early_change_pct': (mid_price - start_price) / start_price * 100,
-        'late_momentum_signal': late_signal,
-        'late_change_pct': (end_price - late_price) / late_price * 100,
-        'ob_correct': ob_signal == actual_outcome,
-        'early_correct': early_signal == actual_outcome,
-        'late_correct': late_signal == actual_outcome,
-        'ob_and_early_agree': ob_signal == early_signal,
-        'ob_and_late_agree': ob_signal == late_signal,
-        'all_agree': ob_signal == early_signal == late_signal
-    }
-
-
-def analyze_spread(data: Dict) -> Dict:
+    # Analyze at different time windows: 60s, 30s, 15s, 10s, 5s before end
+    per_window = {}
+    for window_name, seconds_before in TIME_WINDOWS:
+        cutoff = window_end[groups] - seconds_before
+        per_window[window_name] = group_mean(imbalance, groups, n, timestamps >= cutoff)
+
+    results = []
+    for i in range(n):
+        if count[i] == 0:
+            results.append(None)
+            continue
+        result = {'actual_outcome': str(actual[i]), 'time_windows': {}}
+        for window_name, (avg, window_count) in per_window.items():
+            if window_count[i]:
+                result['time_windows'][window_name] = {
+                    'avg_imbalance': float(avg[i]),
+                    'num_snapshots': int(window_count[i]),
+                    'predicted_outcome': 'UP' if avg[i] > 0 else 'DOWN'
+                }
+        results.append(result)
+    return results
+
+
+def analyze_threshold(cache: FinalMinuteCache) -> List[Optional[Dict]]:
     """
-    Analyze if spread correlates with signal reliability.
+    Analyze if higher absolute imbalance thresholds improve accuracy, per window.
     """
-    orderbook = data.get('orderbook_snapshots', [])
-    if not orderbook:
-        return None
-
-    # Get UP token orderbook with spread data
-    spreads = []
-    imbalances = []
-
-    for ob in orderbook:
-        if ob.get('outcome') != 'up':
+    n = len(cache)
+    avg, count = group_mean(calculate_imbalance(cache, "up"), np.asarray(cache.books['window']), n)
+    actual = get_actual_outcome(cache)
+
+    results = []
+    for i in range(n):
+        if count[i] == 0:
+            results.append(None)
             continue
 
-        best_bid = ob.get('best_bid')
-        best_ask = ob.get('best_ask')
-
-        if best_bid is not None and best_ask is not None:
-            spread = best_ask - best_bid
-            spreads.append(spread)
-
-        bid_depth = ob.get('bid_depth', 0) or 0
-        ask_depth = ob.get('ask_depth', 0) or 0
-        if bid_depth + ask_depth > 0:
-            imbalance = (bid_depth - ask_depth) / (bid_depth + ask_depth)
-            imbalances.append(imbalance)
+        avg_imbalance = float(avg[i])
+        actual_outcome = str(actual[i])
+        result = {
+            'actual_outcome': actual_outcome,
+            'avg_imbalance': avg_imbalance,
+            'abs_imbalance': abs(avg_imbalance),
+            'predicted_outcome': 'UP' if avg_imbalance > 0 else 'DOWN',
+            'thresholds': {}
+        }
+
+        # Test different thresholds
+        for threshold in THRESHOLDS:
+            if abs(avg_imbalance) >= threshold:
+                result['thresholds'][f't{threshold}'] = {
+                    'qualifies': True,
+                    'predicted': 'UP' if avg_imbalance > 0 else 'DOWN',
+                    'correct': (avg_imbalance > 0 and actual_outcome == 'UP') or
+                              (avg_imbalance < 0 and actual_outcome == 'DOWN')
+                }
+            else:
+                result['thresholds'][f't{threshold}'] = {'qualifies': False}
+
+        results.append(result)
+    return results
+
+
+def analyze_combined_signals(cache: FinalMinuteCache) -> List[Optional[Dict]]:
+    """
+    Analyze combined orderbook + momentum signals, per window.
+    """
+    n = len(cache)
+    windows = cache.windows
+    prices = np.asarray(cache.ticks['price'])
+    avg, count = group_mean(calculate_imbalance(cache, "up"), np.asarray(cache.books['window']), n)
+    actual = get_actual_outcome(cache)
+
+    # Momentum needs at least 10 ticks (ticks are time-sorted per window)
+    tick_start = np.asarray(windows['tick_start'])
+    num_prices = np.asarray(windows['tick_end']) - tick_start
+    valid = (count > 0) & (num_prices >= 10)
+    last = np.maximum(num_prices - 1, 0)
+
+    start_price = prices[np.where(valid, tick_start, 0)]
+    end_price = prices[np.where(valid, tick_start + last, 0)]
+    # Early momentum (first half)
+    mid_price = prices[np.where(valid, tick_start + num_prices // 2, 0)]
+    # Late momentum (last 30%)
+    late_price = prices[np.where(valid, tick_start + (num_prices * 0.7).astype(np.int64), 0)]
 
-    if not imbalances:
-        return None
+    results = []
+    for i in range(n):
+        if not valid[i]:
+            results.append(None)
+            continue
 
-    avg_imbalance = statistics.mean(imbalances)
-    actual_outcome = get_actual_outcome(data)
-    ob_correct = (avg_imbalance > 0 and actual_outcome == 'UP') or \
-                 (avg_imbalance < 0 and actual_outcome == 'DOWN')
+        ob_signal = 'UP' if avg[i] > 0 else 'DOWN'
+        early_signal = 'UP' if mid_price[i] - start_price[i] > 0 else 'DOWN'
+        late_signal = 'UP' if end_price[i] - late_price[i] > 0 else 'DOWN'
+        actual_outcome = str(actual[i])
+
+        results.append({
+            'actual_outcome': actual_outcome,
+            'ob_signal': ob_signal,
+            'ob_imbalance': float(avg[i]),
+            'early_momentum_signal': early_signal,
+            'early_change_pct': float((mid_price[i] - start_price[i]) / start_price[i] * 100),
+            'late_momentum_signal': late_signal,
+            'late_change_pct': float((end_price[i] - late_price[i]) / late_price[i] * 100),
+            'ob_correct': ob_signal == actual_outcome,
+            'early_correct': early_signal == actual_outcome,
+            'late_correct': late_signal == actual_outcome,
+            'ob_and_early_agree': ob_signal == early_signal,
+            'ob_and_late_agree': ob_signal == late_signal,
+            'all_agree': ob_signal == early_signal == late_signal
+        })
+    return results
+
+
+def analyze_spread(cache: FinalMinuteCache) -> List[Optional[Dict]]:
+    """
+    Analyze if spread correlates with signal reliability, per window.
+    """
+    n = len(cache)
+    books = cache.books
+    groups = np.asarray(books['window'])
+    avg, count = group_mean(calculate_imbalance(cache, "up"), groups, n)
+    actual = get_actual_outcome(cache)
+
+    # UP token spreads where both sides are quoted (NaN otherwise)
+    up = np.asarray(books['outcome']) == OUTCOMES.index('up')
+    spread = np.asarray(books['best_ask']) - np.asarray(books['best_bid'])
+    avg_spread, spread_count = group_mean(spread, groups, n, up)
+    spread_std = group_std(spread, groups, n, up)
+    has_spread = up & ~np.isnan(spread)
+    min_spread = np.full(n, np.inf)
+    max_spread = np.full(n, -np.inf)
+    np.minimum.at(min_spread, groups[has_spread], spread[has_spread])
+    np.maximum.at(max_spread, groups[has_spread], spread[has_spread])
+
+    results = []
+    for i in range(n):
+        if count[i] == 0:
+            results.append(None)
+            continue
 
-    result = {
-        'actual_outcome': actual_outcome,
-        'avg_imbalance': avg_imbalance,
-        'ob_correct': ob_correct
-    }
+        avg_imbalance = float(avg[i])
+        actual_outcome = str(actual[i])
+        result = {
+            'actual_outcome': actual_outcome,
+            'avg_imbalance': avg_imbalance,
+            'ob_correct': (avg_imbalance > 0 and actual_outcome == 'UP') or
+                          (avg_imbalance < 0 and actual_outcome == 'DOWN')
+        }
 
-    if spreads:
-        result['avg_spread'] = statistics.mean(spreads)
-        result['min_spread'] = min(spreads)
-        result['max_spread'] = max(spreads)
-        result['spread_std'] = statistics.stdev(spreads) if len(spreads) > 1 else 0
+        if spread_count[i]:
+            result['avg_spread'] = float(avg_spread[i])
+            result['min_spread'] = float(min_spread[i])
+            result['max_spread'] = float(max_spread[i])
+            result['spread_std'] = float(spread_std[i])
 
-    return result
+        results.append(result)
+    return results
 
 
 def main(data_dir: str):
@@ -241,19 +241,25 @@ def main(data_dir: str):
     print(f"{'='*70}\n")
 
     # Load data
-    files = load_final_minute_files(data_dir)
-    print(f"Loaded {len(files)} final minute captures\n")
+    cache = load_final_minute_cache(data_dir)
+    print(f"Loaded {len(cache)} final minute captures\n")
 
-    if not files:
+    if not len(cache):
         print("No data files found!")
         return
 
-    # Separate by asset
-    btc_files = [f for f in files if f.get('asset') == 'BTC']
-    eth_files = [f for f in files if f.get('asset') == 'ETH']
+    # Per-window results for every analysis, computed once over all windows
+    time_weighted = analyze_time_weighted(cache)
+    thresholds = analyze_threshold(cache)
+    combined = analyze_combined_signals(cache)
+    spreads = analyze_spread(cache)
+
+    # Separate by asset (window indices)
+    btc_files = np.flatnonzero(cache.asset_mask('BTC'))
+    eth_files = np.flatnonzero(cache.asset_mask('ETH'))
 
     for asset, asset_files in [('BTC', btc_files), ('ETH', eth_files)]:
-        if not asset_files:
+        if not len(asset_files):
             continue
 
         print(f"\n{'='*70}")
@@ -267,8 +273,8 @@ def main(data_dir: str):
         print("Does the signal improve closer to resolution?\n")
 
         time_results = []
-        for data in asset_files:
-            result = analyze_time_weighted(data, data['window_end'])
+        for i in asset_files:
+            result = time_weighted[i]
             if result:
                 time_results.append(result)
 
@@ -289,8 +295,8 @@ def main(data_dir: str):
         print("Does higher |imbalance| threshold improve accuracy?\n")
 
         threshold_results = []
-        for data in asset_files:
-            result = analyze_threshold(data)
+        for i in asset_files:
+            result = thresholds[i]
             if result:
                 threshold_results.append(result)
 
@@ -312,8 +318,8 @@ def main(data_dir: str):
         print("Does combining orderbook + momentum improve accuracy?\n")
 
         combined_results = []
-        for data in asset_files:
-            result = analyze_combined_signals(data)
+        for i in asset_files:
+            result = combined[i]
             if result:
                 combined_results.append(result)
 
@@ -364,8 +370,8 @@ def main(data_dir: str):
         print("Does spread correlate with signal reliability?\n")
 
         spread_results = []
-        for data in asset_files:
-            result = analyze_spread(data)
+        for i in asset_files:
+            result = spreads[i]
             if result and 'avg_spread' in result:
                 spread_results.append(result)
 
@@ -400,14 +406,14 @@ def main(data_dir: str):
     print(f"{'='*70}\n")
 
     # Best performing configurations for BTC
-    if btc_files:
+    if len(btc_files):
         print("RECOMMENDED BTC TRADING RULES:")
         print("-" * 40)
 
         # Find best threshold
         threshold_results = []
-        for data in btc_files:
-            result = analyze_threshold(data)
+        for i in btc_files:
+            result = thresholds[i]
             if result:
                 threshold_results.append(result)
 
@@ -435,8 +441,8 @@ def main(data_dir: str):
 
         # Best time window
         time_results = []
-        for data in btc_files:
-            result = analyze_time_weighted(data, data['window_end'])
+        for i in btc_files:
+            result = time_weighted[i]
             if result:
                 time_results.append(result)
 
@@ -462,8 +468,8 @@ def main(data_dir: str):
 
         # Combined signal rule
         combined_results = []
-        for data in btc_files:
-            result = analyze_combined_signals(data)
+        for i in btc_files:
+            result = combined[i]
             if result:
                 combined_results.append(result)
 
@@ -72,6 +72,22 @@ def load_binance_klines(klines_file: str) -> pd.DataFrame:
     return df
 
 
+def load_cached_klines(cache_dir: str, trades_df: pd.DataFrame) -> pd.DataFrame:
+    """Load 1-minute klines covering the trades from the memory-mapped kline cache."""
+    from src.storage.kline_cache import KlineCache
+
+    print(f"Loading Binance klines from cache {cache_dir}...")
+
+    ts = pd.to_numeric(trades_df['timestamp'], errors='coerce').dropna()
+    start_ms = (int(ts.min()) - 3600) * 1000
+    end_ms = (int(ts.max()) + 3600) * 1000
+
+    df = KlineCache(cache_dir).to_dataframe(["BTCUSDT", "ETHUSDT"], "1m", start_ms, end_ms)
+    print(f"  Loaded {len(df):,} klines for {df['symbol'].nunique()} symbols")
+
+    return df
+
+
 def load_token_mapping(mapping_file: str) -> Dict[str, dict]:
     """Load token ID to market mapping."""
     print(f"Loading token mapping from {mapping_file}...")
@@ -443,6 +459,8 @@ def main():
     parser = argparse.ArgumentParser(description="Feature Engineering Pipeline")
     parser.add_argument("--sample", type=int, default=None, help="Sample N trades (for testing)")
     parser.add_argument("--random-sample", action="store_true", help="Use random sampling instead of first N")
+    parser.add_argument("--klines-cache", type=str, default=None,
+                        help="Load klines from a backfill_klines.py cache dir instead of the CSV")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -460,7 +478,10 @@ def main():
 
     # Load data
     trades_df = load_trades(trades_file)
-    klines_df = load_binance_klines(klines_file)
+    if args.klines_cache:
+        klines_df = load_cached_klines(args.klines_cache, trades_df)
+    else:
+        klines_df = load_binance_klines(klines_file)
     token_mapping = load_token_mapping(mapping_file)
 
     # Sample if requested
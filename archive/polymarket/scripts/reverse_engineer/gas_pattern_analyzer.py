@@ -11,12 +11,12 @@ Analyzes Account88888's gas usage patterns to detect:
 Usage:
     python scripts/reverse_engineer/gas_pattern_analyzer.py --sample 500
 
-Note: Fetches transaction data from Polygon RPC.
+Note: Fetches transaction data from Polygon RPC in batches (src/api/polygon_rpc.py);
+results are cached under data/rpc_cache, so reruns only fetch new transactions.
 """
 
 import json
 import time
-import requests
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -27,6 +27,8 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.api.polygon_rpc import PolygonRPC
+
 
 @dataclass
 class GasAnalysis:
@@ -65,71 +67,53 @@ class GasPatternAnalyzer:
         "https://polygon-mainnet.public.blastapi.io",
     ]
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, rpc: Optional[PolygonRPC] = None):
         self.output_dir = output_dir or PROJECT_ROOT / "data" / "analysis"
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.rpc_index = 0
+        self.rpc = rpc or PolygonRPC(
+            endpoints=self.RPC_ENDPOINTS,
+            cache_dir=str(PROJECT_ROOT / "data" / "rpc_cache"),
+        )
         self.analyses: List[GasAnalysis] = []
-        self.block_cache: Dict[int, dict] = {}
-
-    def get_rpc(self) -> str:
-        return self.RPC_ENDPOINTS[self.rpc_index % len(self.RPC_ENDPOINTS)]
-
-    def rotate_rpc(self):
-        self.rpc_index += 1
 
     def eth_call(self, method: str, params: list) -> Optional[dict]:
-        """Make RPC call with retry."""
-        for _ in range(3):
-            try:
-                response = requests.post(
-                    self.get_rpc(),
-                    json={
-                        "jsonrpc": "2.0",
-                        "method": method,
-                        "params": params,
-                        "id": 1
-                    },
-                    timeout=10
-                )
-                if response.ok:
-                    data = response.json()
-                    if "result" in data:
-                        return data["result"]
-            except:
-                pass
-            self.rotate_rpc()
-            time.sleep(0.3)
-        return None
+        """Make RPC call with retry (cached)."""
+        return self.rpc.call(method, params)
 
     def get_tx_details(self, tx_hash: str) -> Optional[Tuple[dict, dict]]:
         """Get transaction and receipt."""
-        tx = self.eth_call("eth_getTransactionByHash", [tx_hash])
-        receipt = self.eth_call("eth_getTransactionReceipt", [tx_hash])
+        tx, receipt = self.rpc.call_many([
+            ("eth_getTransactionByHash", [tx_hash]),
+            ("eth_getTransactionReceipt", [tx_hash]),
+        ])
         return (tx, receipt) if tx and receipt else None
 
     def get_block(self, block_number: int) -> Optional[dict]:
         """Get block data (cached)."""
-        if block_number in self.block_cache:
-            return self.block_cache[block_number]
-
-        block = self.eth_call("eth_getBlockByNumber", [hex(block_number), True])
-        if block:
-            self.block_cache[block_number] = block
-        return block
-
-    def analyze_transaction(self, trade: dict, token_mapping: Dict) -> Optional[GasAnalysis]:
-        """Analyze gas usage for a trade."""
+        return self.rpc.get_blocks([block_number], full_transactions=True).get(block_number)
+
+    def analyze_transaction(
+        self,
+        trade: dict,
+        token_mapping: Dict,
+        context: Optional[Tuple[dict, dict, Optional[dict]]] = None,
+    ) -> Optional[GasAnalysis]:
+        """
+        Analyze gas usage for a trade.
+
+        `context` is the prefetched (tx, receipt, block); fetched here if omitted.
+        """
         tx_hash = trade.get("tx_hash")
         if not tx_hash:
             return None
 
-        result = self.get_tx_details(tx_hash)
-        if not result:
+        if context is None:
+            context = self.rpc.fetch_tx_context([tx_hash], full_blocks=True).get(tx_hash)
+        if not context or not context[0]:
             return None
 
-        tx, receipt = result
+        tx, receipt, block = context
 
         # Extract gas info
         gas_price = int(tx.get("gasPrice", "0x0"), 16)
@@ -140,8 +124,7 @@ class GasPatternAnalyzer:
 
         block_number = int(receipt.get("blockNumber", "0x0"), 16)
 
-        # Get block for context
-        block = self.get_block(block_number)
+        # Block for context (fetched once per block for all trades)
         timestamp = int(block.get("timestamp", "0x0"), 16) if block else 0
 
         # Calculate block average gas
@@ -236,16 +219,21 @@ class GasPatternAnalyzer:
         """Analyze all trades."""
         print(f"\nAnalyzing {len(trades)} transactions...")
 
-        for i, trade in enumerate(trades):
-            if i % 50 == 0:
-                print(f"  Progress: {i}/{len(trades)}")
+        # Transactions, receipts and their blocks in batched, cached RPC calls
+        contexts = self.rpc.fetch_tx_context(
+            (t["tx_hash"] for t in trades if t.get("tx_hash")),
+            full_blocks=True,
+        )
+        print(f"  Fetched: {len(contexts)} transactions ({self.rpc.stats})")
 
-            analysis = self.analyze_transaction(trade, token_mapping)
+        for trade in trades:
+            context = contexts.get(trade.get("tx_hash"))
+            if not context:
+                continue
+            analysis = self.analyze_transaction(trade, token_mapping, context)
             if analysis:
                 self.analyses.append(analysis)
 
-            time.sleep(0.15)  # Rate limiting
-
         print(f"  Analyzed: {len(self.analyses)} transactions")
 
     def compute_statistics(self) -> Dict:
@@ -391,10 +379,28 @@ def main():
         default="data/token_to_market.json",
         help="Token mapping file"
     )
+    parser.add_argument(
+        "--rpc-url",
+        action="append",
+        help="RPC endpoint (repeatable; default: public Polygon endpoints)"
+    )
+    parser.add_argument(
+        "--rpc-cache",
+        default="data/rpc_cache",
+        help="RPC result cache directory"
+    )
+    parser.add_argument("--batch-size", type=int, default=50, help="Calls per JSON-RPC batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent batches")
 
     args = parser.parse_args()
 
-    analyzer = GasPatternAnalyzer()
+    rpc = PolygonRPC(
+        endpoints=args.rpc_url or GasPatternAnalyzer.RPC_ENDPOINTS,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        cache_dir=str(PROJECT_ROOT / args.rpc_cache),
+    )
+    analyzer = GasPatternAnalyzer(rpc=rpc)
     analyzer.run(
         str(PROJECT_ROOT / args.trades),
         str(PROJECT_ROOT / args.mapping),
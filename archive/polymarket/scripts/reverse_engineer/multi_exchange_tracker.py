@@ -18,8 +18,13 @@ as their signal source, or aggregating multiple exchanges for earlier signals.
 Usage:
     python scripts/reverse_engineer/multi_exchange_tracker.py --duration 300
 
+Lead-lag is estimated by resampling each exchange's ticks onto a common
+grid and cross-correlating returns with FFT (src/feeds/lead_lag.py): a
+rolling estimate while running, and a per-15m-window lag distribution per
+exchange pair at the end.
+
 Output:
-    data/research/multi_exchange/prices_{timestamp}.json
+    data/research/multi_exchange/multi_exchange_{timestamp}.json
 """
 
 import json
@@ -37,6 +42,17 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.feeds.lead_lag import LeadLagEngine, OnlineLeadLag, lag_distribution
+
+
+EXCHANGES = ["binance", "coinbase", "kraken"]
+SYMBOLS = ["BTC", "ETH"]
+
+GRID_MS = 50           # Resampling grid for lead-lag
+MAX_LAG_MS = 3000      # Lags searched either side
+WINDOW_MS = 900_000    # 15m market windows
+MIN_CORRELATION = 0.1  # Ignore estimates with a weaker peak
+
 
 @dataclass
 class PriceTick:
@@ -53,13 +69,13 @@ class PriceTick:
 
 @dataclass
 class LeadLagMeasurement:
-    """Measurement of which exchange moved first."""
+    """Rolling estimate of which exchange moved first."""
     timestamp: float
     symbol: str
-    direction: str  # "up" or "down"
     leader: str  # Exchange that moved first
+    follower: str
     lag_ms: float  # How many ms later the follower moved
-    price_move_pct: float
+    correlation: float  # Return correlation at that lag
 
 
 class MultiExchangeTracker:
@@ -89,6 +105,13 @@ class MultiExchangeTracker:
         self.all_ticks: List[PriceTick] = []
         self.lead_lag_events: List[LeadLagMeasurement] = []
 
+        # Rolling lead-lag over the last 5 minutes, per symbol
+        self.online = {
+            symbol: OnlineLeadLag(EXCHANGES, grid_ms=GRID_MS, max_lag_ms=MAX_LAG_MS, horizon_ms=300_000)
+            for symbol in SYMBOLS
+        }
+        self.lead_lag_summary: Dict = {}
+
         # Control
         self._running = False
         self._lock = threading.Lock()
@@ -155,56 +178,48 @@ class MultiExchangeTracker:
             self.all_ticks.append(tick)
             self.stats[f"{exchange}_ticks"] += 1
 
-            # Check for lead-lag events
-            self._check_lead_lag(symbol)
-
-    def _check_lead_lag(self, symbol: str):
-        """Check if any exchange is leading price moves."""
-        # Get recent prices from all exchanges
-        exchanges = ["binance", "coinbase", "kraken"]
-        recent = {}
-
-        for ex in exchanges:
-            if self.prices[ex][symbol]:
-                ticks = list(self.prices[ex][symbol])[-10:]  # Last 10 ticks
-                if len(ticks) >= 2:
-                    recent[ex] = ticks
-
-        if len(recent) < 2:
-            return  # Need at least 2 exchanges
-
-        # Look for significant price moves (>0.05%)
-        for ex, ticks in recent.items():
-            if len(ticks) < 2:
-                continue
+            self.online[symbol].update(exchange, now * 1000, price)
 
-            move = (ticks[-1].price - ticks[-2].price) / ticks[-2].price
-            if abs(move) > 0.0005:  # 0.05% move
-                direction = "up" if move > 0 else "down"
-
-                # Check if other exchanges followed
-                for other_ex, other_ticks in recent.items():
-                    if other_ex == ex:
+    def snapshot_lead_lag(self):
+        """Record the current rolling lead-lag estimate for each symbol."""
+        now = time.time()
+        with self._lock:
+            for symbol in SYMBOLS:
+                for (first, second), est in self.online[symbol].estimate(now * 1000).items():
+                    if est.leader is None or est.correlation < MIN_CORRELATION:
                         continue
+                    self.lead_lag_events.append(LeadLagMeasurement(
+                        timestamp=now,
+                        symbol=symbol,
+                        leader=est.leader,
+                        follower=second if est.leader == first else first,
+                        lag_ms=abs(est.lag_ms),
+                        correlation=est.correlation,
+                    ))
+                    self.stats["lead_lag_events"] += 1
+
+    def compute_lead_lag(self) -> Dict:
+        """Lag distribution per symbol and exchange pair over 15m windows."""
+        engine = LeadLagEngine(grid_ms=GRID_MS, max_lag_ms=MAX_LAG_MS)
+        summary = {}
+
+        for symbol in SYMBOLS:
+            streams = {}
+            for ex in EXCHANGES:
+                ticks = [t for t in self.all_ticks if t.exchange == ex and t.symbol == symbol]
+                if ticks:
+                    streams[ex] = ([t.timestamp * 1000 for t in ticks], [t.price for t in ticks])
+
+            windows = engine.estimate_windows(streams, window_ms=WINDOW_MS)
+            summary[symbol] = {
+                f"{first}/{second}": {
+                    "distribution": lag_distribution(estimates, MIN_CORRELATION),
+                    "windows": [asdict(e) for e in estimates],
+                }
+                for (first, second), estimates in windows.items()
+            }
 
-                    # Did other exchange move in same direction after?
-                    for other_tick in other_ticks:
-                        if other_tick.timestamp > ticks[-1].timestamp:
-                            other_move = (other_tick.price - ticks[-1].price) / ticks[-1].price
-                            if (direction == "up" and other_move > 0) or (direction == "down" and other_move < 0):
-                                lag_ms = (other_tick.timestamp - ticks[-1].timestamp) * 1000
-
-                                event = LeadLagMeasurement(
-                                    timestamp=ticks[-1].timestamp,
-                                    symbol=symbol,
-                                    direction=direction,
-                                    leader=ex,
-                                    lag_ms=lag_ms,
-                                    price_move_pct=move * 100
-                                )
-                                self.lead_lag_events.append(event)
-                                self.stats["lead_lag_events"] += 1
-                                break
+        return summary
 
     def fetch_binance_price(self, symbol: str) -> Optional[float]:
         """Fetch current price from Binance.US REST API (works in US regions)."""
@@ -262,14 +277,13 @@ class MultiExchangeTracker:
             ticks = self.stats[f"{ex}_ticks"]
             print(f"{ex:10s}: BTC=${btc:,.2f}  ETH=${eth:,.2f}  (ticks: {ticks})")
 
-        if len(self.lead_lag_events) > 0:
-            print(f"\nLead-lag events: {len(self.lead_lag_events)}")
-            # Count leaders
-            leaders = {}
+        if self.lead_lag_events:
+            latest = self.lead_lag_events[-1].timestamp
+            print("\nRolling lead-lag (last 5 min):")
             for event in self.lead_lag_events:
-                leaders[event.leader] = leaders.get(event.leader, 0) + 1
-            for leader, count in sorted(leaders.items(), key=lambda x: -x[1]):
-                print(f"  {leader}: {count} times led")
+                if event.timestamp == latest:
+                    print(f"  {event.symbol}: {event.leader} leads {event.follower} by "
+                          f"{event.lag_ms:.0f}ms (corr {event.correlation:.2f})")
 
     def analyze_results(self):
         """Analyze collected data for patterns."""
@@ -293,36 +307,46 @@ class MultiExchangeTracker:
                     print(f"  {ex:10s}: ${p:,.2f} ({diff:+.4f}% vs avg)")
 
         # Lead-lag analysis
-        if self.lead_lag_events:
-            print("\n--- Lead-Lag Analysis ---")
-            print(f"Total lead-lag events detected: {len(self.lead_lag_events)}")
+        self.lead_lag_summary = self.compute_lead_lag()
+        leader_counts = {}
+        leader_lags = {}
+
+        print("\n--- Lead-Lag Analysis (per 15m window) ---")
+        for symbol, pairs in self.lead_lag_summary.items():
+            for pair, result in pairs.items():
+                dist = result["distribution"]
+                if not dist["windows"]:
+                    continue
+                first, second = pair.split("/")
+                print(f"{symbol} {pair}: {dist['windows']} windows, median lag {dist['median_lag_ms']:+.0f}ms "
+                      f"(p10 {dist['p10_lag_ms']:+.0f}, p90 {dist['p90_lag_ms']:+.0f}), "
+                      f"{first} led {dist[f'{first}_leads']}, {second} led {dist[f'{second}_leads']}")
 
-            # Count by leader
-            leader_counts = {}
-            leader_lags = {}
-            for event in self.lead_lag_events:
-                leader_counts[event.leader] = leader_counts.get(event.leader, 0) + 1
-                if event.leader not in leader_lags:
-                    leader_lags[event.leader] = []
-                leader_lags[event.leader].append(event.lag_ms)
+                for window in result["windows"]:
+                    if window["correlation"] < MIN_CORRELATION or window["lag_ms"] == 0:
+                        continue
+                    leader = first if window["lag_ms"] > 0 else second
+                    leader_counts[leader] = leader_counts.get(leader, 0) + 1
+                    leader_lags.setdefault(leader, []).append(abs(window["lag_ms"]))
 
-            print("\nWhich exchange leads price moves?")
+        if leader_counts:
+            total = sum(leader_counts.values())
+            print("\nWhich exchange leads price moves? (pair-windows led)")
             for leader, count in sorted(leader_counts.items(), key=lambda x: -x[1]):
-                pct = count / len(self.lead_lag_events) * 100
+                pct = count / total * 100
                 avg_lag = sum(leader_lags[leader]) / len(leader_lags[leader])
                 print(f"  {leader:10s}: {count:3d} times ({pct:.1f}%), avg lag: {avg_lag:.0f}ms")
 
             # Implications
             print("\n--- Implications for Account88888 ---")
-            if leader_counts:
-                top_leader = max(leader_counts, key=leader_counts.get)
-                if top_leader != "binance":
-                    print(f"  ! {top_leader.upper()} leads Binance - potential signal source!")
-                    print(f"    Account88888 might be watching {top_leader} for earlier signals")
-                else:
-                    print("  Binance leads other exchanges - unlikely to be their edge")
+            top_leader = max(leader_counts, key=leader_counts.get)
+            if top_leader != "binance":
+                print(f"  ! {top_leader.upper()} leads Binance - potential signal source!")
+                print(f"    Account88888 might be watching {top_leader} for earlier signals")
+            else:
+                print("  Binance leads other exchanges - unlikely to be their edge")
         else:
-            print("\nNo lead-lag events detected (may need longer runtime)")
+            print("\nNo lead-lag detected (may need longer runtime)")
 
     def save_results(self):
         """Save collected data."""
@@ -341,7 +365,10 @@ class MultiExchangeTracker:
             },
             "final_prices": self.latest,
             "lead_lag_events": [asdict(e) for e in self.lead_lag_events],
+            "lead_lag": self.lead_lag_summary,
             "sample_ticks": [t.to_dict() for t in self.all_ticks[-500:]],  # Last 500 ticks
+            # All ticks, columnar: symbol -> exchange -> {"timestamp": [...], "price": [...]}
+            "ticks": self._tick_columns(),
         }
 
         with open(filepath, 'w') as f:
@@ -349,6 +376,14 @@ class MultiExchangeTracker:
 
         print(f"\nSaved results to: {filepath}")
 
+    def _tick_columns(self) -> Dict:
+        columns: Dict = {}
+        for tick in self.all_ticks:
+            col = columns.setdefault(tick.symbol, {}).setdefault(tick.exchange, {"timestamp": [], "price": []})
+            col["timestamp"].append(tick.timestamp)
+            col["price"].append(tick.price)
+        return columns
+
     def run(self, duration_seconds: int = 300):
         """Run the multi-exchange tracker."""
         print("=" * 60)
@@ -387,6 +422,7 @@ class MultiExchangeTracker:
             while time.time() < end_time and self._running:
                 now = time.time()
                 if now - last_status > status_interval:
+                    self.snapshot_lead_lag()
                     self.print_status()
                     last_status = now
                 time.sleep(1)
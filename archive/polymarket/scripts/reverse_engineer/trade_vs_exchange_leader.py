@@ -12,6 +12,10 @@ Analysis:
 
 Requires: Multi-exchange price data collected by multi_exchange_tracker.py
 
+Ticks are held as sorted per-exchange arrays, so each exchange's first move
+before every trade is found with one binary search per trade, and pairwise
+lag distributions come from the FFT lead-lag engine (src/feeds/lead_lag.py).
+
 Usage:
     python scripts/reverse_engineer/trade_vs_exchange_leader.py
 
@@ -32,6 +36,11 @@ import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.feeds.lead_lag import LeadLagEngine, first_significant_move, lag_distribution
+
+
+EXCHANGES = ["binance", "coinbase", "kraken"]
+
 
 @dataclass
 class ExchangeLeadEvent:
@@ -66,7 +75,9 @@ class TradeVsExchangeAnalyzer:
     """Analyzes correlation between trades and exchange price leadership."""
 
     def __init__(self):
-        self.exchange_data: List[dict] = []
+        self.exchange_data: Dict = {}
+        # symbol -> exchange -> (sorted timestamps, prices)
+        self.streams: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
         self.trades: List[dict] = []
         self.correlations: List[TradeExchangeCorrelation] = []
 
@@ -82,24 +93,40 @@ class TradeVsExchangeAnalyzer:
 
         print(f"  Found {len(files)} data files")
 
-        all_ticks = []
+        columns = defaultdict(lambda: defaultdict(lambda: ([], [])))
         all_lead_lag = []
 
         for f in sorted(files):
             with open(f) as fp:
                 data = json.load(fp)
 
-            ticks = data.get("sample_ticks", [])
-            lead_lag = data.get("lead_lag_events", [])
-
-            all_ticks.extend(ticks)
-            all_lead_lag.extend(lead_lag)
-
-        print(f"  Loaded {len(all_ticks):,} price ticks")
+            # Full columnar ticks if the tracker saved them, else the sample
+            if "ticks" in data:
+                for symbol, by_exchange in data["ticks"].items():
+                    for exchange, col in by_exchange.items():
+                        columns[symbol][exchange][0].extend(col["timestamp"])
+                        columns[symbol][exchange][1].extend(col["price"])
+            else:
+                for t in data.get("sample_ticks", []):
+                    col = columns[t.get("symbol")][t.get("exchange")]
+                    col[0].append(t.get("timestamp", 0))
+                    col[1].append(t.get("price", 0))
+
+            all_lead_lag.extend(data.get("lead_lag_events", []))
+
+        total = 0
+        for symbol, by_exchange in columns.items():
+            self.streams[symbol] = {}
+            for exchange, (ts, prices) in by_exchange.items():
+                ts, prices = np.asarray(ts, dtype=np.float64), np.asarray(prices, dtype=np.float64)
+                order = np.argsort(ts, kind="stable")
+                self.streams[symbol][exchange] = (ts[order], prices[order])
+                total += len(ts)
+
+        print(f"  Loaded {total:,} price ticks")
         print(f"  Loaded {len(all_lead_lag):,} lead-lag events")
 
         self.exchange_data = {
-            "ticks": all_ticks,
             "lead_lag_events": all_lead_lag,
         }
 
@@ -134,61 +161,69 @@ class TradeVsExchangeAnalyzer:
         print("  No trades file found!")
         return False
 
-    def find_exchange_leader(self, timestamp: float, symbol: str, lookback_seconds: float = 60) -> Dict[str, bool]:
+    def find_exchange_leaders(
+        self,
+        timestamps: np.ndarray,
+        symbol: str,
+        lookback_seconds: float = 60,
+    ) -> Tuple[List[Optional[str]], np.ndarray]:
         """
-        Find which exchange showed price movement first before a given timestamp.
+        Find which exchange showed price movement first before each timestamp.
 
-        Returns dict of {exchange: was_leader}
+        An exchange's first move is its first tick-to-tick change >0.05%
+        inside [t - lookback, t]; the leader is the exchange whose first
+        move came earliest. Needs at least 3 ticks (any exchange) in the
+        window.
+
+        Returns:
+            (leader per timestamp or None, leader's move time or NaN)
         """
-        ticks = self.exchange_data.get("ticks", [])
-
-        # Filter to relevant ticks
-        window_start = timestamp - lookback_seconds
-        relevant_ticks = [
-            t for t in ticks
-            if window_start <= t.get("timestamp", 0) <= timestamp
-            and t.get("symbol") == symbol
-        ]
-
-        if len(relevant_ticks) < 3:
-            return {"binance": False, "coinbase": False, "kraken": False}
-
-        # Group by exchange
-        by_exchange = defaultdict(list)
-        for t in relevant_ticks:
-            by_exchange[t["exchange"]].append(t)
-
-        # Find first significant move per exchange
-        leaders = {"binance": False, "coinbase": False, "kraken": False}
-        first_move_time = {}
-
-        for exchange, ticks_list in by_exchange.items():
-            if len(ticks_list) < 2:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        streams = self.streams.get(symbol, {})
+
+        # Earliest first move across exchanges, ties going to EXCHANGES order
+        best = np.full(len(timestamps), np.inf)
+        best_exchange = np.full(len(timestamps), -1)
+        for i, exchange in enumerate(EXCHANGES):
+            if exchange not in streams:
                 continue
+            ts, prices = streams[exchange]
+            moved = first_significant_move(ts, prices, timestamps, lookback_seconds)
+            earlier = moved < best
+            best[earlier] = moved[earlier]
+            best_exchange[earlier] = i
+
+        # Too few ticks in the window to say anything
+        all_ts = np.sort(np.concatenate([ts for ts, _ in streams.values()])) if streams else np.empty(0)
+        in_window = (
+            np.searchsorted(all_ts, timestamps, side="right")
+            - np.searchsorted(all_ts, timestamps - lookback_seconds, side="left")
+        )
+        best_exchange[in_window < 3] = -1
 
-            # Sort by time
-            ticks_list.sort(key=lambda x: x["timestamp"])
-
-            # Find first significant move (>0.05%)
-            for i in range(1, len(ticks_list)):
-                prev_price = ticks_list[i-1]["price"]
-                curr_price = ticks_list[i]["price"]
-
-                if prev_price > 0:
-                    move_pct = abs(curr_price - prev_price) / prev_price
-                    if move_pct > 0.0005:  # 0.05%
-                        first_move_time[exchange] = ticks_list[i]["timestamp"]
-                        break
+        leaders = [EXCHANGES[i] if i >= 0 else None for i in best_exchange]
+        return leaders, np.where(best_exchange >= 0, best, np.nan)
 
-        # Determine leader (earliest significant move)
-        if first_move_time:
-            earliest = min(first_move_time.items(), key=lambda x: x[1])
-            leaders[earliest[0]] = True
+    def find_exchange_leader(self, timestamp: float, symbol: str, lookback_seconds: float = 60) -> Dict[str, bool]:
+        """
+        Find which exchange showed price movement first before a given timestamp.
 
-        return leaders
+        Returns dict of {exchange: was_leader}
+        """
+        leaders, _ = self.find_exchange_leaders([timestamp], symbol, lookback_seconds)
+        return {exchange: leaders[0] == exchange for exchange in EXCHANGES}
+
+    def analyze_trade(
+        self,
+        trade: dict,
+        leader_info: Optional[Tuple[Optional[str], float]] = None,
+    ) -> Optional[TradeExchangeCorrelation]:
+        """
+        Analyze a single trade's correlation with exchange leadership.
 
-    def analyze_trade(self, trade: dict) -> Optional[TradeExchangeCorrelation]:
-        """Analyze a single trade's correlation with exchange leadership."""
+        `leader_info` is (leader, leader move time) from find_exchange_leaders
+        when trades are analyzed in bulk; otherwise it is looked up here.
+        """
         timestamp = trade.get("timestamp")
         asset = trade.get("asset")
         betting_up = trade.get("betting_up")
@@ -199,34 +234,46 @@ class TradeVsExchangeAnalyzer:
         symbol = asset  # BTC, ETH
 
         # Find which exchange led
-        leaders = self.find_exchange_leader(timestamp, symbol)
+        if leader_info is None:
+            leaders, times = self.find_exchange_leaders([timestamp], symbol)
+            leader_info = (leaders[0], times[0])
+        leader, leader_ts = leader_info
 
         # Determine betting direction
         betting_direction = "up" if betting_up == 1 else "down"
 
-        # Calculate timing relative to leader
-        # (This is approximate - would need exact leader timestamp)
-        seconds_after = 0  # Placeholder
-
         return TradeExchangeCorrelation(
             trade_timestamp=timestamp,
             slug=trade.get("slug", ""),
             asset=asset,
             betting_direction=betting_direction,
             usdc_amount=trade.get("usdc_amount", 0),
-            binance_showed_first=leaders.get("binance", False),
-            coinbase_showed_first=leaders.get("coinbase", False),
-            kraken_showed_first=leaders.get("kraken", False),
-            seconds_after_leader=seconds_after,
+            binance_showed_first=leader == "binance",
+            coinbase_showed_first=leader == "coinbase",
+            kraken_showed_first=leader == "kraken",
+            seconds_after_leader=float(timestamp - leader_ts) if leader else 0,
         )
 
     def analyze_lead_lag_correlation(self):
         """Analyze correlation between lead-lag events and trade direction."""
         lead_lag_events = self.exchange_data.get("lead_lag_events", [])
 
+        # Lag distribution per exchange pair over 15m windows, from the ticks
+        engine = LeadLagEngine(grid_ms=50, max_lag_ms=3000)
+        distributions = {}
+        for symbol, streams in self.streams.items():
+            windows = engine.estimate_windows(
+                {ex: (ts * 1000, prices) for ex, (ts, prices) in streams.items()},
+                window_ms=900_000,
+            )
+            distributions[symbol] = {
+                f"{first}/{second}": lag_distribution(estimates, min_correlation=0.1)
+                for (first, second), estimates in windows.items()
+            }
+
         if not lead_lag_events:
             print("\nNo lead-lag events to analyze.")
-            return {}
+            return {"lag_distribution": distributions} if distributions else {}
 
         print(f"\nAnalyzing {len(lead_lag_events)} lead-lag events...")
 
@@ -244,6 +291,7 @@ class TradeVsExchangeAnalyzer:
             "total_events": len(lead_lag_events),
             "by_leader": dict(leader_counts),
             "by_symbol": {s: dict(leaders) for s, leaders in leader_by_symbol.items()},
+            "lag_distribution": distributions,
         }
 
         return results
@@ -296,6 +344,13 @@ class TradeVsExchangeAnalyzer:
                 pct = count / total_events * 100
                 print(f"  {leader}: {count} times ({pct:.1f}%)")
 
+            for symbol, pairs in lead_lag_stats.get("lag_distribution", {}).items():
+                for pair, dist in pairs.items():
+                    if not dist.get("windows"):
+                        continue
+                    print(f"  {symbol} {pair}: median lag {dist['median_lag_ms']:+.0f}ms over "
+                          f"{dist['windows']} windows (p10 {dist['p10_lag_ms']:+.0f}, p90 {dist['p90_lag_ms']:+.0f})")
+
         # Trade correlation analysis
         if stats:
             print(f"\n--- Trade Correlation (Account88888) ---")
@@ -362,10 +417,18 @@ class TradeVsExchangeAnalyzer:
         random.seed(42)
         sampled_trades = random.sample(self.trades, sample_size)
 
+        # Leaders for all trades of an asset in one pass
+        by_asset = defaultdict(list)
         for trade in sampled_trades:
-            correlation = self.analyze_trade(trade)
-            if correlation:
-                self.correlations.append(correlation)
+            if trade.get("timestamp") is not None and trade.get("betting_up") is not None and trade.get("asset"):
+                by_asset[trade["asset"]].append(trade)
+
+        for asset, trades in by_asset.items():
+            leaders, leader_ts = self.find_exchange_leaders([t["timestamp"] for t in trades], asset)
+            for trade, leader, ts in zip(trades, leaders, leader_ts):
+                correlation = self.analyze_trade(trade, (leader, ts))
+                if correlation:
+                    self.correlations.append(correlation)
 
         print(f"  Analyzed {len(self.correlations)} trades")
 
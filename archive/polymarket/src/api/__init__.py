@@ -3,10 +3,24 @@ from .gamma import GammaClient
 from .data_api import DataAPIClient
 from .clob_ws import CLOBWebSocket
 from .rtds import RTDSWebSocket
+from .rate_limiter import TokenBucket
+from .http_pool import PooledHTTPClient
+from .gamma_bulk import GammaTokenFetcher
+from .trade_downloader import ParquetTradeSink, TradeHistoryDownloader
+from .etherscan import EtherscanExtractor, ParquetTransferStore
+from .polygon_rpc import PolygonRPC
 
 __all__ = [
     "GammaClient",
     "DataAPIClient",
     "CLOBWebSocket",
     "RTDSWebSocket",
+    "TokenBucket",
+    "PooledHTTPClient",
+    "GammaTokenFetcher",
+    "TradeHistoryDownloader",
+    "ParquetTradeSink",
+    "EtherscanExtractor",
+    "ParquetTransferStore",
+    "PolygonRPC",
 ]
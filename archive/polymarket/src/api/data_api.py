@@ -1,9 +1,11 @@
 """Data API client for wallet and trade data."""
 import json
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from urllib.request import urlopen, Request
 from urllib.parse import urlencode
 
+from .trade_downloader import TradeHistoryDownloader
+
 
 # Gamma API base URL for profile searches
 GAMMA_BASE_URL = "https://gamma-api.polymarket.com"
@@ -144,6 +146,47 @@ class DataAPIClient:
         
         return all_trades
     
+    def download_trades(
+        self,
+        user: str,
+        start_ts: int,
+        end_ts: int,
+        sink: Callable[[str, List[Dict]], None],
+        checkpoint_path: Optional[str] = None,
+        concurrency: int = 4,
+        rate: float = 5.0,
+        partitions: Optional[int] = None,
+    ) -> Dict:
+        """
+        Stream a wallet's full trade history to `sink`, resumably.
+        
+        Unlike get_all_trades, the range is split into partitions fetched
+        concurrently under a rate limiter, pages go straight to `sink`
+        instead of a list, and per-partition cursors are checkpointed so
+        a crashed pull resumes where it stopped.
+        
+        Args:
+            user: Proxy wallet address
+            start_ts: Range start (unix seconds, inclusive)
+            end_ts: Range end (unix seconds, inclusive)
+            sink: Called with (partition_id, trades) per page,
+                e.g. ParquetTradeSink("data/pulls/<wallet>")
+            checkpoint_path: Cursor log for resuming (None = no resume)
+            concurrency: Partitions fetched at once
+            rate: Ceiling requests/sec
+            partitions: Number of time windows
+        
+        Returns:
+            Summary dict from TradeHistoryDownloader.download
+        """
+        downloader = TradeHistoryDownloader(
+            base_url=self.BASE_URL,
+            concurrency=concurrency,
+            rate=rate,
+            checkpoint_path=checkpoint_path,
+        )
+        return downloader.download(user, start_ts, end_ts, sink, partitions=partitions)
+    
     def get_activity(
         self,
         user: str,
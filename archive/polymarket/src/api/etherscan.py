@@ -0,0 +1,420 @@
+"""
+Concurrent multi-wallet Etherscan transfer extractor.
+
+Schedules many wallets x block ranges on one worker pool that draws from
+a single token bucket sized to the API key's limit, so total wall time
+is bounded by the request budget rather than by walking wallets one at a
+time with fixed sleeps.
+
+- Each task pages one (wallet, transfer type, block range) oldest-first
+- A range that hits Etherscan's result window (page x offset <= 10000)
+  is split: rows below the last block are kept and the rest of the range
+  is halved into two new tasks, which run concurrently
+- Transfers are deduplicated across wallets (a trade between two tracked
+  wallets is the same log event in both histories) before reaching the sink
+- Completed ranges are logged to an append-only JSONL file for resume
+
+Usage:
+    extractor = EtherscanExtractor(api_key, rate=5, checkpoint_path="data/etherscan.ckpt.jsonl")
+    with ParquetTransferStore("data/transfers") as store:
+        extractor.extract(wallets, store)
+"""
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .http_pool import PooledHTTPClient
+from .rate_limiter import TokenBucket
+
+
+# sink(transfer_type, transfers) -> None. Called from one thread at a time.
+TransferSink = Callable[[str, List[Dict]], None]
+
+TRANSFER_ACTIONS = {"erc1155": "token1155tx", "erc20": "tokentx"}
+
+RESULT_WINDOW = 10000
+LATEST_BLOCK = 99999999
+
+
+@dataclass(frozen=True)
+class BlockRange:
+    """One unit of work: a wallet's transfers of one type over [start, end]."""
+    wallet: str
+    transfer_type: str
+    start: int
+    end: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.wallet}:{self.transfer_type}:{self.start}-{self.end}"
+
+
+def transfer_key(transfer: Dict) -> Tuple:
+    """Identity of a transfer event, independent of which wallet it was fetched for."""
+    tx_hash = transfer.get("hash", "").lower()
+    if transfer.get("logIndex") not in (None, ""):
+        return (tx_hash, str(transfer["logIndex"]))
+    return (
+        tx_hash,
+        transfer.get("from", "").lower(),
+        transfer.get("to", "").lower(),
+        transfer.get("tokenID", ""),
+        transfer.get("tokenValue", transfer.get("value", "")),
+    )
+
+
+def _json_body(resp) -> Optional[Dict]:
+    try:
+        data = resp.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _body_rate_limited(resp) -> bool:
+    """Etherscan answers an exhausted key with HTTP 200 and a status "0" body."""
+    data = _json_body(resp) if resp.status_code == 200 else None
+    return bool(data) and data.get("status") != "1" and "rate limit" in str(data.get("result", "")).lower()
+
+
+class RangeCheckpoint:
+    """
+    Append-only JSONL log of finished block ranges.
+
+    A split range is recorded with the subranges it handed off, so resume
+    picks up the unfinished leaves instead of re-fetching the parent.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._records: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._records[record["range"]] = record
+                    except (ValueError, KeyError):
+                        continue
+
+    def get(self, task: BlockRange) -> Optional[Dict]:
+        return self._records.get(task.key)
+
+    def mark_done(self, task: BlockRange, count: int, children: Optional[List[BlockRange]] = None):
+        record = {
+            "range": task.key,
+            "transfers": count,
+            "children": [[c.start, c.end] for c in children or []],
+        }
+        with self._lock:
+            self._records[task.key] = record
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+
+class ParquetTransferStore:
+    """
+    Single columnar store for all wallets, partitioned by type and block.
+
+    Rows are buffered per partition (`{type}/block={bucket}`) and written
+    as numbered Parquet part files once `flush_rows` accumulate, and on
+    `close()`. Wallet isn't a partition key because a deduplicated
+    transfer belongs to both its `from` and `to` wallets. Requires pyarrow.
+    """
+
+    def __init__(self, directory: str, partition_blocks: int = 1_000_000, flush_rows: int = 50_000):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "ParquetTransferStore requires pyarrow. Install with: pip install pyarrow"
+            ) from e
+
+        self.directory = Path(directory)
+        self.partition_blocks = partition_blocks
+        self.flush_rows = flush_rows
+        self._buffers: Dict[Tuple[str, int], List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, transfer_type: str, transfers: List[Dict]):
+        with self._lock:
+            for t in transfers:
+                bucket = int(t.get("blockNumber", 0)) // self.partition_blocks
+                rows = self._buffers.setdefault((transfer_type, bucket), [])
+                rows.append(t)
+                if len(rows) >= self.flush_rows:
+                    self._write(transfer_type, bucket, rows)
+                    self._buffers[(transfer_type, bucket)] = []
+
+    def _write(self, transfer_type: str, bucket: int, rows: List[Dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not rows:
+            return
+        part_dir = self.directory / transfer_type / f"block={bucket * self.partition_blocks}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        columns = sorted({k for r in rows for k in r})
+        table = pa.table({c: [None if r.get(c) is None else str(r[c]) for r in rows] for c in columns})
+
+        path = part_dir / f"part-{len(list(part_dir.glob('part-*.parquet'))):06d}.parquet"
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp)
+        tmp.replace(path)
+
+    def close(self):
+        """Write all buffered rows."""
+        with self._lock:
+            for (transfer_type, bucket), rows in self._buffers.items():
+                self._write(transfer_type, bucket, rows)
+            self._buffers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EtherscanExtractor:
+    """
+    Extracts ERC1155/ERC20 transfers for many wallets under one API budget.
+
+    Example:
+        extractor = EtherscanExtractor(api_key, rate=5, concurrency=8)
+        summary = extractor.extract(["0xabc...", "0xdef..."], sink)
+        print(summary["transfers"], extractor.stats)
+    """
+
+    BASE_URL = "https://api.etherscan.io/v2/api"
+    POLYGON_CHAIN_ID = 137
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = BASE_URL,
+        chain_id: int = POLYGON_CHAIN_ID,
+        rate: float = 5.0,
+        concurrency: int = 8,
+        page_size: int = 1000,
+        result_window: int = RESULT_WINDOW,
+        checkpoint_path: Optional[str] = None,
+        max_retries: int = 5,
+        timeout: float = 30.0,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            api_key: Etherscan API key (the budget is per key)
+            base_url: API URL (point at a local fake for tests)
+            chain_id: Chain to query (137 = Polygon)
+            rate: Requests/sec allowed for the key (ignored if `limiter` is given)
+            concurrency: Requests in flight at once
+            page_size: Records per page (`offset`)
+            result_window: Max page x offset the API serves for one query
+            checkpoint_path: Append-only JSONL log of completed ranges (None = no resume)
+            max_retries: Attempts per page before its range is abandoned
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one key across extractors
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.chain_id = chain_id
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.max_pages = max(1, result_window // page_size)
+        self.checkpoint = RangeCheckpoint(checkpoint_path)
+
+        self.http = PooledHTTPClient(
+            base_url,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            timeout=timeout,
+            limiter=limiter or TokenBucket(rate=rate, capacity=max(rate, 1.0)),
+            headers={
+                "Accept": "application/json",
+                "User-Agent": "PolymarketExtractor/3.0",
+            },
+            backoff_base=0.5,
+            backoff_max=30.0,
+        )
+        self.limiter = self.http.limiter
+        self.stats = self.http.stats
+        self.stats.update({"splits": 0, "transfers": 0, "duplicates": 0})
+
+        self._seen = set()
+        self._sink_lock = threading.Lock()
+
+    def _fetch_page(self, task: BlockRange, page: int) -> Optional[List[Dict]]:
+        """
+        Fetch one ascending page of a range.
+
+        Returns:
+            Transfers (empty when the range has none), or None if the page kept failing
+        """
+        params = {
+            "chainid": self.chain_id,
+            "module": "account",
+            "action": TRANSFER_ACTIONS[task.transfer_type],
+            "address": task.wallet,
+            "startblock": task.start,
+            "endblock": task.end,
+            "page": page,
+            "offset": self.page_size,
+            "sort": "asc",
+            "apikey": self.api_key,
+        }
+
+        resp = self.http.request("GET", "", params, is_rate_limited=_body_rate_limited)
+        if resp is None:
+            return None
+        data = _json_body(resp) if resp.status_code == 200 else None
+        if data is None:
+            self.http.count("errors")
+            return None
+
+        if data.get("status") == "1":
+            return data.get("result", [])
+
+        # Etherscan reports most conditions as status "0" with HTTP 200
+        result = str(data.get("result", ""))
+        if "no transactions found" in str(data.get("message", "")).lower() or data.get("result") == []:
+            return []
+
+        self.http.count("errors")
+        print(f"Etherscan error for {task.key} page {page}: {data.get('message')} {result}")
+        return None
+
+    def _deliver(self, task: BlockRange, transfers: List[Dict]) -> int:
+        """Dedup against everything already delivered and hand new rows to the sink."""
+        with self._sink_lock:
+            fresh = []
+            for t in transfers:
+                key = transfer_key(t)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                fresh.append(t)
+
+            self.http.count("duplicates", len(transfers) - len(fresh))
+            if fresh:
+                self._sink(task.transfer_type, fresh)
+                self.http.count("transfers", len(fresh))
+            return len(fresh)
+
+    def _run_range(self, task: BlockRange) -> Tuple[bool, List[BlockRange]]:
+        """
+        Page through a range until it's exhausted or the result window is full.
+
+        Returns:
+            (ok, subranges) - subranges cover whatever this task didn't fetch
+        """
+        fetched: List[Dict] = []
+
+        for page in range(1, self.max_pages + 1):
+            transfers = self._fetch_page(task, page)
+            if transfers is None:
+                return False, []
+            fetched.extend(transfers)
+            if len(transfers) < self.page_size:
+                self.checkpoint.mark_done(task, self._deliver(task, fetched))
+                return True, []
+
+        # Window full: keep blocks we saw completely, split the remainder
+        last_block = int(fetched[-1].get("blockNumber", task.start))
+        if last_block <= task.start:
+            print(f"Warning: block {last_block} alone exceeds the result window for {task.key}")
+            self.checkpoint.mark_done(task, self._deliver(task, fetched))
+            return True, []
+
+        mid = (last_block + task.end) // 2
+        subranges = [BlockRange(task.wallet, task.transfer_type, last_block, mid)]
+        if mid < task.end:
+            subranges.append(BlockRange(task.wallet, task.transfer_type, mid + 1, task.end))
+
+        complete = [t for t in fetched if int(t.get("blockNumber", 0)) < last_block]
+        self.checkpoint.mark_done(task, self._deliver(task, complete), subranges)
+        self.http.count("splits")
+        return True, subranges
+
+    def extract(
+        self,
+        wallets: Iterable[str],
+        sink: TransferSink,
+        transfer_types: Iterable[str] = ("erc1155", "erc20"),
+        start_block: int = 0,
+        end_block: int = LATEST_BLOCK,
+    ) -> Dict:
+        """
+        Extract transfers for all wallets concurrently.
+
+        Ranges already finished in the checkpoint are skipped (resuming with
+        their subranges, if they were split), so a crash re-fetches at most
+        the ranges that were in flight. Cross-wallet dedup state isn't
+        persisted, so those in-flight ranges may be delivered twice.
+
+        Args:
+            wallets: Wallet addresses
+            sink: Called with (transfer_type, new_transfers), one call at a time
+            transfer_types: Any of "erc1155", "erc20"
+            start_block: First block (inclusive)
+            end_block: Last block (inclusive)
+
+        Returns:
+            {"ranges", "completed", "failed", "transfers", "elapsed_sec"}
+        """
+        self._sink = sink
+        started = time.time()
+        before = self.stats["transfers"]
+
+        queue = [
+            BlockRange(wallet.lower(), transfer_type, start_block, end_block)
+            for wallet in wallets
+            for transfer_type in transfer_types
+        ]
+        total = completed = 0
+        failed: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            running = {}
+            while queue or running:
+                while queue:
+                    task = queue.pop()
+                    total += 1
+                    record = self.checkpoint.get(task)
+                    if record:
+                        completed += 1
+                        queue.extend(
+                            BlockRange(task.wallet, task.transfer_type, a, b)
+                            for a, b in record.get("children", [])
+                        )
+                        continue
+                    running[pool.submit(self._run_range, task)] = task
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    ok, subranges = future.result()
+                    if ok:
+                        completed += 1
+                        queue.extend(subranges)
+                    else:
+                        failed.append(task.key)
+
+        return {
+            "ranges": total,
+            "completed": completed,
+            "failed": sorted(failed),
+            "transfers": self.stats["transfers"] - before,
+            "elapsed_sec": time.time() - started,
+        }
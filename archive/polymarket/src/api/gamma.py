@@ -1,8 +1,8 @@
 """Gamma API client for market discovery."""
-import json
 from typing import List, Dict, Optional
-from urllib.request import urlopen, Request
-from urllib.parse import urlencode
+
+from .http_pool import PooledHTTPClient
+from .rate_limiter import TokenBucket
 
 
 class GammaClient:
@@ -13,27 +13,48 @@ class GammaClient:
     - Market discovery
     - Market metadata (start/end times, token IDs)
     - Profile/wallet search
+    
+    Requests share one PooledHTTPClient (keep-alive session, token-bucket
+    rate limit, retries on 429/5xx), so the client is safe to call from
+    many threads at once.
     """
     
     BASE_URL = "https://gamma-api.polymarket.com"
     
-    def __init__(self):
-        self.session_headers = {
-            "Accept": "application/json",
-            "User-Agent": "TradingLab/1.0",
-        }
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        concurrency: int = 8,
+        rate: float = 50.0,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            base_url: Gamma base URL (point at a local fake for tests)
+            concurrency: Connections kept alive for concurrent callers
+            rate: Ceiling requests/sec (ignored if `limiter` is given)
+            max_retries: Attempts per request on 429/5xx/network errors
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one budget across clients
+        """
+        self.http = PooledHTTPClient(
+            base_url,
+            concurrency=concurrency,
+            rate=rate,
+            max_retries=max_retries,
+            timeout=timeout,
+            limiter=limiter,
+        )
     
-    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make GET request."""
-        url = f"{self.BASE_URL}{endpoint}"
-        
-        if params:
-            url = f"{url}?{urlencode(params)}"
-        
-        request = Request(url, headers=self.session_headers)
-        
-        with urlopen(request, timeout=30) as response:
-            return json.loads(response.read().decode())
+    def _get(self, endpoint: str, params: Optional[Dict] = None):
+        """Make GET request (None for 404)."""
+        return self.http.get_json(endpoint, params)
+    
+    def close(self):
+        """Release pooled connections."""
+        self.http.close()
     
     def search_markets(
         self,
@@ -60,7 +81,7 @@ class GammaClient:
         if active:
             params["active"] = "true"
         
-        result = self._get("/markets", params)
+        result = self._get("/markets", params) or []
         
         # Handle both list and dict responses
         if isinstance(result, list):
@@ -75,12 +96,59 @@ class GammaClient:
             print(f"Error fetching market {condition_id}: {e}")
             return None
     
-    def get_market_by_slug(self, slug: str) -> Optional[Dict]:
-        """Get market by slug."""
+    def get_markets(self, condition_ids: List[str], chunk_size: int = 50) -> List[Dict]:
+        """
+        Get many markets by condition ID in as few requests as possible.
+
+        Gamma accepts a repeated `condition_ids` query parameter, so a
+        whole portfolio can be priced with one request per chunk instead
+        of one request per market.
+
+        Args:
+            condition_ids: Condition IDs to fetch
+            chunk_size: Max IDs per request (keeps URLs a sane length)
+
+        Returns:
+            List of market objects (missing markets are simply absent)
+        """
+        unique_ids = list(dict.fromkeys(cid for cid in condition_ids if cid))
+        markets = []
+
+        for i in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[i:i + chunk_size]
+            try:
+                result = self._get("/markets", {
+                    "condition_ids": chunk,
+                    "limit": len(chunk),
+                })
+            except Exception as e:
+                print(f"Error fetching {len(chunk)} markets: {e}")
+                continue
+
+            if isinstance(result, dict):
+                result = result.get("markets", [])
+            markets.extend(result or [])
+
+        return markets
+
+    def get_market_by_slug(self, slug: str, raise_errors: bool = False) -> Optional[Dict]:
+        """
+        Get market by slug.
+        
+        Args:
+            slug: Market slug
+            raise_errors: Re-raise request failures instead of returning
+                None, so None always means the slug doesn't exist
+        """
         try:
-            return self._get(f"/markets/slug/{slug}")
+            market = self._get(f"/markets/slug/{slug}")
         except Exception:
+            if raise_errors:
+                raise
             return None
+        if isinstance(market, list):
+            market = market[0] if market else None
+        return market
     
     def search_profiles(self, query: str, limit: int = 10) -> List[Dict]:
         """
@@ -94,7 +162,7 @@ class GammaClient:
             "limit_per_type": limit,
         }
         
-        result = self._get("/public-search", params)
+        result = self._get("/public-search", params) or {}
         return result.get("profiles", [])
     
     def get_btc_eth_15m_markets(self, limit: int = 50) -> List[Dict]:
@@ -0,0 +1,222 @@
+"""
+Bulk token -> market resolver for the Gamma API.
+
+Backfills hundreds of thousands of CLOB token IDs without the
+one-request-per-token, fixed-sleep pattern:
+
+- Many token IDs per request (Gamma accepts repeated `clob_token_ids`)
+- A bounded pool of concurrent requests over one PooledHTTPClient
+  (keep-alive session, shared token bucket that backs off on 429s)
+- An append-only JSONL cache, so a killed backfill resumes for free
+
+Usage:
+    fetcher = GammaTokenFetcher(cache_path="data/token_market_cache.jsonl")
+    token_to_market = fetcher.fetch(token_ids)
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .http_pool import PooledHTTPClient
+from .rate_limiter import TokenBucket
+
+
+def market_token_ids(market: Dict) -> List[str]:
+    """CLOB token IDs of a Gamma market (`clobTokenIds` is a JSON string)."""
+    token_ids = market.get("clobTokenIds") or []
+    if isinstance(token_ids, str):
+        try:
+            token_ids = json.loads(token_ids)
+        except ValueError:
+            return []
+    return [str(t) for t in token_ids]
+
+
+class TokenMarketCache:
+    """
+    Append-only JSONL cache of token_id -> market.
+
+    Each line is `{"token_id": ..., "market": {...} | null}`. A null
+    market records a confirmed miss so it isn't re-requested. Appends
+    are a single write per batch, so a crash loses at most the batch in
+    flight and a torn last line is skipped on load.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, Optional[Dict]] = {}
+        self._lock = threading.Lock()
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self._entries[record["token_id"]] = record.get("market")
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token_id: str) -> Optional[Dict]:
+        return self._entries.get(token_id)
+
+    def put_many(self, entries: Dict[str, Optional[Dict]]):
+        """Record a batch of results (None = not found)."""
+        if not entries:
+            return
+
+        with self._lock:
+            self._entries.update(entries)
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                lines = "".join(
+                    json.dumps({"token_id": t, "market": m}) + "\n"
+                    for t, m in entries.items()
+                )
+                with open(self.path, "a") as f:
+                    f.write(lines)
+
+    def found(self) -> Dict[str, Dict]:
+        """All token_id -> market entries that resolved."""
+        return {t: m for t, m in self._entries.items() if m is not None}
+
+
+class GammaTokenFetcher:
+    """
+    Resolves CLOB token IDs to Gamma markets concurrently.
+
+    Example:
+        fetcher = GammaTokenFetcher(concurrency=8, rate=20)
+        results = fetcher.fetch(["1234...", "5678..."])
+        print(fetcher.stats)
+    """
+
+    BASE_URL = "https://gamma-api.polymarket.com"
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        batch_size: int = 20,
+        concurrency: int = 8,
+        rate: float = 20.0,
+        cache_path: Optional[str] = None,
+        max_retries: int = 5,
+        timeout: float = 15.0,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            base_url: Gamma base URL (point at a local fake for tests)
+            batch_size: Token IDs packed into one request
+            concurrency: Max in-flight requests
+            rate: Ceiling requests/sec (ignored if `limiter` is given)
+            cache_path: Append-only JSONL cache file
+            max_retries: Attempts per batch before giving up on it
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one budget across fetchers
+        """
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.cache = TokenMarketCache(cache_path)
+
+        self.http = PooledHTTPClient(
+            base_url,
+            concurrency=concurrency,
+            rate=rate,
+            max_retries=max_retries,
+            timeout=timeout,
+            limiter=limiter,
+            backoff_base=0.5,
+            backoff_max=30.0,
+        )
+        self.limiter = self.http.limiter
+        self.stats = self.http.stats
+        self.stats["failed_batches"] = 0
+
+    def _fetch_batch(self, token_ids: List[str]) -> Optional[Dict[str, Optional[Dict]]]:
+        """
+        Fetch one batch of token IDs.
+
+        Returns:
+            token_id -> market (None for confirmed misses), or None if the
+            batch kept failing and should be retried on a later run
+        """
+        resp = self.http.request("GET", "/markets", {
+            "clob_token_ids": token_ids,
+            "limit": len(token_ids),
+        })
+        if resp is None:
+            self.http.count("failed_batches")
+            return None
+        if resp.status_code != 200:
+            self.http.count("errors")
+            return None
+
+        data = resp.json()
+        if isinstance(data, dict):
+            data = data.get("markets", [])
+
+        requested = set(token_ids)
+        results: Dict[str, Optional[Dict]] = {t: None for t in token_ids}
+        for market in data:
+            for token_id in market_token_ids(market):
+                if token_id in requested:
+                    results[token_id] = market
+        return results
+
+    def fetch(
+        self,
+        token_ids: Iterable[str],
+        progress_every: int = 1000,
+    ) -> Dict[str, Dict]:
+        """
+        Resolve token IDs, skipping anything already in the cache.
+
+        Args:
+            token_ids: CLOB token IDs
+            progress_every: Print progress after this many tokens (0 = quiet)
+
+        Returns:
+            token_id -> market for every token that resolved
+        """
+        wanted = list(dict.fromkeys(str(t) for t in token_ids))
+        pending = [t for t in wanted if t not in self.cache]
+        batches = [
+            pending[i:i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+
+        done = 0
+        next_report = progress_every
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._fetch_batch, b): b for b in batches}
+            for future in as_completed(futures):
+                results = future.result()
+                if results is not None:
+                    self.cache.put_many(results)
+
+                done += len(futures[future])
+                if progress_every and done >= next_report:
+                    next_report += progress_every
+                    elapsed = time.monotonic() - start
+                    print(
+                        f"  Progress: {done:,}/{len(pending):,} "
+                        f"({done / elapsed:.0f} tokens/s, "
+                        f"rate {self.limiter.rate:.1f} req/s, "
+                        f"429s: {self.stats['rate_limited']})"
+                    )
+
+        return {t: self.cache.get(t) for t in wanted if self.cache.get(t) is not None}
@@ -0,0 +1,184 @@
+"""
+Pooled, rate-limited HTTP client shared by the concurrent API clients.
+
+Every bulk client (Gamma, Data API, Etherscan, Binance klines, JSON-RPC)
+needs the same plumbing: one keep-alive session sized for its worker
+pool, a TokenBucket drawn on before each request, 429/5xx handling with
+retries, and request counters. PooledHTTPClient is that plumbing; the
+clients only build requests and interpret responses.
+
+Usage:
+    http = PooledHTTPClient("https://gamma-api.polymarket.com", concurrency=8, rate=20)
+    market = http.get_json("/markets/slug/btc-updown-15m-1765000800")  # None on 404
+    resp = http.request("GET", "/markets", params={"q": "Bitcoin"})    # None if every attempt failed
+    print(http.stats)
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import TokenBucket
+
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "TradingLab/1.0",
+}
+
+
+class PooledHTTPClient:
+    """
+    Keep-alive session + shared TokenBucket + retry loop.
+
+    A response is retried when it is rate limited (backs the bucket off
+    and honours Retry-After), a 5xx, or a network error (exponential
+    sleep). Anything else is handed back to the caller as-is.
+
+    Example:
+        http = PooledHTTPClient(base_url, concurrency=16, rate=50)
+        with ThreadPoolExecutor(16) as pool:
+            pages = list(pool.map(lambda p: http.get_json("/items", {"page": p}), range(100)))
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        concurrency: int = 8,
+        rate: float = 20.0,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        limiter: Optional[TokenBucket] = None,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limit_statuses: Sequence[int] = (429,),
+        backoff_base: float = 0.25,
+        backoff_max: float = 5.0,
+        pool_connections: int = 1,
+    ):
+        """
+        Args:
+            base_url: Prefix for relative paths (absolute URLs are used as-is)
+            concurrency: Connections kept alive (size of the caller's worker pool)
+            rate: Ceiling requests/sec (ignored if `limiter` is given)
+            max_retries: Attempts per request on 429/5xx/network errors
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one budget across clients
+            headers: Session headers (default: JSON Accept + User-Agent)
+            rate_limit_statuses: Statuses that mean "slow down" (Binance adds 418)
+            backoff_base: First sleep after a 5xx/network error (doubles per attempt)
+            backoff_max: Longest sleep after a 5xx/network error
+            pool_connections: Distinct hosts to keep pools for
+        """
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = limiter or TokenBucket(rate=rate, capacity=max(concurrency, 1))
+        self.rate_limit_statuses = tuple(rate_limit_statuses)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0}
+
+    def count(self, key: str, n: int = 1):
+        """Add to a counter in `stats` (clients keep their own counters here too)."""
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+
+    def _sleep(self, attempt: int, attempts: int):
+        # No point waiting after the last attempt; the caller gives up or retries its own way
+        if attempt + 1 < attempts:
+            time.sleep(min(2 ** attempt * self.backoff_base, self.backoff_max))
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        data: Any = None,
+        weight: float = 1.0,
+        attempts: Optional[int] = None,
+        is_rate_limited: Optional[Callable[[requests.Response], bool]] = None,
+    ) -> Optional[requests.Response]:
+        """
+        Send a request, retrying rate limits, 5xx and network errors.
+
+        Args:
+            method: HTTP method
+            path: Path under base_url, or an absolute URL
+            params: Query parameters (lists become repeated keys)
+            data: Request body
+            weight: Bucket tokens the request costs (e.g. Binance weights)
+            attempts: Override max_retries for this request
+            is_rate_limited: Extra check for APIs that signal rate limits
+                in a 200 body (Etherscan)
+
+        Returns:
+            The first response that is neither rate limited nor a 5xx,
+            or None if every attempt failed
+        """
+        url = self._url(path)
+        attempts = attempts or self.max_retries
+
+        for attempt in range(attempts):
+            self.limiter.acquire(weight)
+            self.count("requests")
+
+            try:
+                resp = self.session.request(method, url, params=params, data=data, timeout=self.timeout)
+            except requests.RequestException:
+                self.count("errors")
+                self._sleep(attempt, attempts)
+                continue
+
+            if resp.status_code in self.rate_limit_statuses or (
+                is_rate_limited is not None and is_rate_limited(resp)
+            ):
+                self.count("rate_limited")
+                self.limiter.backoff(resp.headers.get("Retry-After"))
+                continue
+
+            if resp.status_code >= 500:
+                self.count("errors")
+                self._sleep(attempt, attempts)
+                continue
+
+            self.limiter.recover()
+            return resp
+
+        return None
+
+    def get_json(self, path: str, params: Optional[Dict] = None) -> Any:
+        """
+        GET and decode JSON.
+
+        Returns:
+            Decoded body, or None for 404
+
+        Raises:
+            RuntimeError when the request kept failing or returned another 4xx
+        """
+        resp = self.request("GET", path, params)
+        if resp is None:
+            raise RuntimeError(f"GET {path} failed after {self.max_retries} attempts")
+        if resp.status_code == 404:
+            return None
+        if resp.status_code != 200:
+            self.count("errors")
+            raise RuntimeError(f"GET {path} returned {resp.status_code}")
+        return resp.json()
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
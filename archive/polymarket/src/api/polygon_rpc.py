@@ -0,0 +1,452 @@
+"""
+Batched, cached JSON-RPC client for Polygon transaction analysis.
+
+The gas and block-position analyzers used to issue one `eth_*` call per
+HTTP request with fixed sleeps in between. PolygonRPC instead:
+
+- Packs calls into JSON-RPC batch arrays (`batch_size` calls per POST)
+  and runs up to `concurrency` batches at once, paced by a shared
+  TokenBucket (one token per POST)
+- Deduplicates identical calls, so many transactions in the same block
+  cost one `eth_getBlockByNumber`
+- Persists results in a content-addressed on-disk cache. Transactions,
+  receipts and numbered blocks are only cached once they sit at least
+  `confirmations` blocks below the head (read in the same batch), so a
+  reorg can't leave a stale entry behind; blocks by hash are cached at
+  once. Pending transactions, null results and tag queries ("latest")
+  are never cached
+- Retries failed batches (and failed items within a batch) with endpoint
+  rotation, honouring 429 Retry-After via the bucket's backoff
+
+Works against any Ethereum-compatible node, e.g. a local anvil/hardhat
+instance at http://127.0.0.1:8545.
+
+Usage:
+    rpc = PolygonRPC(cache_dir="data/rpc_cache")
+    context = rpc.fetch_tx_context(tx_hashes, full_blocks=True)
+    for tx_hash, (tx, receipt, block) in context.items():
+        ...
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .http_pool import PooledHTTPClient
+from .rate_limiter import TokenBucket
+
+
+# Methods whose (non-null) results are immutable once mined
+CACHEABLE_METHODS = {
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+    "eth_getBlockByNumber",
+    "eth_getBlockByHash",
+}
+
+# Depth below the head before a block-positioned result is cached. Polygon
+# PoS has seen reorgs well over 100 blocks deep.
+DEFAULT_CONFIRMATIONS = 256
+
+# A head read this recent is reused rather than fetched again (an older
+# head only makes the depth check more conservative)
+HEAD_MAX_AGE = 10.0
+
+Call = Tuple[str, Sequence[Any]]
+
+
+def call_key(method: str, params: Sequence[Any]) -> str:
+    """Content address of a call: SHA-256 of its canonical JSON."""
+    canonical = json.dumps([method, list(params)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.lower().encode()).hexdigest()
+
+
+def result_block(method: str, params: Sequence[Any], result: Any) -> Optional[int]:
+    """Block number a result's content depends on (None for blocks by hash)."""
+    if method == "eth_getBlockByNumber":
+        return int(params[0], 16)
+    if method in ("eth_getTransactionByHash", "eth_getTransactionReceipt"):
+        return int(result["blockNumber"], 16)
+    return None
+
+
+def is_immutable(
+    method: str,
+    params: Sequence[Any],
+    result: Any,
+    head: Optional[int] = None,
+    confirmations: int = DEFAULT_CONFIRMATIONS,
+) -> bool:
+    """
+    Whether a result can be cached forever.
+
+    Args:
+        method: JSON-RPC method
+        params: Call parameters
+        result: Non-null result from the node
+        head: Latest block number when the result was read (None if unknown)
+        confirmations: Required depth below `head` for results tied to a
+            block number; a block fetched by hash is fixed by its hash
+
+    Returns:
+        True if the result is final
+    """
+    if result is None or method not in CACHEABLE_METHODS:
+        return False
+    if method == "eth_getBlockByNumber":
+        # Tags ("latest", "pending", ...) move; only numbered blocks are fixed
+        if not (isinstance(params[0], str) and params[0].startswith("0x")):
+            return False
+    elif method in ("eth_getTransactionByHash", "eth_getTransactionReceipt"):
+        if result.get("blockNumber") is None:
+            return False
+
+    block = result_block(method, params, result)
+    if block is None or confirmations <= 0:
+        return True
+    return head is not None and head - block >= confirmations
+
+
+class RPCCache:
+    """
+    On-disk content-addressed cache of immutable RPC results.
+
+    Layout:
+        {root}/{key[:2]}/{key}.json
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except ValueError:
+            return None
+
+    def put(self, key: str, result: Any):
+        """Atomically store one result."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+class PolygonRPC:
+    """
+    JSON-RPC client that batches, deduplicates and caches calls.
+
+    Example:
+        rpc = PolygonRPC(batch_size=50, concurrency=4, cache_dir="data/rpc_cache")
+        receipts = rpc.get_receipts(tx_hashes)
+        blocks = rpc.get_blocks({int(r["blockNumber"], 16) for r in receipts.values()})
+    """
+
+    ENDPOINTS = [
+        "https://polygon-rpc.com",
+        "https://rpc-mainnet.matic.network",
+        "https://polygon-mainnet.public.blastapi.io",
+    ]
+
+    def __init__(
+        self,
+        endpoints: Optional[List[str]] = None,
+        batch_size: int = 50,
+        concurrency: int = 4,
+        rate: float = 10.0,
+        cache_dir: Optional[str] = None,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        limiter: Optional[TokenBucket] = None,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+    ):
+        """
+        Args:
+            endpoints: RPC URLs, rotated on failure (point at a local node for tests)
+            batch_size: Calls per JSON-RPC batch request
+            concurrency: Max batches in flight
+            rate: Ceiling batch requests/sec (ignored if `limiter` is given)
+            cache_dir: Directory for the persistent result cache (None = memory only)
+            max_retries: Attempts per batch on 429/5xx/network/per-item errors
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one budget across clients
+            confirmations: Blocks below the head before transactions,
+                receipts and numbered blocks are cached (0 = immediately)
+        """
+        self.endpoints = list(endpoints or self.ENDPOINTS)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.confirmations = confirmations
+        self.cache = RPCCache(cache_dir) if cache_dir else None
+
+        # One attempt per POST: _run_batch retries, rotating endpoints and
+        # resending only the items that failed
+        self.http = PooledHTTPClient(
+            concurrency=concurrency,
+            rate=rate,
+            max_retries=1,
+            timeout=timeout,
+            limiter=limiter,
+            headers={"Content-Type": "application/json"},
+            pool_connections=len(self.endpoints),
+        )
+        self.limiter = self.http.limiter
+        self.stats = self.http.stats
+        self.stats.update({
+            "calls": 0,
+            "deduplicated": 0,
+            "cache_hits": 0,
+            "fetched": 0,
+            "failed": 0,
+        })
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rpc")
+
+        self._lock = threading.Lock()
+        self._endpoint_index = 0
+        self._memory: Dict[str, Any] = {}
+        self._head: Optional[Tuple[int, float]] = None  # (block, monotonic time)
+
+    def _endpoint(self) -> str:
+        with self._lock:
+            return self.endpoints[self._endpoint_index % len(self.endpoints)]
+
+    def _rotate(self, failed: str):
+        with self._lock:
+            if self.endpoints[self._endpoint_index % len(self.endpoints)] == failed:
+                self._endpoint_index += 1
+
+    def _cached(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        result = self.cache.get(key) if self.cache else None
+        if result is not None:
+            with self._lock:
+                self._memory[key] = result
+        return result
+
+    def _post(self, calls: List[Call]) -> Dict[int, Any]:
+        """
+        Send one batch.
+
+        Returns:
+            id -> result for every call that succeeded (errors are omitted)
+
+        Raises:
+            RuntimeError on transport failures, 429 and non-200 responses
+        """
+        endpoint = self._endpoint()
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": list(params)}
+            for i, (method, params) in enumerate(calls)
+        ]
+
+        # The client has already counted the error/429 and backed off the bucket
+        resp = self.http.request("POST", endpoint, data=json.dumps(payload))
+        if resp is None:
+            self._rotate(endpoint)
+            raise RuntimeError(f"RPC request to {endpoint} failed")
+        if resp.status_code != 200:
+            self.http.count("errors")
+            self._rotate(endpoint)
+            raise RuntimeError(f"RPC returned {resp.status_code}")
+
+        data = resp.json()
+        if isinstance(data, dict):
+            # A single error object: the node rejected the whole batch
+            self.http.count("errors")
+            self._rotate(endpoint)
+            raise RuntimeError(f"RPC batch rejected: {data.get('error')}")
+
+        return {
+            item["id"]: item.get("result")
+            for item in data
+            if isinstance(item, dict) and "error" not in item and "id" in item
+        }
+
+    def _run_batch(self, keys: List[str], calls: List[Call]) -> Dict[str, Any]:
+        """Fetch one batch, retrying the calls that failed."""
+        results: Dict[str, Any] = {}
+        pending = list(range(len(calls)))
+
+        for attempt in range(self.max_retries):
+            try:
+                got = self._post([calls[i] for i in pending])
+            except RuntimeError:
+                time.sleep(min(2 ** attempt * 0.25, 5))
+                continue
+
+            retry = []
+            for j, i in enumerate(pending):
+                if j in got:
+                    results[keys[i]] = got[j]
+                else:
+                    retry.append(i)
+            pending = retry
+            if not pending:
+                break
+            self.http.count("errors")
+            time.sleep(min(2 ** attempt * 0.25, 5))
+
+        self.http.count("fetched", len(results))
+        self.http.count("failed", len(pending))
+        return results
+
+    def call_many(self, calls: Iterable[Call]) -> List[Optional[Any]]:
+        """
+        Execute calls with dedup, caching and concurrent batching.
+
+        Args:
+            calls: (method, params) pairs
+
+        Returns:
+            Results in call order (None for null results and failures)
+        """
+        calls = [(method, list(params)) for method, params in calls]
+        keys = [call_key(method, params) for method, params in calls]
+        self.http.count("calls", len(calls))
+
+        results: Dict[str, Any] = {}
+        missing: Dict[str, Call] = {}
+        for key, call in zip(keys, calls):
+            if key in results or key in missing:
+                self.http.count("deduplicated")
+                continue
+            cached = self._cached(key)
+            if cached is not None:
+                self.http.count("cache_hits")
+                results[key] = cached
+            else:
+                missing[key] = call
+
+        # Read the head in the first batch when a fetched result's
+        # cacheability depends on its depth
+        head = self._recent_head()
+        head_key = None
+        if head is None and self.confirmations > 0 and any(
+            method in CACHEABLE_METHODS and method != "eth_getBlockByHash"
+            for method, _ in missing.values()
+        ):
+            head_key = call_key("eth_blockNumber", [])
+            if head_key not in missing:
+                missing = {head_key: ("eth_blockNumber", []), **missing}
+
+        todo = list(missing.items())
+        batches = [todo[i:i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+        futures = [
+            self._executor.submit(self._run_batch, [k for k, _ in batch], [c for _, c in batch])
+            for batch in batches
+        ]
+
+        fetched = {}
+        for future in futures:
+            fetched.update(future.result())
+        if head_key is not None and fetched.get(head_key) is not None:
+            head = int(fetched[head_key], 16)
+            with self._lock:
+                self._head = (head, time.monotonic())
+
+        for key, result in fetched.items():
+            results[key] = result
+            method, params = missing[key]
+            if is_immutable(method, params, result, head, self.confirmations):
+                with self._lock:
+                    self._memory[key] = result
+                if self.cache:
+                    self.cache.put(key, result)
+
+        return [results.get(key) for key in keys]
+
+    def _recent_head(self) -> Optional[int]:
+        """Last head read, if it is younger than HEAD_MAX_AGE."""
+        with self._lock:
+            if self._head is not None and time.monotonic() - self._head[1] < HEAD_MAX_AGE:
+                return self._head[0]
+        return None
+
+    def call(self, method: str, params: Sequence[Any]) -> Optional[Any]:
+        """Single call through the same cache and retry path."""
+        return self.call_many([(method, params)])[0]
+
+    def get_transactions(self, tx_hashes: Iterable[str]) -> Dict[str, Dict]:
+        """tx hash -> transaction, for the hashes that were found."""
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+        results = self.call_many(("eth_getTransactionByHash", [h]) for h in tx_hashes)
+        return {h: r for h, r in zip(tx_hashes, results) if r}
+
+    def get_receipts(self, tx_hashes: Iterable[str]) -> Dict[str, Dict]:
+        """tx hash -> receipt, for the hashes that were found."""
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+        results = self.call_many(("eth_getTransactionReceipt", [h]) for h in tx_hashes)
+        return {h: r for h, r in zip(tx_hashes, results) if r}
+
+    def get_blocks(self, block_numbers: Iterable[int], full_transactions: bool = False) -> Dict[int, Dict]:
+        """block number -> block, each unique block fetched once."""
+        numbers = sorted(set(block_numbers))
+        results = self.call_many(("eth_getBlockByNumber", [hex(n), full_transactions]) for n in numbers)
+        return {n: r for n, r in zip(numbers, results) if r}
+
+    def fetch_tx_context(
+        self,
+        tx_hashes: Iterable[str],
+        transactions: bool = True,
+        full_blocks: bool = False,
+    ) -> Dict[str, Tuple[Optional[Dict], Dict, Optional[Dict]]]:
+        """
+        Fetch (transaction, receipt, block) for many transactions.
+
+        Transactions and receipts go out in the same batches; blocks are
+        fetched afterwards, once per distinct block number.
+
+        Args:
+            tx_hashes: Transaction hashes
+            transactions: Also fetch eth_getTransactionByHash (else tx is None)
+            full_blocks: Fetch blocks with full transaction objects
+
+        Returns:
+            tx hash -> (tx, receipt, block) for every hash with a receipt
+        """
+        tx_hashes = list(dict.fromkeys(tx_hashes))
+        calls: List[Call] = [("eth_getTransactionReceipt", [h]) for h in tx_hashes]
+        if transactions:
+            calls += [("eth_getTransactionByHash", [h]) for h in tx_hashes]
+        results = self.call_many(calls)
+
+        n = len(tx_hashes)
+        receipts = dict(zip(tx_hashes, results[:n]))
+        txs = dict(zip(tx_hashes, results[n:])) if transactions else {}
+
+        block_numbers = {
+            int(r["blockNumber"], 16)
+            for r in receipts.values()
+            if r and r.get("blockNumber")
+        }
+        blocks = self.get_blocks(block_numbers, full_transactions=full_blocks)
+
+        context = {}
+        for h in tx_hashes:
+            receipt = receipts.get(h)
+            if not receipt:
+                continue
+            number = int(receipt["blockNumber"], 16) if receipt.get("blockNumber") else None
+            context[h] = (txs.get(h), receipt, blocks.get(number))
+        return context
+
+    def close(self):
+        """Shut down the worker pool and session."""
+        self._executor.shutdown(wait=False)
+        self.http.close()
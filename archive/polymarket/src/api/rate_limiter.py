@@ -0,0 +1,155 @@
+"""
+Token-bucket rate limiter shared by concurrent API clients.
+
+Replaces fixed `time.sleep()` pacing: any number of worker threads draw
+from one bucket, so a pool of connections runs at the API limit instead
+of at one request per sleep interval.
+
+Adaptive backoff: a 429 halves the refill rate and pauses the bucket for
+the server's Retry-After; each success then creeps the rate back up
+toward the configured ceiling (AIMD, as in TCP congestion control).
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD rate adaptation.
+
+    Example:
+        bucket = TokenBucket(rate=20, capacity=20)
+
+        def worker():
+            bucket.acquire()
+            resp = session.get(url)
+            if resp.status_code == 429:
+                bucket.backoff(resp.headers.get("Retry-After"))
+            else:
+                bucket.recover()
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        recovery_step: Optional[float] = None,
+    ):
+        """
+        Args:
+            rate: Ceiling refill rate in tokens per second
+            capacity: Max burst size (defaults to one second of tokens)
+            min_rate: Floor for the adapted rate (defaults to rate / 16)
+            recovery_step: Rate added back per success (defaults to rate / 50)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self.min_rate = float(min_rate if min_rate is not None else rate / 16)
+        self.recovery_step = float(recovery_step if recovery_step is not None else rate / 50)
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Stats
+        self.total_acquired = 0.0
+        self.total_wait = 0.0
+        self.backoffs = 0
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last refill (lock must be held)."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now, without blocking."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return False
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.total_acquired += tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them.
+
+        Args:
+            tokens: Cost of the request (e.g. an endpoint's weight)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Request of {tokens} tokens exceeds capacity {self.capacity}")
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        self.total_acquired += tokens
+                        self.total_wait += waited
+                        return waited
+                    delay = (tokens - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def backoff(self, retry_after: Optional[float] = None):
+        """
+        React to a rate-limit response.
+
+        Args:
+            retry_after: Server-suggested pause in seconds (Retry-After)
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self.backoffs += 1
+
+            try:
+                pause = float(retry_after) if retry_after is not None else 0.0
+            except (TypeError, ValueError):
+                pause = 0.0
+            if pause <= 0:
+                pause = 1.0 / self.rate
+
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + pause)
+            self._last_refill = self._paused_until
+
+    def recover(self):
+        """Creep the rate back toward the ceiling after a success."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def get_stats(self) -> dict:
+        """Current rate and counters."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "max_rate": self.max_rate,
+                "acquired": self.total_acquired,
+                "total_wait": round(self.total_wait, 3),
+                "backoffs": self.backoffs,
+            }
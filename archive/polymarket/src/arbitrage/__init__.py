@@ -1,15 +1,21 @@
 """Arbitrage bot components."""
 from .market_calendar import MarketCalendar, WindowEvent
+from .phase_scheduler import PhaseScheduler
 from .market_scanner import MarketScanner, ArbitrageMarket
-from .decision_engine import DecisionEngine, TradeSignal
+from .slug_discovery import SlugDiscovery
+from .decision_engine import DecisionEngine, MarketStateBatch, SignalBatch, TradeSignal
 from .bot import ArbitrageBot
 
 __all__ = [
     "MarketCalendar",
     "WindowEvent",
+    "PhaseScheduler",
     "MarketScanner",
     "ArbitrageMarket",
+    "SlugDiscovery",
     "DecisionEngine",
     "TradeSignal",
+    "MarketStateBatch",
+    "SignalBatch",
     "ArbitrageBot",
 ]
@@ -6,13 +6,16 @@ the arbitrage strategy.
 """
 import time
 import json
-from typing import Optional, Dict, List
+import threading
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from .market_calendar import MarketCalendar, WindowEvent, WindowPhase
 from .market_scanner import MarketScanner, ArbitrageMarket
-from .decision_engine import DecisionEngine, TradeSignal, MarketState, TradeAction
+from .slug_discovery import SlugDiscovery
+from ..api.gamma import GammaClient
+from .decision_engine import DecisionEngine, TradeSignal, MarketState, MarketStateBatch, TradeAction
 from ..feeds.binance_feed import BinanceFeed, PriceTick
 from ..config import DATA_DIR
 
@@ -116,7 +119,8 @@ class ArbitrageBot:
         # Components
         self.binance = BinanceFeed()
         self.calendar = MarketCalendar()
-        self.scanner = MarketScanner(data_api)
+        gamma = GammaClient()
+        self.scanner = MarketScanner(data_api, gamma_client=gamma, discovery=SlugDiscovery(client=gamma))
         self.scanner.min_liquidity = min_liquidity
         self.decision = DecisionEngine(
             min_edge=min_edge,
@@ -129,6 +133,7 @@ class ArbitrageBot:
         self._running = False
         self._current_phase = WindowPhase.IDLE
         self._last_state_save = 0
+        self._state_lock = threading.Lock()  # Phase handlers save from the calendar thread
 
         # Tracking
         self.trades_today = 0
@@ -154,7 +159,7 @@ class ArbitrageBot:
         self.data_dir = DATA_DIR / "arbitrage"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Subscribe to events
+        # Subscribe to events (phase handlers run on the calendar's dispatcher thread)
         self.calendar.subscribe(self._on_window_event)
         self.binance.subscribe(self._on_price_update)
 
@@ -346,6 +351,9 @@ class ArbitrageBot:
         # Save initial state
         self._save_state()
 
+        # Phase events fire on time from the calendar's scheduler
+        self.calendar.start()
+
         # Main loop
         try:
             while self._running:
@@ -359,53 +367,43 @@ class ArbitrageBot:
         """Stop the bot."""
         self._running = False
         self.binance.stop()
+        self.calendar.stop()
         self._save_state()
         print("✅ Bot stopped")
 
     def _main_loop(self):
-        """Main bot loop (called every second)."""
-        # Update calendar
-        self.calendar.update()
-
+        """Main bot loop (called every second); phases are driven by the calendar."""
         # Periodic state save (every 30 seconds)
         if time.time() - self._last_state_save >= 30:
             self._save_state()
             self._last_state_save = time.time()
 
-        # Get current phase
-        event = self.calendar.get_current_event()
-        phase = event.phase
-
-        # Phase-specific actions
-        if phase == WindowPhase.WATCHING:
-            # 60-30s before window
-            # Scan for markets
-            if self._current_phase != phase:
-                self._on_watching_phase(event)
-
-        elif phase == WindowPhase.READY:
-            # 30-10s before window
-            # Calculate positions
-            if self._current_phase != phase:
-                self._on_ready_phase(event)
-
-        elif phase == WindowPhase.EXECUTING:
-            # 10-2s before window
-            # Execute trades
-            self._on_executing_phase(event)
-
-        elif phase == WindowPhase.CLOSED:
-            # Window just closed
-            if self._current_phase != phase:
-                self._on_closed_phase(event)
-
-        self._current_phase = phase
-
     def _on_window_event(self, event: WindowEvent):
-        """Handle window phase changes."""
-        print(f"\n⏰ Window event: {event.phase.value}")
-        print(f"   Next window: {event.window_time.strftime('%H:%M:%S')}")
-        print(f"   Time until: {event.seconds_until:.0f}s")
+        """
+        Handle window events pushed by the calendar.
+
+        EXECUTING repeats every second until CLOSED, so markets that only
+        start to qualify late in the phase are still traded.
+        """
+        if event.phase == WindowPhase.EXECUTING:
+            # Skip a repeat that was delivered after the phase ended
+            if (event.window_time - datetime.utcnow()).total_seconds() <= 2:
+                return
+
+        if event.phase != self._current_phase:
+            print(f"\n⏰ Window event: {event.phase.value}")
+            print(f"   Next window: {event.window_time.strftime('%H:%M:%S')}")
+            print(f"   Time until: {event.seconds_until:.0f}s")
+
+        self._current_phase = event.phase
+        handler = {
+            WindowPhase.WATCHING: self._on_watching_phase,  # 60-30s: scan for markets
+            WindowPhase.READY: self._on_ready_phase,  # 30-10s: calculate positions
+            WindowPhase.EXECUTING: self._on_executing_phase,  # 10-2s: execute trades
+            WindowPhase.CLOSED: self._on_closed_phase,  # Window just closed
+        }.get(event.phase)
+        if handler and self._running:
+            handler(event)
 
     def _on_price_update(self, tick: PriceTick):
         """Handle price updates from Binance."""
@@ -440,10 +438,8 @@ class ArbitrageBot:
         # Get markets for this window
         markets = self.scanner.find_markets_for_next_window(event.window_time)
 
-        for market in markets:
-            signal = self._analyze_market(market)
-
-            if signal and signal.should_trade:
+        for market, signal in self._analyze_markets(markets):
+            if signal.should_trade:
                 self._execute_signal(signal, market)
 
     def _on_closed_phase(self, event: WindowEvent):
@@ -453,28 +449,13 @@ class ArbitrageBot:
         # Decrement cooldown counter
         self._decrement_cooldown()
 
-    def _analyze_market(self, market: ArbitrageMarket) -> Optional[TradeSignal]:
-        """
-        Analyze a market and generate signal.
-
-        Args:
-            market: Market to analyze
-
-        Returns:
-            TradeSignal or None
-        """
-        # Get current price from Binance
-        current_price = self.binance.get_price(market.asset)
-
-        if not current_price:
-            return None
-
+    def _market_state(self, market: ArbitrageMarket, current_price: float) -> MarketState:
+        """Build the decision engine's view of a market."""
         # Check if this is an "Up or Down" style market
         question_lower = market.question.lower()
         is_up_or_down = "up or down" in question_lower or "up/down" in question_lower
 
-        # Build market state
-        state = MarketState(
+        return MarketState(
             asset=market.asset,
             strike_price=market.strike_price,
             current_price=current_price,
@@ -489,9 +470,8 @@ class ArbitrageBot:
             previous_price=market.strike_price  # For up/down, strike_price represents reference
         )
 
-        # Generate signal
-        signal = self.decision.analyze(state)
-
+    def _log_signal(self, market: ArbitrageMarket, current_price: float, signal: TradeSignal):
+        """Count and print a generated signal."""
         self.stats["signals_generated"] += 1
 
         if signal.should_trade:
@@ -507,8 +487,50 @@ class ArbitrageBot:
             # Log rejected signals for debugging
             print(f"   ⏭️  SKIP: {market.asset} ${current_price:,.0f} vs ${market.strike_price:,.0f} | {signal.reason}")
 
+    def _analyze_market(self, market: ArbitrageMarket) -> Optional[TradeSignal]:
+        """
+        Analyze a market and generate signal.
+
+        Args:
+            market: Market to analyze
+
+        Returns:
+            TradeSignal or None
+        """
+        # Get current price from Binance
+        current_price = self.binance.get_price(market.asset)
+
+        if not current_price:
+            return None
+
+        signal = self.decision.analyze(self._market_state(market, current_price))
+        self._log_signal(market, current_price, signal)
+
         return signal
 
+    def _analyze_markets(self, markets: List[ArbitrageMarket]) -> List[Tuple[ArbitrageMarket, TradeSignal]]:
+        """
+        Analyze all markets for a window in one batched evaluation.
+
+        Returns:
+            (market, signal) pairs for markets with a current price
+        """
+        priced, states = [], []
+        for market in markets:
+            current_price = self.binance.get_price(market.asset)
+            if current_price:
+                priced.append((market, current_price))
+                states.append(self._market_state(market, current_price))
+
+        if not states:
+            return []
+
+        signals = self.decision.analyze_batch(MarketStateBatch.from_states(states)).to_signals()
+        for (market, current_price), signal in zip(priced, signals):
+            self._log_signal(market, current_price, signal)
+
+        return [(market, signal) for (market, _), signal in zip(priced, signals)]
+
     def _execute_signal(self, signal: TradeSignal, market: ArbitrageMarket):
         """
         Execute a trade signal.
@@ -619,7 +641,7 @@ class ArbitrageBot:
             }
         }
 
-        with open(filepath, 'w') as f:
+        with self._state_lock, open(filepath, 'w') as f:
             json.dump(state, f, indent=2)
 
     def get_stats(self) -> Dict:
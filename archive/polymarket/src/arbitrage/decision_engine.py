@@ -12,11 +12,19 @@ FIXED:
 - Edge calculation now uses actual token price vs expected resolution
 - Dynamic threshold based on confidence instead of arbitrary 0.8
 - Asymmetric payoff strategy (25% win rate + 4:1 ratio)
+
+numpy is only needed for the batch API (MarketStateBatch, analyze_batch)
+and is imported there, so the single-market path works without it.
 """
-from typing import Optional, Tuple
-from dataclasses import dataclass
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class TradeAction(Enum):
     """Trade action to take."""
@@ -72,6 +80,165 @@ class MarketState:
     previous_price: float = 0.0  # Price at window open (for up/down markets)
 
 
+@dataclass
+class MarketStateBatch:
+    """
+    Many market states as a struct of arrays (one element per market).
+
+    Built from live states with `from_states`, or directly from columns
+    when replaying history. Optional columns default to the MarketState
+    defaults.
+    """
+    strike_price: np.ndarray
+    current_price: np.ndarray
+    yes_price: np.ndarray
+    no_price: np.ndarray
+    seconds_until_close: np.ndarray
+    liquidity: np.ndarray
+    is_above_strike_question: Optional[np.ndarray] = None
+    is_up_or_down_market: Optional[np.ndarray] = None
+    previous_price: Optional[np.ndarray] = None
+    asset: Optional[Sequence[str]] = None
+    yes_token_id: Optional[Sequence[str]] = None
+    no_token_id: Optional[Sequence[str]] = None
+
+    def __post_init__(self):
+        import numpy as np
+
+        for name in ("strike_price", "current_price", "yes_price", "no_price",
+                     "seconds_until_close", "liquidity"):
+            setattr(self, name, np.asarray(getattr(self, name), dtype=np.float64))
+        n = len(self.current_price)
+
+        defaults = {
+            "is_above_strike_question": (True, bool),
+            "is_up_or_down_market": (False, bool),
+            "previous_price": (0.0, np.float64),
+        }
+        for name, (default, dtype) in defaults.items():
+            value = getattr(self, name)
+            setattr(self, name, np.full(n, default, dtype=dtype) if value is None
+                    else np.asarray(value, dtype=dtype))
+
+        for name in ("asset", "yes_token_id", "no_token_id"):
+            if getattr(self, name) is None:
+                setattr(self, name, [""] * n)
+
+    def __len__(self) -> int:
+        return len(self.current_price)
+
+    @classmethod
+    def from_states(cls, states: Sequence["MarketState"]) -> "MarketStateBatch":
+        """Pack MarketState objects into columns."""
+        return cls(
+            strike_price=[s.strike_price for s in states],
+            current_price=[s.current_price for s in states],
+            yes_price=[s.yes_price for s in states],
+            no_price=[s.no_price for s in states],
+            seconds_until_close=[s.seconds_until_close for s in states],
+            liquidity=[s.liquidity for s in states],
+            is_above_strike_question=[s.is_above_strike_question for s in states],
+            is_up_or_down_market=[s.is_up_or_down_market for s in states],
+            previous_price=[s.previous_price for s in states],
+            asset=[s.asset for s in states],
+            yes_token_id=[s.yes_token_id for s in states],
+            no_token_id=[s.no_token_id for s in states],
+        )
+
+
+class SignalStatus:
+    """Outcome codes in SignalBatch.status (TRADE or why the market was held)."""
+    TRADE = 0
+    OUTSIDE_WINDOW = 1
+    NO_PREDICTION = 2
+    LOW_EDGE = 3
+    LOW_CONFIDENCE = 4
+    LOW_REWARD_RISK = 5
+
+
+@dataclass
+class SignalBatch:
+    """
+    Signals for a MarketStateBatch as arrays.
+
+    `status` says whether each market trades and, if not, which check
+    held it. `buy_yes` is the predicted side where a prediction was made.
+    Use `signal(i)` / `to_signals()` for TradeSignal objects identical
+    to DecisionEngine.analyze.
+    """
+    states: MarketStateBatch
+    status: np.ndarray
+    buy_yes: np.ndarray
+    size: np.ndarray
+    max_price: np.ndarray
+    edge: np.ndarray
+    confidence: np.ndarray
+    reward_risk: np.ndarray
+    expected_payout: np.ndarray
+    risk_amount: np.ndarray
+    min_edge: float = 0.0
+    min_confidence: float = 0.0
+    trade_mask: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.trade_mask = self.status == SignalStatus.TRADE
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def _reason(self, i: int) -> str:
+        status = self.status[i]
+        states = self.states
+        if status == SignalStatus.OUTSIDE_WINDOW:
+            return f"Not in execution window ({states.seconds_until_close[i]:.1f}s remaining)"
+        if status == SignalStatus.NO_PREDICTION:
+            return "Cannot predict outcome (price too close to strike)"
+        if status == SignalStatus.LOW_EDGE:
+            return f"Edge too small ({self.edge[i]:.2%} < {self.min_edge:.2%})"
+        if status == SignalStatus.LOW_CONFIDENCE:
+            return f"Confidence too low ({self.confidence[i]:.2%} < {self.min_confidence:.2%})"
+        if status == SignalStatus.LOW_REWARD_RISK:
+            return f"Reward/risk too low ({self.reward_risk[i]:.1f}:1 < 1.5:1)"
+
+        asset = states.asset[i]
+        if states.is_up_or_down_market[i]:
+            direction = "up" if self.buy_yes[i] else "down"
+            return f"{asset} price went {direction}"
+        direction = ">" if self.buy_yes[i] else "<"
+        return f"{asset} ${states.current_price[i]:,.0f} {direction} ${states.strike_price[i]:,.0f}"
+
+    def signal(self, i: int) -> TradeSignal:
+        """TradeSignal for market `i`."""
+        status = self.status[i]
+        if status != SignalStatus.TRADE:
+            return TradeSignal(
+                action=TradeAction.HOLD,
+                token_id="",
+                size=0,
+                max_price=0,
+                edge=float(self.edge[i]),
+                confidence=float(self.confidence[i]),
+                reason=self._reason(i),
+            )
+
+        yes = bool(self.buy_yes[i])
+        return TradeSignal(
+            action=TradeAction.BUY_YES if yes else TradeAction.BUY_NO,
+            token_id=self.states.yes_token_id[i] if yes else self.states.no_token_id[i],
+            size=float(self.size[i]),
+            max_price=float(self.max_price[i]),
+            edge=float(self.edge[i]),
+            confidence=float(self.confidence[i]),
+            reason=self._reason(i),
+            expected_payout=float(self.expected_payout[i]),
+            risk_amount=float(self.risk_amount[i]),
+        )
+
+    def to_signals(self) -> List[TradeSignal]:
+        """TradeSignal objects for every market, in batch order."""
+        return [self.signal(i) for i in range(len(self))]
+
+
 class DecisionEngine:
     """
     Makes trading decisions based on market conditions.
@@ -223,6 +390,135 @@ class DecisionEngine:
             risk_amount=risk_amount
         )
 
+    def analyze_batch(self, batch: MarketStateBatch) -> SignalBatch:
+        """
+        Analyze many markets in one vectorized pass.
+
+        Applies the same checks, in the same order, as analyze(); each
+        element of the result matches analyze() on that market's state.
+        Works the same on a handful of live markets or millions of
+        historical states.
+
+        Args:
+            batch: Market states as columns
+
+        Returns:
+            SignalBatch (see SignalBatch.to_signals for TradeSignal objects)
+        """
+        import numpy as np
+
+        n = len(batch)
+        status = np.full(n, SignalStatus.TRADE, dtype=np.int8)
+        edge = np.zeros(n)
+        confidence = np.zeros(n)
+        reward_risk = np.zeros(n)
+        zeros = np.zeros(n)
+
+        cur, strike, prev = batch.current_price, batch.strike_price, batch.previous_price
+        t = batch.seconds_until_close
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Timing
+            min_sec, max_sec = self.execution_window
+            in_window = (min_sec <= t) & (t <= max_sec)
+
+            # Outcome prediction (see _predict_outcome)
+            up_down = batch.is_up_or_down_market
+            change = cur - prev
+            updown_ok = (prev > 0) & ~(np.abs(change) / prev < 0.0005)
+            strike_ok = ~(np.abs(cur - strike) / strike < 0.003)
+            predicted = np.where(up_down, updown_ok, strike_ok)
+            buy_yes = np.where(up_down, change > 0, batch.is_above_strike_question == (cur > strike))
+
+            # Edge (see _calculate_actual_edge)
+            token_price = np.where(buy_yes, batch.yes_price, batch.no_price)
+            net_profit = (1.0 - token_price) - token_price * self.TAKER_FEE
+            priced = token_price > 0
+            raw_edge = np.where(priced, net_profit / token_price, 0.0)
+
+            # Confidence (see _calculate_confidence)
+            edge_score = np.minimum(1.0, raw_edge / 0.02)
+            distance_score = np.where(
+                strike > 0, np.minimum(1.0, np.abs(cur - strike) / strike / 0.01), 0.5
+            )
+            time_score = np.where(
+                (10 <= t) & (t <= 20),
+                1.0,
+                np.where(t < 10, np.maximum(0.5, t / 10), np.maximum(0.5, 1.0 - (t - 20) / 10)),
+            )
+            liquidity_score = np.minimum(1.0, batch.liquidity / 1000)
+            agrees = np.where(buy_yes, batch.yes_price > 0.5, batch.no_price > 0.5)
+            agreement_score = np.where(agrees, 0.7, 0.3)
+            raw_confidence = (
+                0.30 * edge_score +
+                0.25 * distance_score +
+                0.20 * time_score +
+                0.15 * liquidity_score +
+                0.10 * agreement_score
+            )
+
+            # Reward/risk (see _calculate_reward_risk)
+            fees = token_price * self.TAKER_FEE
+            raw_rr = np.where(priced, (1.0 - token_price - fees) / token_price, 0.0)
+
+            # Position size (see _calculate_position_size)
+            c = raw_confidence
+            base_value = np.select(
+                [c < 0.65, c < 0.75, c < 0.85, c < 0.92],
+                [
+                    np.full(n, self.min_position_size),
+                    self.min_position_size + ((c - 0.65) / 0.10 * 15),
+                    25 + ((c - 0.75) / 0.10 * 50),
+                    75 + ((c - 0.85) / 0.07 * 75),
+                ],
+                150 + ((c - 0.92) / 0.08 * 50),
+            )
+            rr_multiplier = np.minimum(1.2, 0.8 + (raw_rr / 10))
+            position_value = np.maximum(
+                self.min_position_size, np.minimum(self.max_position_size, base_value * rr_multiplier)
+            )
+            raw_size = np.where(priced, position_value / token_price, 0.0)
+
+        # Checks in analyze() order; the first failing check sets the status
+        failed = ~in_window
+        status[failed] = SignalStatus.OUTSIDE_WINDOW
+
+        check = ~failed & ~predicted
+        status[check] = SignalStatus.NO_PREDICTION
+        failed |= check
+
+        edge = np.where(failed, zeros, raw_edge)
+        check = ~failed & (raw_edge < self.min_edge)
+        status[check] = SignalStatus.LOW_EDGE
+        failed |= check
+
+        confidence = np.where(failed, zeros, raw_confidence)
+        check = ~failed & (raw_confidence < self.min_confidence)
+        status[check] = SignalStatus.LOW_CONFIDENCE
+        failed |= check
+
+        reward_risk = np.where(failed, zeros, raw_rr)
+        check = ~failed & (raw_rr < 1.5)
+        status[check] = SignalStatus.LOW_REWARD_RISK
+        failed |= check
+
+        size = np.where(failed, zeros, raw_size)
+        cost = size * token_price
+        return SignalBatch(
+            states=batch,
+            status=status,
+            buy_yes=buy_yes & predicted,
+            size=size,
+            max_price=np.where(failed, zeros, np.minimum(self.max_token_price, token_price * 1.02)),
+            edge=edge,
+            confidence=confidence,
+            reward_risk=reward_risk,
+            expected_payout=np.where(failed, zeros, size * 1.0 - cost),
+            risk_amount=np.where(failed, zeros, cost),
+            min_edge=self.min_edge,
+            min_confidence=self.min_confidence,
+        )
+
     def _hold_signal(
         self,
         reason: str,
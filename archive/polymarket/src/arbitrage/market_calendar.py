@@ -3,13 +3,22 @@ Market Calendar
 
 Tracks 15-minute window resolution times and generates alerts
 when approaching trading opportunities.
+
+Phase changes can be polled with update(), or pushed by start(), which
+fires each boundary on time from a timer wheel (see phase_scheduler.py).
+The scheduler also repeats the EXECUTING event every EXECUTE_INTERVAL
+seconds until CLOSED, so subscribers can re-evaluate trades throughout
+the phase.
 """
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Callable, List
+from typing import Dict, Iterator, Optional, Callable, List
 from dataclasses import dataclass
 from enum import Enum
 
+from .phase_scheduler import EventDispatcher, PhaseScheduler
+
 
 class WindowPhase(Enum):
     """Phase of the 15-minute window."""
@@ -26,6 +35,7 @@ class WindowEvent:
     window_time: datetime  # When the window closes (e.g., 12:15:00)
     seconds_until: float  # Seconds until window close
     phase: WindowPhase  # Current phase
+    jitter: float = 0.0  # Seconds the event fired after its boundary (scheduler only)
 
     @property
     def timestamp(self) -> int:
@@ -59,15 +69,34 @@ class MarketCalendar:
         while True:
             calendar.update()
             time.sleep(1)
+
+        # Or let the scheduler fire phases on time, with no polling loop:
+        calendar.start()
     """
 
     WINDOW_MINUTES = [0, 15, 30, 45]  # Minutes when windows close
 
+    # Seconds before close at which each phase begins (see get_phase);
+    # IDLE at 0 is the start of the following window
+    PHASE_BOUNDARIES = [
+        (60, WindowPhase.WATCHING),
+        (30, WindowPhase.READY),
+        (10, WindowPhase.EXECUTING),
+        (2, WindowPhase.CLOSED),
+        (0, WindowPhase.IDLE),
+    ]
+
+    # Seconds between repeated EXECUTING events (scheduler only)
+    EXECUTE_INTERVAL = 1.0
+
     def __init__(self):
         # Callbacks
         self._callbacks: List[Callable[[WindowEvent], None]] = []
+        self._dispatcher = EventDispatcher("calendar")
+        self._scheduler: Optional[PhaseScheduler] = None
 
-        # State
+        # State (written by the scheduler thread while it runs)
+        self._lock = threading.Lock()
         self._current_phase = WindowPhase.IDLE
         self._last_window: Optional[datetime] = None
         self._next_window: Optional[datetime] = None
@@ -79,9 +108,99 @@ class MarketCalendar:
         """
         Subscribe to window events.
 
-        Callback is called when phase changes.
+        Callback is called when phase changes. While the scheduler is
+        running it is called on its own dispatcher thread.
         """
         self._callbacks.append(callback)
+        if self._scheduler:
+            self._dispatcher.subscribe(callback)
+
+    def iter_window_closes(self, after: float) -> Iterator[float]:
+        """
+        Yield window close timestamps after `after`, in order.
+
+        Args:
+            after: Unix timestamp (UTC)
+        """
+        hour = int(after // 3600) * 3600
+        while True:
+            for minute in self.WINDOW_MINUTES:
+                close = hour + minute * 60
+                if close > after:
+                    yield close
+            hour += 3600
+
+    def scheduled_boundaries(self) -> List[tuple]:
+        """PHASE_BOUNDARIES plus a repeat of EXECUTING every EXECUTE_INTERVAL until CLOSED."""
+        offsets = dict((phase, offset) for offset, phase in self.PHASE_BOUNDARIES)
+        executing, closed = offsets[WindowPhase.EXECUTING], offsets[WindowPhase.CLOSED]
+
+        repeats = []
+        offset = executing - self.EXECUTE_INTERVAL
+        while offset > closed:
+            repeats.append((offset, WindowPhase.EXECUTING))
+            offset -= self.EXECUTE_INTERVAL
+        return self.PHASE_BOUNDARIES + repeats
+
+    def start(self, horizon: int = 2):
+        """
+        Fire phase events from a background scheduler.
+
+        Boundaries for the next `horizon` windows are precomputed and fired
+        at their exact times; update() then only refreshes state.
+        """
+        if self._scheduler and self._scheduler.running:
+            return
+
+        self._dispatcher = EventDispatcher("calendar")
+        for callback in self._callbacks:
+            self._dispatcher.subscribe(callback)
+
+        self._scheduler = PhaseScheduler(
+            window_closes=self.iter_window_closes,
+            boundaries=self.scheduled_boundaries(),
+            on_boundary=self._on_boundary,
+            horizon=horizon,
+        )
+        self._scheduler.start()
+
+        # Report the phase we started in, as update() would
+        with self._lock:
+            phase = self.get_phase()
+            changed = phase != self._current_phase
+            self._current_phase = phase
+        if changed:
+            self._dispatcher.publish(self.get_current_event())
+
+    def stop(self):
+        """Stop the background scheduler."""
+        if self._scheduler:
+            self._scheduler.stop()
+            self._scheduler = None
+            self._dispatcher.close()
+
+    def jitter_stats(self) -> Dict[str, float]:
+        """How late scheduled phase events fired (seconds): count, last, mean, p99, max."""
+        if not self._scheduler:
+            return {"count": 0, "last": 0.0, "mean": 0.0, "p99": 0.0, "max": 0.0}
+        return self._scheduler.jitter.summary()
+
+    def _on_boundary(self, close: float, phase: WindowPhase, jitter: float):
+        """Scheduler hook: publish the event for a phase boundary."""
+        now = time.time()
+        if phase == WindowPhase.IDLE:
+            # The window just closed; the event describes the next one
+            close = next(self.iter_window_closes(close))
+        with self._lock:
+            self._update_windows()
+            self._current_phase = phase
+
+        self._dispatcher.publish(WindowEvent(
+            window_time=datetime.utcfromtimestamp(close),
+            seconds_until=max(0.0, close - now),
+            phase=phase,
+            jitter=jitter,
+        ))
 
     def _update_windows(self):
         """Calculate next window time."""
@@ -170,18 +289,25 @@ class MarketCalendar:
         Update calendar state.
 
         Call this regularly (e.g., every second) to check for phase changes.
+        While start() is active the scheduler owns the window state and
+        fires the callbacks, so this is a no-op.
         """
-        # Check if window closed
-        seconds_until = self.get_seconds_until_next()
+        if self._scheduler and self._scheduler.running:
+            return
 
-        if seconds_until <= 0:
-            # Window closed, move to next
-            self._update_windows()
+        with self._lock:
+            # Check if window closed
+            seconds_until = self.get_seconds_until_next()
+
+            if seconds_until <= 0:
+                # Window closed, move to next
+                self._update_windows()
 
-        # Check for phase change
-        new_phase = self.get_phase()
+            # Check for phase change
+            new_phase = self.get_phase()
+            if new_phase == self._current_phase:
+                return
 
-        if new_phase != self._current_phase:
             # Phase changed
             self._current_phase = new_phase
 
@@ -192,12 +318,12 @@ class MarketCalendar:
                 phase=new_phase
             )
 
-            # Notify callbacks
-            for callback in self._callbacks:
-                try:
-                    callback(event)
-                except Exception as e:
-                    print(f"Error in calendar callback: {e}")
+        # Notify callbacks
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in calendar callback: {e}")
 
     def get_current_event(self) -> WindowEvent:
         """Get current window event."""
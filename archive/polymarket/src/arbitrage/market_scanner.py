@@ -89,15 +89,19 @@ class MarketScanner:
             print(f"  Resolves in: {market.seconds_until_resolution:.0f}s")
     """
 
-    def __init__(self, data_api=None, gamma_client=None):
+    def __init__(self, data_api=None, gamma_client=None, discovery=None):
         """
         Initialize scanner.
 
         Args:
             data_api: DataAPIClient instance
             gamma_client: GammaClient instance (optional, will create if None)
+            discovery: SlugDiscovery instance; when set, slug lookups and
+                keyword searches run concurrently with caching instead of
+                one request at a time
         """
         self.data_api = data_api
+        self.discovery = discovery
 
         # Import and create GammaClient if not provided
         if gamma_client is None:
@@ -168,7 +172,15 @@ class MarketScanner:
                         seen_ids.add(market.condition_id)
 
             # Strategy 2: Fall back to keyword search if no constructed markets found
-            if not markets:
+            if not markets and self.discovery:
+                for market_data in self.discovery.search_many(self.target_keywords, limit=50):
+                    market = self._parse_market(market_data)
+                    if market and market.condition_id not in seen_ids:
+                        if self._passes_filters(market):
+                            markets.append(market)
+                            seen_ids.add(market.condition_id)
+
+            elif not markets:
                 for keyword in self.target_keywords:
                     try:
                         results = self.gamma.search_markets(keyword, limit=50, active=True)
@@ -195,9 +207,9 @@ class MarketScanner:
 
         return markets
 
-    def _scan_constructed_slugs(self) -> List[ArbitrageMarket]:
+    def _constructed_slugs(self, now: Optional[float] = None) -> List[str]:
         """
-        Construct and fetch 15-minute market slugs.
+        Slugs for the next few 15-minute windows.
 
         Account88888's markets use format:
         - btc-updown-15m-{unix_timestamp}
@@ -205,54 +217,42 @@ class MarketScanner:
 
         Where timestamp is the resolution time (e.g., :00, :15, :30, :45)
         """
-        from datetime import datetime, timezone
-
-        markets = []
-        now = datetime.now(timezone.utc)
-
-        # Calculate next few 15-minute windows
-        # Windows are at :00, :15, :30, :45
-        current_minute = now.minute
-        current_second = now.second
-
-        # Find next window times
-        window_minutes = [0, 15, 30, 45]
-        windows_to_check = []
-
-        for offset_hours in range(2):  # Check current and next hour
-            for wm in window_minutes:
-                # Calculate window time
-                window_time = now.replace(minute=wm, second=0, microsecond=0)
-                if offset_hours > 0:
-                    window_time = window_time.replace(hour=(now.hour + offset_hours) % 24)
+        now = time.time() if now is None else now
 
-                # Only include future windows within 2 hours
-                window_ts = int(window_time.timestamp())
-                current_ts = int(now.timestamp())
+        # Windows are at :00, :15, :30, :45; check up to 8 within 2 hours
+        first = (int(now) // 900 + 1) * 900
+        windows_to_check = [ts for ts in range(first, first + 8 * 900, 900) if ts - now < 7200]
 
-                if 0 < (window_ts - current_ts) < 7200:  # Within 2 hours
-                    windows_to_check.append(window_ts)
-
-        # Remove duplicates and sort
-        windows_to_check = sorted(set(windows_to_check))[:8]  # Max 8 windows
+        return [
+            f"{asset}-updown-15m-{window_ts}"
+            for asset in ["btc", "eth"]
+            for window_ts in windows_to_check
+        ]
 
-        # Try to fetch each potential market
-        assets = ["btc", "eth"]
+    def _scan_constructed_slugs(self) -> List[ArbitrageMarket]:
+        """Construct and fetch 15-minute market slugs."""
+        slugs = self._constructed_slugs()
 
-        for asset in assets:
-            for window_ts in windows_to_check:
-                slug = f"{asset}-updown-15m-{window_ts}"
+        if self.discovery:
+            found = self.discovery.discover(slugs)
+            results = [found[slug] for slug in slugs if slug in found]
+        else:
+            results = []
+            for slug in slugs:
                 try:
-                    market_data = self.gamma.get_market_by_slug(slug)
-                    if market_data and market_data.get("active"):
-                        market = self._parse_market(market_data)
-                        if market:
-                            markets.append(market)
+                    results.append(self.gamma.get_market_by_slug(slug))
                 except Exception:
                     continue
 
                 time.sleep(0.05)  # Small delay
 
+        markets = []
+        for market_data in results:
+            if market_data and market_data.get("active"):
+                market = self._parse_market(market_data)
+                if market:
+                    markets.append(market)
+
         return markets
 
     def _parse_market(self, market_data: Dict) -> Optional[ArbitrageMarket]:
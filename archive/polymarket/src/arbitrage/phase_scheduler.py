@@ -0,0 +1,317 @@
+"""
+Phase Scheduler
+
+Fires window phase boundaries (T-60s, T-30s, ...) at their exact times
+instead of discovering them from a once-a-second polling loop.
+
+- Upcoming boundaries for the next few windows are precomputed into a
+  hashed timer wheel keyed on the monotonic clock.
+- A scheduler thread sleeps until the earliest deadline (woken early if
+  stopped), pops everything due and records how late each one fired.
+- Events are handed to an EventDispatcher, which gives every subscriber
+  its own queue and worker thread, so a slow callback only delays itself.
+
+Usage:
+    dispatcher = EventDispatcher()
+    dispatcher.subscribe(print)
+    scheduler = PhaseScheduler(
+        window_closes=calendar.iter_window_closes,
+        boundaries=[(60, "watch"), (10, "execute")],
+        on_boundary=lambda close, label, jitter: dispatcher.publish((close, label)),
+    )
+    scheduler.start()
+"""
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel of (deadline, item) entries.
+
+    Deadlines are hashed into `slots` buckets of `resolution` seconds.
+    Entries further out than one rotation share a bucket with nearer ones
+    and are skipped until their own tick comes round.
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 1024, now: float = 0.0):
+        """
+        Args:
+            resolution: Seconds per slot
+            slots: Number of slots (one rotation = resolution * slots seconds)
+            now: Current time on the wheel's clock
+        """
+        self.resolution = resolution
+        self._slots: List[List[Tuple[int, float, Any]]] = [[] for _ in range(slots)]
+        self._cursor = self._tick(now)
+        self._count = 0
+
+    def _tick(self, t: float) -> int:
+        return int(math.floor(t / self.resolution))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, deadline: float, item: Any):
+        """Schedule `item` for `deadline` (past deadlines fire on the next pop)."""
+        tick = max(self._tick(deadline), self._cursor)
+        self._slots[tick % len(self._slots)].append((tick, deadline, item))
+        self._count += 1
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest scheduled deadline, or None when empty."""
+        if not self._count:
+            return None
+
+        n = len(self._slots)
+        for tick in range(self._cursor, self._cursor + n):
+            due = [d for t, d, _ in self._slots[tick % n] if t == tick]
+            if due:
+                return min(due)
+
+        # Everything is more than a rotation away
+        return min(d for slot in self._slots for _, d, _ in slot)
+
+    def pop_due(self, now: float) -> List[Tuple[float, Any]]:
+        """
+        Remove and return every entry with deadline <= now.
+
+        Returns:
+            (deadline, item) pairs in deadline order
+        """
+        n = len(self._slots)
+        end = self._tick(now)
+        ticks = range(self._cursor, end + 1) if end - self._cursor < n else range(n)
+
+        fired = []
+        for tick in ticks:
+            slot = self._slots[tick % n]
+            keep = []
+            for entry in slot:
+                if entry[1] <= now:
+                    fired.append(entry)
+                else:
+                    keep.append(entry)
+            self._slots[tick % n] = keep
+
+        self._cursor = max(self._cursor, end)
+        self._count -= len(fired)
+        fired.sort(key=lambda e: e[1])
+        return [(deadline, item) for _, deadline, item in fired]
+
+
+class JitterStats:
+    """Running record of how late scheduled events fired (seconds)."""
+
+    def __init__(self, window: int = 1000):
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, jitter: float):
+        with self._lock:
+            self._recent.append(jitter)
+            self.count += 1
+            self.last = jitter
+            self.max = max(self.max, jitter)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, last, mean, p99 and max jitter (recent window for mean/p99)."""
+        with self._lock:
+            recent = sorted(self._recent)
+            count, last, worst = self.count, self.last, self.max
+
+        if not recent:
+            return {"count": 0, "last": 0.0, "mean": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "count": count,
+            "last": last,
+            "mean": sum(recent) / len(recent),
+            "p99": recent[min(len(recent) - 1, int(len(recent) * 0.99))],
+            "max": worst,
+        }
+
+
+class EventDispatcher:
+    """
+    Delivers events to subscribers, each on its own queue and thread.
+
+    A callback that blocks or raises only affects its own queue; the
+    publisher never waits on subscribers.
+    """
+
+    def __init__(self, name: str = "dispatch"):
+        self.name = name
+        self._subscribers: List[Tuple[Callable[[Any], None], queue.Queue, threading.Thread]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Any], None]):
+        """Add a subscriber and start its worker."""
+        q: queue.Queue = queue.Queue()
+        worker = threading.Thread(
+            target=self._run, args=(callback, q),
+            name=f"{self.name}-{len(self._subscribers)}", daemon=True,
+        )
+        with self._lock:
+            self._subscribers.append((callback, q, worker))
+        worker.start()
+
+    def publish(self, event: Any):
+        """Queue `event` for every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for _, q, _ in subscribers:
+            q.put(event)
+
+    def pending(self) -> int:
+        """Events queued but not yet delivered, across subscribers."""
+        with self._lock:
+            return sum(q.qsize() for _, q, _ in self._subscribers)
+
+    def close(self, timeout: float = 1.0):
+        """Stop workers after they drain their queues."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for _, q, _ in subscribers:
+            q.put(None)
+        for _, _, worker in subscribers:
+            worker.join(timeout)
+
+    @staticmethod
+    def _run(callback: Callable[[Any], None], q: queue.Queue):
+        while True:
+            event = q.get()
+            if event is None:
+                return
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in calendar callback: {e}")
+
+
+class PhaseScheduler:
+    """
+    Schedules phase boundaries for upcoming windows on a timer wheel.
+
+    Each window close T produces one boundary per (offset, label) pair at
+    T - offset. `on_boundary(close, label, jitter)` runs on the scheduler
+    thread as each boundary fires, so it should only hand off work.
+
+    Example:
+        scheduler = PhaseScheduler(calendar.iter_window_closes, boundaries, handler)
+        scheduler.start()
+        ...
+        print(scheduler.jitter.summary())
+        scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        window_closes: Callable[[float], Iterator[float]],
+        boundaries: Sequence[Tuple[float, Any]],
+        on_boundary: Callable[[float, Any, float], None],
+        horizon: int = 2,
+        resolution: float = 1.0,
+        clock: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            window_closes: Yields window close timestamps (Unix seconds)
+                after the given timestamp, in order
+            boundaries: (seconds before close, label) pairs
+            on_boundary: Called with (close timestamp, label, jitter seconds)
+            horizon: Windows kept scheduled ahead of now
+            resolution: Timer wheel slot width in seconds
+            clock: Wall clock (window closes are wall times)
+            monotonic: Clock the scheduler sleeps on
+        """
+        self.window_closes = window_closes
+        self.boundaries = sorted(boundaries, key=lambda b: -b[0])
+        self.on_boundary = on_boundary
+        self.horizon = horizon
+        self.clock = clock
+        self.monotonic = monotonic
+
+        self.jitter = JitterStats()
+        self._wheel = TimerWheel(resolution=resolution, now=monotonic())
+        self._windows: Optional[Iterator[float]] = None
+        self._scheduled: deque = deque()  # window closes currently on the wheel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _to_monotonic(self, wall: float) -> float:
+        # Re-read the offset each time so wall-clock steps (NTP) are picked up
+        return wall - self.clock() + self.monotonic()
+
+    def _fill(self):
+        """Top up the wheel so `horizon` windows are scheduled ahead."""
+        now = self.clock()
+        while self._scheduled and self._scheduled[0] <= now:
+            self._scheduled.popleft()
+
+        while len(self._scheduled) < self.horizon:
+            close = next(self._windows)
+            self._scheduled.append(close)
+            for offset, label in self.boundaries:
+                wall = close - offset
+                if wall > now:
+                    self._wheel.add(self._to_monotonic(wall), (close, label))
+
+    def upcoming(self) -> List[Tuple[float, Any]]:
+        """Scheduled (close, label) pairs in firing order."""
+        return [
+            (close, label)
+            for close in self._scheduled
+            for offset, label in self.boundaries
+            if close - offset > self.clock()
+        ]
+
+    def start(self):
+        """Start the scheduler thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._windows = self.window_closes(self.clock())
+        self._fill()
+        self._thread = threading.Thread(target=self._run, name="phase-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the scheduler thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = self._wheel.next_deadline()
+            if deadline is None:
+                self._fill()
+                continue
+
+            delay = deadline - self.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                return
+
+            now = self.monotonic()
+            for deadline, (close, label) in self._wheel.pop_due(now):
+                late = max(0.0, now - deadline)
+                self.jitter.record(late)
+                try:
+                    self.on_boundary(close, label, late)
+                except Exception as e:
+                    print(f"Error in phase scheduler: {e}")
+
+            self._fill()
@@ -0,0 +1,258 @@
+"""
+Concurrent slug discovery for 15-minute markets.
+
+MarketScanner used to look up every constructed slug one at a time with
+a fixed sleep in between. SlugDiscovery resolves a whole scan's slugs in
+one concurrent burst through a GammaClient (pooled, rate-limited,
+retrying):
+
+- Slugs that don't exist yet are negatively cached until the time their
+  market is expected to be created (or a backoff), so they aren't asked
+  for again on every scan.
+- Fields that never change once a market exists (condition ID, question,
+  token IDs, end date) are cached permanently. Known markets are then
+  refreshed with one batched `/markets?condition_ids=` request instead
+  of one request per slug (GammaClient.get_markets).
+- Keyword searches (the scanner's fallback) run concurrently too.
+
+Usage:
+    gamma = GammaClient()
+    discovery = SlugDiscovery(client=gamma)
+    scanner = MarketScanner(gamma_client=gamma, discovery=discovery)
+    markets = scanner.scan()
+    print(discovery.stats)
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..api.gamma import GammaClient
+from ..api.rate_limiter import TokenBucket
+
+
+# Fields fixed at market creation; everything else is re-fetched
+IMMUTABLE_FIELDS = (
+    "id",
+    "conditionId",
+    "question",
+    "slug",
+    "clobTokenIds",
+    "outcomes",
+    "startDate",
+    "endDate",
+    "endDateIso",
+)
+
+
+def slug_timestamp(slug: str) -> Optional[int]:
+    """Window timestamp at the end of a constructed slug (e.g. btc-updown-15m-1765000800)."""
+    match = re.search(r"-(\d{9,})$", slug)
+    return int(match.group(1)) if match else None
+
+
+class SlugDiscovery:
+    """
+    Resolves market slugs concurrently with positive and negative caching.
+
+    Example:
+        discovery = SlugDiscovery(concurrency=16)  # or SlugDiscovery(client=gamma)
+        found = discovery.discover(["btc-updown-15m-1765000800", ...])
+        for slug, market in found.items():
+            print(slug, market["outcomePrices"])
+    """
+
+    def __init__(
+        self,
+        client: Optional[GammaClient] = None,
+        base_url: str = GammaClient.BASE_URL,
+        concurrency: int = 16,
+        rate: float = 50.0,
+        creation_lead: float = 3600.0,
+        retry_base: float = 30.0,
+        retry_max: float = 300.0,
+        refresh_chunk: int = 50,
+        max_retries: int = 3,
+        timeout: float = 10.0,
+        limiter: Optional[TokenBucket] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            client: GammaClient to query through (built from base_url,
+                rate, max_retries, timeout and limiter if None)
+            base_url: Gamma base URL (point at a local fake for tests)
+            concurrency: Max in-flight requests
+            rate: Ceiling requests/sec (ignored if `limiter` is given)
+            creation_lead: Seconds before its window timestamp a market is
+                expected to exist; missing slugs are retried from then
+            retry_base: First retry delay for a slug missing after its
+                expected creation time (doubles per miss)
+            retry_max: Longest retry delay for a missing slug
+            refresh_chunk: Condition IDs per batched refresh request
+            max_retries: Attempts per request on 429/5xx/network errors
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, to split one budget across clients
+            clock: Wall clock (injectable for tests)
+        """
+        self._owns_client = client is None
+        self.client = client or GammaClient(
+            base_url=base_url,
+            concurrency=concurrency,
+            rate=rate,
+            max_retries=max_retries,
+            timeout=timeout,
+            limiter=limiter,
+        )
+        self.concurrency = concurrency
+        self.creation_lead = creation_lead
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.refresh_chunk = refresh_chunk
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="slug")
+
+        self._lock = threading.Lock()
+        self._static: Dict[str, Dict] = {}  # slug -> immutable fields
+        self._missing: Dict[str, Tuple[float, int]] = {}  # slug -> (retry_at, misses)
+        # Request/429/error counters live in self.client.http.stats
+        self.stats = {
+            "lookups": 0,
+            "refreshed": 0,
+            "found": 0,
+            "not_found": 0,
+            "negative_hits": 0,
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _retry_at(self, slug: str, misses: int, now: float) -> float:
+        """When to look for a missing slug again."""
+        backoff = now + min(self.retry_base * 2 ** (misses - 1), self.retry_max)
+        window_ts = slug_timestamp(slug)
+        if window_ts is None:
+            return backoff
+        expected = window_ts - self.creation_lead
+        return expected if expected > now else backoff
+
+    def _remember(self, slug: str, market: Dict):
+        with self._lock:
+            self._static[slug] = {k: market[k] for k in IMMUTABLE_FIELDS if k in market}
+            self._missing.pop(slug, None)
+
+    def _lookup(self, slug: str) -> Optional[Dict]:
+        """Fetch one slug; records a negative entry when it doesn't exist."""
+        self._count("lookups")
+        market = self.client.get_market_by_slug(slug, raise_errors=True)
+
+        if market:
+            self._remember(slug, market)
+            self._count("found")
+            return market
+
+        now = self.clock()
+        with self._lock:
+            misses = self._missing.get(slug, (0.0, 0))[1] + 1
+            self._missing[slug] = (self._retry_at(slug, misses, now), misses)
+        self._count("not_found")
+        return None
+
+    def _refresh(self, slugs: List[str]) -> Dict[str, Dict]:
+        """Re-fetch mutable fields for known slugs in one batched request."""
+        with self._lock:
+            by_condition = {self._static[s].get("conditionId"): s for s in slugs}
+
+        data = self.client.get_markets(list(by_condition), chunk_size=len(by_condition))
+
+        fresh = {}
+        for market in data:
+            slug = by_condition.get(market.get("conditionId"))
+            if slug:
+                with self._lock:
+                    fresh[slug] = {**market, **self._static[slug]}
+        self._count("refreshed", len(fresh))
+        return fresh
+
+    def _prune(self, now: float):
+        """Forget constructed slugs whose window is long past."""
+        horizon = now - 3600
+        for cache in (self._static, self._missing):
+            stale = [s for s in cache if (slug_timestamp(s) or now) < horizon]
+            for slug in stale:
+                del cache[slug]
+
+    def discover(self, slugs: List[str]) -> Dict[str, Dict]:
+        """
+        Resolve slugs to current market data.
+
+        Args:
+            slugs: Market slugs to look for
+
+        Returns:
+            slug -> market dict for every slug that exists (order of `slugs`)
+        """
+        now = self.clock()
+        known, unknown = [], []
+        with self._lock:
+            self._prune(now)
+            for slug in dict.fromkeys(slugs):
+                if slug in self._static:
+                    known.append(slug)
+                elif slug in self._missing and self._missing[slug][0] > now:
+                    self.stats["negative_hits"] += 1
+                else:
+                    unknown.append(slug)
+
+        chunks = [known[i:i + self.refresh_chunk] for i in range(0, len(known), self.refresh_chunk)]
+        refresh_futures = [(chunk, self._executor.submit(self._refresh, chunk)) for chunk in chunks]
+        lookup_futures = {slug: self._executor.submit(self._lookup, slug) for slug in unknown}
+
+        found: Dict[str, Dict] = {}
+        for chunk, future in refresh_futures:
+            try:
+                fresh = future.result()
+            except Exception:
+                fresh = {}
+            found.update(fresh)
+            # Anything the batch didn't return gets an individual lookup
+            for slug in chunk:
+                if slug not in fresh:
+                    lookup_futures[slug] = self._executor.submit(self._lookup, slug)
+
+        for slug, future in lookup_futures.items():
+            try:
+                market = future.result()
+            except Exception:
+                continue
+            if market:
+                found[slug] = market
+
+        return {slug: found[slug] for slug in slugs if slug in found}
+
+    def search_many(self, queries: List[str], limit: int = 50, active: bool = True) -> List[Dict]:
+        """
+        Run keyword searches concurrently.
+
+        Returns:
+            Markets from all queries, in query order (duplicates included)
+        """
+        futures = [
+            self._executor.submit(self.client.search_markets, q, limit=limit, active=active)
+            for q in queries
+        ]
+        markets = []
+        for future in futures:
+            try:
+                markets.extend(future.result())
+            except Exception:
+                continue
+        return markets
+
+    def close(self):
+        """Shut down the worker pool, and the client if this instance built it."""
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
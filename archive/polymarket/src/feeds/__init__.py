@@ -1,4 +1,26 @@
-"""Price feeds from various exchanges."""
+"""Price feeds from various exchanges.
+
+KlineBackfiller and the lead-lag estimators need numpy and are imported
+on first access, so BinanceFeed works without it.
+"""
+from importlib import import_module
+
 from .binance_feed import BinanceFeed
 
-__all__ = ["BinanceFeed"]
+# Lazily imported exports: name -> submodule
+_LAZY = {
+    "KlineBackfiller": "kline_backfill",
+    "LeadLagEngine": "lead_lag",
+    "OnlineLeadLag": "lead_lag",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["BinanceFeed", "KlineBackfiller", "LeadLagEngine", "OnlineLeadLag"]
@@ -0,0 +1,196 @@
+"""
+Concurrent Binance Kline Backfill
+
+Fills a KlineCache with historical klines for many symbols at once:
+- Work is split into (symbol, interval, day) chunks; cached days are skipped,
+  so a re-run only fetches the gaps
+- Chunks are fetched concurrently under one weight-aware token bucket
+  (Binance limits by request weight per minute, not request count)
+- 429/418 responses pause the bucket for the server's Retry-After
+- A day is written only once complete, atomically
+
+Usage:
+    cache = KlineCache("data/klines")
+    backfiller = KlineBackfiller(cache, concurrency=8)
+    summary = backfiller.backfill(["BTCUSDT", "ETHUSDT"], start_ms, end_ms)
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from ..api.http_pool import PooledHTTPClient
+from ..api.rate_limiter import TokenBucket
+from ..storage.kline_cache import DAY_MS, KlineCache, days_between, interval_to_ms, klines_to_array
+
+
+class KlineBackfiller:
+    """
+    Backfills historical klines into a KlineCache.
+
+    Example:
+        backfiller = KlineBackfiller(KlineCache("data/klines"))
+        backfiller.backfill(["BTCUSDT"], start_ms, end_ms, interval="1m")
+        print(backfiller.stats)
+    """
+
+    BASE_URL = "https://api.binance.com"
+    KLINES_ENDPOINT = "/api/v3/klines"
+    MAX_LIMIT = 1000
+
+    def __init__(
+        self,
+        cache: KlineCache,
+        base_url: str = BASE_URL,
+        weight_per_minute: int = 6000,
+        request_weight: int = 2,
+        concurrency: int = 8,
+        max_retries: int = 5,
+        timeout: float = 10.0,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            cache: Destination cache
+            base_url: API base URL (point at a local fake for tests)
+            weight_per_minute: Request-weight budget per minute (IP limit)
+            request_weight: Weight of one klines request
+            concurrency: Chunks fetched at once
+            max_retries: Attempts per request before the day is abandoned
+            timeout: Per-request timeout in seconds
+            limiter: Shared bucket, e.g. with other Binance REST clients
+        """
+        self.cache = cache
+        self.request_weight = request_weight
+        self.concurrency = concurrency
+
+        self.http = PooledHTTPClient(
+            base_url,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            timeout=timeout,
+            limiter=limiter or TokenBucket(
+                rate=weight_per_minute / 60.0,
+                capacity=max(request_weight * concurrency, weight_per_minute / 60.0),
+            ),
+            rate_limit_statuses=(418, 429),
+            backoff_base=0.5,
+            backoff_max=30.0,
+        )
+        self.limiter = self.http.limiter
+        self.stats = self.http.stats
+        self.stats.update({"klines": 0, "used_weight": 0})
+        self._weight_lock = threading.Lock()
+
+    def _fetch_klines(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> Optional[List[List]]:
+        """
+        Fetch one page of klines.
+
+        Returns:
+            Raw kline rows, or None if the request kept failing
+        """
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_ms,
+            "endTime": end_ms,
+            "limit": self.MAX_LIMIT,
+        }
+
+        resp = self.http.request("GET", self.KLINES_ENDPOINT, params, weight=self.request_weight)
+        if resp is None:
+            return None
+
+        used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+        if used and used.isdigit():
+            with self._weight_lock:
+                self.stats["used_weight"] = max(self.stats["used_weight"], int(used))
+
+        if resp.status_code != 200:
+            self.http.count("errors")
+            print(f"Error fetching {symbol} klines: HTTP {resp.status_code} {resp.text[:200]}")
+            return None
+        return resp.json()
+
+    def _fetch_day(self, symbol: str, interval: str, day_ms: int) -> Optional[int]:
+        """
+        Fetch and cache one full UTC day.
+
+        Returns:
+            Number of klines written, or None if the day failed
+        """
+        step = interval_to_ms(interval)
+        day_end = day_ms + DAY_MS - 1
+        rows: List[List] = []
+        cursor = day_ms
+
+        while cursor <= day_end:
+            page = self._fetch_klines(symbol, interval, cursor, day_end)
+            if page is None:
+                return None
+            if not page:
+                break
+            rows.extend(page)
+            if len(page) < self.MAX_LIMIT:
+                break
+            cursor = int(page[-1][0]) + step
+
+        self.cache.write_day(symbol, interval, day_ms, klines_to_array(rows))
+        self.http.count("klines", len(rows))
+        return len(rows)
+
+    def backfill(
+        self,
+        symbols: Sequence[str],
+        start_ms: int,
+        end_ms: int,
+        interval: str = "1m",
+        now_ms: Optional[int] = None,
+    ) -> Dict:
+        """
+        Fetch every uncached day overlapping [start_ms, end_ms].
+
+        Days that haven't closed yet are skipped (never cached partially).
+
+        Args:
+            symbols: Trading pairs (e.g. "BTCUSDT")
+            start_ms: Range start (ms)
+            end_ms: Range end (ms)
+            interval: Kline interval
+            now_ms: Current time override (for tests)
+
+        Returns:
+            {"days", "cached", "fetched", "failed", "skipped_open", "klines"}
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        symbols = [s.upper() for s in symbols]
+
+        chunks = []
+        total_days = cached = skipped_open = 0
+        for symbol in symbols:
+            for day_ms in days_between(start_ms, end_ms):
+                total_days += 1
+                if day_ms + DAY_MS > now_ms:
+                    skipped_open += 1
+                elif self.cache.has_day(symbol, interval, day_ms):
+                    cached += 1
+                else:
+                    chunks.append((symbol, day_ms))
+
+        before = self.stats["klines"]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {
+                chunk: pool.submit(self._fetch_day, chunk[0], interval, chunk[1])
+                for chunk in chunks
+            }
+            results = {chunk: f.result() for chunk, f in futures.items()}
+
+        failed = sorted(chunk for chunk, n in results.items() if n is None)
+        return {
+            "days": total_days,
+            "cached": cached,
+            "fetched": len(chunks) - len(failed),
+            "failed": failed,
+            "skipped_open": skipped_open,
+            "klines": self.stats["klines"] - before,
+        }
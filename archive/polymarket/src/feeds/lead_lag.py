@@ -0,0 +1,352 @@
+"""
+Lead-lag estimation between exchange price streams.
+
+Tick streams arrive at irregular times and rates (WebSocket pushes, REST
+polls every few hundred ms), so comparing them tick by tick mostly measures
+polling jitter. Instead each stream is resampled onto a common grid (last
+price at the end of every `grid_ms` bin), turned into log returns, and
+every pair is cross-correlated over lags of +/- `max_lag_ms` with one FFT.
+The lag of the correlation peak (a multiple of grid_ms) is the lead:
+positive means the first stream of the pair moves first.
+
+Market windows (e.g. the 15m updown windows) are handled as one batched
+FFT over a (windows, bins) matrix, which gives a lag distribution per
+exchange pair rather than a single number. `OnlineLeadLag` keeps a rolling
+grid for live use.
+
+Usage:
+    engine = LeadLagEngine(grid_ms=50, max_lag_ms=2000)
+    streams = {"binance": (ts_ms, prices), "coinbase": (ts_ms2, prices2)}
+    per_window = engine.estimate_windows(streams, window_ms=900_000)
+    lag_distribution(per_window[("binance", "coinbase")])
+"""
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+Stream = Tuple[Sequence[float], Sequence[float]]  # (timestamps ms, prices)
+
+
+@dataclass
+class LeadLagEstimate:
+    """Cross-correlation peak between two streams over one time range."""
+    first: str
+    second: str
+    lag_ms: float        # > 0: first leads second; < 0: second leads first
+    correlation: float   # Correlation of returns at the peak
+    start_ms: int
+    end_ms: int
+
+    @property
+    def leader(self) -> Optional[str]:
+        if self.lag_ms > 0:
+            return self.first
+        if self.lag_ms < 0:
+            return self.second
+        return None
+
+
+def resample_last(
+    ts: np.ndarray,
+    prices: np.ndarray,
+    start_ms: int,
+    grid_ms: int,
+    n_bins: int,
+) -> np.ndarray:
+    """
+    Last price at the end of each grid bin [start + k*grid, start + (k+1)*grid).
+
+    `ts` must be sorted. Bins before the first tick are NaN.
+    """
+    edges = start_ms + (np.arange(n_bins, dtype=np.int64) + 1) * grid_ms
+    idx = np.searchsorted(ts, edges, side="left") - 1
+    out = np.full(n_bins, np.nan)
+    ok = idx >= 0
+    out[ok] = prices[idx[ok]]
+    return out
+
+
+def grid_returns(grid_prices: np.ndarray) -> np.ndarray:
+    """Log returns between consecutive bins (last axis); 0 where either side is missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(grid_prices), axis=-1)
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def cross_correlation(x: np.ndarray, y: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Normalized cross-correlation of x and y along the last axis, via FFT.
+
+    Returns:
+        Array (..., 2 * max_lag + 1); entry max_lag + k is
+        sum_t x[t] * y[t + k] / (|x| |y|), so a peak at k > 0 means x leads
+        y by k samples. NaN where either input is all zeros.
+    """
+    n = x.shape[-1]
+    x = x - x.mean(axis=-1, keepdims=True)
+    y = y - y.mean(axis=-1, keepdims=True)
+
+    # Zero-pad so lags up to max_lag don't wrap around
+    nfft = 1 << int(np.ceil(np.log2(max(n + max_lag, 2))))
+    spectrum = np.conj(np.fft.rfft(x, nfft)) * np.fft.rfft(y, nfft)
+    circular = np.fft.irfft(spectrum, nfft)
+    corr = np.concatenate([circular[..., nfft - max_lag:], circular[..., :max_lag + 1]], axis=-1)
+
+    norm = np.sqrt((x * x).sum(axis=-1) * (y * y).sum(axis=-1))[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norm > 0, corr / norm, np.nan)
+
+
+def peak_lag(corr: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Lag (in samples) and height of the correlation peak along the last axis."""
+    filled = np.where(np.isnan(corr), -np.inf, corr)
+    k = filled.argmax(axis=-1)
+    peak = np.take_along_axis(corr, k[..., None], axis=-1)[..., 0]
+    return k - max_lag, peak
+
+
+def lag_distribution(estimates: List[LeadLagEstimate], min_correlation: float = 0.0) -> Dict:
+    """
+    Summary of per-window lags for one pair.
+
+    Windows whose peak correlation is below `min_correlation` are dropped.
+    """
+    kept = [e for e in estimates if e.correlation >= min_correlation]
+    if not kept:
+        return {"windows": 0}
+
+    lags = np.array([e.lag_ms for e in kept])
+    first, second = kept[0].first, kept[0].second
+    return {
+        "windows": len(kept),
+        "mean_lag_ms": float(lags.mean()),
+        "median_lag_ms": float(np.median(lags)),
+        "p10_lag_ms": float(np.percentile(lags, 10)),
+        "p90_lag_ms": float(np.percentile(lags, 90)),
+        "mean_correlation": float(np.mean([e.correlation for e in kept])),
+        f"{first}_leads": int((lags > 0).sum()),
+        f"{second}_leads": int((lags < 0).sum()),
+        "simultaneous": int((lags == 0).sum()),
+    }
+
+
+def first_significant_move(
+    ts: np.ndarray,
+    prices: np.ndarray,
+    query_ts: np.ndarray,
+    lookback: float,
+    threshold: float = 0.0005,
+) -> np.ndarray:
+    """
+    Time of the first tick-to-tick move larger than `threshold` (fractional)
+    within [q - lookback, q], for every query time q.
+
+    Both ticks of a move must lie inside the window. `ts` must be sorted.
+    Units are whatever `ts` and `query_ts` use.
+
+    Returns:
+        Array of move times, NaN where the window has no such move
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    query_ts = np.asarray(query_ts, dtype=np.float64)
+
+    prev = prices[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        moved = (prev > 0) & (np.abs(prices[1:] - prev) / prev > threshold)
+    move_ts = ts[1:][moved]
+    move_prev_ts = ts[:-1][moved]
+
+    out = np.full(len(query_ts), np.nan)
+    if not len(move_ts):
+        return out
+    j = np.searchsorted(move_prev_ts, query_ts - lookback, side="left")
+    ok = j < len(move_ts)
+    hit = np.zeros(len(query_ts), dtype=bool)
+    hit[ok] = move_ts[j[ok]] <= query_ts[ok]
+    out[hit] = move_ts[j[hit]]
+    return out
+
+
+def _sorted(stream: Stream) -> Tuple[np.ndarray, np.ndarray]:
+    ts = np.asarray(stream[0], dtype=np.float64)
+    prices = np.asarray(stream[1], dtype=np.float64)
+    order = np.argsort(ts, kind="stable")
+    return ts[order], prices[order]
+
+
+class LeadLagEngine:
+    """Batch lead-lag estimation over resampled tick streams."""
+
+    def __init__(self, grid_ms: int = 50, max_lag_ms: int = 2000):
+        self.grid_ms = grid_ms
+        self.max_lag = max(1, max_lag_ms // grid_ms)
+
+    def estimate_windows(
+        self,
+        streams: Dict[str, Stream],
+        window_ms: int = 900_000,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Dict[Tuple[str, str], List[LeadLagEstimate]]:
+        """
+        Lead-lag per exchange pair for every window.
+
+        Windows are aligned to multiples of window_ms (so 900_000 gives the
+        15m market windows). Windows where either stream never moves are
+        skipped.
+
+        Args:
+            streams: name -> (timestamps ms, prices)
+            window_ms: Window length
+            start_ms: Range start (default: first tick, rounded down to a window)
+            end_ms: Range end (default: last tick)
+
+        Returns:
+            (first, second) -> estimates in time order, for names in sorted order
+        """
+        data = {name: _sorted(s) for name, s in streams.items() if len(s[0])}
+        if len(data) < 2:
+            return {}
+
+        if start_ms is None:
+            start_ms = int(min(ts[0] for ts, _ in data.values()))
+            start_ms -= start_ms % window_ms
+        if end_ms is None:
+            end_ms = int(max(ts[-1] for ts, _ in data.values())) + 1
+        bins_per_window = window_ms // self.grid_ms
+        n_windows = max(0, -(-(end_ms - start_ms) // window_ms))
+        if not n_windows:
+            return {}
+
+        # One grid over the whole range, cut into (windows, bins)
+        returns = {}
+        for name, (ts, prices) in data.items():
+            grid = resample_last(ts, prices, start_ms, self.grid_ms, n_windows * bins_per_window)
+            returns[name] = grid_returns(grid.reshape(n_windows, bins_per_window))
+
+        starts = start_ms + np.arange(n_windows, dtype=np.int64) * window_ms
+        results = {}
+        for first, second in combinations(sorted(returns), 2):
+            corr = cross_correlation(returns[first], returns[second], self.max_lag)
+            lags, peaks = peak_lag(corr, self.max_lag)
+            results[(first, second)] = [
+                LeadLagEstimate(
+                    first=first,
+                    second=second,
+                    lag_ms=float(lags[w] * self.grid_ms),
+                    correlation=float(peaks[w]),
+                    start_ms=int(starts[w]),
+                    end_ms=int(starts[w] + window_ms),
+                )
+                for w in range(n_windows)
+                if not np.isnan(peaks[w])
+            ]
+        return results
+
+    def estimate(
+        self,
+        streams: Dict[str, Stream],
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Dict[Tuple[str, str], LeadLagEstimate]:
+        """Lead-lag per exchange pair over the whole range, as one window."""
+        data = {name: _sorted(s) for name, s in streams.items() if len(s[0])}
+        if len(data) < 2:
+            return {}
+        if start_ms is None:
+            start_ms = int(min(ts[0] for ts, _ in data.values()))
+        if end_ms is None:
+            end_ms = int(max(ts[-1] for ts, _ in data.values())) + 1
+        span = -(-(end_ms - start_ms) // self.grid_ms) * self.grid_ms
+
+        windows = self.estimate_windows(data, window_ms=span, start_ms=start_ms, end_ms=start_ms + span)
+        return {pair: found[0] for pair, found in windows.items() if found}
+
+
+class OnlineLeadLag:
+    """
+    Rolling lead-lag over the last `horizon_ms`, for live feeds.
+
+    `update` is O(1) per tick (amortized over grid bins); `estimate` runs
+    the FFT over the current horizon, a few ms for minutes of 50 ms bins.
+    Ticks older than the current bin are counted in the current bin.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        grid_ms: int = 50,
+        max_lag_ms: int = 2000,
+        horizon_ms: int = 300_000,
+    ):
+        self.names = list(names)
+        self.grid_ms = grid_ms
+        self.max_lag = max(1, max_lag_ms // grid_ms)
+        self.n_bins = max(horizon_ms // grid_ms, 2 * self.max_lag + 2)
+
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._grid = np.full((len(self.names), self.n_bins), np.nan)
+        self._last = np.full(len(self.names), np.nan)
+        self._bin: Optional[int] = None   # Absolute bin number of the newest column
+        self._filled = 0
+
+    def _advance(self, bin_number: int):
+        if self._bin is None:
+            self._bin = bin_number
+            self._filled = 1
+            return
+        steps = bin_number - self._bin
+        if steps <= 0:
+            return
+        # New bins carry the last known price forward
+        cols = (np.arange(self._bin + 1, self._bin + 1 + min(steps, self.n_bins))) % self.n_bins
+        self._grid[:, cols] = self._last[:, None]
+        self._bin = bin_number
+        self._filled = min(self._filled + steps, self.n_bins)
+
+    def update(self, name: str, ts_ms: float, price: float):
+        """Record one tick."""
+        self._advance(max(int(ts_ms // self.grid_ms), self._bin or 0))
+        i = self._index[name]
+        self._grid[i, self._bin % self.n_bins] = price
+        self._last[i] = price
+
+    def estimate(self, now_ms: Optional[float] = None) -> Dict[Tuple[str, str], LeadLagEstimate]:
+        """
+        Lead-lag per pair over the rolling horizon.
+
+        Args:
+            now_ms: Advance the grid to this time first (so quiet streams age)
+        """
+        if now_ms is not None:
+            self._advance(int(now_ms // self.grid_ms))
+        if self._bin is None or self._filled <= 2 * self.max_lag + 1:
+            return {}
+
+        # Unroll the ring buffer, oldest bin first
+        newest = self._bin % self.n_bins
+        order = (np.arange(newest - self._filled + 1, newest + 1)) % self.n_bins
+        returns = grid_returns(self._grid[:, order])
+
+        end_ms = (self._bin + 1) * self.grid_ms
+        start_ms = end_ms - self._filled * self.grid_ms
+        results = {}
+        for first, second in combinations(sorted(self.names), 2):
+            corr = cross_correlation(returns[self._index[first]], returns[self._index[second]], self.max_lag)
+            lag, peak = peak_lag(corr, self.max_lag)
+            if np.isnan(peak):
+                continue
+            results[(first, second)] = LeadLagEstimate(
+                first=first,
+                second=second,
+                lag_ms=float(lag * self.grid_ms),
+                correlation=float(peak),
+                start_ms=int(start_ms),
+                end_ms=int(end_ms),
+            )
+        return results
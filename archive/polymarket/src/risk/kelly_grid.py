@@ -0,0 +1,298 @@
+"""
+Vectorized Kelly-sizing simulator over a grid of sizing/band/fee settings.
+
+Replays the bankroll recursion of large_dataset_backtester.run_backtest
+for many configurations at once instead of one `iterrows()` pass per
+strategy:
+
+- Fees, odds and Kelly fractions (src.risk.sizing) are computed as
+  whole-array operations, once per fee assumption
+- The bankroll path is advanced a chunk of trades at a time with
+  `cumprod` for every configuration simultaneously
+- The recursion has two capital-dependent rules (stop below
+  `min_capital`, skip positions under $1). A chunk's cumprod is accepted
+  for a configuration only if neither rule would have fired; otherwise
+  that configuration replays the chunk row by row, still vectorized
+  across the other failing configurations
+
+Trades are read from a columnar `.npy` cache (see `save_trade_columns`)
+that can be memory-mapped, so repeated runs skip the JSON parse.
+
+Usage:
+    trades = load_trade_columns("data/cache/account88888_windows.npy")
+    grid = SimulationGrid(kelly_fractions=[0.25, 0.5, 1.0], max_fees=[0.0, 0.03])
+    results = simulate_grid(trades, grid, expected_win_rate=0.84)
+"""
+import itertools
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.risk.sizing import ReturnMoments, estimate_fees, kelly_fractions, net_odds, win_multiplier
+
+
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("price", "<f8"),
+    ("won", "?"),
+    ("asset", "u1"),  # index into ASSETS
+])
+
+ASSETS = ("BTC", "ETH")
+
+# Annualization used by run_backtest (~100 trades/day)
+SHARPE_SCALE = np.sqrt(252 * 100)
+
+
+def save_trade_columns(path: str, timestamp, price, won, asset=None):
+    """Write trades as a memory-mappable structured array, sorted by time."""
+    arr = np.empty(len(price), dtype=TRADE_DTYPE)
+    arr["timestamp"] = timestamp
+    arr["price"] = price
+    arr["won"] = won
+    if asset is not None:
+        arr["asset"] = [ASSETS.index(a) if isinstance(a, str) else a for a in asset]
+    else:
+        arr["asset"] = 0
+    arr = arr[np.argsort(arr["timestamp"], kind="stable")]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+def load_trade_columns(path: str) -> np.ndarray:
+    """Memory-map a trade cache written by save_trade_columns."""
+    return np.load(path, mmap_mode="r")
+
+
+@dataclass
+class SimulationGrid:
+    """
+    Cartesian product of settings to evaluate.
+
+    A sizing entry is either a Kelly multiplier (`kelly_fractions`) or a
+    fixed fraction of capital (`fixed_fractions`); both lists are crossed
+    with every price band and fee assumption.
+    """
+    kelly_fractions: Sequence[float] = (0.25, 0.5, 1.0)
+    fixed_fractions: Sequence[float] = ()
+    price_bands: Sequence[Tuple[float, float]] = ((0.0, 1.0),)
+    max_fees: Sequence[float] = (0.03,)
+    position_cap: float = 0.20
+
+    def configs(self) -> List[Tuple[str, float, Tuple[float, float], float]]:
+        """(sizing, fraction, band, max_fee) tuples in evaluation order."""
+        sizings = [("kelly", k) for k in self.kelly_fractions] + [("fixed", f) for f in self.fixed_fractions]
+        return [
+            (sizing, fraction, tuple(band), fee)
+            for (sizing, fraction), band, fee in itertools.product(sizings, self.price_bands, self.max_fees)
+        ]
+
+
+@dataclass
+class GridResult:
+    """Outcome of one grid configuration (fields mirror BacktestResult)."""
+    sizing: str
+    fraction: float
+    price_band: Tuple[float, float]
+    max_fee: float
+    initial_capital: float
+    final_capital: float
+    total_return_pct: float
+    total_trades: int
+    wins: int
+    losses: int
+    win_rate: float
+    max_drawdown_pct: float
+    sharpe_ratio: float
+    profit_factor: float
+    stopped: bool = field(default=False)
+
+    @property
+    def label(self) -> str:
+        lo, hi = self.price_band
+        return f"{self.sizing}_{self.fraction:g} [{lo:.2f}-{hi:.2f}] fee={self.max_fee:.3f}"
+
+
+class _GridState:
+    """Per-configuration running totals, one array slot per config."""
+
+    def __init__(self, n: int, initial_capital: float):
+        self.capital = np.full(n, initial_capital)
+        self.peak = np.full(n, initial_capital)
+        self.max_dd = np.zeros(n)
+        self.wins = np.zeros(n, dtype=np.int64)
+        self.losses = np.zeros(n, dtype=np.int64)
+        self.total_profit = np.zeros(n)
+        self.total_loss = np.zeros(n)
+        self.returns = ReturnMoments(n)
+
+
+def _advance_cumprod(state: _GridState, idx, pct, r, won, min_capital) -> np.ndarray:
+    """
+    Advance configs `idx` through a chunk with cumprod.
+
+    Returns:
+        Boolean mask over `idx` of configs whose chunk was accepted
+    """
+    cap0 = state.capital[idx]
+    take = pct > 0
+    step = np.where(take, pct * r, 0.0)
+    path = cap0[:, None] * np.cumprod(1.0 + step, axis=1)
+    prev = np.concatenate([cap0[:, None], path[:, :-1]], axis=1)
+
+    ok = np.all(~take | ((prev >= min_capital) & (prev * pct >= 1.0)), axis=1)
+    if not ok.any():
+        return ok
+
+    sel = idx[ok]
+    take, pct, r, prev, path, step = take[ok], pct[ok], r[ok], prev[ok], path[ok], step[ok]
+    won_take = take & won[None, :]
+    lost_take = take & ~won[None, :]
+
+    state.wins[sel] += won_take.sum(axis=1)
+    state.losses[sel] += lost_take.sum(axis=1)
+    state.total_profit[sel] += np.where(won_take, prev * step, 0.0).sum(axis=1)
+    state.total_loss[sel] += np.where(lost_take, prev * pct, 0.0).sum(axis=1)
+    state.returns.add_batch(sel, step, take)
+
+    peaks = np.maximum(state.peak[sel][:, None], np.maximum.accumulate(path, axis=1))
+    state.max_dd[sel] = np.maximum(state.max_dd[sel], ((peaks - path) / peaks).max(axis=1))
+    state.peak[sel] = peaks[:, -1]
+    state.capital[sel] = path[:, -1]
+    return ok
+
+
+def _advance_rows(state: _GridState, idx, pct, r, won, min_capital):
+    """Exact row-by-row recursion for configs `idx`, vectorized across them."""
+    for j in range(pct.shape[1]):
+        capital = state.capital[idx]
+        position = capital * pct[:, j]
+        take = (capital >= min_capital) & (position >= 1.0) & (pct[:, j] > 0)
+        if not take.any():
+            continue
+
+        sel = idx[take]
+        pos = position[take]
+        cap = capital[take]
+        profit = pos * r[take, j]
+        if won[j]:
+            state.wins[sel] += 1
+            state.total_profit[sel] += profit
+        else:
+            state.losses[sel] += 1
+            state.total_loss[sel] += pos
+        state.returns.add(sel, profit / cap)
+
+        new_cap = cap + profit
+        state.capital[sel] = new_cap
+        state.peak[sel] = np.maximum(state.peak[sel], new_cap)
+        state.max_dd[sel] = np.maximum(state.max_dd[sel], (state.peak[sel] - new_cap) / state.peak[sel])
+
+
+def simulate_grid(
+    trades: np.ndarray,
+    grid: SimulationGrid,
+    expected_win_rate: float,
+    initial_capital: float = 300.0,
+    min_capital: float = 10.0,
+    chunk_size: int = 4096,
+) -> List[GridResult]:
+    """
+    Run every grid configuration over `trades` in one pass.
+
+    Matches run_backtest: position = capital x min(fraction, cap); a win
+    pays position / price x (1 - fee), a loss forfeits the position;
+    trades outside a config's price band, or sized under $1, are skipped;
+    the run stops once capital falls below `min_capital`.
+
+    Args:
+        trades: Structured array with at least `price` and `won` (TRADE_DTYPE)
+        grid: Settings to evaluate
+        expected_win_rate: Win probability fed to the Kelly formula
+        initial_capital: Starting bankroll
+        min_capital: Stop trading below this bankroll
+        chunk_size: Trades advanced per cumprod block
+
+    Returns:
+        One GridResult per configuration, in grid.configs() order
+    """
+    configs = grid.configs()
+    n = len(configs)
+    price = np.asarray(trades["price"], dtype=np.float64)
+    won = np.asarray(trades["won"], dtype=bool)
+
+    # Per-fee-level arrays, computed once
+    fee_levels = sorted({c[3] for c in configs})
+    fee_row = np.array([fee_levels.index(c[3]) for c in configs])
+    win_return = np.empty((len(fee_levels), len(price)))
+    kelly = np.empty_like(win_return)
+    for i, max_fee in enumerate(fee_levels):
+        fee = estimate_fees(price, max_fee)
+        win_return[i] = np.where(price > 0, win_multiplier(price, fee), -1.0)
+        kelly[i] = kelly_fractions(expected_win_rate, net_odds(price, fee))
+
+    is_kelly = np.array([c[0] == "kelly" for c in configs])
+    fraction = np.array([c[1] for c in configs])
+    band_lo = np.array([c[2][0] for c in configs])
+    band_hi = np.array([c[2][1] for c in configs])
+
+    state = _GridState(n, initial_capital)
+    all_idx = np.arange(n)
+
+    # Full-Kelly paths on long samples can compound past float range;
+    # like run_backtest, let them go to inf rather than warn per chunk
+    with np.errstate(over="ignore", invalid="ignore"):
+        for start in range(0, len(price), chunk_size):
+            sl = slice(start, start + chunk_size)
+            p = price[sl]
+            in_band = (p[None, :] >= band_lo[:, None]) & (p[None, :] <= band_hi[:, None])
+            sized = np.where(
+                is_kelly[:, None],
+                kelly[fee_row, sl] * fraction[:, None],
+                fraction[:, None],
+            )
+            pct = np.where(in_band, np.minimum(sized, grid.position_cap), 0.0)
+            r = np.where(won[sl][None, :], win_return[fee_row, sl], -1.0)
+
+            active = all_idx[state.capital >= min_capital]
+            if len(active) == 0:
+                break
+            ok = _advance_cumprod(state, active, pct[active], r[active], won[sl], min_capital)
+            redo = active[~ok]
+            if len(redo):
+                _advance_rows(state, redo, pct[redo], r[redo], won[sl], min_capital)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(state.total_loss > 0, state.total_profit / state.total_loss, np.inf)
+    sharpe = state.returns.sharpe_ratios(SHARPE_SCALE)
+
+    results = []
+    for i, (sizing, frac, band, max_fee) in enumerate(configs):
+        trades_taken = int(state.wins[i] + state.losses[i])
+
+        results.append(GridResult(
+            sizing=sizing,
+            fraction=frac,
+            price_band=band,
+            max_fee=max_fee,
+            initial_capital=initial_capital,
+            final_capital=float(state.capital[i]),
+            total_return_pct=float((state.capital[i] - initial_capital) / initial_capital * 100),
+            total_trades=trades_taken,
+            wins=int(state.wins[i]),
+            losses=int(state.losses[i]),
+            win_rate=state.wins[i] / trades_taken if trades_taken else 0.0,
+            max_drawdown_pct=float(state.max_dd[i] * 100),
+            sharpe_ratio=float(sharpe[i]),
+            profit_factor=float(profit_factor[i]),
+            stopped=bool(state.capital[i] < min_capital),
+        ))
+    return results
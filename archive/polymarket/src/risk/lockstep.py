@@ -0,0 +1,324 @@
+"""
+Lockstep bankroll runner for many position-sizing variants at once.
+
+compound_growth_backtester.run_backtest walks the trade table once per
+strategy. This runner loads the trades once into contiguous arrays and
+advances every variant's bankroll together: capital is one vector with a
+slot per variant, so each trade costs a handful of array operations no
+matter how many variants are being compared.
+
+Per variant it reports the same metrics as run_backtest plus the equity
+curve, and `ruin_probability()` replays bootstrap-resampled trade
+sequences (again all variants x all paths in lockstep) to estimate how
+often each sizing rule ends in ruin.
+
+Usage:
+    trades = TradeArrays(timestamp, price, confidence, won)
+    runner = LockstepRunner(trades, standard_variants())
+    results = runner.run()
+    ruin = runner.ruin_probability(n_paths=1000)
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.risk.sizing import ReturnMoments, estimate_fees, kelly_fractions, net_odds, win_multiplier
+
+
+# Documented accuracy by confidence threshold (MODEL_IMPROVEMENTS.md)
+THRESHOLD_WIN_RATES = ((0.6, 0.942), (0.5, 0.92), (0.4, 0.902))
+DEFAULT_WIN_RATE = 0.84
+
+
+def expected_win_rate(confidence_threshold: float) -> float:
+    """Win rate run_backtest assumes for a confidence threshold."""
+    for threshold, win_rate in THRESHOLD_WIN_RATES:
+        if confidence_threshold >= threshold:
+            return win_rate
+    return DEFAULT_WIN_RATE
+
+
+@dataclass
+class SizingVariant:
+    """One position-sizing rule: a fixed fraction or a Kelly multiple."""
+    name: str
+    kind: str  # "fixed" or "kelly"
+    fraction: float
+    confidence_threshold: float = 0.0
+    win_rate: Optional[float] = None  # Kelly input; defaults from the threshold
+    max_position_pct: float = 0.20
+
+    def __post_init__(self):
+        if self.kind not in ("fixed", "kelly"):
+            raise ValueError(f"Unknown sizing kind: {self.kind}")
+        if self.win_rate is None:
+            self.win_rate = expected_win_rate(self.confidence_threshold)
+
+
+STANDARD_SIZINGS = {
+    "fixed_1pct": ("fixed", 0.01),
+    "fixed_2pct": ("fixed", 0.02),
+    "fixed_5pct": ("fixed", 0.05),
+    "quarter_kelly": ("kelly", 0.25),
+    "half_kelly": ("kelly", 0.5),
+    "kelly": ("kelly", 1.0),
+}
+
+
+def standard_variants(thresholds: Sequence[float] = (0.4, 0.5, 0.6)) -> List[SizingVariant]:
+    """The strategy x threshold set run_all_backtests has always reported."""
+    return [
+        SizingVariant(f"{name}_conf{int(t * 100)}", kind, fraction, confidence_threshold=t)
+        for name, (kind, fraction) in STANDARD_SIZINGS.items()
+        for t in thresholds
+    ]
+
+
+@dataclass
+class TradeArrays:
+    """Trades as contiguous columns, sorted by time."""
+    timestamp: np.ndarray
+    price: np.ndarray
+    confidence: np.ndarray
+    won: np.ndarray
+
+    def __post_init__(self):
+        self.timestamp = np.ascontiguousarray(self.timestamp, dtype=np.int64)
+        self.price = np.ascontiguousarray(self.price, dtype=np.float64)
+        self.confidence = np.ascontiguousarray(self.confidence, dtype=np.float64)
+        self.won = np.ascontiguousarray(self.won, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+
+@dataclass
+class LockstepResult:
+    """Metrics for one variant (fields mirror compound_growth BacktestResult)."""
+    variant: SizingVariant
+    initial_capital: float
+    final_capital: float
+    total_return: float
+    trades: int
+    wins: int
+    win_rate: float
+    max_drawdown: float
+    max_drawdown_pct: float
+    sharpe_ratio: float
+    profit_factor: float
+    avg_win: float
+    avg_loss: float
+    equity_curve: np.ndarray = field(default_factory=lambda: np.empty(0))
+    timestamps: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+
+class LockstepRunner:
+    """
+    Advances all sizing variants' bankrolls through the trades together.
+
+    Example:
+        runner = LockstepRunner(trades, standard_variants(), initial_capital=300)
+        for r in runner.run():
+            print(r.variant.name, r.final_capital, r.max_drawdown_pct)
+    """
+
+    def __init__(
+        self,
+        trades: TradeArrays,
+        variants: Sequence[SizingVariant],
+        initial_capital: float = 300.0,
+        min_capital: float = 10.0,
+        trades_per_year: float = 96 * 365,
+    ):
+        """
+        Args:
+            trades: Trade columns (one trade per market window, time-sorted)
+            variants: Sizing rules to compare
+            initial_capital: Starting bankroll for every variant
+            min_capital: Trading stops below this bankroll
+            trades_per_year: Sharpe annualization
+        """
+        self.trades = trades
+        self.variants = list(variants)
+        self.initial_capital = initial_capital
+        self.min_capital = min_capital
+        self.trades_per_year = trades_per_year
+
+        # Per-trade terms, computed once for all variants
+        price = trades.price
+        self._fee = estimate_fees(price)
+        self._odds = net_odds(price, self._fee)
+        self._win_mult = win_multiplier(price, self._fee)
+
+        # Per-variant parameters, one slot each
+        self._is_kelly = np.array([v.kind == "kelly" for v in self.variants])
+        self._fraction = np.array([v.fraction for v in self.variants], dtype=np.float64)
+        self._threshold = np.array([v.confidence_threshold for v in self.variants], dtype=np.float64)
+        self._p = np.array([v.win_rate for v in self.variants], dtype=np.float64)
+        self._cap = np.array([v.max_position_pct for v in self.variants], dtype=np.float64)
+
+    def _position_pct(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Position fraction for each (path, variant) at the given trade rows.
+
+        Args:
+            rows: Trade index per path, shape (paths,)
+
+        Returns:
+            (paths, variants) fractions, 0 where the variant skips the trade
+        """
+        kelly = kelly_fractions(self._p, self._odds[rows][:, None])
+
+        pct = np.where(self._is_kelly, kelly * self._fraction, self._fraction)
+        pct = np.minimum(pct, self._cap)
+        eligible = self.trades.confidence[rows][:, None] >= self._threshold
+        return np.where(eligible, pct, 0.0)
+
+    def _step(self, capital: np.ndarray, rows: np.ndarray):
+        """
+        Apply one trade per path to every variant.
+
+        Returns:
+            (taken mask, pnl) arrays shaped like `capital`
+        """
+        position = capital * self._position_pct(rows)
+        taken = (capital >= self.min_capital) & (position >= 1.0)
+        pnl = np.where(
+            self.trades.won[rows][:, None],
+            position * self._win_mult[rows][:, None],
+            -position,
+        )
+        pnl = np.where(taken, pnl, 0.0)
+        capital += pnl
+        return taken, pnl
+
+    def run(self, record_curves: bool = True) -> List[LockstepResult]:
+        """
+        Replay the trades once for all variants.
+
+        Args:
+            record_curves: Keep per-variant equity curves (T x variants memory)
+
+        Returns:
+            One LockstepResult per variant, in input order
+        """
+        n_trades, n = len(self.trades), len(self.variants)
+        capital = np.full((1, n), self.initial_capital)
+        peak = capital.copy()
+        max_dd = np.zeros((1, n))
+        max_dd_pct = np.zeros((1, n))
+        wins = np.zeros((1, n), dtype=np.int64)
+        count = np.zeros((1, n), dtype=np.int64)
+        pnl_moments = ReturnMoments(n)
+        gross_profit = np.zeros((1, n))
+        gross_loss = np.zeros((1, n))
+        n_pos = np.zeros((1, n), dtype=np.int64)
+        n_neg = np.zeros((1, n), dtype=np.int64)
+
+        if record_curves:
+            taken_log = np.zeros((n_trades, n), dtype=bool)
+            capital_log = np.empty((n_trades, n))
+
+        # Long runs at large fractions can compound past float range
+        with np.errstate(over="ignore", invalid="ignore"):
+            row = np.zeros(1, dtype=np.int64)
+            for t in range(n_trades):
+                row[0] = t
+                taken, pnl = self._step(capital, row)
+                if not taken.any():
+                    if not (capital >= self.min_capital).any():
+                        break
+                    continue
+
+                count += taken
+                if self.trades.won[t]:
+                    wins += taken
+                slots = np.flatnonzero(taken[0])
+                pnl_moments.add(slots, pnl[0, slots])
+                gross_profit += np.where(pnl > 0, pnl, 0.0)
+                gross_loss -= np.where(pnl < 0, pnl, 0.0)
+                n_pos += pnl > 0
+                n_neg += pnl < 0
+
+                np.maximum(peak, capital, out=peak)
+                dd = peak - capital
+                deeper = dd > max_dd
+                max_dd = np.where(deeper, dd, max_dd)
+                max_dd_pct = np.where(deeper, dd / peak, max_dd_pct)
+
+                if record_curves:
+                    taken_log[t] = taken[0]
+                    capital_log[t] = capital[0]
+
+            sharpe = pnl_moments.sharpe_ratios(np.sqrt(self.trades_per_year))
+            results = []
+            for i, variant in enumerate(self.variants):
+                trades = int(count[0, i])
+
+                if record_curves:
+                    mask = taken_log[:, i]
+                    curve = np.concatenate([[self.initial_capital], capital_log[mask, i]])
+                    stamps = self.trades.timestamp[mask]
+                else:
+                    curve, stamps = np.empty(0), np.empty(0, dtype=np.int64)
+
+                final = float(capital[0, i])
+                results.append(LockstepResult(
+                    variant=variant,
+                    initial_capital=self.initial_capital,
+                    final_capital=final,
+                    total_return=(final - self.initial_capital) / self.initial_capital,
+                    trades=trades,
+                    wins=int(wins[0, i]),
+                    win_rate=wins[0, i] / trades if trades > 0 else 0,
+                    max_drawdown=float(max_dd[0, i]),
+                    max_drawdown_pct=float(max_dd_pct[0, i]),
+                    sharpe_ratio=float(sharpe[i]),
+                    profit_factor=(
+                        float(gross_profit[0, i]) / float(gross_loss[0, i]) if gross_loss[0, i] > 0 else float("inf")
+                    ),
+                    avg_win=float(gross_profit[0, i] / n_pos[0, i]) if n_pos[0, i] else 0,
+                    avg_loss=float(-gross_loss[0, i] / n_neg[0, i]) if n_neg[0, i] else 0,
+                    equity_curve=curve,
+                    timestamps=stamps,
+                ))
+        return results
+
+    def ruin_probability(
+        self,
+        n_paths: int = 1000,
+        ruin_capital: Optional[float] = None,
+        path_length: Optional[int] = None,
+        seed: Optional[int] = 0,
+    ) -> np.ndarray:
+        """
+        Estimate each variant's probability of ruin by bootstrap.
+
+        Each path draws `path_length` trades with replacement from the
+        history; all paths and variants advance together.
+
+        Args:
+            n_paths: Number of resampled trade sequences
+            ruin_capital: Bankroll counted as ruin (default: min_capital,
+                where trading stops)
+            path_length: Trades per path (default: length of the history)
+            seed: RNG seed (None for nondeterministic)
+
+        Returns:
+            Array of ruin probabilities, one per variant
+        """
+        ruin_capital = self.min_capital if ruin_capital is None else ruin_capital
+        path_length = path_length or len(self.trades)
+        rng = np.random.default_rng(seed)
+
+        capital = np.full((n_paths, len(self.variants)), self.initial_capital)
+        ruined = capital < ruin_capital
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            for _ in range(path_length):
+                rows = rng.integers(0, len(self.trades), n_paths)
+                self._step(capital, rows)
+                ruined |= capital < ruin_capital
+
+        return ruined.mean(axis=0)
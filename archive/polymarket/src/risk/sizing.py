@@ -0,0 +1,106 @@
+"""
+Fee, Kelly and return-statistics helpers shared by the sizing simulators.
+
+kelly_grid.simulate_grid and lockstep.LockstepRunner both replay the
+backtesters' bankroll loops; the per-trade terms (taker fee curve, net
+odds, Kelly fraction) and the Sharpe ratio they report are defined once
+here so the two stay in step with each other and with the scalar
+estimate_fee / kelly_fraction functions in the backtest scripts.
+"""
+import numpy as np
+
+
+# Kelly fractions above this are capped, as in the backtest scripts
+KELLY_CAP = 0.5
+
+
+def estimate_fees(price: np.ndarray, max_fee: float = 0.03) -> np.ndarray:
+    """Taker fee per trade: `max_fee` at 0.50, falling to zero at 0 and 1."""
+    distance = np.abs(price - 0.50)
+    return np.maximum(0.0, max_fee * (1 - (distance / 0.50) ** 2))
+
+
+def net_odds(price: np.ndarray, fee: np.ndarray) -> np.ndarray:
+    """Net odds b of buying at `price` after `fee` (0 where price <= 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(price > 0, (1.0 - fee - price) / price, 0.0)
+
+
+def win_multiplier(price: np.ndarray, fee: np.ndarray) -> np.ndarray:
+    """Profit per dollar staked on a winning trade (0 where price <= 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(price > 0, (1.0 - fee) / price - 1.0, 0.0)
+
+
+def kelly_fractions(win_prob, odds: np.ndarray) -> np.ndarray:
+    """
+    Kelly fraction (p*b - q) / b, clipped to [0, KELLY_CAP].
+
+    `win_prob` may be a scalar or an array broadcasting against `odds`;
+    slots with non-positive odds or a win probability outside (0, 1) get 0.
+    """
+    p = np.asarray(win_prob, dtype=np.float64)
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kelly = (p * odds - (1 - p)) / odds
+    valid = (odds > 0) & (p > 0) & (p < 1)
+    return np.where(valid, np.clip(kelly, 0.0, KELLY_CAP), 0.0)
+
+
+class ReturnMoments:
+    """
+    Per-slot running mean and variance of returns.
+
+    Single observations use Welford's update and whole batches are merged
+    with Chan et al.'s pairwise formula, so the variance never comes from
+    `sum(x**2)/n - mean**2` and stays accurate when returns are small
+    relative to their mean.
+    """
+
+    def __init__(self, n: int):
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)  # Sum of squared deviations from the mean
+
+    def add(self, idx: np.ndarray, values: np.ndarray):
+        """Add one return to each slot in `idx` (distinct indices)."""
+        count = self.count[idx] + 1
+        delta = values - self.mean[idx]
+        mean = self.mean[idx] + delta / count
+        self.m2[idx] += delta * (values - mean)
+        self.mean[idx] = mean
+        self.count[idx] = count
+
+    def add_batch(self, idx: np.ndarray, values: np.ndarray, mask: np.ndarray):
+        """
+        Add a block of returns per slot.
+
+        Args:
+            idx: Slots, shape (k,) with distinct indices
+            values: Returns, shape (k, m)
+            mask: Which entries of `values` are observations, shape (k, m)
+        """
+        n_b = mask.sum(axis=1)
+        safe = np.maximum(n_b, 1)
+        mean_b = np.where(mask, values, 0.0).sum(axis=1) / safe
+        m2_b = np.where(mask, (values - mean_b[:, None]) ** 2, 0.0).sum(axis=1)
+
+        n_a = self.count[idx]
+        n = n_a + n_b
+        total = np.maximum(n, 1)
+        delta = mean_b - self.mean[idx]
+        self.mean[idx] += delta * n_b / total
+        self.m2[idx] += m2_b + delta * delta * n_a * n_b / total
+        self.count[idx] = n
+
+    def sharpe_ratios(self, scale: float) -> np.ndarray:
+        """
+        Annualized Sharpe ratio per slot.
+
+        Uses the population standard deviation, like `np.std`; slots with
+        fewer than two observations or zero variance get 0.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = self.m2 / self.count
+            sharpe = self.mean / np.sqrt(var) * scale
+        return np.where((self.count > 1) & (var > 0), sharpe, 0.0)
@@ -1,5 +1,12 @@
-"""Storage module for trading-lab."""
+"""Storage module for trading-lab.
+
+The numpy-backed caches are imported on first access, so importing
+db or the models doesn't require numpy.
+"""
+from importlib import import_module
+
 from .db import Database, db
+from .wallet_activity import WalletActivityStore
 from .models import (
     Market,
     OrderbookSnapshot,
@@ -8,6 +15,22 @@ from .models import (
     Feature,
 )
 
+# Lazily imported exports: name -> submodule
+_LAZY = {
+    "KlineCache": "kline_cache",
+    "OrderbookLogCache": "orderbook_cache",
+    "FinalMinuteCache": "final_minute_cache",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "Database",
     "db",
@@ -16,4 +39,8 @@ __all__ = [
     "PriceTick",
     "WalletTrade",
     "Feature",
+    "KlineCache",
+    "OrderbookLogCache",
+    "FinalMinuteCache",
+    "WalletActivityStore",
 ]
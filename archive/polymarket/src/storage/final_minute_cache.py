@@ -0,0 +1,374 @@
+"""
+Columnar cache of final-minute captures.
+
+final_minute_tracker.py saves one JSON file per market window, with
+Binance price ticks and order book snapshots as lists of dicts. The
+reverse-engineering analyzers used to `json.load` every file on every run
+and loop over those dicts. This cache compiles a capture directory into
+three flat NumPy tables, parsing only files it hasn't seen before:
+
+    windows.npy   one row per capture (asset, window bounds, start/end
+                  price, and [start, end) row ranges into the other two)
+    ticks.npy     Binance price ticks, time-sorted within each window
+    books.npy     order book snapshots, in capture order
+
+Every tick and book row carries its `window` row number, so per-window
+statistics are grouped reductions (`group_mean`, `group_std`) instead of
+Python loops. Missing values (None in the JSON) are stored as NaN.
+
+Each ingest appends its new rows as a chunk ({table}.{id}.npy) instead
+of rewriting the full tables; once `compact_every` chunks have built up
+they are folded back into the base tables.
+
+Layout:
+    {root}/manifest.json   files ingested (row-aligned with windows),
+                           slugs, asset names, committed row counts and
+                           the chunks appended since the last compaction
+    {root}/{windows,ticks,books}.npy          base tables
+    {root}/{windows,ticks,books}.{id:06d}.npy appended chunks
+
+Usage:
+    cache = FinalMinuteCache("data/research/final_minute_cache")
+    cache.ingest("data/research/final_minute")
+    books = cache.books
+    up = books["outcome"] == OUTCOMES.index("up")
+    mean, count = group_mean(book_imbalance(books), books["window"], len(cache), up)
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+OUTCOMES = ("up", "down")
+
+WINDOW_DTYPE = np.dtype([
+    ("window_start", "<i8"),
+    ("window_end", "<i8"),
+    ("asset", "<i2"),
+    ("start_price", "<f8"),
+    ("end_price", "<f8"),
+    ("tick_start", "<i8"),
+    ("tick_end", "<i8"),
+    ("book_start", "<i8"),
+    ("book_end", "<i8"),
+])
+
+TICK_DTYPE = np.dtype([
+    ("window", "<i4"),
+    ("timestamp", "<f8"),
+    ("price", "<f8"),
+])
+
+BOOK_DTYPE = np.dtype([
+    ("window", "<i4"),
+    ("timestamp", "<f8"),
+    ("outcome", "<i1"),  # index into OUTCOMES, -1 if unknown
+    ("best_bid", "<f8"),
+    ("best_ask", "<f8"),
+    ("bid_depth", "<f8"),
+    ("ask_depth", "<f8"),
+    ("spread", "<f8"),
+    ("mid_price", "<f8"),
+])
+
+_TABLES = (("windows", WINDOW_DTYPE), ("ticks", TICK_DTYPE), ("books", BOOK_DTYPE))
+
+# Appended chunks kept before they are folded into the base tables
+COMPACT_EVERY = 16
+
+
+def _float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _save(path: Path, array: np.ndarray):
+    """Atomically write one .npy file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def book_imbalance(books: np.ndarray) -> np.ndarray:
+    """
+    Depth imbalance per snapshot, (bid - ask) / (bid + ask).
+
+    Missing depths count as zero; snapshots with no depth at all get NaN.
+    Positive = more bids.
+    """
+    bid = np.nan_to_num(np.asarray(books["bid_depth"], dtype=np.float64))
+    ask = np.nan_to_num(np.asarray(books["ask_depth"], dtype=np.float64))
+    total = bid + ask
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, (bid - ask) / total, np.nan)
+
+
+def group_mean(
+    values: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int,
+    mask: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-group mean of the non-NaN (and `mask`-selected) values.
+
+    Returns:
+        (mean, count) arrays of length n_groups; mean is NaN where count is 0
+    """
+    keep = ~np.isnan(values)
+    if mask is not None:
+        keep &= mask
+    count = np.bincount(groups[keep], minlength=n_groups)
+    total = np.bincount(groups[keep], weights=values[keep], minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count > 0, total / count, np.nan), count
+
+
+def group_std(
+    values: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int,
+    mask: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Per-group sample standard deviation (0 for groups with one value, NaN for none)."""
+    mean, count = group_mean(values, groups, n_groups, mask)
+    keep = ~np.isnan(values)
+    if mask is not None:
+        keep &= mask
+    dev = (values[keep] - mean[groups[keep]]) ** 2
+    ss = np.bincount(groups[keep], weights=dev, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(ss / (count - 1))
+    return np.where(count > 1, std, np.where(count == 1, 0.0, np.nan))
+
+
+class FinalMinuteCache:
+    """Window, tick and book tables compiled from final-minute JSON captures."""
+
+    def __init__(self, root: str, compact_every: int = COMPACT_EVERY):
+        """
+        Args:
+            root: Cache directory
+            compact_every: Fold appended chunks into the base tables once
+                this many have built up
+        """
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self.compact_every = compact_every
+        self._manifest = self._read_manifest()
+        self._tables: Dict[str, np.ndarray] = {}
+
+    def _read_manifest(self) -> Dict:
+        manifest = {"files": [], "slugs": [], "assets": [], "rows": {"windows": 0, "ticks": 0, "books": 0}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        # Manifests from before chunked appends have everything in the base
+        manifest.setdefault("chunks", [])
+        manifest.setdefault("next_chunk", 0)
+        return manifest
+
+    def _chunk_path(self, name: str, chunk_id: int) -> Path:
+        return self.root / f"{name}.{chunk_id:06d}.npy"
+
+    def _table(self, name: str, dtype: np.dtype) -> np.ndarray:
+        """
+        Load a table: the memory-mapped base, trimmed to its committed row
+        count, followed by any appended chunks.
+        """
+        if name not in self._tables:
+            chunks = self._manifest["chunks"]
+            base_rows = self._manifest["rows"][name] - sum(c["rows"][name] for c in chunks)
+            path = self.root / f"{name}.npy"
+            parts = []
+            if base_rows and path.exists():
+                parts.append(np.load(path, mmap_mode="r")[:base_rows])
+            for chunk in chunks:
+                if chunk["rows"][name]:
+                    parts.append(np.load(self._chunk_path(name, chunk["id"]), mmap_mode="r"))
+            if not parts:
+                self._tables[name] = np.empty(0, dtype=dtype)
+            elif len(parts) == 1:
+                self._tables[name] = parts[0]
+            else:
+                self._tables[name] = np.concatenate(parts)
+        return self._tables[name]
+
+    @property
+    def windows(self) -> np.ndarray:
+        return self._table("windows", WINDOW_DTYPE)
+
+    @property
+    def ticks(self) -> np.ndarray:
+        return self._table("ticks", TICK_DTYPE)
+
+    @property
+    def books(self) -> np.ndarray:
+        return self._table("books", BOOK_DTYPE)
+
+    @property
+    def files(self) -> List[str]:
+        """Source file of each window row."""
+        return list(self._manifest["files"])
+
+    @property
+    def slugs(self) -> List[str]:
+        return list(self._manifest["slugs"])
+
+    @property
+    def assets(self) -> List[str]:
+        """Asset names; a window's `asset` code indexes this list."""
+        return list(self._manifest["assets"])
+
+    def __len__(self) -> int:
+        return self._manifest["rows"]["windows"]
+
+    def asset_mask(self, asset: str) -> np.ndarray:
+        """Boolean mask over windows for one asset ("BTC", "ETH")."""
+        if asset not in self._manifest["assets"]:
+            return np.zeros(len(self), dtype=bool)
+        return self.windows["asset"] == self._manifest["assets"].index(asset)
+
+    def _asset_code(self, asset: str) -> int:
+        assets = self._manifest["assets"]
+        if asset not in assets:
+            assets.append(asset)
+        return assets.index(asset)
+
+    def _parse(self, data: Dict, window: int, tick_start: int, book_start: int):
+        """Convert one capture to (window row, ticks, books)."""
+        prices = data.get("binance_prices", [])
+        ticks = np.empty(len(prices), dtype=TICK_DTYPE)
+        ticks["window"] = window
+        ticks["timestamp"] = [p["timestamp"] for p in prices]
+        ticks["price"] = [p["price"] for p in prices]
+        ticks = ticks[np.argsort(ticks["timestamp"], kind="stable")]
+
+        snapshots = data.get("orderbook_snapshots", [])
+        books = np.empty(len(snapshots), dtype=BOOK_DTYPE)
+        for i, ob in enumerate(snapshots):
+            outcome = ob.get("outcome")
+            books[i] = (
+                window,
+                ob["timestamp"],
+                OUTCOMES.index(outcome) if outcome in OUTCOMES else -1,
+                _float(ob.get("best_bid")),
+                _float(ob.get("best_ask")),
+                _float(ob.get("bid_depth")),
+                _float(ob.get("ask_depth")),
+                _float(ob.get("spread")),
+                _float(ob.get("mid_price")),
+            )
+
+        row = np.array([(
+            data.get("window_start") or 0,
+            data.get("window_end") or 0,
+            self._asset_code(data.get("asset", "Unknown")),
+            _float(data.get("start_price")),
+            _float(data.get("end_price")),
+            tick_start,
+            tick_start + len(ticks),
+            book_start,
+            book_start + len(books),
+        )], dtype=WINDOW_DTYPE)
+        return row, ticks, books
+
+    def ingest(self, directory: str) -> int:
+        """
+        Compile capture files not seen before into the cache.
+
+        Files that fail to parse are reported and retried on the next run.
+
+        Returns:
+            Number of windows added
+        """
+        seen = set(self._manifest["files"])
+        new_files = sorted(
+            name for name in os.listdir(directory)
+            if name.endswith(".json") and name not in seen
+        )
+        if not new_files:
+            return 0
+
+        rows = self._manifest["rows"]
+        window, tick_start, book_start = rows["windows"], rows["ticks"], rows["books"]
+        parts = {"windows": [], "ticks": [], "books": []}
+        files, slugs = [], []
+
+        for name in new_files:
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    data = json.load(f)
+                row, ticks, books = self._parse(data, window, tick_start, book_start)
+            except Exception as e:
+                print(f"Error loading {name}: {e}")
+                continue
+
+            parts["windows"].append(row)
+            parts["ticks"].append(ticks)
+            parts["books"].append(books)
+            files.append(name)
+            slugs.append(data.get("slug", ""))
+            window += 1
+            tick_start += len(ticks)
+            book_start += len(books)
+
+        if not files:
+            return 0
+
+        # Tables first, manifest last: rows and chunks the manifest doesn't
+        # list (from an interrupted run) are ignored and overwritten. An
+        # empty cache gets its first rows as the base tables directly.
+        self.root.mkdir(parents=True, exist_ok=True)
+        first = rows["windows"] == 0 and not self._manifest["chunks"]
+        chunk_id = self._manifest["next_chunk"]
+        chunk_rows = {}
+        for name, dtype in _TABLES:
+            table = np.concatenate(parts[name]).astype(dtype, copy=False)
+            path = self.root / f"{name}.npy" if first else self._chunk_path(name, chunk_id)
+            _save(path, table)
+            chunk_rows[name] = len(table)
+            rows[name] += len(table)
+
+        if not first:
+            self._manifest["chunks"].append({"id": chunk_id, "rows": chunk_rows})
+            self._manifest["next_chunk"] = chunk_id + 1
+        self._manifest["files"].extend(files)
+        self._manifest["slugs"].extend(slugs)
+        self._write_manifest()
+        self._tables.clear()
+
+        if len(self._manifest["chunks"]) >= self.compact_every:
+            self.compact()
+
+        return len(files)
+
+    def compact(self):
+        """
+        Fold appended chunks into the base tables and delete them.
+
+        A new base only ever extends the old one, so a manifest still
+        listing the chunks (if this is interrupted) reads the same rows.
+        """
+        chunks = self._manifest["chunks"]
+        if not chunks:
+            return
+
+        for name, dtype in _TABLES:
+            _save(self.root / f"{name}.npy", np.ascontiguousarray(self._table(name, dtype)))
+
+        self._manifest["chunks"] = []
+        self._write_manifest()
+        self._tables.clear()
+        for chunk in chunks:
+            for name, _ in _TABLES:
+                self._chunk_path(name, chunk["id"]).unlink(missing_ok=True)
+
+    def _write_manifest(self):
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.manifest_path)
@@ -0,0 +1,161 @@
+"""
+Columnar kline cache, one memory-mappable file per symbol/interval/day.
+
+Replaces re-parsing CSV/JSONL kline dumps in every analysis script: each
+UTC day is stored as a NumPy structured array (`.npy`), so loading is an
+`mmap` of fixed-width columns with no parsing at all, and backfills only
+have to fetch the days that are missing.
+
+Layout:
+    {root}/{SYMBOL}/{interval}/{YYYY-MM-DD}.npy
+
+Only complete (closed) days are written, so a cached day is never stale.
+
+Usage:
+    cache = KlineCache("data/klines")
+    closes = cache.load("BTCUSDT", "1m", start_ms, end_ms)["close"]
+    df = cache.to_dataframe(["BTCUSDT", "ETHUSDT"], "1m", start_ms, end_ms)
+"""
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+KLINE_DTYPE = np.dtype([
+    ("open_time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("close_time", "<i8"),
+    ("quote_volume", "<f8"),
+    ("trades", "<i8"),
+])
+
+
+def interval_to_ms(interval: str) -> int:
+    """Convert a Binance interval string ("1m", "4h", "1d") to milliseconds."""
+    unit = interval[-1]
+    value = int(interval[:-1])
+
+    multipliers = {
+        "s": 1000,
+        "m": 60 * 1000,
+        "h": 60 * 60 * 1000,
+        "d": DAY_MS,
+    }
+
+    return value * multipliers.get(unit, 60 * 1000)
+
+
+def day_start(ts_ms: int) -> int:
+    """Midnight UTC (ms) of the day containing ts_ms."""
+    return ts_ms - ts_ms % DAY_MS
+
+
+def days_between(start_ms: int, end_ms: int) -> List[int]:
+    """Day starts (ms) of every UTC day overlapping [start_ms, end_ms]."""
+    return list(range(day_start(start_ms), end_ms + 1, DAY_MS))
+
+
+def klines_to_array(klines: Sequence[Sequence]) -> np.ndarray:
+    """Convert raw Binance kline rows to a KLINE_DTYPE array."""
+    out = np.empty(len(klines), dtype=KLINE_DTYPE)
+    for i, k in enumerate(klines):
+        out[i] = (
+            int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]),
+            float(k[5]), int(k[6]), float(k[7]), int(k[8]),
+        )
+    return out
+
+
+class KlineCache:
+    """Per-day NumPy kline files, loaded via memory map."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def day_path(self, symbol: str, interval: str, day_ms: int) -> Path:
+        day = datetime.fromtimestamp(day_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        return self.root / symbol.upper() / interval / f"{day}.npy"
+
+    def has_day(self, symbol: str, interval: str, day_ms: int) -> bool:
+        return self.day_path(symbol, interval, day_ms).exists()
+
+    def missing_days(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[int]:
+        """Day starts in [start_ms, end_ms] that aren't cached yet."""
+        return [d for d in days_between(start_ms, end_ms) if not self.has_day(symbol, interval, d)]
+
+    def write_day(self, symbol: str, interval: str, day_ms: int, klines: np.ndarray):
+        """Atomically store one complete day (sorted by open_time)."""
+        path = self.day_path(symbol, interval, day_ms)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        klines = np.sort(klines.astype(KLINE_DTYPE, copy=False), order="open_time")
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, klines)
+        os.replace(tmp, path)
+
+    def open_day(self, symbol: str, interval: str, day_ms: int) -> Optional[np.ndarray]:
+        """Memory-map one cached day (read-only), or None if not cached."""
+        path = self.day_path(symbol, interval, day_ms)
+        if not path.exists():
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def iter_days(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> Iterator[np.ndarray]:
+        """Yield zero-copy memmap slices of each cached day within [start_ms, end_ms]."""
+        for day_ms in days_between(start_ms, end_ms):
+            day = self.open_day(symbol, interval, day_ms)
+            if day is None or len(day) == 0:
+                continue
+            times = day["open_time"]
+            lo = np.searchsorted(times, start_ms, side="left")
+            hi = np.searchsorted(times, end_ms, side="right")
+            if hi > lo:
+                yield day[lo:hi]
+
+    def load(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """
+        Load cached klines with start_ms <= open_time <= end_ms.
+
+        Single-day ranges come back as a read-only memmap view; multi-day
+        ranges are concatenated into one array (a copy, but no parsing).
+        """
+        parts = list(self.iter_days(symbol, interval, start_ms, end_ms))
+        if not parts:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def to_dataframe(self, symbols: Sequence[str], interval: str, start_ms: int, end_ms: int):
+        """
+        Load klines for several symbols into one DataFrame.
+
+        Columns match fetch_historical_binance.py's CSV output (plus
+        `timestamp` in seconds), so scripts can swap their CSV loader for
+        the cache. Requires pandas.
+        """
+        import pandas as pd
+
+        frames = []
+        for symbol in symbols:
+            arr = self.load(symbol, interval, start_ms, end_ms)
+            df = pd.DataFrame({name: np.asarray(arr[name]) for name in KLINE_DTYPE.names})
+            df.insert(0, "symbol", symbol.upper())
+            frames.append(df)
+
+        df = pd.concat(frames, ignore_index=True)
+        df["timestamp"] = df["open_time"] // 1000
+        df["close_timestamp"] = df["close_time"] // 1000
+        return df
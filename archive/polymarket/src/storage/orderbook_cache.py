@@ -0,0 +1,405 @@
+"""
+Columnar orderbook log cache, one memory-mappable file per market.
+
+The logger writes one JSON line per order book poll into hourly
+`polymarket_books_*.jsonl[.gz]` files. Re-parsing weeks of those on every
+analysis run (and holding every record as a dict) doesn't scale, so the
+cache converts each log once into per-market NumPy structured arrays
+sorted by `ts_received`:
+
+- Ingest streams logs line by line and spills fixed-size chunks to disk,
+  so memory is bounded by the chunk size plus the largest single market.
+- Ingest is incremental: the manifest remembers how many lines of each
+  log were consumed, so a growing hourly file (or the same file after it
+  was rotated to `.gz`) only contributes its new lines.
+- Ingest is crash-safe: consumed line counts are committed (with the
+  list of markets still to merge) before any market file is rewritten,
+  and an interrupted merge is finished from the spool on the next run.
+- Reads are `mmap`s of fixed-width columns; `iter_chunks` streams them
+  in bounded slices and `asof` joins arbitrary timestamps against a
+  market with `np.searchsorted` (O(log n) per lookup, vectorized).
+
+Layout:
+    {root}/manifest.json       sources consumed, token IDs, regions
+    {root}/markets/{slug}.npy  BOOK_DTYPE rows sorted by ts_received
+    {root}/spool/{slug}.bin    rows awaiting merge (only between runs if one crashed)
+
+String fields are stored as small integer codes: `token` indexes the
+market's token list and `region` indexes the cache's region list (the
+name of the directory the log came from, e.g. "tokyo" or "us_east").
+
+Usage:
+    cache = OrderbookLogCache("data/orderbook_cache")
+    cache.ingest(find_log_files("data/orderbook_logs/tokyo"))
+    for slug, chunk in cache.iter_chunks():
+        spreads = chunk["spread"]
+    idx = cache.asof("btc-updown-15m-1767648600", trade_ts_ms)
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+UNKNOWN_SLUG = "unknown"
+
+BOOK_DTYPE = np.dtype([
+    ("ts_received", "<i8"),
+    ("ts_exchange", "<i8"),
+    ("latency_ms", "<i8"),
+    ("best_bid", "<f8"),
+    ("best_bid_size", "<f8"),
+    ("best_ask", "<f8"),
+    ("best_ask_size", "<f8"),
+    ("mid", "<f8"),
+    ("spread", "<f8"),
+    ("bid_depth", "<i4"),
+    ("ask_depth", "<i4"),
+    ("token", "<i4"),
+    ("region", "<i2"),
+])
+
+_FLOAT_FIELDS = ("best_bid", "best_bid_size", "best_ask", "best_ask_size", "mid", "spread")
+
+
+def find_log_files(log_dir: str) -> List[Path]:
+    """Orderbook log files in a directory, oldest first."""
+    return sorted(Path(log_dir).glob("polymarket_books_*.jsonl*"))
+
+
+def _source_key(path: Path) -> str:
+    """Manifest key shared by a log and its rotated `.gz` copy."""
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    return f"{path.parent.name}/{name}"
+
+
+class OrderbookLogCache:
+    """Per-market NumPy orderbook files, built incrementally from JSONL logs."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self._manifest = self._read_manifest()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _read_manifest(self) -> Dict:
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {"sources": {}, "regions": [], "markets": {}}
+
+    def _write_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    @property
+    def regions(self) -> List[str]:
+        """Region names; a row's `region` code indexes this list."""
+        return list(self._manifest["regions"])
+
+    def markets(self) -> List[str]:
+        """Cached market slugs."""
+        return sorted(self._manifest["markets"])
+
+    def tokens(self, slug: str) -> List[str]:
+        """Token IDs of a market; a row's `token` code indexes this list."""
+        return list(self._manifest["markets"].get(slug, {}).get("tokens", []))
+
+    def __len__(self) -> int:
+        return sum(m["rows"] for m in self._manifest["markets"].values())
+
+    def market_path(self, slug: str) -> Path:
+        return self.root / "markets" / f"{slug}.npy"
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def _code(self, values: List[str], value: str) -> int:
+        try:
+            return values.index(value)
+        except ValueError:
+            values.append(value)
+            return len(values) - 1
+
+    def _row(self, record: Dict, slug: str, region: int) -> Tuple:
+        ts_received = int(record.get("ts_received", 0))
+        ts_exchange = int(record.get("ts_exchange", ts_received))
+        market = self._manifest["markets"].setdefault(slug, {"tokens": [], "rows": 0})
+        token = self._code(market["tokens"], str(record.get("token_id", "")))
+        floats = tuple(float(record.get(name, np.nan)) for name in _FLOAT_FIELDS)
+        return (
+            ts_received,
+            ts_exchange,
+            int(record.get("latency_ms", ts_received - ts_exchange)),
+            *floats,
+            int(record.get("bid_depth", 0)),
+            int(record.get("ask_depth", 0)),
+            token,
+            region,
+        )
+
+    def _spill(self, buffers: Dict[str, List[Tuple]], spool: Path):
+        """Append buffered rows to each market's spool file."""
+        spool.mkdir(parents=True, exist_ok=True)
+        for slug, rows in buffers.items():
+            with open(spool / f"{slug}.bin", "ab") as f:
+                np.array(rows, dtype=BOOK_DTYPE).tofile(f)
+        buffers.clear()
+
+    def _record_rows(self, slug: str, rows: np.ndarray):
+        market = self._manifest["markets"][slug]
+        market["rows"] = len(rows)
+        market["first_ts"] = int(rows["ts_received"][0])
+        market["last_ts"] = int(rows["ts_received"][-1])
+
+    def _merge(self, slug: str, spooled: Path):
+        """Merge one market's spooled rows into its sorted file (atomic)."""
+        new = np.fromfile(spooled, dtype=BOOK_DTYPE)
+        path = self.market_path(slug)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            new = np.concatenate([np.load(path), new])
+
+        order = np.argsort(new["ts_received"], kind="stable")
+        rows = new[order]
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, rows)
+        os.replace(tmp, path)
+        spooled.unlink()
+        self._record_rows(slug, rows)
+
+    def _recover(self, spool: Path):
+        """
+        Finish the merges of an interrupted ingest.
+
+        The manifest lists the markets that still had to be merged, with
+        their row counts from before the merge. A market file that is
+        already longer than that was merged before the crash; only its
+        spool file (and its manifest entry) were left behind.
+        """
+        pending = self._manifest.pop("merging", [])
+        for slug in pending:
+            spooled = spool / f"{slug}.bin"
+            path = self.market_path(slug)
+            on_disk = np.load(path, mmap_mode="r") if path.exists() else None
+            if on_disk is not None and len(on_disk) != self._manifest["markets"][slug]["rows"]:
+                self._record_rows(slug, on_disk)
+                if spooled.exists():
+                    spooled.unlink()
+            elif spooled.exists():
+                self._merge(slug, spooled)
+
+        # Anything else was spooled by a run that never committed its
+        # line counts, so those lines get read again
+        if spool.exists():
+            for stale in spool.glob("*.bin"):
+                stale.unlink()
+            spool.rmdir()
+        if pending:
+            self._write_manifest()
+
+    def ingest(self, paths: Iterable[Path], chunk_rows: int = 200_000) -> int:
+        """
+        Convert log files into the cache, skipping lines already ingested.
+
+        Only complete (newline-terminated) lines are consumed, so a file
+        that is still being written is picked up where it left off next
+        time. Malformed lines are skipped but still counted as consumed.
+
+        Args:
+            paths: `polymarket_books_*.jsonl[.gz]` files
+            chunk_rows: Rows buffered in memory before spilling to disk
+
+        Returns:
+            Number of rows added
+        """
+        spool = self.root / "spool"
+        self._recover(spool)
+        sources = self._manifest["sources"]
+        regions = self._manifest["regions"]
+
+        buffers: Dict[str, List[Tuple]] = {}
+        buffered = 0
+        added = 0
+
+        for path in paths:
+            path = Path(path)
+            key = _source_key(path)
+            skip = sources.get(key, 0)
+            region = self._code(regions, path.parent.name)
+            opener = gzip.open if path.suffix == ".gz" else open
+
+            consumed = 0
+            with opener(path, "rt") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    consumed += 1
+                    if consumed <= skip:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    slug = record.get("slug") or UNKNOWN_SLUG
+                    buffers.setdefault(slug, []).append(self._row(record, slug, region))
+                    buffered += 1
+                    added += 1
+                    if buffered >= chunk_rows:
+                        self._spill(buffers, spool)
+                        buffered = 0
+
+            sources[key] = max(skip, consumed)
+
+        if buffers:
+            self._spill(buffers, spool)
+        if spool.exists():
+            # Commit the consumed line counts before touching market files
+            spooled = sorted(spool.glob("*.bin"))
+            self._manifest["merging"] = [p.stem for p in spooled]
+            self._write_manifest()
+            for path in spooled:
+                self._merge(path.stem, path)
+            spool.rmdir()
+            del self._manifest["merging"]
+
+        self._write_manifest()
+        return added
+
+    def sync(self, log_dirs: Sequence[str], chunk_rows: int = 200_000) -> int:
+        """Ingest every log file under the given directories (missing ones are skipped)."""
+        paths = [p for d in log_dirs if Path(d).exists() for p in find_log_files(d)]
+        return self.ingest(paths, chunk_rows=chunk_rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def open_market(self, slug: str) -> np.ndarray:
+        """Memory-map one market's rows (read-only); empty if not cached."""
+        path = self.market_path(slug)
+        if not path.exists():
+            return np.empty(0, dtype=BOOK_DTYPE)
+        return np.load(path, mmap_mode="r")
+
+    def load(
+        self,
+        slug: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        """Zero-copy slice of a market with start_ms <= ts_received <= end_ms."""
+        rows = self.open_market(slug)
+        times = rows["ts_received"]
+        lo = 0 if start_ms is None else np.searchsorted(times, start_ms, side="left")
+        hi = len(rows) if end_ms is None else np.searchsorted(times, end_ms, side="right")
+        return rows[lo:hi]
+
+    def region_mask(self, rows: np.ndarray, regions: Optional[Sequence[str]]) -> np.ndarray:
+        """Boolean mask of rows logged from any of `regions` (all rows if None)."""
+        if regions is None:
+            return np.ones(len(rows), dtype=bool)
+        codes = [i for i, name in enumerate(self._manifest["regions"]) if name in regions]
+        return np.isin(rows["region"], codes)
+
+    def iter_chunks(
+        self,
+        slugs: Optional[Sequence[str]] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        chunk_rows: int = 100_000,
+        regions: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[str, np.ndarray]]:
+        """
+        Stream (slug, rows) chunks of at most `chunk_rows`, market by market.
+
+        Chunks are memmap views unless `regions` filters them (then each
+        chunk is a copy of its matching rows). Rows are time-sorted within
+        a market, not across markets.
+        """
+        for slug in (self.markets() if slugs is None else slugs):
+            rows = self.load(slug, start_ms, end_ms)
+            for lo in range(0, len(rows), chunk_rows):
+                chunk = rows[lo:lo + chunk_rows]
+                if regions is not None:
+                    chunk = chunk[self.region_mask(chunk, regions)]
+                if len(chunk):
+                    yield slug, chunk
+
+    def column(
+        self,
+        name: str,
+        slugs: Optional[Sequence[str]] = None,
+        regions: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """One field across markets as a single array (8 bytes a row, not a dict)."""
+        parts = [chunk[name] for _, chunk in self.iter_chunks(slugs, regions=regions)]
+        if not parts:
+            return np.empty(0, dtype=BOOK_DTYPE[name])
+        return np.concatenate(parts)
+
+    def asof(
+        self,
+        slug: str,
+        ts_ms,
+        tolerance_ms: int = 5000,
+        direction: str = "nearest",
+    ) -> np.ndarray:
+        """
+        As-of join: row index for each timestamp, or -1 if none qualifies.
+
+        Args:
+            slug: Market to search
+            ts_ms: Timestamps (ms), scalar or array, in any order
+            tolerance_ms: Max distance between a timestamp and its row
+            direction: "backward" (last row at or before), "forward" (first
+                row at or after) or "nearest" (ties go forward)
+
+        Returns:
+            Index array (same shape as ts_ms) into `open_market(slug)`
+        """
+        if direction not in ("backward", "forward", "nearest"):
+            raise ValueError(f"Unknown direction: {direction}")
+
+        times = np.asarray(self.open_market(slug)["ts_received"])
+        ts = np.asarray(ts_ms, dtype=np.int64)
+        n = len(times)
+        if n == 0:
+            return np.full(ts.shape, -1, dtype=np.int64)
+
+        after = np.searchsorted(times, ts, side="left")
+        before = np.searchsorted(times, ts, side="right") - 1
+        after_gap = np.where(after < n, times[np.minimum(after, n - 1)] - ts, np.iinfo(np.int64).max)
+        before_gap = np.where(before >= 0, ts - times[np.maximum(before, 0)], np.iinfo(np.int64).max)
+
+        if direction == "forward":
+            idx, gap = after, after_gap
+        elif direction == "backward":
+            idx, gap = before, before_gap
+        else:
+            use_after = after_gap <= before_gap
+            idx = np.where(use_after, after, before)
+            gap = np.where(use_after, after_gap, before_gap)
+
+        return np.where(gap <= tolerance_ms, idx, -1).astype(np.int64)
+
+    def record(self, slug: str, row) -> Dict:
+        """Rebuild a logger-style dict from one row (for printing and JSON)."""
+        tokens = self.tokens(slug)
+        out = {name: row[name].item() for name in BOOK_DTYPE.names if name not in ("token", "region")}
+        out["token_id"] = tokens[row["token"]] if row["token"] < len(tokens) else ""
+        out["region"] = self._manifest["regions"][row["region"]]
+        if slug != UNKNOWN_SLUG:
+            out["slug"] = slug
+        return out
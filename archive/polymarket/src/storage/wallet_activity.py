@@ -0,0 +1,583 @@
+"""
+Indexed, incrementally updated store of wallet activity per market.
+
+The reverse-engineering trackers used to re-read whole ERC1155 transfer
+JSONL dumps and trade JSON exports on every run and rebuild per-wallet
+aggregates in nested dicts. This store keeps that activity in a SQLite
+file instead:
+
+    activity        one row per wallet leg of a transfer or trade, indexed
+                    by (wallet, market, ts), (market, ts) and ts
+    wallet_markets  running totals per (wallet, market)
+    wallets         running totals per wallet
+    sources         ingest watermark per input file
+    unresolved      activity whose token isn't in the token mapping yet
+
+Each ingest reads only what was appended to a source since its watermark
+(a byte offset for JSONL, a record count for JSON trade exports) and
+updates the running totals in the same transaction as the new rows, so an
+interrupted run never double counts. All-time rankings read the `wallets`
+table; windowed rankings and per-wallet/per-market lookups are index range
+scans over `activity`.
+
+A transfer or trade whose token isn't in the mapping yet is parked in
+`unresolved` rather than dropped, and moves into `activity` on the first
+ingest whose mapping knows the token (the watermark has already passed
+it). Transfers and trade exports describe the same fills, so a row whose
+(wallet, tx hash, token) is already stored from the other kind of source
+isn't counted again: a trade only adds its USDC to the matching transfer
+leg, and a transfer leg matching a stored trade is skipped.
+
+Transfers carry no USDC, so only trades contribute to `pnl`, which is the
+net USDC cash flow (sells minus buys). Open positions and redemptions are
+not valued.
+
+Usage:
+    store = WalletActivityStore("data/wallet_activity.db")
+    store.ingest_transfers("data/ec2_transfers/transfers_0x7f69983e_erc1155.jsonl", token_mapping)
+    store.top_wallets(10, by="volume", start=1767600000, end=1767686400)
+    store.activity("0x7f69...", market="btc-updown-15m-1767648600")
+"""
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+NULL_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+RANK_COLUMNS = ("trades", "volume", "pnl", "markets")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+    wallet TEXT NOT NULL,
+    market TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    token_id TEXT,
+    amount REAL NOT NULL,
+    usdc REAL NOT NULL,
+    counterparty TEXT,
+    tx_hash TEXT,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_activity_wallet ON activity(wallet, market, ts);
+CREATE INDEX IF NOT EXISTS idx_activity_market ON activity(market, ts);
+CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity(ts, wallet, market, amount, usdc);
+CREATE INDEX IF NOT EXISTS idx_activity_fill ON activity(tx_hash, token_id, wallet);
+
+CREATE TABLE IF NOT EXISTS unresolved (
+    wallet TEXT NOT NULL,
+    market TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    token_id TEXT,
+    amount REAL NOT NULL,
+    usdc REAL NOT NULL,
+    counterparty TEXT,
+    tx_hash TEXT,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_unresolved_token ON unresolved(token_id);
+
+CREATE TABLE IF NOT EXISTS wallet_markets (
+    wallet TEXT NOT NULL,
+    market TEXT NOT NULL,
+    trades INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    pnl REAL NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    PRIMARY KEY (wallet, market)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS wallets (
+    wallet TEXT PRIMARY KEY,
+    trades INTEGER NOT NULL,
+    volume REAL NOT NULL,
+    pnl REAL NOT NULL,
+    markets INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_wallets_volume ON wallets(volume);
+CREATE INDEX IF NOT EXISTS idx_wallets_pnl ON wallets(pnl);
+CREATE INDEX IF NOT EXISTS idx_wallets_trades ON wallets(trades);
+
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    watermark INTEGER NOT NULL
+);
+"""
+
+# (wallet, market, ts, side, token_id, amount, usdc, counterparty, tx_hash)
+Row = Tuple[str, str, int, str, str, float, float, Optional[str], Optional[str]]
+
+# Keeps a market (by slug) in the store, e.g. lambda slug: "updown" in slug
+MarketFilter = Callable[[str], bool]
+
+
+def _market_for(
+    token_id: str,
+    slug: Optional[str],
+    token_mapping: Optional[Dict],
+    include: Optional[MarketFilter],
+) -> Optional[str]:
+    """Market slug for a record, "" to drop it, or None if its token isn't mapped yet."""
+    if not slug:
+        if token_id not in (token_mapping or {}):
+            return None
+        slug = token_mapping[token_id].get("slug", "")
+    if not slug or (include is not None and not include(slug)):
+        return ""
+    return slug
+
+
+def _transfer_rows(transfer: Dict, market: str) -> List[Row]:
+    """Buy leg for the receiver and sell leg for the sender of one ERC1155 transfer."""
+    from_addr = (transfer.get("from_address") or "").lower()
+    to_addr = (transfer.get("to_address") or "").lower()
+    token_id = str(transfer.get("token_id", ""))
+    amount = float(transfer.get("value", 0))
+    ts = int(transfer.get("block_timestamp", 0))
+    tx_hash = transfer.get("transaction_hash") or transfer.get("tx_hash")
+
+    rows = []
+    if to_addr and to_addr != NULL_ADDRESS:
+        rows.append((to_addr, market, ts, "buy", token_id, amount, 0.0, from_addr or None, tx_hash))
+    if from_addr and from_addr != NULL_ADDRESS:
+        rows.append((from_addr, market, ts, "sell", token_id, amount, 0.0, to_addr or None, tx_hash))
+    return rows
+
+
+def _trade_row(trade: Dict, market: str) -> Optional[Row]:
+    """One row for a trade export record (blockchain_trade_extractor / trade downloader)."""
+    wallet = (trade.get("wallet") or "").lower()
+    token_id = str(trade.get("token_id", ""))
+    if not wallet:
+        return None
+
+    side = str(trade.get("side", "")).lower()
+    usdc = float(trade.get("usdc_amount") or 0)
+    return (
+        wallet,
+        market,
+        int(trade.get("timestamp") or 0),
+        side,
+        token_id,
+        float(trade.get("token_amount") or 0),
+        usdc if side == "sell" else -usdc,
+        None,
+        trade.get("tx_hash"),
+    )
+
+
+class WalletActivityStore:
+    """SQLite-backed wallet activity with running per-wallet aggregates."""
+
+    def __init__(self, path: str, batch_rows: int = 50_000):
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM activity").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def watermark(self, source: str) -> int:
+        """Bytes (JSONL) or records (JSON) already ingested from a source."""
+        row = self.conn.execute(
+            "SELECT watermark FROM sources WHERE path = ?", (os.path.abspath(source),)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def unresolved(self) -> int:
+        """Rows parked until the token mapping knows their token."""
+        return self.conn.execute("SELECT COUNT(*) FROM unresolved").fetchone()[0]
+
+    def _counterpart(self, row: Row, kind: str) -> Optional[Tuple[int, str]]:
+        """(rowid, market) of the same fill already stored from the other kind of source."""
+        wallet, _, _, _, token_id, _, _, _, tx_hash = row
+        if not tx_hash:
+            return None
+        match = self.conn.execute(
+            "SELECT rowid, market FROM activity "
+            "WHERE tx_hash = ? AND token_id = ? AND wallet = ? AND kind != ? LIMIT 1",
+            (tx_hash, token_id, wallet, kind),
+        ).fetchone()
+        return tuple(match) if match else None
+
+    def _commit(
+        self,
+        rows: List[Row],
+        kind: str,
+        source: Optional[str] = None,
+        watermark: Optional[int] = None,
+        parked: List[Row] = (),
+        unparked: List[int] = (),
+    ):
+        """
+        Insert rows, fold them into the running totals and move the watermark, atomically.
+
+        Args:
+            rows: Resolved rows of one kind ("transfer" or "trade")
+            kind: Source kind of `rows` and `parked`
+            source: Input file whose watermark moves (None = no watermark)
+            watermark: New watermark for `source`
+            parked: Rows whose token isn't mapped yet
+            unparked: `unresolved` rowids that `rows` were resolved from
+        """
+        with self.conn:
+            per_market: Dict[Tuple[str, str], List] = defaultdict(lambda: [0, 0.0, 0.0, None, None])
+            inserts = []
+            for row in rows:
+                wallet, market, ts, _, _, amount, usdc, _, _ = row
+                match = self._counterpart(row, kind)
+                if match is None:
+                    inserts.append((*row, kind))
+                    counted, volume = 1, amount
+                elif kind == "trade" and usdc:
+                    # Same fill as a stored transfer leg: only its cash flow is new
+                    rowid, market = match
+                    self.conn.execute("UPDATE activity SET usdc = usdc + ? WHERE rowid = ?", (usdc, rowid))
+                    counted, volume = 0, 0.0
+                else:
+                    continue
+
+                agg = per_market[(wallet, market)]
+                agg[0] += counted
+                agg[1] += volume
+                agg[2] += usdc
+                agg[3] = ts if agg[3] is None else min(agg[3], ts)
+                agg[4] = ts if agg[4] is None else max(agg[4], ts)
+
+            per_wallet: Dict[str, List] = defaultdict(lambda: [0, 0.0, 0.0, None, None])
+            for (wallet, _), (trades, volume, pnl, first, last) in per_market.items():
+                agg = per_wallet[wallet]
+                agg[0] += trades
+                agg[1] += volume
+                agg[2] += pnl
+                agg[3] = first if agg[3] is None else min(agg[3], first)
+                agg[4] = last if agg[4] is None else max(agg[4], last)
+
+            self.conn.executemany(
+                "INSERT INTO activity VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", inserts
+            )
+            self.conn.executemany(
+                "INSERT INTO unresolved VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*row, kind) for row in parked],
+            )
+            self.conn.executemany("DELETE FROM unresolved WHERE rowid = ?", [(i,) for i in unparked])
+            self.conn.executemany(
+                """
+                INSERT INTO wallet_markets VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(wallet, market) DO UPDATE SET
+                    trades = trades + excluded.trades,
+                    volume = volume + excluded.volume,
+                    pnl = pnl + excluded.pnl,
+                    first_seen = MIN(first_seen, excluded.first_seen),
+                    last_seen = MAX(last_seen, excluded.last_seen)
+                """,
+                [(w, m, *agg) for (w, m), agg in per_market.items()],
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO wallets VALUES (?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT(wallet) DO UPDATE SET
+                    trades = trades + excluded.trades,
+                    volume = volume + excluded.volume,
+                    pnl = pnl + excluded.pnl,
+                    first_seen = MIN(first_seen, excluded.first_seen),
+                    last_seen = MAX(last_seen, excluded.last_seen)
+                """,
+                [(w, *agg) for w, agg in per_wallet.items()],
+            )
+            self.conn.executemany(
+                """
+                UPDATE wallets SET markets =
+                    (SELECT COUNT(*) FROM wallet_markets WHERE wallet_markets.wallet = wallets.wallet)
+                WHERE wallet = ?
+                """,
+                [(w,) for w in per_wallet],
+            )
+            if source is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?)",
+                    (os.path.abspath(source), watermark),
+                )
+
+    def _resolve_parked(self, token_mapping: Optional[Dict], include: Optional[MarketFilter]):
+        """Move parked rows whose token the mapping now knows into the store (or drop them)."""
+        tokens = [
+            t for (t,) in self.conn.execute("SELECT DISTINCT token_id FROM unresolved")
+            if t in (token_mapping or {})
+        ]
+        for i in range(0, len(tokens), 500):
+            chunk = tokens[i:i + 500]
+            parked = self.conn.execute(
+                f"SELECT rowid, * FROM unresolved WHERE token_id IN ({','.join('?' * len(chunk))}) "
+                "ORDER BY rowid",
+                chunk,
+            ).fetchall()
+            for kind in ("transfer", "trade"):
+                rows, unparked = [], []
+                for r in parked:
+                    if r["kind"] != kind:
+                        continue
+                    unparked.append(r["rowid"])
+                    market = _market_for(r["token_id"], None, token_mapping, include)
+                    if market:
+                        rows.append((r["wallet"], market, *tuple(r)[3:10]))
+                if unparked:
+                    self._commit(rows, kind, unparked=unparked)
+
+    def ingest_transfers(
+        self,
+        path: str,
+        token_mapping: Dict,
+        limit: Optional[int] = None,
+        include: Optional[MarketFilter] = None,
+    ) -> int:
+        """
+        Ingest ERC1155 transfers appended to a JSONL file since the last run.
+
+        Transfers whose token isn't in `token_mapping` are parked until a
+        later mapping knows it; transfers mapped to an empty slug or a
+        market `include` rejects are skipped. A trailing line without a
+        newline is left for the next run.
+
+        Args:
+            path: Transfers JSONL file
+            token_mapping: token_id -> {"slug": ...}
+            limit: Max transfers to read this run (the rest are picked up next run)
+            include: Keep only markets whose slug passes this filter
+
+        Returns:
+            Number of transfers read
+        """
+        self._resolve_parked(token_mapping, include)
+        offset = self.watermark(path)
+        size = os.path.getsize(path)
+        if size < offset:
+            print(f"  {path} is smaller than its watermark ({size} < {offset}), skipping")
+            return 0
+
+        read = 0
+        rows: List[Row] = []
+        parked: List[Row] = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n") or (limit is not None and read >= limit):
+                    break
+                offset += len(line)
+                read += 1
+                try:
+                    transfer = json.loads(line)
+                    market = _market_for(str(transfer.get("token_id", "")), None, token_mapping, include)
+                    if market is None:
+                        parked.extend(_transfer_rows(transfer, ""))
+                    elif market:
+                        rows.extend(_transfer_rows(transfer, market))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                if len(rows) + len(parked) >= self.batch_rows:
+                    self._commit(rows, "transfer", path, offset, parked)
+                    rows, parked = [], []
+
+        self._commit(rows, "transfer", path, offset, parked)
+        return read
+
+    def ingest_trades(
+        self,
+        path: str,
+        token_mapping: Optional[Dict] = None,
+        include: Optional[MarketFilter] = None,
+    ) -> int:
+        """
+        Ingest records appended to a trade export since the last run.
+
+        The file is either a JSON list or {"trades": [...]}; records need
+        wallet, side, token_id, timestamp, token_amount and usdc_amount, plus
+        a slug (or a token_mapping to resolve it; unresolved records are
+        parked like transfers).
+
+        Returns:
+            Number of trade records read
+        """
+        self._resolve_parked(token_mapping, include)
+        with open(path) as f:
+            data = json.load(f)
+        trades = data["trades"] if isinstance(data, dict) else data
+
+        done = self.watermark(path)
+        if len(trades) < done:
+            print(f"  {path} has fewer trades than its watermark ({len(trades)} < {done}), skipping")
+            return 0
+
+        rows: List[Row] = []
+        parked: List[Row] = []
+        for i in range(done, len(trades)):
+            trade = trades[i]
+            market = _market_for(str(trade.get("token_id", "")), trade.get("slug"), token_mapping, include)
+            row = _trade_row(trade, market or "") if market != "" else None
+            if row:
+                (rows if market else parked).append(row)
+            if len(rows) + len(parked) >= self.batch_rows:
+                self._commit(rows, "trade", path, i + 1, parked)
+                rows, parked = [], []
+
+        self._commit(rows, "trade", path, len(trades), parked)
+        return len(trades) - done
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def wallet(self, wallet: str) -> Optional[Dict]:
+        """All-time totals for one wallet."""
+        row = self.conn.execute("SELECT * FROM wallets WHERE wallet = ?", (wallet.lower(),)).fetchone()
+        return dict(row) if row else None
+
+    def wallet_markets(self, wallet: str) -> List[Dict]:
+        """Per-market totals for one wallet, oldest market first."""
+        rows = self.conn.execute(
+            "SELECT * FROM wallet_markets WHERE wallet = ? ORDER BY first_seen",
+            (wallet.lower(),),
+        )
+        return [dict(r) for r in rows]
+
+    def top_wallets(
+        self,
+        n: Optional[int] = 10,
+        by: str = "volume",
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        min_trades: int = 0,
+        exclude: Iterable[str] = (),
+    ) -> List[Dict]:
+        """
+        Wallets ranked by trades, volume, pnl or markets.
+
+        Without a window this reads the running totals; with `start`/`end`
+        (unix seconds, inclusive) it aggregates the activity in that range.
+
+        Args:
+            n: Number of wallets (None = all)
+            by: One of RANK_COLUMNS
+            start: Window start
+            end: Window end
+            min_trades: Drop wallets with fewer trades (in the window)
+            exclude: Wallets to leave out
+        """
+        if by not in RANK_COLUMNS:
+            raise ValueError(f"by must be one of {RANK_COLUMNS}, got {by!r}")
+
+        exclude = [w.lower() for w in exclude]
+        not_excluded = f"wallet NOT IN ({','.join('?' * len(exclude))})"
+
+        if start is None and end is None:
+            query = "SELECT * FROM wallets WHERE trades >= ?"
+            params: List = [min_trades]
+            if exclude:
+                query += f" AND {not_excluded}"
+                params += exclude
+        else:
+            query = "SELECT wallet, COUNT(*) AS trades, SUM(amount) AS volume, SUM(usdc) AS pnl, " \
+                    "COUNT(DISTINCT market) AS markets, MIN(ts) AS first_seen, MAX(ts) AS last_seen " \
+                    "FROM activity WHERE ts BETWEEN ? AND ?"
+            params = [-2**63 if start is None else start, 2**63 - 1 if end is None else end]
+            if exclude:
+                query += f" AND {not_excluded}"
+                params += exclude
+            query += " GROUP BY wallet HAVING trades >= ?"
+            params.append(min_trades)
+
+        query += f" ORDER BY {by} DESC, wallet"
+        if n is not None:
+            query += " LIMIT ?"
+            params.append(n)
+
+        return [dict(r) for r in self.conn.execute(query, params)]
+
+    def activity(
+        self,
+        wallet: str,
+        market: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Dict]:
+        """Rows for one wallet (optionally one market and time range), in time order."""
+        query = "SELECT * FROM activity WHERE wallet = ?"
+        params: List = [wallet.lower()]
+        if market is not None:
+            query += " AND market = ?"
+            params.append(market)
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(end)
+        query += " ORDER BY ts, rowid"
+        return [dict(r) for r in self.conn.execute(query, params)]
+
+    def market_activity(self, market: str, side: Optional[str] = None) -> List[Dict]:
+        """Rows for one market, in time order."""
+        query = "SELECT * FROM activity WHERE market = ?"
+        params: List = [market]
+        if side is not None:
+            query += " AND side = ?"
+            params.append(side)
+        query += " ORDER BY ts, rowid"
+        return [dict(r) for r in self.conn.execute(query, params)]
+
+    def relative_timing(
+        self,
+        reference: str,
+        threshold_s: int = 10,
+        side: str = "buy",
+    ) -> Dict[str, Dict]:
+        """
+        How other wallets' trades fall relative to a reference wallet.
+
+        For every market the reference wallet traded (on `side`), each other
+        wallet's `side` trades are compared with the reference's first trade
+        there.
+
+        Returns:
+            wallet -> {"shared_markets", "before", "after", "avg_seconds_diff"},
+            where before/after count trades more than threshold_s earlier/later
+        """
+        rows = self.conn.execute(
+            """
+            WITH first AS (
+                SELECT market, MIN(ts) AS t0 FROM activity
+                WHERE wallet = ? AND side = ? GROUP BY market
+            )
+            SELECT a.wallet AS wallet,
+                   COUNT(DISTINCT a.market) AS shared_markets,
+                   SUM(a.ts - f.t0 < -?) AS before,
+                   SUM(a.ts - f.t0 > ?) AS after,
+                   AVG(a.ts - f.t0) AS avg_seconds_diff
+            FROM first f JOIN activity a ON a.market = f.market
+            WHERE a.side = ? AND a.wallet != ?
+            GROUP BY a.wallet
+            """,
+            (reference.lower(), side, threshold_s, threshold_s, side, reference.lower()),
+        )
+        return {r["wallet"]: dict(r) for r in rows}
@@ -201,7 +201,23 @@ class PositionTracker:
         tracker.close_position(pos.id, exit_price=0.65)
     """
     
-    def __init__(self, auto_update: bool = False, update_interval: int = 30):
+    # Compact the price log into a full snapshot after this many records
+    PRICE_LOG_COMPACT_RECORDS = 10_000
+
+    def __init__(
+        self,
+        auto_update: bool = False,
+        update_interval: float = 1.0,
+        price_source: Optional[Callable[[List[str]], Dict[str, float]]] = None
+    ):
+        """
+        Args:
+            auto_update: Start the background price refresh thread
+            update_interval: Seconds between background refreshes
+            price_source: Optional callable mapping token IDs to current
+                prices (e.g. backed by a local order book cache). Tokens
+                it doesn't return are priced from Gamma in bulk.
+        """
         # Positions
         self.positions: Dict[str, Position] = {}
         self.closed_positions: List[Position] = []
@@ -209,10 +225,14 @@ class PositionTracker:
         # APIs
         self.gamma = GammaClient()
         self.data_api = DataAPIClient()
+        self._price_source = price_source
         
         # Persistence
         self.data_dir = DATA_DIR / "positions"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._state_file = self.data_dir / "tracker_state.json"
+        self._price_log_file = self.data_dir / "price_log.jsonl"
+        self._price_log_records = 0
         
         # Auto-update
         self._auto_update = auto_update
@@ -348,30 +368,72 @@ class PositionTracker:
     
     def update_prices(self):
         """Update prices for all open positions."""
-        for position in self.positions.values():
+        self.refresh_prices()
+
+    def refresh_prices(self) -> int:
+        """
+        Refresh prices for all open positions in one pass.
+
+        Positions are grouped by market so each market is priced once.
+        Prices come from the shared price source first (e.g. a local
+        book cache fed by the CLOB WebSocket), and whatever it can't
+        answer is fetched from Gamma in bulk. Only positions whose price
+        actually moved are written, as records appended to the price log.
+
+        Returns:
+            Number of positions whose price changed
+        """
+        by_market: Dict[str, List[Position]] = {}
+        for position in list(self.positions.values()):
+            by_market.setdefault(position.market_id, []).append(position)
+
+        if not by_market:
+            return 0
+
+        prices: Dict[str, float] = {}
+        if self._price_source:
+            token_ids = [p.token_id for group in by_market.values() for p in group]
             try:
-                market = self.gamma.get_market(position.market_id)
-                if market:
-                    tokens = market.get("tokens", [])
-                    for t in tokens:
-                        if t.get("token_id") == position.token_id:
-                            new_price = float(t.get("price", position.current_price))
-                            old_pnl = position.unrealized_pnl
-                            position.update_price(new_price)
-                            
-                            # Trigger callbacks if P&L changed significantly
-                            if abs(position.unrealized_pnl - old_pnl) > 0.01:
-                                for callback in self._on_pnl_change:
-                                    try:
-                                        callback(position)
-                                    except Exception:
-                                        pass
-                            break
+                prices.update(self._price_source(token_ids) or {})
             except Exception:
                 pass
-        
-        self._save_state()
-    
+
+        missing = [
+            market_id for market_id, group in by_market.items()
+            if any(p.token_id not in prices for p in group)
+        ]
+        if missing:
+            try:
+                for market in self.gamma.get_markets(missing):
+                    for token_id, price in _token_prices(market).items():
+                        prices.setdefault(token_id, price)
+            except Exception:
+                pass
+
+        changed: List[Position] = []
+        for group in by_market.values():
+            for position in group:
+                new_price = prices.get(position.token_id)
+                if new_price is None or new_price == position.current_price:
+                    continue
+
+                old_pnl = position.unrealized_pnl
+                position.update_price(new_price)
+                changed.append(position)
+
+                # Trigger callbacks if P&L changed significantly
+                if abs(position.unrealized_pnl - old_pnl) > 0.01:
+                    for callback in self._on_pnl_change:
+                        try:
+                            callback(position)
+                        except Exception:
+                            pass
+
+        if changed:
+            self._append_price_log(changed)
+
+        return len(changed)
+
     def check_aged_positions(self, max_age_seconds: int = 3600) -> List[Position]:
         """
         Check for positions that have exceeded max age.
@@ -482,8 +544,44 @@ class PositionTracker:
         print(f"Unrealized P&L: ${summary['unrealized_pnl']:.2f}")
         print(f"{'='*60}")
     
+    def _append_price_log(self, positions: List[Position]):
+        """Append price updates to the log instead of rewriting the snapshot."""
+        lines = "".join(
+            json.dumps({
+                "id": p.id,
+                "price": p.current_price,
+                "ts": p.updated_at,
+            }) + "\n"
+            for p in positions
+        )
+        with open(self._price_log_file, 'a') as f:
+            f.write(lines)
+
+        self._price_log_records += len(positions)
+        if self._price_log_records >= self.PRICE_LOG_COMPACT_RECORDS:
+            self._save_state()
+
+    def _replay_price_log(self):
+        """Apply logged price updates on top of the loaded snapshot."""
+        if not self._price_log_file.exists():
+            return
+
+        with open(self._price_log_file, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from a crash mid-append
+                self._price_log_records += 1
+
+                position = self.positions.get(record.get("id"))
+                if position is None:
+                    continue
+                position.update_price(record["price"])
+                position.updated_at = record.get("ts", position.updated_at)
+
     def _save_state(self):
-        """Save state to disk."""
+        """Save a full snapshot to disk and truncate the price log."""
         state = {
             "positions": {pid: p.to_dict() for pid, p in self.positions.items()},
             "closed": [p.to_dict() for p in self.closed_positions[-100:]],  # Last 100
@@ -491,13 +589,18 @@ class PositionTracker:
             "saved_at": int(time.time())
         }
         
-        filepath = self.data_dir / "tracker_state.json"
-        with open(filepath, 'w') as f:
+        tmp_path = self._state_file.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(state, f, indent=2)
+        tmp_path.replace(self._state_file)
+
+        # Snapshot now contains every logged price
+        open(self._price_log_file, 'w').close()
+        self._price_log_records = 0
     
     def _load_state(self):
         """Load state from disk."""
-        filepath = self.data_dir / "tracker_state.json"
+        filepath = self._state_file
         
         if not filepath.exists():
             return
@@ -516,6 +619,8 @@ class PositionTracker:
             for pdata in state.get("closed", []):
                 self.closed_positions.append(Position.from_dict(pdata))
             
+            self._replay_price_log()
+            
             if self.positions:
                 print(f"   ✓ Loaded {len(self.positions)} open position(s)")
                 
@@ -523,6 +628,32 @@ class PositionTracker:
             print(f"   Warning: Could not load positions: {e}")
 
 
+def _token_prices(market: Dict) -> Dict[str, float]:
+    """
+    Extract token_id -> price from a Gamma market object.
+
+    Handles both the `tokens` list shape and the `clobTokenIds` /
+    `outcomePrices` shape (which Gamma returns as JSON-encoded strings).
+    """
+    prices = {}
+
+    for t in market.get("tokens") or []:
+        token_id = t.get("token_id")
+        if token_id and t.get("price") is not None:
+            prices[token_id] = float(t["price"])
+
+    token_ids = market.get("clobTokenIds") or []
+    outcome_prices = market.get("outcomePrices") or []
+    if isinstance(token_ids, str):
+        token_ids = json.loads(token_ids)
+    if isinstance(outcome_prices, str):
+        outcome_prices = json.loads(outcome_prices)
+    for token_id, price in zip(token_ids, outcome_prices):
+        prices.setdefault(token_id, float(price))
+
+    return prices
+
+
 # Global instance
 _tracker: Optional[PositionTracker] = None
 
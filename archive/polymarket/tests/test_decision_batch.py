@@ -0,0 +1,122 @@
+"""
+Tests for DecisionEngine.analyze_batch.
+
+Every element of a batch must produce the same TradeSignal as
+DecisionEngine.analyze on that market's state.
+"""
+import os
+import time
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arbitrage.decision_engine import (
+    DecisionEngine,
+    MarketState,
+    MarketStateBatch,
+    SignalStatus,
+    TradeAction,
+)
+
+
+def _states(n, seed=5):
+    rng = np.random.default_rng(seed)
+    states = []
+    for i in range(n):
+        strike = float(rng.choice([95000.0, 3500.0]))
+        current = strike * (1 + float(rng.normal(0, 0.008)))
+        yes = float(rng.choice([0.0, round(float(rng.uniform(0.01, 0.99)), 3)], p=[0.02, 0.98]))
+        up_down = bool(rng.random() < 0.4)
+        states.append(MarketState(
+            asset="BTC" if strike > 10000 else "ETH",
+            strike_price=strike,
+            current_price=current,
+            is_above_strike_question=bool(rng.random() < 0.7),
+            yes_token_id=f"yes-{i}",
+            no_token_id=f"no-{i}",
+            yes_price=yes,
+            no_price=round(1 - yes, 3),
+            seconds_until_close=float(rng.uniform(0, 150)),
+            liquidity=float(rng.uniform(0, 3000)),
+            is_up_or_down_market=up_down,
+            previous_price=float(rng.choice([0.0, strike], p=[0.1, 0.9])) if up_down else 0.0,
+        ))
+    return states
+
+
+class TestAnalyzeBatch:
+    """Tests for vectorized signal evaluation."""
+
+    def test_matches_analyze(self):
+        engine = DecisionEngine(min_confidence=0.55)
+        states = _states(3000)
+
+        batch = engine.analyze_batch(MarketStateBatch.from_states(states))
+        signals = batch.to_signals()
+
+        for state, signal in zip(states, signals):
+            assert signal == engine.analyze(state)
+
+        # Every path through analyze() is exercised
+        assert set(batch.status.tolist()) == {
+            SignalStatus.TRADE,
+            SignalStatus.OUTSIDE_WINDOW,
+            SignalStatus.NO_PREDICTION,
+            SignalStatus.LOW_EDGE,
+            SignalStatus.LOW_CONFIDENCE,
+            SignalStatus.LOW_REWARD_RISK,
+        }
+        assert {s.action for s in signals} == set(TradeAction)
+
+    def test_trade_mask_and_columns(self):
+        engine = DecisionEngine()
+        states = _states(500, seed=9)
+
+        batch = engine.analyze_batch(MarketStateBatch.from_states(states))
+
+        for i in np.flatnonzero(batch.trade_mask):
+            signal = engine.analyze(states[i])
+            assert signal.should_trade
+            assert batch.size[i] == signal.size
+            assert batch.risk_amount[i] == signal.risk_amount
+        assert (batch.size[~batch.trade_mask] == 0).all()
+
+    def test_columns_without_optional_fields(self):
+        engine = DecisionEngine()
+        batch = MarketStateBatch(
+            strike_price=[95000.0, 95000.0],
+            current_price=[96000.0, 95010.0],
+            yes_price=[0.25, 0.5],
+            no_price=[0.75, 0.5],
+            seconds_until_close=[12.0, 12.0],
+            liquidity=[1500.0, 1500.0],
+        )
+
+        signals = engine.analyze_batch(batch).to_signals()
+
+        assert signals[0].action == TradeAction.BUY_YES
+        assert signals[1].reason == "Cannot predict outcome (price too close to strike)"
+
+    def test_replays_a_million_states(self):
+        engine = DecisionEngine()
+        rng = np.random.default_rng(1)
+        n = 1_000_000
+        strike = np.full(n, 95000.0)
+        yes = rng.uniform(0.01, 0.99, n)
+        batch = MarketStateBatch(
+            strike_price=strike,
+            current_price=strike * (1 + rng.normal(0, 0.008, n)),
+            yes_price=yes,
+            no_price=1 - yes,
+            seconds_until_close=rng.uniform(0, 150, n),
+            liquidity=rng.uniform(0, 3000, n),
+        )
+
+        started = time.perf_counter()
+        result = engine.analyze_batch(batch)
+        elapsed = time.perf_counter() - started
+
+        assert len(result) == n
+        assert result.trade_mask.any()
+        assert elapsed < 10.0
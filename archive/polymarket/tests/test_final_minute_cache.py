@@ -0,0 +1,214 @@
+"""
+Tests for the columnar final-minute capture cache.
+
+Fixtures are tracker-style window JSON files (Binance ticks and order book
+snapshots, some with missing fields) written to a temp directory.
+"""
+import os
+import json
+import statistics
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage.final_minute_cache import (
+    OUTCOMES,
+    FinalMinuteCache,
+    book_imbalance,
+    group_mean,
+    group_std,
+)
+
+
+END = 1_767_648_600
+
+
+def _capture(w, rng):
+    end = END + w * 900
+    asset = "BTC" if w % 3 else "ETH"
+    prices = [
+        {"timestamp": end - 60 + float(rng.uniform(0, 60)), "source": "binance",
+         "asset": asset, "price": 90000 + float(rng.normal(0, 50)), "extra": {}}
+        for _ in range(int(rng.integers(0, 40)))
+    ]
+    books = []
+    for k in range(int(rng.integers(0, 30))):
+        bid = None if rng.random() < 0.2 else round(float(rng.uniform(0.1, 0.8)), 2)
+        ask = None if rng.random() < 0.2 else round(float(rng.uniform(0.2, 0.95)), 2)
+        books.append({
+            "timestamp": end - 60 + k * 2.0,
+            "asset": asset,
+            "token_id": "tok",
+            "outcome": "up" if rng.random() < 0.6 else "down",
+            "best_bid": bid,
+            "best_ask": ask,
+            "bid_depth": None if rng.random() < 0.1 else float(rng.uniform(0, 500)),
+            "ask_depth": 0.0 if rng.random() < 0.1 else float(rng.uniform(0, 500)),
+            "spread": (ask - bid) if (bid and ask) else None,
+            "mid_price": None,
+        })
+    return {
+        "asset": asset,
+        "slug": f"{asset.lower()}-updown-15m-{end - 900}",
+        "window_start": end - 900,
+        "window_end": end,
+        "token_up": "a",
+        "token_down": "b",
+        "start_price": 90000 + float(rng.normal(0, 50)),
+        "end_price": None if w == 5 else 90000 + float(rng.normal(0, 50)),
+        "implied_up_prob": None,
+        "binance_prices": prices,
+        "orderbook_snapshots": books,
+    }
+
+
+def _write_captures(directory, start, stop, seed=2):
+    rng = np.random.default_rng(seed + start)
+    captures = {}
+    for w in range(start, stop):
+        name = f"capture_{w:03d}.json"
+        captures[name] = _capture(w, rng)
+        with open(directory / name, "w") as f:
+            json.dump(captures[name], f)
+    return captures
+
+
+@pytest.fixture
+def captures(tmp_path):
+    directory = tmp_path / "final_minute"
+    directory.mkdir()
+    return directory, _write_captures(directory, 0, 20)
+
+
+class TestIngest:
+    """Tests for compiling captures into tables."""
+
+    def test_tables_match_captures(self, captures, tmp_path):
+        directory, data = captures
+        cache = FinalMinuteCache(str(tmp_path / "cache"))
+
+        assert cache.ingest(str(directory)) == 20
+        assert len(cache) == 20
+        assert cache.files == sorted(data)
+
+        windows, ticks, books = cache.windows, cache.ticks, cache.books
+        for i, name in enumerate(cache.files):
+            capture = data[name]
+            row = windows[i]
+            assert cache.assets[row["asset"]] == capture["asset"]
+            assert cache.slugs[i] == capture["slug"]
+            assert row["window_end"] == capture["window_end"]
+
+            window_ticks = ticks[row["tick_start"]:row["tick_end"]]
+            expected = sorted(capture["binance_prices"], key=lambda p: p["timestamp"])
+            assert (window_ticks["window"] == i).all()
+            assert window_ticks["price"].tolist() == [p["price"] for p in expected]
+
+            window_books = books[row["book_start"]:row["book_end"]]
+            assert len(window_books) == len(capture["orderbook_snapshots"])
+            for got, ob in zip(window_books, capture["orderbook_snapshots"]):
+                assert OUTCOMES[got["outcome"]] == ob["outcome"]
+                assert (np.isnan(got["best_bid"]) if ob["best_bid"] is None else got["best_bid"] == ob["best_bid"])
+
+        assert np.isnan(windows[5]["end_price"])
+
+    def test_only_new_files_are_parsed(self, captures, tmp_path):
+        directory, _ = captures
+        cache = FinalMinuteCache(str(tmp_path / "cache"))
+        cache.ingest(str(directory))
+        before = np.array(cache.books)
+
+        assert FinalMinuteCache(str(tmp_path / "cache")).ingest(str(directory)) == 0
+
+        _write_captures(directory, 20, 25)
+        (directory / "capture_999.json").write_text("{truncated")
+        reopened = FinalMinuteCache(str(tmp_path / "cache"))
+        assert reopened.ingest(str(directory)) == 5
+        assert len(reopened) == 25
+        assert reopened.books[:len(before)].tobytes() == before.tobytes()
+        assert reopened.windows["book_end"][-1] == len(reopened.books)
+        assert "capture_999.json" not in reopened.files
+
+    def test_uncommitted_rows_are_ignored(self, captures, tmp_path):
+        directory, _ = captures
+        cache = FinalMinuteCache(str(tmp_path / "cache"))
+        cache.ingest(str(directory))
+
+        # Simulate a run that wrote a table but died before the manifest
+        ticks = np.load(tmp_path / "cache" / "ticks.npy")
+        np.save(tmp_path / "cache" / "ticks.npy", np.concatenate([ticks, ticks[:3]]))
+
+        reopened = FinalMinuteCache(str(tmp_path / "cache"))
+        assert len(reopened.ticks) == len(ticks)
+
+
+    def test_ingests_append_chunks_then_compact(self, captures, tmp_path):
+        directory, _ = captures
+        root = tmp_path / "cache"
+        cache = FinalMinuteCache(str(root), compact_every=3)
+        cache.ingest(str(directory))
+        base = (root / "books.npy").read_bytes()
+
+        # Each later ingest appends a chunk; the base tables are untouched
+        for start in (20, 23):
+            _write_captures(directory, start, start + 3)
+            assert FinalMinuteCache(str(root), compact_every=3).ingest(str(directory)) == 3
+        assert (root / "books.npy").read_bytes() == base
+        assert len(list(root.glob("books.*.npy"))) == 2
+
+        # Chunks from a run that died before the manifest are ignored
+        np.save(root / "books.000002.npy", np.array(cache.books[:4]))
+        reopened = FinalMinuteCache(str(root), compact_every=3)
+        assert len(reopened) == 26
+        assert reopened.windows["book_end"][-1] == len(reopened.books)
+        expected = {name: np.array(getattr(reopened, name)) for name in ("windows", "ticks", "books")}
+
+        # The third chunk triggers a compaction back into the base tables
+        _write_captures(directory, 26, 28)
+        assert reopened.ingest(str(directory)) == 2
+        assert not list(root.glob("*.0*.npy"))
+        compacted = FinalMinuteCache(str(root))
+        assert len(compacted) == 28
+        for name, table in expected.items():
+            assert getattr(compacted, name)[:len(table)].tobytes() == table.tobytes()
+        assert compacted.windows["tick_end"][-1] == len(compacted.ticks)
+
+
+class TestGroupedStats:
+    """Tests for the vectorized per-window reductions."""
+
+    def test_imbalance_stats_match_loops(self, captures, tmp_path):
+        directory, data = captures
+        cache = FinalMinuteCache(str(tmp_path / "cache"))
+        cache.ingest(str(directory))
+        books = cache.books
+        up = books["outcome"] == OUTCOMES.index("up")
+
+        imbalance = book_imbalance(books)
+        mean, count = group_mean(imbalance, books["window"], len(cache), up)
+        std = group_std(imbalance, books["window"], len(cache), up)
+
+        for i, name in enumerate(cache.files):
+            values = []
+            for ob in data[name]["orderbook_snapshots"]:
+                bid, ask = ob["bid_depth"] or 0, ob["ask_depth"] or 0
+                if ob["outcome"] == "up" and bid + ask > 0:
+                    values.append((bid - ask) / (bid + ask))
+            assert count[i] == len(values)
+            if values:
+                assert mean[i] == pytest.approx(statistics.mean(values))
+                expected_std = statistics.stdev(values) if len(values) > 1 else 0
+                assert std[i] == pytest.approx(expected_std)
+            else:
+                assert np.isnan(mean[i]) and np.isnan(std[i])
+
+    def test_asset_mask(self, captures, tmp_path):
+        directory, data = captures
+        cache = FinalMinuteCache(str(tmp_path / "cache"))
+        cache.ingest(str(directory))
+
+        btc = cache.asset_mask("BTC")
+        assert btc.sum() == sum(1 for d in data.values() if d["asset"] == "BTC")
+        assert not cache.asset_mask("SOL").any()
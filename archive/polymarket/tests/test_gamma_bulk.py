@@ -0,0 +1,191 @@
+"""
+Tests for the bulk Gamma token fetcher and token-bucket limiter.
+
+Runs against a local fake Gamma server that serves `/markets` with
+repeated `clob_token_ids` parameters and can inject 429 responses.
+"""
+import os
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.rate_limiter import TokenBucket
+from src.api.gamma_bulk import GammaTokenFetcher, TokenMarketCache
+
+
+# 50 markets, two tokens each: tokens "1000".."1049" (yes) and "2000".."2049" (no)
+MARKETS = {
+    str(1000 + i): {
+        "conditionId": f"0xcond{i}",
+        "question": f"Market {i}",
+        "clobTokenIds": json.dumps([str(1000 + i), str(2000 + i)]),
+    }
+    for i in range(50)
+}
+TOKEN_TO_MARKET = {}
+for _m in MARKETS.values():
+    for _t in json.loads(_m["clobTokenIds"]):
+        TOKEN_TO_MARKET[_t] = _m
+
+
+class FakeGammaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            throttle = server.throttle_remaining > 0
+            if throttle:
+                server.throttle_remaining -= 1
+
+        if throttle:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.05")
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        seen = set()
+        body = []
+        for token_id in query.get("clob_token_ids", []):
+            market = TOKEN_TO_MARKET.get(token_id)
+            if market and market["conditionId"] not in seen:
+                seen.add(market["conditionId"])
+                body.append(market)
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_gamma():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGammaHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.throttle_remaining = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestTokenBucket:
+    """Tests for the rate limiter."""
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        # 5 burst tokens free, 10 more at 100/s
+        assert 0.07 <= elapsed < 0.5
+
+    def test_backoff_halves_rate_and_recovers(self):
+        bucket = TokenBucket(rate=40, recovery_step=10)
+        bucket.backoff(retry_after=0)
+        assert bucket.rate == 20
+        assert bucket.backoffs == 1
+        bucket.recover()
+        bucket.recover()
+        bucket.recover()
+        assert bucket.rate == 40
+
+    def test_rate_floor(self):
+        bucket = TokenBucket(rate=16, min_rate=4)
+        for _ in range(10):
+            bucket.backoff(retry_after=0)
+        assert bucket.rate == 4
+
+    def test_try_acquire(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        assert bucket.try_acquire() is True
+        assert bucket.try_acquire() is False
+
+
+class TestGammaTokenFetcher:
+    """Tests for batched concurrent fetching."""
+
+    def test_packs_many_tokens_per_request(self, fake_gamma):
+        fetcher = GammaTokenFetcher(
+            base_url=_url(fake_gamma), batch_size=20, concurrency=4, rate=1000
+        )
+        tokens = list(TOKEN_TO_MARKET)  # 100 tokens
+
+        results = fetcher.fetch(tokens, progress_every=0)
+
+        assert len(results) == 100
+        assert results["1007"]["conditionId"] == "0xcond7"
+        assert results["2007"]["conditionId"] == "0xcond7"
+        assert len(fake_gamma.requests) == 5
+
+    def test_misses_are_cached(self, fake_gamma, tmp_path):
+        cache_file = tmp_path / "cache.jsonl"
+        fetcher = GammaTokenFetcher(
+            base_url=_url(fake_gamma), rate=1000, cache_path=str(cache_file)
+        )
+
+        results = fetcher.fetch(["1000", "999999"], progress_every=0)
+
+        assert list(results) == ["1000"]
+        assert "999999" in fetcher.cache
+        assert fetcher.cache.get("999999") is None
+
+    def test_resumes_from_append_only_cache(self, fake_gamma, tmp_path):
+        cache_file = tmp_path / "cache.jsonl"
+        first = GammaTokenFetcher(
+            base_url=_url(fake_gamma), batch_size=10, rate=1000, cache_path=str(cache_file)
+        )
+        first.fetch(list(TOKEN_TO_MARKET)[:30], progress_every=0)
+        requests_after_first = len(fake_gamma.requests)
+
+        second = GammaTokenFetcher(
+            base_url=_url(fake_gamma), batch_size=10, rate=1000, cache_path=str(cache_file)
+        )
+        results = second.fetch(list(TOKEN_TO_MARKET)[:40], progress_every=0)
+
+        assert len(results) == 40
+        assert len(fake_gamma.requests) - requests_after_first == 1
+
+    def test_backs_off_on_429(self, fake_gamma):
+        fake_gamma.throttle_remaining = 3
+        fetcher = GammaTokenFetcher(
+            base_url=_url(fake_gamma), batch_size=50, concurrency=2, rate=100
+        )
+
+        results = fetcher.fetch(list(TOKEN_TO_MARKET), progress_every=0)
+
+        assert len(results) == 100
+        assert fetcher.stats["rate_limited"] == 3
+        assert fetcher.limiter.backoffs == 3
+        assert fetcher.limiter.rate < 100
+
+
+class TestTokenMarketCache:
+    """Tests for the append-only cache."""
+
+    def test_skips_torn_line(self, tmp_path):
+        path = tmp_path / "cache.jsonl"
+        path.write_text('{"token_id": "1", "market": {"q": 1}}\n{"token_id": "2", "mar')
+
+        cache = TokenMarketCache(str(path))
+
+        assert len(cache) == 1
+        assert cache.get("1") == {"q": 1}
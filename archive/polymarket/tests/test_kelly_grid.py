@@ -0,0 +1,149 @@
+"""
+Tests for the vectorized Kelly grid simulator.
+
+Results are checked against a scalar replay of
+large_dataset_backtester.run_backtest's bankroll loop.
+"""
+import os
+import time
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.risk.kelly_grid import (
+    TRADE_DTYPE,
+    SimulationGrid,
+    load_trade_columns,
+    save_trade_columns,
+    simulate_grid,
+)
+
+
+def _trades(n, win_rate=0.84, seed=7):
+    rng = np.random.default_rng(seed)
+    arr = np.empty(n, dtype=TRADE_DTYPE)
+    arr["timestamp"] = 1_700_000_000 + np.arange(n) * 900
+    arr["price"] = rng.uniform(0.05, 0.95, n).round(3)
+    arr["won"] = rng.random(n) < win_rate
+    arr["asset"] = rng.integers(0, 2, n)
+    return arr
+
+
+def _reference(trades, sizing, fraction, band, max_fee, win_rate, capital=300.0, cap=0.20):
+    """Scalar port of run_backtest's loop for one configuration."""
+    initial = capital
+    peak, max_dd = capital, 0.0
+    wins = losses = 0
+    profit_sum = loss_sum = 0.0
+    returns = []
+
+    for price, won in zip(trades["price"], trades["won"]):
+        if capital < 10:
+            break
+        if not band[0] <= price <= band[1]:
+            continue
+        fee = max(0.0, max_fee * (1 - (abs(price - 0.5) / 0.5) ** 2))
+        if sizing == "kelly":
+            odds = (1.0 - fee - price) / price
+            k = 0.0 if odds <= 0 else max(0.0, min((win_rate * odds - (1 - win_rate)) / odds, 0.5))
+            pct = k * fraction
+        else:
+            pct = fraction
+        position = capital * min(pct, cap)
+        if position < 1:
+            continue
+        if won:
+            profit = position / price * (1.0 - fee) - position
+            capital += profit
+            wins += 1
+            profit_sum += profit
+            returns.append(profit / (capital - profit))
+        else:
+            capital -= position
+            losses += 1
+            loss_sum += position
+            returns.append(-position / (capital + position))
+        peak = max(peak, capital)
+        max_dd = max(max_dd, (peak - capital) / peak)
+
+    r = np.array(returns)
+    sharpe = r.mean() / r.std() * np.sqrt(252 * 100) if len(r) > 1 and r.std() > 0 else 0
+    return {
+        "final_capital": capital,
+        "wins": wins,
+        "losses": losses,
+        "max_drawdown_pct": max_dd * 100,
+        "sharpe_ratio": sharpe,
+        "profit_factor": profit_sum / loss_sum if loss_sum > 0 else float("inf"),
+    }
+
+
+GRID = SimulationGrid(
+    kelly_fractions=[0.01, 0.25, 1.0],
+    fixed_fractions=[0.02, 0.2],
+    price_bands=[(0.0, 1.0), (0.3, 0.7)],
+    max_fees=[0.0, 0.03],
+)
+
+
+class TestSimulateGrid:
+    """Tests for equivalence with the scalar backtest loop."""
+
+    @pytest.mark.parametrize("win_rate", [0.84, 0.45])
+    def test_matches_scalar_backtest(self, win_rate):
+        trades = _trades(3000, win_rate=win_rate)
+
+        results = simulate_grid(trades, GRID, expected_win_rate=0.84, chunk_size=256)
+
+        assert len(results) == len(GRID.configs()) == 20
+        for res in results:
+            ref = _reference(trades, res.sizing, res.fraction, res.price_band, res.max_fee, 0.84)
+            assert res.wins == ref["wins"], res.label
+            assert res.losses == ref["losses"], res.label
+            assert res.final_capital == pytest.approx(ref["final_capital"], rel=1e-9), res.label
+            assert res.max_drawdown_pct == pytest.approx(ref["max_drawdown_pct"], rel=1e-9, abs=1e-9)
+            assert res.sharpe_ratio == pytest.approx(ref["sharpe_ratio"], rel=1e-6, abs=1e-9)
+            assert res.profit_factor == pytest.approx(ref["profit_factor"], rel=1e-9)
+
+    def test_losing_config_stops(self):
+        trades = _trades(2000, win_rate=0.2)
+        grid = SimulationGrid(kelly_fractions=[], fixed_fractions=[0.2])
+
+        (res,) = simulate_grid(trades, grid, expected_win_rate=0.84)
+
+        assert res.stopped
+        assert res.final_capital < 10
+
+    def test_large_grid_throughput(self):
+        trades = _trades(100_000)
+        grid = SimulationGrid(
+            kelly_fractions=[0.1, 0.25, 0.5, 1.0],
+            fixed_fractions=[0.01, 0.05],
+            price_bands=[(0.0, 1.0), (0.2, 0.8), (0.4, 0.6)],
+            max_fees=[0.0, 0.015, 0.03],
+        )
+
+        start = time.perf_counter()
+        results = simulate_grid(trades, grid, expected_win_rate=0.84)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 54
+        # 54 configs x 100k trades in one pass
+        assert elapsed < 10.0
+
+
+class TestTradeColumns:
+    """Tests for the columnar trade cache."""
+
+    def test_round_trip_is_memory_mapped_and_sorted(self, tmp_path):
+        path = tmp_path / "trades.npy"
+        save_trade_columns(str(path), [30, 10, 20], [0.5, 0.6, 0.7], [True, False, True], ["ETH", "BTC", "BTC"])
+
+        arr = load_trade_columns(str(path))
+
+        assert isinstance(arr, np.memmap)
+        assert list(arr["timestamp"]) == [10, 20, 30]
+        assert list(arr["asset"]) == [0, 0, 1]
+        assert list(arr["won"]) == [False, True, True]
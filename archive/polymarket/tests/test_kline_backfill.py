@@ -0,0 +1,189 @@
+"""
+Tests for the concurrent kline backfill and the memory-mapped kline cache.
+
+Runs against a local fake Binance server that replays a fixed set of
+recorded klines for `/api/v3/klines` and can inject 429 responses.
+"""
+import os
+import json
+import threading
+import numpy as np
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feeds.kline_backfill import KlineBackfiller
+from src.storage.kline_cache import DAY_MS, KlineCache, klines_to_array
+
+
+DAY0 = 1_764_547_200_000  # 2025-12-01 00:00 UTC
+DAYS = 3
+MINUTE = 60_000
+END = DAY0 + DAYS * DAY_MS - 1
+NOW = END + 2
+
+
+def _recorded(symbol, base):
+    rows = []
+    for i in range(DAYS * 1440):
+        t = DAY0 + i * MINUTE
+        price = base + i * 0.5
+        rows.append([t, str(price), str(price + 1), str(price - 1), str(price + 0.25),
+                     "1.5", t + MINUTE - 1, "100.0", 7, "0.7", "50.0", "0"])
+    return rows
+
+
+RECORDED = {"BTCUSDT": _recorded("BTCUSDT", 90000.0), "ETHUSDT": _recorded("ETHUSDT", 3000.0)}
+
+
+class FakeBinanceHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            throttle = server.throttle_remaining > 0
+            if throttle:
+                server.throttle_remaining -= 1
+
+        if throttle:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.01")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        lo, hi, limit = int(q["startTime"]), int(q["endTime"]), int(q["limit"])
+        rows = [k for k in RECORDED[q["symbol"]] if lo <= k[0] <= hi][:limit]
+
+        payload = json.dumps(rows).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-MBX-USED-WEIGHT-1M", str(server.requests * 2))
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_binance():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBinanceHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.throttle_remaining = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _backfiller(server, cache, **kwargs):
+    kwargs.setdefault("weight_per_minute", 600000)
+    return KlineBackfiller(cache, base_url=f"http://127.0.0.1:{server.server_address[1]}", **kwargs)
+
+
+class TestKlineBackfiller:
+    """Tests for concurrent, gap-only backfill."""
+
+    def test_backfills_all_days(self, fake_binance, tmp_path):
+        cache = KlineCache(str(tmp_path))
+        backfiller = _backfiller(fake_binance, cache, concurrency=4)
+
+        summary = backfiller.backfill(["BTCUSDT", "ETHUSDT"], DAY0, END, now_ms=NOW)
+
+        assert summary["fetched"] == 6
+        assert summary["failed"] == []
+        assert summary["klines"] == 2 * DAYS * 1440
+        # 1440 klines/day = two pages of 1000
+        assert fake_binance.requests == 12
+        # Every request drew its weight from the bucket
+        assert backfiller.limiter.total_acquired == 12 * backfiller.request_weight
+        assert backfiller.stats["used_weight"] > 0
+
+        closes = cache.load("BTCUSDT", "1m", DAY0, NOW)["close"]
+        expected = [float(k[4]) for k in RECORDED["BTCUSDT"]]
+        assert np.array_equal(closes, expected)
+
+    def test_rerun_fills_only_gaps(self, fake_binance, tmp_path):
+        cache = KlineCache(str(tmp_path))
+        _backfiller(fake_binance, cache).backfill(["BTCUSDT"], DAY0, END, now_ms=NOW)
+        cache.day_path("BTCUSDT", "1m", DAY0 + DAY_MS).unlink()
+        requests_before = fake_binance.requests
+
+        summary = _backfiller(fake_binance, cache).backfill(["BTCUSDT"], DAY0, END, now_ms=NOW)
+
+        assert summary["cached"] == 2
+        assert summary["fetched"] == 1
+        assert fake_binance.requests - requests_before == 2
+        assert cache.missing_days("BTCUSDT", "1m", DAY0, END) == []
+
+    def test_open_day_not_cached(self, fake_binance, tmp_path):
+        cache = KlineCache(str(tmp_path))
+
+        summary = _backfiller(fake_binance, cache).backfill(
+            ["BTCUSDT"], DAY0, DAY0 + DAY_MS + 5, now_ms=DAY0 + DAY_MS + 10 * MINUTE
+        )
+
+        assert summary["fetched"] == 1
+        assert summary["skipped_open"] == 1
+        assert not cache.has_day("BTCUSDT", "1m", DAY0 + DAY_MS)
+
+    def test_backs_off_on_429(self, fake_binance, tmp_path):
+        fake_binance.throttle_remaining = 2
+        cache = KlineCache(str(tmp_path))
+        backfiller = _backfiller(fake_binance, cache, concurrency=2)
+
+        summary = backfiller.backfill(["ETHUSDT"], DAY0, DAY0 + DAY_MS - 1, now_ms=NOW)
+
+        assert summary["failed"] == []
+        assert backfiller.stats["rate_limited"] == 2
+        assert backfiller.limiter.backoffs == 2
+        assert len(cache.load("ETHUSDT", "1m", DAY0, DAY0 + DAY_MS - 1)) == 1440
+
+
+class TestKlineCache:
+    """Tests for the per-day memory-mapped store."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = KlineCache(str(tmp_path))
+        for d in range(DAYS):
+            rows = RECORDED["BTCUSDT"][d * 1440:(d + 1) * 1440]
+            cache.write_day("BTCUSDT", "1m", DAY0 + d * DAY_MS, klines_to_array(rows))
+        return cache
+
+    def test_single_day_load_is_memory_mapped(self, cache):
+        arr = cache.load("BTCUSDT", "1m", DAY0 + 10 * MINUTE, DAY0 + 19 * MINUTE)
+
+        assert isinstance(arr, np.memmap)
+        assert len(arr) == 10
+        assert arr["open_time"][0] == DAY0 + 10 * MINUTE
+
+    def test_range_spanning_days(self, cache):
+        start = DAY0 + DAY_MS - 5 * MINUTE
+        arr = cache.load("BTCUSDT", "1m", start, start + 9 * MINUTE)
+
+        assert list(arr["open_time"]) == [start + i * MINUTE for i in range(10)]
+
+    def test_missing_days(self, cache):
+        cache.day_path("BTCUSDT", "1m", DAY0 + DAY_MS).unlink()
+
+        assert cache.missing_days("BTCUSDT", "1m", DAY0, DAY0 + 3 * DAY_MS) == [
+            DAY0 + DAY_MS, DAY0 + 3 * DAY_MS
+        ]
+        assert len(cache.load("ETHUSDT", "1m", DAY0, DAY0 + DAY_MS)) == 0
+
+    def test_to_dataframe_matches_csv_columns(self, cache):
+        pytest.importorskip("pandas")
+        df = cache.to_dataframe(["BTCUSDT"], "1m", DAY0, DAY0 + DAY_MS - 1)
+
+        assert len(df) == 1440
+        assert {"symbol", "open_time", "close", "timestamp"} <= set(df.columns)
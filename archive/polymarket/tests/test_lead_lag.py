@@ -0,0 +1,161 @@
+"""
+Tests for the FFT lead-lag engine.
+
+Fixtures are synthetic tick streams: one latent random walk observed by
+several "exchanges" with fixed delays and random (Poisson) tick times, so
+the true lead of each pair is known.
+"""
+import os
+import time
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feeds.lead_lag import (
+    LeadLagEngine,
+    OnlineLeadLag,
+    cross_correlation,
+    first_significant_move,
+    lag_distribution,
+)
+
+
+HOUR_MS = 3_600_000
+DELAYS = {"binance": 0, "coinbase": 300, "kraken": 700}
+
+
+def _streams(duration_ms, seed=0, delays=DELAYS, mean_gap_ms=120):
+    rng = np.random.default_rng(seed)
+    t = np.arange(0, duration_ms, 10)
+    walk = 90_000 * np.exp(np.cumsum(rng.normal(0, 2e-5, len(t))))
+    streams = {}
+    for name, delay in delays.items():
+        ts = np.sort(rng.uniform(0, duration_ms, int(duration_ms / mean_gap_ms)))
+        idx = np.clip(np.searchsorted(t, ts - delay, side="right") - 1, 0, None)
+        streams[name] = (ts, walk[idx])
+    return streams
+
+
+class TestCrossCorrelation:
+    """Tests for the FFT cross-correlation."""
+
+    def test_matches_direct_sum(self):
+        rng = np.random.default_rng(1)
+        x, y = rng.normal(size=(3, 257)), rng.normal(size=(3, 257))
+        max_lag = 20
+
+        got = cross_correlation(x, y, max_lag)
+
+        for row in range(3):
+            xc, yc = x[row] - x[row].mean(), y[row] - y[row].mean()
+            norm = np.sqrt((xc ** 2).sum() * (yc ** 2).sum())
+            for k in range(-max_lag, max_lag + 1):
+                direct = sum(xc[t] * yc[t + k] for t in range(257) if 0 <= t + k < 257)
+                assert got[row, max_lag + k] == pytest.approx(direct / norm)
+
+    def test_flat_input_is_nan(self):
+        corr = cross_correlation(np.zeros(64), np.arange(64.0), 5)
+        assert np.isnan(corr).all()
+
+
+class TestEngine:
+    """Tests for batch and per-window estimation."""
+
+    def test_recovers_planted_lags_per_window(self):
+        streams = _streams(HOUR_MS, seed=2)
+        engine = LeadLagEngine(grid_ms=50, max_lag_ms=2000)
+
+        windows = engine.estimate_windows(streams, window_ms=900_000)
+
+        assert set(windows) == {("binance", "coinbase"), ("binance", "kraken"), ("coinbase", "kraken")}
+        for (first, second), estimates in windows.items():
+            assert len(estimates) == 4
+            assert [e.start_ms for e in estimates] == [0, 900_000, 1_800_000, 2_700_000]
+            expected = DELAYS[second] - DELAYS[first]
+            dist = lag_distribution(estimates)
+            assert abs(dist["median_lag_ms"] - expected) <= 50
+            assert dist[f"{first}_leads"] == 4
+            assert all(e.leader == first for e in estimates)
+
+    def test_reversed_names_flip_sign(self):
+        delays = {"a_late": 400, "b_early": 0}
+        estimate = LeadLagEngine(grid_ms=50).estimate(_streams(900_000, seed=3, delays=delays))
+
+        est = estimate[("a_late", "b_early")]
+        assert abs(est.lag_ms + 400) <= 50
+        assert est.leader == "b_early"
+
+    def test_quiet_window_is_skipped(self):
+        streams = _streams(1_800_000, seed=4, delays={"binance": 0, "coinbase": 200})
+        ts, prices = streams["coinbase"]
+        prices = prices.copy()
+        prices[ts >= 900_000] = prices[ts < 900_000][-1]
+        streams["coinbase"] = (ts, prices)
+
+        windows = LeadLagEngine().estimate_windows(streams, window_ms=900_000)
+
+        assert [e.start_ms for e in windows[("binance", "coinbase")]] == [0]
+
+    def test_hours_of_ticks_in_seconds(self):
+        streams = _streams(4 * HOUR_MS, seed=5)
+        assert sum(len(ts) for ts, _ in streams.values()) > 300_000
+
+        started = time.perf_counter()
+        windows = LeadLagEngine(grid_ms=50, max_lag_ms=3000).estimate_windows(streams)
+        elapsed = time.perf_counter() - started
+
+        assert len(windows[("binance", "kraken")]) == 16
+        assert elapsed < 5
+
+
+class TestOnline:
+    """Tests for the rolling estimator."""
+
+    def test_matches_batch_over_horizon(self):
+        streams = _streams(600_000, seed=6)
+        online = OnlineLeadLag(list(streams), grid_ms=50, max_lag_ms=2000, horizon_ms=300_000)
+        events = sorted((ts, name, price) for name, (tss, ps) in streams.items() for ts, price in zip(tss, ps))
+        for ts, name, price in events:
+            online.update(name, ts, price)
+
+        rolling = online.estimate()
+        est = rolling[("binance", "coinbase")]
+        assert est.end_ms - est.start_ms == 300_000
+
+        # Ticks before the horizon only seed the first bin's carried price
+        batch = LeadLagEngine(grid_ms=50, max_lag_ms=2000).estimate(
+            streams, start_ms=est.start_ms, end_ms=est.end_ms
+        )
+        for pair, got in rolling.items():
+            assert abs(got.lag_ms - (DELAYS[pair[1]] - DELAYS[pair[0]])) <= 50
+            assert got.lag_ms == batch[pair].lag_ms
+
+    def test_needs_enough_history(self):
+        online = OnlineLeadLag(["a", "b"], grid_ms=50, max_lag_ms=1000)
+        online.update("a", 1_000, 100.0)
+        online.update("b", 1_020, 100.0)
+
+        assert online.estimate() == {}
+
+
+class TestFirstMove:
+    """Tests for the windowed first-move lookup."""
+
+    def test_matches_loop(self):
+        rng = np.random.default_rng(7)
+        ts = np.sort(rng.uniform(0, 1000, 400))
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.0006, 400)))
+        queries = rng.uniform(-50, 1100, 300)
+
+        got = first_significant_move(ts, prices, queries, lookback=60)
+
+        for q, moved in zip(queries, got):
+            inside = [i for i in range(400) if q - 60 <= ts[i] <= q]
+            expected = np.nan
+            for a, b in zip(inside, inside[1:]):
+                if abs(prices[b] - prices[a]) / prices[a] > 0.0005:
+                    expected = ts[b]
+                    break
+            assert (np.isnan(moved) and np.isnan(expected)) or moved == expected
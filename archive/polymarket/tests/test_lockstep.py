@@ -0,0 +1,163 @@
+"""
+Tests for the lockstep multi-variant bankroll runner.
+
+Results are checked against a scalar replay of
+compound_growth_backtester.run_backtest's loop.
+"""
+import os
+import time
+import math
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.risk.lockstep import (
+    LockstepRunner,
+    SizingVariant,
+    TradeArrays,
+    expected_win_rate,
+    standard_variants,
+)
+
+
+def _trades(n, win_rate=0.84, seed=11):
+    rng = np.random.default_rng(seed)
+    return TradeArrays(
+        timestamp=1_700_000_000 + np.arange(n) * 900,
+        price=rng.uniform(0.05, 0.95, n).round(3),
+        confidence=rng.uniform(0.3, 0.95, n),
+        won=rng.random(n) < win_rate,
+    )
+
+
+def _reference(trades, variant, capital=300.0):
+    """Scalar port of run_backtest for one variant."""
+    initial = capital
+    peak, max_dd, max_dd_pct = capital, 0.0, 0.0
+    curve, stamps, pnls = [capital], [], []
+    wins = 0
+    p = variant.win_rate
+
+    for ts, price, conf, won in zip(trades.timestamp, trades.price, trades.confidence, trades.won):
+        if conf < variant.confidence_threshold:
+            continue
+        if capital < 10:
+            break
+        fee = max(0.0, 0.03 * (1 - (abs(price - 0.5) / 0.5) ** 2))
+        odds = max(0.0, (1.0 - fee - price) / price)
+        if variant.kind == "kelly":
+            k = 0.0 if odds <= 0 else max(0.0, min((p * odds - (1 - p)) / odds, 0.5))
+            pct = k * variant.fraction
+        else:
+            pct = variant.fraction
+        position = capital * min(pct, variant.max_position_pct)
+        if position < 1:
+            continue
+        if won:
+            pnl = position * ((1.0 - fee) / price - 1)
+            wins += 1
+        else:
+            pnl = -position
+        capital += pnl
+        pnls.append(pnl)
+        curve.append(capital)
+        stamps.append(int(ts))
+        if capital > peak:
+            peak = capital
+        dd = peak - capital
+        if dd > max_dd:
+            max_dd, max_dd_pct = dd, dd / peak
+
+    arr = np.array(pnls)
+    sharpe = arr.mean() / arr.std() * math.sqrt(96 * 365) if len(arr) > 1 and arr.std() > 0 else 0
+    return {
+        "final_capital": capital,
+        "trades": len(pnls),
+        "wins": wins,
+        "max_drawdown": max_dd,
+        "max_drawdown_pct": max_dd_pct,
+        "sharpe_ratio": sharpe,
+        "avg_win": arr[arr > 0].mean() if (arr > 0).any() else 0,
+        "avg_loss": arr[arr < 0].mean() if (arr < 0).any() else 0,
+        "equity_curve": curve,
+        "timestamps": stamps,
+    }
+
+
+class TestLockstepRunner:
+    """Tests for lockstep replay against the per-strategy loop."""
+
+    def test_matches_scalar_backtest(self):
+        trades = _trades(1500)
+        variants = standard_variants()
+        results = LockstepRunner(trades, variants).run()
+
+        assert [r.variant.name for r in results] == [v.name for v in variants]
+        for result, variant in zip(results, variants):
+            ref = _reference(trades, variant)
+            assert result.trades == ref["trades"], variant.name
+            assert result.wins == ref["wins"]
+            assert result.final_capital == pytest.approx(ref["final_capital"], rel=1e-9)
+            assert result.max_drawdown == pytest.approx(ref["max_drawdown"], rel=1e-9)
+            assert result.max_drawdown_pct == pytest.approx(ref["max_drawdown_pct"], rel=1e-9)
+            assert result.sharpe_ratio == pytest.approx(ref["sharpe_ratio"], rel=1e-6)
+            assert result.avg_win == pytest.approx(ref["avg_win"], rel=1e-9)
+            assert result.avg_loss == pytest.approx(ref["avg_loss"], rel=1e-9)
+            assert np.allclose(result.equity_curve, ref["equity_curve"], rtol=1e-9)
+            assert result.timestamps.tolist() == ref["timestamps"]
+
+    def test_stops_below_min_capital(self):
+        trades = _trades(500, win_rate=0.0)
+        variant = SizingVariant("fixed_20pct", "fixed", 0.2)
+        result = LockstepRunner(trades, [variant]).run()[0]
+
+        assert result.final_capital < 10
+        assert result.trades == _reference(trades, variant)["trades"]
+        assert result.wins == 0
+
+    def test_default_win_rate_from_threshold(self):
+        assert SizingVariant("k", "kelly", 1.0, confidence_threshold=0.55).win_rate == 0.92
+        assert expected_win_rate(0.3) == 0.84
+        with pytest.raises(ValueError):
+            SizingVariant("bad", "martingale", 1.0)
+
+    def test_hundreds_of_variants_in_one_pass(self):
+        trades = _trades(5000)
+        variants = [
+            SizingVariant(f"v{i}", "kelly" if i % 2 else "fixed", 0.005 + i * 0.0005,
+                          confidence_threshold=0.3 + (i % 7) * 0.05)
+            for i in range(400)
+        ]
+
+        started = time.perf_counter()
+        results = LockstepRunner(trades, variants).run(record_curves=False)
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 400
+        assert elapsed < 10.0
+
+
+class TestRuinProbability:
+    """Tests for bootstrap ruin estimates."""
+
+    def test_ruin_ordering(self):
+        trades = _trades(400, win_rate=0.5)
+        variants = [
+            SizingVariant("fixed_1pct", "fixed", 0.01),
+            SizingVariant("fixed_20pct", "fixed", 0.20),
+        ]
+        runner = LockstepRunner(trades, variants)
+
+        ruin = runner.ruin_probability(n_paths=200, ruin_capital=150.0, seed=3)
+
+        assert ruin.shape == (2,)
+        assert ruin[0] < ruin[1]
+        assert np.array_equal(ruin, runner.ruin_probability(n_paths=200, ruin_capital=150.0, seed=3))
+
+    def test_no_ruin_when_always_winning(self):
+        trades = _trades(200, win_rate=1.0)
+        runner = LockstepRunner(trades, standard_variants())
+
+        assert runner.ruin_probability(n_paths=50).max() == 0.0
@@ -0,0 +1,247 @@
+"""
+Tests for the columnar orderbook log cache.
+
+Fixtures are small logger-style `polymarket_books_*.jsonl[.gz]` files
+written to a temp directory, with two regions and interleaved markets.
+"""
+import os
+import gzip
+import json
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage.orderbook_cache import UNKNOWN_SLUG, OrderbookLogCache, find_log_files
+
+
+T0 = 1_767_648_000_000
+SLUGS = ["btc-updown-15m-1767648600", "eth-updown-15m-1767648600"]
+
+
+def _record(i, rng, slug=None, region="tokyo"):
+    bid = round(float(rng.uniform(0.05, 0.9)), 2)
+    ts = T0 + i * 250 + int(rng.integers(0, 200))
+    record = {
+        "ts_received": ts,
+        "ts_exchange": ts - 40,
+        "latency_ms": 40,
+        "token_id": f"{slug}-{'yes' if i % 2 else 'no'}",
+        "best_bid": bid,
+        "best_bid_size": float(rng.uniform(1, 500)),
+        "best_ask": round(bid + 0.01, 2),
+        "best_ask_size": float(rng.uniform(1, 500)),
+        "mid": round(bid + 0.005, 6),
+        "spread": 0.01,
+        "bid_depth": int(rng.integers(0, 30)),
+        "ask_depth": int(rng.integers(0, 30)),
+        "region": region,
+    }
+    if slug:
+        record["condition_id"] = f"0x{slug}"
+        record["slug"] = slug
+    return record
+
+
+def _write(path, records, compress=False, extra=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = "".join(json.dumps(r) + "\n" for r in records) + extra
+    if compress:
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+
+
+@pytest.fixture
+def logs(tmp_path):
+    """Two regions, each with a rotated .gz hour and a live .jsonl hour (shuffled order)."""
+    rng = np.random.default_rng(3)
+    written = {}
+    for region in ("tokyo", "us_east"):
+        records = [_record(i, rng, SLUGS[i % 2], region) for i in range(400)]
+        records += [_record(400 + i, rng, None, region) for i in range(5)]
+        rng.shuffle(records)
+        base = tmp_path / "logs" / region
+        _write(base / "polymarket_books_2026-01-05_21.jsonl.gz", records[:250], compress=True)
+        _write(base / "polymarket_books_2026-01-05_22.jsonl", records[250:], extra="not json\n")
+        written[region] = records
+    return tmp_path / "logs", written
+
+
+def _all_files(root):
+    return find_log_files(root / "tokyo") + find_log_files(root / "us_east")
+
+
+class TestIngest:
+    """Tests for converting logs into the cache."""
+
+    def test_markets_are_time_sorted_and_complete(self, logs, tmp_path):
+        root, written = logs
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+
+        added = cache.ingest(_all_files(root))
+
+        assert added == 810
+        assert len(cache) == 810
+        assert cache.markets() == sorted(SLUGS + [UNKNOWN_SLUG])
+        assert cache.regions == ["tokyo", "us_east"]
+        for slug in SLUGS:
+            rows = cache.open_market(slug)
+            assert isinstance(rows, np.memmap)
+            assert len(rows) == 400
+            assert (np.diff(rows["ts_received"]) >= 0).all()
+
+        expected = sorted(
+            (r for region in written.values() for r in region if r.get("slug") == SLUGS[0]),
+            key=lambda r: r["ts_received"],
+        )
+        rows = cache.open_market(SLUGS[0])
+        got = sorted((cache.record(SLUGS[0], row) for row in rows), key=lambda r: r["ts_received"])
+        for want, have in zip(expected, got):
+            for key in ("ts_received", "token_id", "best_bid", "bid_depth", "region", "slug"):
+                assert have[key] == want[key]
+
+    def test_small_chunks_match_one_pass(self, logs, tmp_path):
+        root, _ = logs
+        one = OrderbookLogCache(str(tmp_path / "one"))
+        many = OrderbookLogCache(str(tmp_path / "many"))
+
+        one.ingest(_all_files(root))
+        many.ingest(_all_files(root), chunk_rows=7)
+
+        for slug in one.markets():
+            assert one.tokens(slug) == many.tokens(slug)
+            assert np.array_equal(one.open_market(slug), many.open_market(slug))
+        assert not (tmp_path / "many" / "spool").exists()
+
+    def test_incremental_ingest(self, logs, tmp_path):
+        root, _ = logs
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+        cache.ingest(_all_files(root))
+
+        # Nothing new: a rerun (and a reopened cache) adds nothing
+        assert cache.ingest(_all_files(root)) == 0
+        assert OrderbookLogCache(str(tmp_path / "cache")).ingest(_all_files(root)) == 0
+
+        # The live hour grows, with a half-written last line
+        live = root / "tokyo" / "polymarket_books_2026-01-05_22.jsonl"
+        rng = np.random.default_rng(8)
+        new = [_record(1000 + i, rng, SLUGS[0]) for i in range(3)]
+        with open(live, "a") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in new[:2]))
+            f.write(json.dumps(new[2])[:20])
+        assert cache.ingest(_all_files(root)) == 2
+
+        with open(live, "a") as f:
+            f.write(json.dumps(new[2])[20:] + "\n")
+        assert cache.ingest(_all_files(root)) == 1
+
+        # Rotating the live hour to .gz doesn't re-add its lines
+        text = live.read_text()
+        live.unlink()
+        with gzip.open(str(live) + ".gz", "wt") as f:
+            f.write(text)
+        assert cache.ingest(_all_files(root)) == 0
+        assert len(cache.open_market(SLUGS[0])) == 403
+
+    def test_interrupted_merge_is_finished_once(self, logs, tmp_path, monkeypatch):
+        root, _ = logs
+        full = OrderbookLogCache(str(tmp_path / "full"))
+        full.ingest(_all_files(root))
+
+        # Die during the second market's merge, after its file was replaced
+        # but before its spool file was removed; the third is never merged
+        merge = OrderbookLogCache._merge
+        merged = []
+
+        def crashing(self, slug, spooled):
+            merged.append(slug)
+            kept = spooled.read_bytes()
+            merge(self, slug, spooled)
+            if len(merged) == 2:
+                spooled.write_bytes(kept)
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(OrderbookLogCache, "_merge", crashing)
+        with pytest.raises(KeyboardInterrupt):
+            OrderbookLogCache(str(tmp_path / "cache")).ingest(_all_files(root))
+        monkeypatch.undo()
+
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+        assert cache.ingest(_all_files(root)) == 0
+        assert len(cache) == 810
+        for slug in full.markets():
+            assert cache.tokens(slug) == full.tokens(slug)
+            assert np.array_equal(cache.open_market(slug), full.open_market(slug))
+        assert not (tmp_path / "cache" / "spool").exists()
+        assert OrderbookLogCache(str(tmp_path / "cache")).ingest(_all_files(root)) == 0
+
+
+class TestReads:
+    """Tests for streaming and as-of lookups."""
+
+    def test_iter_chunks_is_bounded(self, logs, tmp_path):
+        root, _ = logs
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+        cache.ingest(_all_files(root))
+
+        chunks = list(cache.iter_chunks(chunk_rows=64))
+        assert max(len(c) for _, c in chunks) <= 64
+        assert sum(len(c) for _, c in chunks) == 810
+
+        tokyo = list(cache.iter_chunks(chunk_rows=64, regions=["tokyo"]))
+        assert sum(len(c) for _, c in tokyo) == 405
+        assert all((c["region"] == 0).all() for _, c in tokyo)
+
+        spreads = cache.column("spread", slugs=SLUGS)
+        assert len(spreads) == 800
+
+    def test_load_time_range(self, logs, tmp_path):
+        root, _ = logs
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+        cache.ingest(_all_files(root))
+
+        start, end = T0 + 10_000, T0 + 20_000
+        rows = cache.load(SLUGS[1], start, end)
+        all_rows = cache.open_market(SLUGS[1])
+        inside = (all_rows["ts_received"] >= start) & (all_rows["ts_received"] <= end)
+
+        assert len(rows) == inside.sum()
+        assert np.array_equal(rows, all_rows[inside])
+
+    @pytest.mark.parametrize("direction", ["backward", "forward", "nearest"])
+    def test_asof_matches_brute_force(self, logs, tmp_path, direction):
+        root, _ = logs
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+        cache.ingest(_all_files(root))
+        times = np.asarray(cache.open_market(SLUGS[0])["ts_received"])
+
+        rng = np.random.default_rng(11)
+        queries = rng.integers(T0 - 3000, T0 + 110_000, 500)
+        tolerance = 300
+
+        got = cache.asof(SLUGS[0], queries, tolerance_ms=tolerance, direction=direction)
+
+        for q, idx in zip(queries, got):
+            gaps = times - q
+            if direction == "backward":
+                ok = gaps <= 0
+            elif direction == "forward":
+                ok = gaps >= 0
+            else:
+                ok = np.ones(len(times), dtype=bool)
+            ok &= np.abs(gaps) <= tolerance
+            if not ok.any():
+                assert idx == -1
+            else:
+                best = np.abs(gaps[ok]).min()
+                assert idx >= 0 and abs(times[idx] - q) == best
+
+    def test_asof_unknown_market(self, tmp_path):
+        cache = OrderbookLogCache(str(tmp_path / "cache"))
+
+        assert cache.asof("missing", [T0, T0 + 1]).tolist() == [-1, -1]
+        with pytest.raises(ValueError):
+            cache.asof("missing", [T0], direction="sideways")
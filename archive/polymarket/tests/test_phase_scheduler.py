@@ -0,0 +1,274 @@
+"""
+Tests for the timer-wheel phase scheduler and MarketCalendar's pushed events.
+
+Scheduler tests run against real clocks with sub-second "windows", so
+they check ordering and lateness without waiting for 15-minute marks.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arbitrage.bot import ArbitrageBot
+from src.arbitrage.market_calendar import MarketCalendar, WindowEvent, WindowPhase
+from src.arbitrage.phase_scheduler import EventDispatcher, PhaseScheduler, TimerWheel
+
+
+class TestTimerWheel:
+    """Tests for the hashed timer wheel."""
+
+    def test_pops_in_deadline_order(self):
+        wheel = TimerWheel(resolution=1.0, slots=8, now=100.0)
+        for deadline in (103.5, 101.2, 101.1, 106.0):
+            wheel.add(deadline, deadline)
+
+        assert wheel.next_deadline() == 101.1
+        assert [d for d, _ in wheel.pop_due(102.0)] == [101.1, 101.2]
+        assert len(wheel) == 2
+        assert wheel.next_deadline() == 103.5
+
+    def test_entries_beyond_one_rotation(self):
+        wheel = TimerWheel(resolution=1.0, slots=4, now=0.0)
+        wheel.add(9.5, "far")
+        wheel.add(1.5, "near")  # same slot as 9.5
+
+        assert wheel.next_deadline() == 1.5
+        assert wheel.pop_due(2.0) == [(1.5, "near")]
+        assert wheel.next_deadline() == 9.5
+        assert wheel.pop_due(8.0) == []
+        assert wheel.pop_due(50.0) == [(9.5, "far")]
+
+    def test_past_deadline_fires_on_next_pop(self):
+        wheel = TimerWheel(resolution=1.0, slots=8, now=10.0)
+        wheel.add(3.0, "late")
+
+        assert wheel.pop_due(10.0) == [(3.0, "late")]
+        assert len(wheel) == 0
+
+
+def _closes(period, first):
+    def window_closes(after):
+        close = first
+        while True:
+            if close > after:
+                yield close
+            close += period
+    return window_closes
+
+
+class TestPhaseScheduler:
+    """Tests for on-time boundary firing."""
+
+    def test_fires_boundaries_in_order_on_time(self):
+        fired = []
+        done = threading.Event()
+
+        def on_boundary(close, label, jitter):
+            fired.append((close, label, time.time()))
+            if len(fired) == 6:
+                done.set()
+
+        start = time.time()
+        scheduler = PhaseScheduler(
+            window_closes=_closes(0.4, start + 0.35),
+            boundaries=[(0.0, "close"), (0.2, "watch"), (0.1, "execute")],
+            on_boundary=on_boundary,
+            resolution=0.05,
+        )
+        scheduler.start()
+        assert done.wait(3.0)
+        scheduler.stop()
+
+        labels = [label for _, label, _ in fired[:6]]
+        assert labels == ["watch", "execute", "close"] * 2
+        offsets = {"watch": 0.2, "execute": 0.1, "close": 0.0}
+        for close, label, at in fired[:6]:
+            assert at >= close - offsets[label] - 0.005
+            assert at - (close - offsets[label]) < 0.05
+
+        stats = scheduler.jitter.summary()
+        assert stats["count"] >= 6
+        assert stats["max"] < 0.05
+
+    def test_keeps_horizon_scheduled(self):
+        start = time.time()
+        scheduler = PhaseScheduler(
+            window_closes=_closes(10.0, start + 5.0),
+            boundaries=[(1.0, "a"), (0.0, "b")],
+            on_boundary=lambda *args: None,
+            horizon=3,
+        )
+        scheduler.start()
+        try:
+            upcoming = scheduler.upcoming()
+        finally:
+            scheduler.stop()
+
+        assert len(upcoming) == 6
+        assert [label for _, label in upcoming[:2]] == ["a", "b"]
+        assert not scheduler.running
+
+
+class TestEventDispatcher:
+    """Tests for per-subscriber delivery."""
+
+    def test_slow_subscriber_does_not_block_others(self):
+        dispatcher = EventDispatcher()
+        release = threading.Event()
+        fast = []
+
+        dispatcher.subscribe(lambda e: release.wait(2.0))
+        dispatcher.subscribe(fast.append)
+
+        started = time.perf_counter()
+        for i in range(5):
+            dispatcher.publish(i)
+        publish_time = time.perf_counter() - started
+
+        deadline = time.time() + 1.0
+        while len(fast) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert fast == [0, 1, 2, 3, 4]
+        assert publish_time < 0.1
+        assert dispatcher.pending() > 0
+        release.set()
+        dispatcher.close()
+
+    def test_callback_errors_are_contained(self):
+        dispatcher = EventDispatcher()
+        got = []
+
+        def flaky(e):
+            if e == 0:
+                raise RuntimeError("boom")
+            got.append(e)
+
+        dispatcher.subscribe(flaky)
+        dispatcher.publish(0)
+        dispatcher.publish(1)
+        dispatcher.close()
+
+        assert got == [1]
+
+
+class TestMarketCalendarScheduling:
+    """Tests for MarketCalendar's scheduler wiring."""
+
+    def test_window_closes_on_quarter_hours(self):
+        calendar = MarketCalendar()
+        after = 1_765_000_000.0  # 05:46:40 UTC
+        closes = calendar.iter_window_closes(after)
+
+        got = [next(closes) for _ in range(5)]
+
+        assert got[0] == 1_765_000_800
+        assert all(b - a == 900 for a, b in zip(got, got[1:]))
+        assert all(c % 900 == 0 for c in got)
+
+    def test_boundaries_match_polled_phases(self):
+        calendar = MarketCalendar()
+        for offset, phase in calendar.PHASE_BOUNDARIES[:-1]:
+            calendar._next_window = datetime.utcnow() + timedelta(seconds=offset - 0.5)
+            assert calendar.get_phase() == phase
+
+    def test_executing_repeats_until_closed(self):
+        calendar = MarketCalendar()
+        scheduled = calendar.scheduled_boundaries()
+
+        executing = sorted((o for o, p in scheduled if p == WindowPhase.EXECUTING), reverse=True)
+        assert executing == [10, 9, 8, 7, 6, 5, 4, 3]
+        assert [p for _, p in scheduled].count(WindowPhase.CLOSED) == 1
+
+    def test_idle_event_describes_next_window(self):
+        calendar = MarketCalendar()
+        events = []
+        calendar.subscribe(events.append)
+        calendar.start()
+        try:
+            close = 1_765_000_800
+            calendar._on_boundary(close, WindowPhase.IDLE, 0.001)
+            deadline = time.time() + 1.0
+            while not any(e.jitter == 0.001 for e in events) and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            calendar.stop()
+
+        event = [e for e in events if e.jitter == 0.001][0]
+        assert isinstance(event, WindowEvent)
+        assert event.phase == WindowPhase.IDLE
+        assert event.window_time == datetime.utcfromtimestamp(close + 900)
+        assert calendar.jitter_stats()["count"] == 0
+
+    def test_update_is_noop_while_scheduler_runs(self):
+        calendar = MarketCalendar()
+        events = []
+        calendar.subscribe(events.append)
+        calendar.start()
+        try:
+            time.sleep(0.05)
+            events.clear()
+            calendar._current_phase = WindowPhase.CLOSED
+            calendar._next_window = datetime.utcnow() - timedelta(seconds=1)
+            calendar.update()
+            time.sleep(0.05)
+
+            assert events == []
+            assert calendar._current_phase == WindowPhase.CLOSED
+            assert calendar.get_next_window() < datetime.utcnow()
+        finally:
+            calendar.stop()
+
+
+class TestBotPhaseDispatch:
+    """Tests for the bot's phase handlers running off calendar events."""
+
+    def test_scheduled_events_drive_phase_handlers(self):
+        bot = ArbitrageBot(data_api=None)
+        seen = []
+        bot._on_watching_phase = lambda e: seen.append(("watching", e.phase))
+        bot._on_ready_phase = lambda e: seen.append(("ready", e.phase))
+        bot._on_executing_phase = lambda e: seen.append(("executing", e.phase))
+        bot._on_closed_phase = lambda e: seen.append(("closed", e.phase))
+        bot._running = True
+        bot.calendar.start()
+        try:
+            time.sleep(0.05)
+            seen.clear()
+            close = time.time() + 60
+            for phase in (WindowPhase.WATCHING, WindowPhase.READY,
+                          WindowPhase.EXECUTING, WindowPhase.CLOSED, WindowPhase.IDLE):
+                bot.calendar._on_boundary(close, phase, 0.0)
+            deadline = time.time() + 1.0
+            while len(seen) < 4 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            bot._running = False
+            bot.calendar.stop()
+
+        assert [name for name, _ in seen] == ["watching", "ready", "executing", "closed"]
+        assert all(name == phase.value for name, phase in seen)
+        assert bot._current_phase == WindowPhase.IDLE
+
+    def test_executing_is_reevaluated_each_tick(self):
+        bot = ArbitrageBot(data_api=None)
+        ticks = []
+        bot._on_executing_phase = ticks.append
+        bot._running = True
+
+        def event(seconds_until):
+            return WindowEvent(
+                window_time=datetime.utcnow() + timedelta(seconds=seconds_until),
+                seconds_until=seconds_until,
+                phase=WindowPhase.EXECUTING,
+            )
+
+        for seconds_until in (10, 9, 8, 3):
+            bot._on_window_event(event(seconds_until))
+        # A repeat delivered after the phase ended is dropped
+        bot._on_window_event(event(1.5))
+
+        assert [e.seconds_until for e in ticks] == [10, 9, 8, 3]
@@ -0,0 +1,301 @@
+"""
+Tests for the batched, cached JSON-RPC client.
+
+Runs against a local fake EVM node that answers JSON-RPC batch arrays for
+transactions, receipts and blocks, with a small per-request latency, and
+can inject 429s and per-item errors. Set EVM_RPC_URL (e.g. a local anvil
+node at http://127.0.0.1:8545) to also run the smoke test against a real
+node.
+"""
+import os
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.polygon_rpc import DEFAULT_CONFIRMATIONS, PolygonRPC, call_key, is_immutable
+
+
+LATENCY = 0.05
+N_TX = 300
+PENDING = "0x" + "ee" * 32
+
+
+def _tx_hash(i):
+    return "0x" + f"{i:064x}"
+
+
+def _block_of(i):
+    return 1000 + i // 6  # six trades per block
+
+
+# Head far enough past the last trade block that everything is final
+HEAD = _block_of(N_TX - 1) + DEFAULT_CONFIRMATIONS
+
+
+def _tx(i):
+    return {
+        "hash": _tx_hash(i),
+        "blockNumber": hex(_block_of(i)),
+        "transactionIndex": hex(i % 6),
+        "gasPrice": hex(30_000_000_000 + i * 1000),
+    }
+
+
+def _receipt(i):
+    return {
+        "transactionHash": _tx_hash(i),
+        "blockNumber": hex(_block_of(i)),
+        "transactionIndex": hex(i % 6),
+        "gasUsed": hex(150_000),
+        "effectiveGasPrice": hex(30_000_000_000 + i * 1000),
+    }
+
+
+def _block(number, full):
+    txs = [_tx(i) for i in range(N_TX) if _block_of(i) == number]
+    return {
+        "number": hex(number),
+        "timestamp": hex(1_765_000_000 + number * 2),
+        "transactions": txs if full else [t["hash"] for t in txs],
+    }
+
+
+class FakeNodeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            server.batch_sizes.append(len(batch))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            throttle = server.throttle_remaining > 0
+            if throttle:
+                server.throttle_remaining -= 1
+
+        try:
+            time.sleep(LATENCY)
+            if throttle:
+                self._send(429, {"error": "rate limited"})
+                return
+            self._send(200, [self._answer(call) for call in batch])
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _answer(self, call):
+        server = self.server
+        method, params = call["method"], call["params"]
+        with server.lock:
+            server.calls.append((method, params[0] if params else None))
+            fail = server.fail_items > 0
+            if fail:
+                server.fail_items -= 1
+        if fail:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32005, "message": "limit"}}
+
+        result = None
+        if method in ("eth_getTransactionByHash", "eth_getTransactionReceipt"):
+            if params[0] == PENDING and method == "eth_getTransactionByHash":
+                result = {"hash": PENDING, "blockNumber": None}
+            elif params[0] != PENDING:
+                i = int(params[0], 16)
+                if i < N_TX:
+                    result = _tx(i) if method == "eth_getTransactionByHash" else _receipt(i)
+        elif method == "eth_getBlockByNumber":
+            result = _block(int(params[0], 16), params[1])
+        elif method == "eth_blockNumber":
+            result = hex(server.head)
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_node():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNodeHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.batch_sizes = []
+    server.calls = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.throttle_remaining = 0
+    server.fail_items = 0
+    server.head = HEAD
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _rpc(server, **kwargs):
+    kwargs.setdefault("rate", 1000)
+    return PolygonRPC(endpoints=[f"http://127.0.0.1:{server.server_address[1]}"], **kwargs)
+
+
+class TestBatching:
+    """Tests for batch packing, concurrency and block dedup."""
+
+    def test_fetch_tx_context(self, fake_node):
+        rpc = _rpc(fake_node, batch_size=50, concurrency=4)
+        hashes = [_tx_hash(i) for i in range(N_TX)]
+
+        context = rpc.fetch_tx_context(hashes + hashes[:10], full_blocks=True)
+
+        assert list(context) == hashes
+        tx, receipt, block = context[_tx_hash(13)]
+        assert tx == _tx(13)
+        assert receipt == _receipt(13)
+        assert block == _block(_block_of(13), True)
+
+        # 600 tx/receipt calls + one head read + 50 distinct blocks, 50
+        # calls per request
+        block_calls = [c for c in fake_node.calls if c[0] == "eth_getBlockByNumber"]
+        assert len(block_calls) == N_TX // 6
+        assert len(fake_node.calls) == 2 * N_TX + 1 + N_TX // 6
+        assert fake_node.requests == 14
+        assert max(fake_node.batch_sizes) == 50
+
+    def test_duplicate_calls_are_sent_once(self, fake_node):
+        rpc = _rpc(fake_node)
+        call = ("eth_getTransactionReceipt", [_tx_hash(4)])
+
+        results = rpc.call_many([call, ("eth_getTransactionReceipt", [_tx_hash(4).upper()]), call])
+
+        assert results == [_receipt(4)] * 3
+        assert fake_node.calls == [("eth_blockNumber", None), (call[0], _tx_hash(4))]
+        assert rpc.stats["deduplicated"] == 2
+
+    def test_batches_run_concurrently(self, fake_node):
+        rpc = _rpc(fake_node, batch_size=10, concurrency=8)
+
+        started = time.perf_counter()
+        receipts = rpc.get_receipts(_tx_hash(i) for i in range(80))
+        elapsed = time.perf_counter() - started
+
+        assert len(receipts) == 80
+        assert fake_node.max_in_flight > 1
+        # 8 batches serially would take 8 * LATENCY
+        assert elapsed < 5 * LATENCY
+
+    def test_missing_and_pending(self, fake_node):
+        rpc = _rpc(fake_node)
+
+        missing = _tx_hash(N_TX + 5)
+        txs = rpc.get_transactions([_tx_hash(1), missing, PENDING])
+
+        assert set(txs) == {_tx_hash(1), PENDING}
+        assert rpc.fetch_tx_context([missing, PENDING]) == {}
+
+
+class TestCache:
+    """Tests for the content-addressed result cache."""
+
+    def test_second_run_hits_disk_cache(self, fake_node, tmp_path):
+        hashes = [_tx_hash(i) for i in range(60)]
+        first = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"))
+        expected = first.fetch_tx_context(hashes, full_blocks=True)
+        requests_before = fake_node.requests
+
+        second = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"))
+        assert second.fetch_tx_context(hashes, full_blocks=True) == expected
+        assert fake_node.requests == requests_before
+        assert second.stats["cache_hits"] == 2 * 60 + 10
+
+    def test_mutable_results_are_not_cached(self, fake_node, tmp_path):
+        rpc = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"))
+        rpc.get_transactions([PENDING, _tx_hash(N_TX + 1)])
+        rpc.get_transactions([PENDING, _tx_hash(N_TX + 1)])
+
+        assert fake_node.calls.count(("eth_getTransactionByHash", PENDING)) == 2
+        assert not any((tmp_path / "rpc").rglob("*.json"))
+
+    def test_recent_results_wait_for_confirmations(self, fake_node, tmp_path):
+        newest = _tx_hash(N_TX - 1)
+        fake_node.head = _block_of(N_TX - 1) + 10
+        rpc = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"))
+
+        assert len(rpc.get_receipts([newest, _tx_hash(0)])) == 2
+        rpc.get_blocks([_block_of(N_TX - 1)])
+        assert not any((tmp_path / "rpc").rglob("*.json"))
+
+        # Once the head moves past the confirmation depth they are cached
+        fake_node.head = HEAD
+        later = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"))
+        later.get_receipts([newest])
+        later.get_blocks([_block_of(N_TX - 1)])
+        assert len(list((tmp_path / "rpc").rglob("*.json"))) == 2
+
+    def test_zero_confirmations_skips_head_read(self, fake_node, tmp_path):
+        rpc = _rpc(fake_node, cache_dir=str(tmp_path / "rpc"), confirmations=0)
+
+        rpc.get_receipts([_tx_hash(1)])
+
+        assert fake_node.calls == [("eth_getTransactionReceipt", _tx_hash(1))]
+        assert len(list((tmp_path / "rpc").rglob("*.json"))) == 1
+
+    def test_immutability_rules(self):
+        assert is_immutable("eth_getBlockByNumber", ["0x10", False], {"number": "0x10"}, head=0x10 + 256)
+        assert not is_immutable("eth_getBlockByNumber", ["0x10", False], {"number": "0x10"}, head=0x20)
+        assert not is_immutable("eth_getBlockByNumber", ["0x10", False], {"number": "0x10"})
+        assert is_immutable("eth_getBlockByNumber", ["0x10", False], {"number": "0x10"}, confirmations=0)
+        assert is_immutable("eth_getBlockByHash", ["0xab", False], {"number": "0x10"})
+        assert not is_immutable("eth_getBlockByNumber", ["latest", False], {"number": "0x10"})
+        assert not is_immutable("eth_getTransactionReceipt", ["0x1"], None)
+        assert not is_immutable("eth_blockNumber", [], "0x10")
+        assert call_key("eth_getTransactionReceipt", ["0xAB"]) == call_key("eth_getTransactionReceipt", ["0xab"])
+
+
+class TestRetries:
+    """Tests for rate limits and per-item errors."""
+
+    def test_rate_limit_then_success(self, fake_node):
+        fake_node.throttle_remaining = 1
+        rpc = _rpc(fake_node, concurrency=1)
+
+        receipts = rpc.get_receipts(_tx_hash(i) for i in range(5))
+
+        assert len(receipts) == 5
+        assert rpc.stats["rate_limited"] == 1
+
+    def test_failed_items_are_retried(self, fake_node):
+        fake_node.fail_items = 3
+        rpc = _rpc(fake_node, batch_size=20)
+
+        # 19 receipts plus the head read fill one batch
+        receipts = rpc.get_receipts(_tx_hash(i) for i in range(19))
+
+        assert len(receipts) == 19
+        assert fake_node.batch_sizes == [20, 3]
+        assert rpc.stats["failed"] == 0
+
+
+@pytest.mark.skipif(not os.environ.get("EVM_RPC_URL"), reason="EVM_RPC_URL not set")
+def test_local_node_smoke():
+    rpc = PolygonRPC(endpoints=[os.environ["EVM_RPC_URL"]], rate=50)
+    latest = int(rpc.call("eth_blockNumber", []), 16)
+
+    blocks = rpc.get_blocks(range(max(latest - 3, 0), latest + 1))
+
+    assert latest in blocks
+    for number, block in blocks.items():
+        assert int(block["number"], 16) == number
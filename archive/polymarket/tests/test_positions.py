@@ -0,0 +1,123 @@
+"""
+Tests for PositionTracker batched price refresh.
+
+Tests cover:
+- One bulk Gamma request per refresh regardless of position count
+- Shared price source takes precedence over Gamma
+- Unchanged prices are not persisted
+- Price log replay on restart
+"""
+import os
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.trading.positions import PositionTracker, _token_prices
+
+
+def _market(condition_id, yes_token, yes_price, no_token, no_price):
+    return {
+        "conditionId": condition_id,
+        "clobTokenIds": json.dumps([yes_token, no_token]),
+        "outcomePrices": json.dumps([str(yes_price), str(no_price)]),
+    }
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Tracker writing to a temp dir with mocked APIs."""
+    with patch("src.trading.positions.DATA_DIR", tmp_path), \
+            patch("src.trading.positions.GammaClient") as mock_gamma, \
+            patch("src.trading.positions.DataAPIClient"):
+        mock_gamma.return_value = Mock()
+        t = PositionTracker()
+        t.open_position("m1", "buy", "yes", 100, 0.50, market_name="M1", token_id="t1")
+        t.open_position("m1", "buy", "no", 50, 0.40, market_name="M1", token_id="t2")
+        t.open_position("m2", "buy", "yes", 10, 0.20, market_name="M2", token_id="t3")
+        yield t
+
+
+class TestTokenPrices:
+    """Tests for market price extraction."""
+
+    def test_tokens_list_shape(self):
+        market = {"tokens": [{"token_id": "a", "price": 0.3}, {"token_id": "b", "price": 0.7}]}
+        assert _token_prices(market) == {"a": 0.3, "b": 0.7}
+
+    def test_clob_token_ids_shape(self):
+        market = _market("m1", "a", 0.25, "b", 0.75)
+        assert _token_prices(market) == {"a": 0.25, "b": 0.75}
+
+
+class TestRefreshPrices:
+    """Tests for batched refresh."""
+
+    def test_single_bulk_request(self, tracker):
+        tracker.gamma.get_markets.return_value = [
+            _market("m1", "t1", 0.60, "t2", 0.40),
+            _market("m2", "t3", 0.30, "t4", 0.70),
+        ]
+
+        changed = tracker.refresh_prices()
+
+        assert changed == 2  # t2 unchanged
+        tracker.gamma.get_markets.assert_called_once()
+        assert sorted(tracker.gamma.get_markets.call_args[0][0]) == ["m1", "m2"]
+        tracker.gamma.get_market.assert_not_called()
+
+        prices = {p.token_id: p.current_price for p in tracker.get_open_positions()}
+        assert prices == {"t1": 0.60, "t2": 0.40, "t3": 0.30}
+        assert tracker.get_summary()["unrealized_pnl"] == pytest.approx(10.0 + 1.0)
+
+    def test_price_source_skips_gamma(self, tracker):
+        source = Mock(return_value={"t1": 0.55, "t2": 0.45, "t3": 0.25})
+        tracker._price_source = source
+
+        tracker.refresh_prices()
+
+        tracker.gamma.get_markets.assert_not_called()
+        prices = {p.token_id: p.current_price for p in tracker.get_open_positions()}
+        assert prices == {"t1": 0.55, "t2": 0.45, "t3": 0.25}
+
+    def test_price_source_gaps_filled_from_gamma(self, tracker):
+        tracker._price_source = Mock(return_value={"t1": 0.55, "t2": 0.45})
+        tracker.gamma.get_markets.return_value = [_market("m2", "t3", 0.35, "t4", 0.65)]
+
+        tracker.refresh_prices()
+
+        assert tracker.gamma.get_markets.call_args[0][0] == ["m2"]
+        prices = {p.token_id: p.current_price for p in tracker.get_open_positions()}
+        assert prices["t1"] == 0.55
+        assert prices["t3"] == 0.35
+
+    def test_unchanged_prices_not_persisted(self, tracker):
+        tracker._price_source = Mock(return_value={"t1": 0.50, "t2": 0.40, "t3": 0.20})
+
+        assert tracker.refresh_prices() == 0
+        assert tracker._price_log_file.read_text() == ""
+
+    def test_price_log_replayed_on_load(self, tracker, tmp_path):
+        tracker._price_source = Mock(return_value={"t1": 0.70})
+        tracker.refresh_prices()
+        assert tracker._price_log_file.read_text().count("\n") == 1
+
+        with patch("src.trading.positions.DATA_DIR", tmp_path), \
+                patch("src.trading.positions.GammaClient"), \
+                patch("src.trading.positions.DataAPIClient"):
+            restored = PositionTracker()
+
+        prices = {p.token_id: p.current_price for p in restored.get_open_positions()}
+        assert prices["t1"] == 0.70
+        assert prices["t2"] == 0.40
+
+    def test_snapshot_truncates_log(self, tracker):
+        tracker._price_source = Mock(return_value={"t1": 0.70})
+        tracker.refresh_prices()
+
+        pos = tracker.get_open_positions()[0]
+        tracker.close_position(pos.id, exit_price=0.70)
+
+        assert tracker._price_log_file.read_text() == ""
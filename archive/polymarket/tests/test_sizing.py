@@ -0,0 +1,99 @@
+"""
+Tests for the shared fee, Kelly and Sharpe helpers.
+
+Vectorized results are checked against the scalar estimate_fee /
+kelly_fraction formulas from the backtest scripts.
+"""
+import os
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.risk.sizing import ReturnMoments, estimate_fees, kelly_fractions, net_odds, win_multiplier
+
+
+def _kelly(win_prob, odds):
+    """Scalar kelly_fraction from the backtest scripts."""
+    if win_prob <= 0 or win_prob >= 1 or odds <= 0:
+        return 0.0
+    return max(0.0, min((win_prob * odds - (1 - win_prob)) / odds, 0.5))
+
+
+class TestPerTradeTerms:
+    """Fees, odds and Kelly fractions."""
+
+    def test_match_scalar_formulas(self):
+        price = np.array([0.0, 0.05, 0.3, 0.5, 0.77, 0.95, 1.0])
+        fee = estimate_fees(price)
+        odds = net_odds(price, fee)
+
+        for i, p in enumerate(price):
+            expected_fee = max(0.0, 0.03 * (1 - (abs(p - 0.5) / 0.5) ** 2))
+            assert fee[i] == pytest.approx(expected_fee)
+            if p > 0:
+                assert odds[i] == pytest.approx((1 - expected_fee - p) / p)
+                assert win_multiplier(price, fee)[i] == pytest.approx((1 - expected_fee) / p - 1)
+            for win_prob in (0.0, 0.55, 0.84, 1.0):
+                assert kelly_fractions(win_prob, odds)[i] == pytest.approx(_kelly(win_prob, odds[i]))
+
+    def test_kelly_broadcasts_win_probabilities(self):
+        odds = np.array([[0.2], [1.5], [-0.1]])
+        p = np.array([0.4, 0.84, 1.0])
+
+        kelly = kelly_fractions(p, odds)
+
+        assert kelly.shape == (3, 3)
+        for row in range(3):
+            for col in range(3):
+                assert kelly[row, col] == pytest.approx(_kelly(p[col], odds[row, 0]))
+
+
+class TestReturnMoments:
+    """Running mean/variance and Sharpe ratios."""
+
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(3)
+        returns = rng.normal(0.01, 0.05, 50)
+        moments = ReturnMoments(3)
+
+        for r in returns:
+            moments.add(np.array([0]), np.array([r]))
+        moments.add(np.array([1]), np.array([0.02]))
+        for _ in range(5):
+            moments.add(np.array([2]), np.array([0.01]))
+
+        sharpe = moments.sharpe_ratios(scale=10.0)
+        assert sharpe[0] == pytest.approx(returns.mean() / returns.std() * 10.0)
+        assert sharpe[1] == 0.0  # Single observation
+        assert sharpe[2] == 0.0  # No variance
+
+    def test_batches_match_single_updates(self):
+        rng = np.random.default_rng(5)
+        values = rng.normal(0.0, 0.1, (2, 40))
+        mask = rng.random((2, 40)) < 0.7
+        single, batched = ReturnMoments(2), ReturnMoments(2)
+
+        for j in range(40):
+            slots = np.flatnonzero(mask[:, j])
+            single.add(slots, values[slots, j])
+        for start in range(0, 40, 16):
+            sl = slice(start, start + 16)
+            batched.add_batch(np.arange(2), values[:, sl], mask[:, sl])
+
+        np.testing.assert_array_equal(batched.count, single.count)
+        np.testing.assert_allclose(batched.mean, single.mean)
+        np.testing.assert_allclose(batched.m2, single.m2)
+
+    def test_small_spread_around_large_mean(self):
+        """Sum-of-squares variance cancels to noise here; Welford doesn't."""
+        rng = np.random.default_rng(9)
+        returns = 1.0 + rng.normal(0.0, 1e-7, 1000)
+        moments = ReturnMoments(1)
+
+        moments.add_batch(np.array([0]), returns[None, :500], np.ones((1, 500), dtype=bool))
+        for r in returns[500:]:
+            moments.add(np.array([0]), np.array([r]))
+
+        assert moments.sharpe_ratios(1.0)[0] == pytest.approx(returns.mean() / returns.std(), rel=1e-6)
@@ -0,0 +1,232 @@
+"""
+Tests for concurrent slug discovery and MarketScanner's discovery mode.
+
+Runs against a local fake Gamma server that serves `/markets/slug/{slug}`
+(404 for markets that don't exist yet), batched `/markets?condition_ids=`
+refreshes and keyword searches, with a small per-request latency.
+"""
+import os
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.gamma import GammaClient
+from src.arbitrage.market_scanner import MarketScanner
+from src.arbitrage.slug_discovery import SlugDiscovery, slug_timestamp
+
+
+LATENCY = 0.05
+WINDOW = 1_765_000_800
+
+
+def _market(slug, price=0.5):
+    asset = "Bitcoin" if slug.startswith("btc") else "Ethereum"
+    return {
+        "conditionId": f"0x{abs(hash(slug)) % 10 ** 12:012x}",
+        "question": f"{asset} Up or Down - 15 minute",
+        "slug": slug,
+        "active": True,
+        "clobTokenIds": [f"{slug}-yes", f"{slug}-no"],
+        "outcomePrices": [str(price), str(round(1 - price, 3))],
+        "liquidity": "2500",
+        "volume24hr": "1000",
+    }
+
+
+class FakeGammaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.paths.append(url.path)
+        time.sleep(LATENCY)
+
+        if url.path.startswith("/markets/slug/"):
+            slug = url.path.rsplit("/", 1)[1]
+            market = server.markets.get(slug)
+            if market is None and server.auto_create:
+                market = server.markets[slug] = _market(slug)
+            if market is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = market
+        else:
+            query = parse_qs(url.query)
+            if "condition_ids" in query:
+                wanted = set(query["condition_ids"])
+                body = [m for m in server.markets.values() if m["conditionId"] in wanted]
+            else:
+                body = [m for m in server.markets.values() if query["q"][0] in m["question"]]
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_gamma():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGammaHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.paths = []
+    server.markets = {}
+    server.auto_create = False
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _discovery(server, **kwargs):
+    kwargs.setdefault("rate", 1000)
+    return SlugDiscovery(base_url=f"http://127.0.0.1:{server.server_address[1]}", **kwargs)
+
+
+def _slugs(n):
+    return [f"{asset}-updown-15m-{WINDOW + i * 900}" for asset in ("btc", "eth") for i in range(n)]
+
+
+class TestSlugDiscovery:
+    """Tests for concurrent lookup with positive and negative caching."""
+
+    def test_lookups_run_concurrently(self, fake_gamma):
+        slugs = _slugs(8)
+        for slug in slugs:
+            fake_gamma.markets[slug] = _market(slug)
+        discovery = _discovery(fake_gamma, concurrency=16, clock=FakeClock(WINDOW - 600))
+
+        started = time.perf_counter()
+        found = discovery.discover(slugs)
+        elapsed = time.perf_counter() - started
+
+        assert list(found) == slugs
+        # 16 lookups serially would take 16 * LATENCY
+        assert elapsed < 8 * LATENCY
+
+    def test_known_slugs_refresh_in_one_request(self, fake_gamma):
+        slugs = _slugs(4)
+        for slug in slugs:
+            fake_gamma.markets[slug] = _market(slug)
+        discovery = _discovery(fake_gamma, clock=FakeClock(WINDOW - 600))
+        discovery.discover(slugs)
+        fake_gamma.paths.clear()
+
+        fake_gamma.markets[slugs[0]]["outcomePrices"] = ["0.71", "0.29"]
+        fake_gamma.markets[slugs[0]]["question"] = "edited upstream"
+        found = discovery.discover(slugs)
+
+        assert fake_gamma.paths == ["/markets"]
+        assert found[slugs[0]]["outcomePrices"] == ["0.71", "0.29"]
+        # Immutable fields come from the permanent cache
+        assert found[slugs[0]]["question"] == "Bitcoin Up or Down - 15 minute"
+        assert discovery.stats["refreshed"] == 8
+
+    def test_missing_slug_waits_for_expected_creation(self, fake_gamma):
+        clock = FakeClock(WINDOW - 3 * 3600)
+        discovery = _discovery(fake_gamma, creation_lead=3600, clock=clock)
+        slug = f"btc-updown-15m-{WINDOW}"
+
+        assert discovery.discover([slug]) == {}
+        assert discovery.discover([slug]) == {}
+        assert fake_gamma.paths.count(f"/markets/slug/{slug}") == 1
+        assert discovery.stats["negative_hits"] == 1
+
+        # Not retried until the market should exist
+        clock.now = WINDOW - 3600 - 1
+        discovery.discover([slug])
+        assert fake_gamma.paths.count(f"/markets/slug/{slug}") == 1
+
+        fake_gamma.markets[slug] = _market(slug)
+        clock.now = WINDOW - 3600
+        assert slug in discovery.discover([slug])
+
+    def test_late_missing_slug_backs_off(self, fake_gamma):
+        clock = FakeClock(WINDOW - 60)
+        discovery = _discovery(fake_gamma, creation_lead=3600, retry_base=30, retry_max=100, clock=clock)
+        slug = f"eth-updown-15m-{WINDOW}"
+
+        discovery.discover([slug])
+        assert discovery._missing[slug][0] == WINDOW - 30
+
+        clock.now = WINDOW - 30
+        discovery.discover([slug])
+        assert discovery._missing[slug] == (WINDOW + 30, 2)
+
+    def test_search_many(self, fake_gamma):
+        for slug in _slugs(2):
+            fake_gamma.markets[slug] = _market(slug)
+        discovery = _discovery(fake_gamma)
+
+        results = discovery.search_many(["Bitcoin Up or Down", "Ethereum Up or Down", "Dogecoin"])
+
+        assert sorted(m["slug"] for m in results) == sorted(_slugs(2))
+
+    def test_shared_client_carries_transport(self, fake_gamma):
+        slugs = _slugs(2)
+        for slug in slugs:
+            fake_gamma.markets[slug] = _market(slug)
+        gamma = GammaClient(base_url=f"http://127.0.0.1:{fake_gamma.server_address[1]}", rate=1000)
+        discovery = SlugDiscovery(client=gamma, clock=FakeClock(WINDOW - 600))
+
+        assert list(discovery.discover(slugs)) == slugs
+        assert gamma.http.stats["requests"] == len(fake_gamma.paths) == 4
+        assert gamma.get_market_by_slug(slugs[0])["slug"] == slugs[0]
+
+        # The scanner's client stays usable after discovery shuts down
+        discovery.close()
+        assert gamma.get_market_by_slug(slugs[1])["slug"] == slugs[1]
+
+    def test_slug_timestamp(self):
+        assert slug_timestamp(f"btc-updown-15m-{WINDOW}") == WINDOW
+        assert slug_timestamp("bitcoin-up-or-down") is None
+
+
+class TestScannerDiscoveryMode:
+    """Tests for MarketScanner using SlugDiscovery."""
+
+    def test_scan_uses_discovery(self, fake_gamma):
+        fake_gamma.auto_create = True
+        discovery = _discovery(fake_gamma)
+        scanner = MarketScanner(gamma_client=object(), discovery=discovery)
+
+        markets = scanner.scan(force_refresh=True)
+
+        assert len(markets) == 16
+        assert {m.asset for m in markets} == {"BTC", "ETH"}
+        assert discovery.stats["lookups"] == 16
+
+        fake_gamma.paths.clear()
+        scanner.scan(force_refresh=True)
+        assert fake_gamma.paths == ["/markets"]
+
+    def test_constructed_slugs(self):
+        scanner = MarketScanner(gamma_client=object())
+
+        slugs = scanner._constructed_slugs(now=WINDOW - 1)
+
+        assert slugs[0] == f"btc-updown-15m-{WINDOW}"
+        assert len(slugs) == 16
+        assert slugs[8] == f"eth-updown-15m-{WINDOW}"
@@ -0,0 +1,277 @@
+"""
+Tests for the indexed wallet activity store.
+
+Fixtures are ERC1155 transfer JSONL files and trade JSON exports with a
+handful of wallets trading a few 15m markets, written to a temp directory.
+Expected values are recomputed from the raw records with plain loops.
+"""
+import os
+import json
+from collections import defaultdict
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage.wallet_activity import NULL_ADDRESS, WalletActivityStore
+
+
+T0 = 1_767_648_000
+WALLETS = [f"0x{i:040x}" for i in range(1, 9)]
+MARKETS = [f"btc-updown-15m-{T0 + k * 900}" for k in range(4)]
+MAPPING = {f"{k}{o}": {"slug": m} for k, m in enumerate(MARKETS) for o in "ud"}
+MAPPING["999"] = {"slug": ""}
+
+
+def _transfers(n, seed):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        k = int(rng.integers(0, 4))
+        sender = NULL_ADDRESS if rng.random() < 0.2 else WALLETS[int(rng.integers(0, 8))]
+        out.append({
+            "from_address": sender.upper() if rng.random() < 0.5 else sender,
+            "to_address": WALLETS[int(rng.integers(0, 8))],
+            "token_id": "999" if rng.random() < 0.05 else f"{k}{'ud'[int(rng.integers(0, 2))]}",
+            "value": float(rng.integers(1, 500)),
+            "block_timestamp": T0 + k * 900 + int(rng.integers(0, 900)),
+        })
+    return out
+
+
+def _trades(n, seed):
+    rng = np.random.default_rng(seed)
+    return [{
+        "wallet": WALLETS[int(rng.integers(0, 4))],
+        "side": "BUY" if rng.random() < 0.6 else "SELL",
+        "token_id": f"{int(rng.integers(0, 4))}u",
+        "token_amount": float(rng.integers(1, 100)),
+        "usdc_amount": round(float(rng.uniform(1, 60)), 2),
+        "timestamp": T0 + int(rng.integers(0, 3600)),
+        "tx_hash": f"0x{i:064x}",
+    } for i in range(n)]
+
+
+def _legs(transfers):
+    """(wallet, market, ts, side, amount) per non-null address, as the store should record them."""
+    legs = []
+    for t in transfers:
+        market = MAPPING.get(t["token_id"], {}).get("slug")
+        if not market:
+            continue
+        for addr, side in ((t["to_address"], "buy"), (t["from_address"], "sell")):
+            addr = addr.lower()
+            if addr != NULL_ADDRESS:
+                legs.append((addr, market, t["block_timestamp"], side, t["value"]))
+    return legs
+
+
+def _write_jsonl(path, records, tail=""):
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records) + tail)
+
+
+@pytest.fixture
+def transfers(tmp_path):
+    path = tmp_path / "transfers.jsonl"
+    records = _transfers(600, seed=1)
+    _write_jsonl(path, records[:300])
+    path.open("a").write("not json\n")
+    _write_jsonl(path, records[300:])
+    return path, records
+
+
+class TestIngest:
+    """Tests for incremental ingest and running totals."""
+
+    def test_totals_match_records(self, transfers, tmp_path):
+        path, records = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"), batch_rows=64)
+
+        assert store.ingest_transfers(str(path), MAPPING) == 601
+        legs = _legs(records)
+        assert len(store) == len(legs)
+
+        for wallet in WALLETS:
+            mine = [leg for leg in legs if leg[0] == wallet]
+            totals = store.wallet(wallet.upper())
+            assert totals["trades"] == len(mine)
+            assert totals["volume"] == pytest.approx(sum(leg[4] for leg in mine))
+            assert totals["markets"] == len({leg[1] for leg in mine})
+            assert totals["first_seen"] == min(leg[2] for leg in mine)
+            assert totals["last_seen"] == max(leg[2] for leg in mine)
+            for market in MARKETS:
+                rows = store.activity(wallet, market=market)
+                assert [r["ts"] for r in rows] == sorted(leg[2] for leg in mine if leg[1] == market)
+
+    def test_only_appended_records_are_read(self, transfers, tmp_path):
+        path, records = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+        store.ingest_transfers(str(path), MAPPING)
+        assert WalletActivityStore(str(tmp_path / "wa.db")).ingest_transfers(str(path), MAPPING) == 0
+
+        more = _transfers(50, seed=2)
+        _write_jsonl(path, more[:49], tail=json.dumps(more[49])[:15])
+        assert store.ingest_transfers(str(path), MAPPING) == 49
+        with open(path, "a") as f:
+            f.write(json.dumps(more[49])[15:] + "\n")
+        assert store.ingest_transfers(str(path), MAPPING) == 1
+
+        one_shot = WalletActivityStore(str(tmp_path / "one.db"))
+        one_shot.ingest_transfers(str(path), MAPPING)
+        assert len(store) == len(one_shot)
+        assert store.top_wallets(None) == one_shot.top_wallets(None)
+        for wallet in WALLETS:
+            assert store.wallet_markets(wallet) == one_shot.wallet_markets(wallet)
+
+    def test_limit_resumes_from_watermark(self, transfers, tmp_path):
+        path, _ = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+
+        assert store.ingest_transfers(str(path), MAPPING, limit=250) == 250
+        assert store.ingest_transfers(str(path), MAPPING, limit=250) == 250
+        assert store.ingest_transfers(str(path), MAPPING, limit=250) == 101
+
+        full = WalletActivityStore(str(tmp_path / "full.db"))
+        full.ingest_transfers(str(path), MAPPING)
+        assert store.top_wallets(None) == full.top_wallets(None)
+
+    def test_trade_exports_track_pnl(self, tmp_path):
+        path = tmp_path / "trades.json"
+        trades = _trades(120, seed=4)
+        path.write_text(json.dumps({"trades": trades[:80]}))
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+
+        assert store.ingest_trades(str(path), MAPPING) == 80
+        path.write_text(json.dumps({"trades": trades}))
+        assert store.ingest_trades(str(path), MAPPING) == 40
+        assert store.ingest_trades(str(path), MAPPING) == 0
+
+        for wallet in WALLETS[:4]:
+            mine = [t for t in trades if t["wallet"] == wallet]
+            cash = sum(t["usdc_amount"] if t["side"] == "SELL" else -t["usdc_amount"] for t in mine)
+            assert store.wallet(wallet)["pnl"] == pytest.approx(cash)
+
+        ranked = store.top_wallets(4, by="pnl")
+        assert [r["pnl"] for r in ranked] == sorted((r["pnl"] for r in ranked), reverse=True)
+
+    def test_late_mapped_tokens_are_ingested(self, transfers, tmp_path):
+        path, _ = transfers
+        partial = {t: m for t, m in MAPPING.items() if not t.startswith("0")}
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+
+        store.ingest_transfers(str(path), partial)
+        assert store.market_activity(MARKETS[0]) == []
+        assert store.unresolved() > 0
+
+        # The watermark is past those lines; the mapping update alone brings them in
+        more = _transfers(20, seed=5)
+        _write_jsonl(path, more)
+        assert store.ingest_transfers(str(path), MAPPING) == 20
+        assert store.unresolved() == 0
+
+        full = WalletActivityStore(str(tmp_path / "full.db"))
+        full.ingest_transfers(str(path), MAPPING)
+        assert len(store) == len(full)
+        assert store.top_wallets(None) == full.top_wallets(None)
+        for wallet in WALLETS:
+            assert store.wallet_markets(wallet) == full.wallet_markets(wallet)
+
+    def test_include_filter_drops_markets(self, transfers, tmp_path):
+        path, records = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+
+        store.ingest_transfers(str(path), MAPPING, include=lambda slug: slug != MARKETS[1])
+
+        assert store.market_activity(MARKETS[1]) == []
+        assert store.unresolved() == 0
+        assert len(store) == sum(1 for leg in _legs(records) if leg[1] != MARKETS[1])
+
+    @pytest.mark.parametrize("trades_first", [False, True])
+    def test_trades_and_transfers_of_a_fill_count_once(self, tmp_path, trades_first):
+        buyer, seller = WALLETS[:2]
+        transfers, trades = [], []
+        for i in range(30):
+            tx_hash = f"0x{i:064x}"
+            transfers.append({
+                "from_address": seller, "to_address": buyer, "token_id": "1u",
+                "value": 10.0 + i, "block_timestamp": T0 + 900 + i, "transaction_hash": tx_hash,
+            })
+            trades.append({
+                "wallet": buyer, "side": "BUY", "token_id": "1u", "token_amount": 10.0 + i,
+                "usdc_amount": 5.0, "timestamp": T0 + 900 + i, "tx_hash": tx_hash,
+            })
+        transfer_path, trade_path = tmp_path / "transfers.jsonl", tmp_path / "trades.json"
+        _write_jsonl(transfer_path, transfers)
+        trade_path.write_text(json.dumps(trades))
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+
+        if trades_first:
+            store.ingest_trades(str(trade_path), MAPPING)
+        store.ingest_transfers(str(transfer_path), MAPPING)
+        store.ingest_trades(str(trade_path), MAPPING)
+
+        assert len(store) == 60
+        totals = store.wallet(buyer)
+        assert totals["trades"] == 30
+        assert totals["volume"] == pytest.approx(sum(t["value"] for t in transfers))
+        assert totals["pnl"] == pytest.approx(-150.0)
+        assert store.wallet(seller)["trades"] == 30
+        window = store.top_wallets(None, start=T0, end=T0 + 3600)
+        assert {r["wallet"]: r["trades"] for r in window} == {buyer: 30, seller: 30}
+        assert {r["wallet"]: r["pnl"] for r in window}[buyer] == pytest.approx(-150.0)
+
+
+class TestQueries:
+    """Tests for ranked and windowed lookups."""
+
+    def test_windowed_ranking(self, transfers, tmp_path):
+        path, records = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+        store.ingest_transfers(str(path), MAPPING)
+        start, end = T0 + 600, T0 + 2100
+
+        volume = defaultdict(float)
+        trades = defaultdict(int)
+        for wallet, _, ts, _, amount in _legs(records):
+            if start <= ts <= end and wallet != WALLETS[0]:
+                volume[wallet] += amount
+                trades[wallet] += 1
+
+        top = store.top_wallets(3, by="volume", start=start, end=end, exclude=[WALLETS[0]])
+        expected = sorted(volume, key=lambda w: (-volume[w], w))[:3]
+        assert [r["wallet"] for r in top] == expected
+        assert [r["trades"] for r in top] == [trades[w] for w in expected]
+
+        busy = store.top_wallets(None, by="trades", start=start, end=end, min_trades=40, exclude=[WALLETS[0]])
+        assert {r["wallet"] for r in busy} == {w for w, c in trades.items() if c >= 40}
+
+        with pytest.raises(ValueError):
+            store.top_wallets(by="price")
+
+    def test_relative_timing_matches_loops(self, transfers, tmp_path):
+        path, records = transfers
+        store = WalletActivityStore(str(tmp_path / "wa.db"))
+        store.ingest_transfers(str(path), MAPPING)
+        reference = WALLETS[0]
+
+        buys = [leg for leg in _legs(records) if leg[3] == "buy"]
+        first = {}
+        for wallet, market, ts, _, _ in buys:
+            if wallet == reference:
+                first[market] = min(first.get(market, ts), ts)
+
+        timing = store.relative_timing(reference, threshold_s=10)
+
+        for wallet in WALLETS[1:]:
+            diffs = [ts - first[m] for w, m, ts, _, _ in buys if w == wallet and m in first]
+            shared = {m for w, m, _, _, _ in buys if w == wallet and m in first}
+            if not diffs:
+                assert wallet not in timing
+                continue
+            got = timing[wallet]
+            assert got["shared_markets"] == len(shared)
+            assert got["before"] == sum(d < -10 for d in diffs)
+            assert got["after"] == sum(d > 10 for d in diffs)
+            assert got["avg_seconds_diff"] == pytest.approx(sum(diffs) / len(diffs))
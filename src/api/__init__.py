@@ -1,4 +1,6 @@
 """Polymarket API clients."""
 from .clob_ws import CLOBWebSocket
+from .gamma import GammaClient
+from .gamma_transport import GammaHTTPError, GammaTransport
 
-__all__ = ["CLOBWebSocket"]
+__all__ = ["CLOBWebSocket", "GammaClient", "GammaTransport", "GammaHTTPError"]
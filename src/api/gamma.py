@@ -1,8 +1,8 @@
 """Gamma API client for market discovery."""
-import json
 from typing import List, Dict, Optional
-from urllib.request import urlopen, Request
-from urllib.parse import urlencode
+
+from ..config import DATA_DIR
+from .gamma_transport import GammaTransport
 
 
 class GammaClient:
@@ -13,27 +13,49 @@ class GammaClient:
     - Market discovery
     - Market metadata (start/end times, token IDs)
     - Profile/wallet search
+    
+    Requests go through a GammaTransport: keep-alive connections,
+    coalesced duplicate requests and an on-disk response cache with
+    per-endpoint TTLs (closed/resolved markets never expire).
     """
     
     BASE_URL = "https://gamma-api.polymarket.com"
+    DEFAULT_CACHE_DIR = str(DATA_DIR / "gamma_cache")
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        ttls: Optional[Dict[str, float]] = None,
+        pool_size: int = 8,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            cache_dir: Response cache directory (None disables disk caching)
+            ttls: Endpoint prefix -> seconds fresh, merged over the defaults
+            pool_size: Max keep-alive connections
+            max_workers: Concurrent requests for multi-query methods
+        """
         self.session_headers = {
             "Accept": "application/json",
             "User-Agent": "TradingLab/1.0",
         }
+        self.transport = GammaTransport(
+            self.BASE_URL,
+            headers=self.session_headers,
+            cache_dir=cache_dir,
+            ttls=ttls,
+            pool_size=pool_size,
+            max_workers=max_workers,
+        )
     
     def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make GET request."""
-        url = f"{self.BASE_URL}{endpoint}"
-        
-        if params:
-            url = f"{url}?{urlencode(params)}"
-        
-        request = Request(url, headers=self.session_headers)
-        
-        with urlopen(request, timeout=30) as response:
-            return json.loads(response.read().decode())
+        return self.transport.get(endpoint, params)
+    
+    def close(self):
+        """Release pooled connections and worker threads."""
+        self.transport.close()
     
     def search_markets(
         self,
@@ -105,14 +127,20 @@ class GammaClient:
         """
         markets = []
         
-        # Search for BTC and ETH 15m markets
-        for symbol in ["BTC", "ETH", "Bitcoin", "Ethereum"]:
-            for term in ["Up or Down", "15m", "15 minute"]:
-                try:
-                    results = self.search_markets(f"{symbol} {term}", limit=20)
-                    markets.extend(results)
-                except Exception:
-                    continue
+        # Search for BTC and ETH 15m markets (queries run concurrently)
+        queries = [
+            f"{symbol} {term}"
+            for symbol in ["BTC", "ETH", "Bitcoin", "Ethereum"]
+            for term in ["Up or Down", "15m", "15 minute"]
+        ]
+        results = self.transport.fan_out(
+            [("/markets", {"q": q, "limit": 20, "active": "true"}) for q in queries]
+        )
+        for result in results:
+            if isinstance(result, list):
+                markets.extend(result)
+            elif isinstance(result, dict):
+                markets.extend(result.get("markets", []))
         
         # Deduplicate by condition_id
         seen = set()
@@ -0,0 +1,449 @@
+"""
+Pooled, conditional and disk-cached HTTP transport for the Gamma API.
+
+Features:
+- Keep-alive connection pool (stdlib http.client, no extra dependency)
+- Concurrent fan-out for methods that issue several queries
+- Coalescing: identical in-flight requests share one network call
+- On-disk cache with per-endpoint TTLs, revalidated with
+  If-None-Match / If-Modified-Since when stale
+- Closed or resolved single-market responses are cached permanently
+
+Cache layout (content-addressed):
+    <cache_dir>/entries/<sha256(url)>.json   metadata + body hash
+    <cache_dir>/blobs/<sha256(body)>         response body
+
+Identical bodies (common across overlapping search queries) are stored once.
+
+Usage:
+    transport = GammaTransport("https://gamma-api.polymarket.com",
+                               cache_dir="data/gamma_cache")
+    market = transport.get("/markets/slug/btc-updown-15m-1700000000")
+"""
+import hashlib
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+# Endpoint prefix -> seconds a cached response stays fresh (longest prefix wins)
+DEFAULT_TTLS: Dict[str, float] = {
+    "/markets": 30.0,
+    "/markets/": 60.0,
+    "/markets/slug/": 60.0,
+    "/events": 60.0,
+    "/public-search": 300.0,
+}
+
+# Errors from a keep-alive connection the server closed while idle
+_RETRYABLE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class GammaHTTPError(Exception):
+    """Non-2xx response from the Gamma API."""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+def is_final_market(payload: Any) -> bool:
+    """
+    Whether a response describes markets that can no longer change.
+
+    True for a closed/resolved market, or a non-empty list of them.
+    """
+    if isinstance(payload, list):
+        return bool(payload) and all(is_final_market(item) for item in payload)
+    if not isinstance(payload, dict):
+        return False
+    if payload.get("closed") is True:
+        return True
+    return str(payload.get("umaResolutionStatus", "")).lower() == "resolved"
+
+
+def is_single_market_endpoint(endpoint: str) -> bool:
+    """Whether an endpoint returns one market (/markets/{id}, /markets/slug/{slug})."""
+    parts = [p for p in endpoint.split("?", 1)[0].split("/") if p]
+    if len(parts) == 2 and parts[0] == "markets":
+        return parts[1] != "slug"
+    return len(parts) == 3 and parts[:2] == ["markets", "slug"]
+
+
+class ConnectionPool:
+    """
+    LIFO pool of keep-alive HTTP(S) connections to one host.
+
+    Example:
+        pool = ConnectionPool("https://gamma-api.polymarket.com", size=8)
+        status, headers, body = pool.request("GET", "/markets?limit=1", {})
+    """
+
+    def __init__(self, base_url: str, size: int = 8, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.size = size
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+        # Stats
+        self.connections_opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(
+        self, method: str, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a request on a pooled connection.
+
+        A connection the server closed while idle is replaced and the
+        request retried once.
+
+        Returns:
+            (status, lowercase headers, body)
+        """
+        with self._slots:
+            for attempt in range(2):
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connect()
+
+                try:
+                    conn.request(method, path, headers=headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                except _RETRYABLE_ERRORS:
+                    conn.close()
+                    if attempt == 0:
+                        continue
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+
+                if response.will_close:
+                    conn.close()
+                else:
+                    self._idle.put(conn)
+                return (
+                    response.status,
+                    {k.lower(): v for k, v in response.getheaders()},
+                    body,
+                )
+        raise RuntimeError("unreachable")
+
+    def close(self):
+        """Close idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk response cache with a small in-memory layer.
+
+    Entries are keyed by the request URL's hash and point at a body blob
+    keyed by the body's hash. A ttl of None marks an entry permanent.
+    """
+
+    def __init__(self, cache_dir: str, memory_entries: int = 1024):
+        self.root = Path(cache_dir)
+        self.entries_dir = self.root / "entries"
+        self.blobs_dir = self.root / "blobs"
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._memory_entries = memory_entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _remember(self, key: str, entry: Dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Cached entry for a URL.
+
+        Returns:
+            Dict with url, etag, last_modified, fetched_at, ttl and body
+            (bytes), or None
+        """
+        key = self._hash(url.encode())
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+
+        try:
+            meta = json.loads((self.entries_dir / f"{key}.json").read_text())
+            body = (self.blobs_dir / meta["blob"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        entry = {**meta, "body": body}
+        self._remember(key, entry)
+        return entry
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        ttl: Optional[float],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> Dict:
+        """Store a response (ttl=None = never expires)."""
+        key = self._hash(url.encode())
+        blob = self._hash(body)
+        blob_path = self.blobs_dir / blob
+        if not blob_path.exists():
+            self._atomic_write(blob_path, body)
+
+        meta = {
+            "url": url,
+            "blob": blob,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "ttl": ttl,
+        }
+        self._atomic_write(self.entries_dir / f"{key}.json", json.dumps(meta).encode())
+
+        entry = {**meta, "body": body}
+        self._remember(key, entry)
+        return entry
+
+    def touch(self, url: str, entry: Dict, ttl: Optional[float]) -> Dict:
+        """Mark a revalidated (304) entry fresh again."""
+        return self.put(url, entry["body"], ttl, entry.get("etag"), entry.get("last_modified"))
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+class GammaTransport:
+    """
+    Keep-alive, coalescing, disk-cached GET transport.
+
+    Example:
+        transport = GammaTransport(GammaClient.BASE_URL, cache_dir="data/gamma_cache")
+        results = transport.fan_out([("/markets", {"q": "BTC"}), ("/markets", {"q": "ETH"})])
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        cache_dir: Optional[str] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        pool_size: int = 8,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+    ):
+        """
+        Args:
+            base_url: API root, e.g. https://gamma-api.polymarket.com
+            headers: Headers sent with every request
+            cache_dir: Response cache directory (None disables disk caching)
+            ttls: Endpoint prefix -> freshness seconds, merged over DEFAULT_TTLS
+            pool_size: Max open connections
+            max_workers: Threads for fan_out
+            timeout: Socket timeout per request
+        """
+        self.base_url = base_url.rstrip("/")
+        self._base_path = urlsplit(self.base_url).path
+        self.headers = dict(headers or {})
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.pool = ConnectionPool(self.base_url, size=pool_size, timeout=timeout)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "not_modified": 0,
+            "coalesced": 0,
+        }
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Freshness TTL for an endpoint (longest matching prefix)."""
+        best, ttl = -1, 0.0
+        for prefix, seconds in self.ttls.items():
+            if endpoint.startswith(prefix) and len(prefix) > best:
+                best, ttl = len(prefix), seconds
+        return ttl
+
+    @staticmethod
+    def _is_fresh(entry: Dict) -> bool:
+        ttl = entry.get("ttl")
+        return ttl is None or time.time() - entry["fetched_at"] < ttl
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Any:
+        """
+        GET an endpoint and decode the JSON body.
+
+        Fresh cache entries are returned without a request. Concurrent
+        callers asking for the same URL share one in-flight request.
+
+        Raises:
+            GammaHTTPError: On a non-2xx, non-304 response
+        """
+        query = f"?{urlencode(params)}" if params else ""
+        url = f"{self.base_url}{endpoint}{query}"
+
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None and self._is_fresh(entry):
+                self.stats["cache_hits"] += 1
+                return json.loads(entry["body"])
+
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[url] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return json.loads(future.result())
+
+        try:
+            body = self._fetch(endpoint, url, f"{self._base_path}{endpoint}{query}")
+            future.set_result(body)
+            return json.loads(body)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+    def _fetch(self, endpoint: str, url: str, path: str) -> bytes:
+        """Network fetch with conditional revalidation and cache update."""
+        headers = dict(self.headers)
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        self.stats["requests"] += 1
+        status, response_headers, body = self.pool.request("GET", path, headers)
+
+        if status == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            self.cache.touch(url, entry, self._ttl_for_body(endpoint, entry["body"]))
+            return entry["body"]
+
+        if not 200 <= status < 300:
+            raise GammaHTTPError(status, url)
+
+        if self.cache is not None:
+            self.cache.put(
+                url,
+                body,
+                self._ttl_for_body(endpoint, body),
+                etag=response_headers.get("etag"),
+                last_modified=response_headers.get("last-modified"),
+            )
+        return body
+
+    def _ttl_for_body(self, endpoint: str, body: bytes) -> Optional[float]:
+        """
+        Endpoint TTL, or None (permanent) for a closed/resolved single market.
+
+        Lists and searches keep the endpoint TTL even when every result is
+        closed: new results can still appear in them.
+        """
+        if is_single_market_endpoint(endpoint):
+            try:
+                if is_final_market(json.loads(body)):
+                    return None
+            except ValueError:
+                pass
+        return self.ttl_for(endpoint)
+
+    def fan_out(
+        self,
+        calls: List[Tuple[str, Optional[Dict]]],
+        on_error: Optional[Callable[[Tuple[str, Optional[Dict]], Exception], None]] = None,
+    ) -> List[Any]:
+        """
+        Run several GETs concurrently.
+
+        Args:
+            calls: (endpoint, params) pairs
+            on_error: Called with (call, exception) for failures
+
+        Returns:
+            Decoded results in call order (None where a call failed)
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="gamma"
+                    )
+
+        futures = [self._executor.submit(self.get, endpoint, params) for endpoint, params in calls]
+        results = []
+        for call, future in zip(calls, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if on_error is not None:
+                    on_error(call, e)
+                results.append(None)
+        return results
+
+    def close(self):
+        """Shut down fan-out workers and close pooled connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
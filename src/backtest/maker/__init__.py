@@ -16,7 +16,7 @@ from .models import (
 )
 from .engine import MakerBacktestEngine
 from .fill_simulator import FillSimulator
-from .metrics import MakerMetrics
+from .metrics import MakerMetrics, MetricsAccumulator, WindowArrays
 
 __all__ = [
     "BacktestConfig",
@@ -27,4 +27,6 @@ __all__ = [
     "MakerBacktestEngine",
     "FillSimulator",
     "MakerMetrics",
+    "MetricsAccumulator",
+    "WindowArrays",
 ]
@@ -5,13 +5,25 @@ Calculates comprehensive metrics from backtest results including:
 - P&L breakdown (resolution vs rebates)
 - Risk metrics (Sharpe, Sortino, max drawdown)
 - Entry/fill statistics
+
+Two implementations compute the same metric set:
+- MakerMetrics.calculate: one vectorized pass over NumPy arrays
+  (falls back to plain Python loops if NumPy isn't installed)
+- MetricsAccumulator: O(1) per-window streaming updates for the live
+  bot and parameter sweeps (Welford moments, running drawdown, P²
+  quantile estimates)
 """
 
 import math
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from dataclasses import dataclass
 from .models import WindowResult
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
 
 @dataclass
 class RiskMetrics:
@@ -56,6 +68,61 @@ class PnLBreakdown:
     negative_pnl_windows: int
 
 
+@dataclass
+class WindowArrays:
+    """
+    Columnar view of window results, one array per WindowResult field.
+
+    Attributes:
+        entered, yes_filled, no_filled: Boolean arrays
+        total_pnl, resolution_pnl, rebate_earned: Float arrays
+        yes_fill_price, no_fill_price: Float arrays
+    """
+    entered: Any
+    yes_filled: Any
+    no_filled: Any
+    total_pnl: Any
+    resolution_pnl: Any
+    rebate_earned: Any
+    yes_fill_price: Any
+    no_fill_price: Any
+
+    @property
+    def size(self) -> int:
+        """Number of windows."""
+        return int(self.entered.size)
+
+    @classmethod
+    def from_results(cls, results: Sequence[WindowResult]) -> "WindowArrays":
+        """Columnarize window results in a single pass."""
+        if np is None:
+            raise ImportError("WindowArrays requires numpy")
+
+        data = np.array(
+            [
+                (
+                    r.entered, r.yes_filled, r.no_filled,
+                    r.total_pnl, r.resolution_pnl, r.rebate_earned,
+                    r.yes_fill_price, r.no_fill_price,
+                )
+                for r in results
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 8)
+        columns = np.ascontiguousarray(data.T)
+
+        return cls(
+            entered=columns[0].astype(bool),
+            yes_filled=columns[1].astype(bool),
+            no_filled=columns[2].astype(bool),
+            total_pnl=columns[3],
+            resolution_pnl=columns[4],
+            rebate_earned=columns[5],
+            yes_fill_price=columns[6],
+            no_fill_price=columns[7],
+        )
+
+
 class MakerMetrics:
     """
     Calculate comprehensive performance metrics for maker strategy backtests.
@@ -72,6 +139,214 @@ class MakerMetrics:
         Returns:
             Dictionary containing all computed metrics
         """
+        if np is None:
+            return MakerMetrics._calculate_python(results)
+        return MakerMetrics.calculate_arrays(WindowArrays.from_results(results))
+
+    @staticmethod
+    def calculate_arrays(arrays: "WindowArrays") -> Dict[str, Any]:
+        """
+        Calculate all metrics from columnar window data in one pass.
+
+        Produces the same dictionary as the per-section Python helpers,
+        but every statistic is a whole-array reduction over the entered
+        windows. Sweeps that already hold results as arrays can call
+        this directly and skip building WindowResult objects.
+
+        Args:
+            arrays: Columnar window results
+
+        Returns:
+            Dictionary containing all computed metrics
+        """
+        if arrays.size == 0:
+            return {
+                "total_windows": 0,
+                "error": "No results to analyze"
+            }
+
+        mask = arrays.entered
+        pnl = arrays.total_pnl[mask]
+        yes_filled = arrays.yes_filled[mask]
+        no_filled = arrays.no_filled[mask]
+        yes_price = arrays.yes_fill_price[mask]
+        no_price = arrays.no_fill_price[mask]
+        yes_prices = yes_price[yes_filled & (yes_price > 0)]
+        no_prices = no_price[no_filled & (no_price > 0)]
+
+        n = int(pnl.size)
+        stats = {
+            "n_all": arrays.size,
+            "n": n,
+            "total_pnl": float(pnl.sum()),
+            "total_rebates": float(arrays.rebate_earned[mask].sum()),
+            "total_resolution": float(arrays.resolution_pnl[mask].sum()),
+            "yes_fills": int(yes_filled.sum()),
+            "no_fills": int(no_filled.sum()),
+            "both_fills": int((yes_filled & no_filled).sum()),
+            "single_fills": int((yes_filled ^ no_filled).sum()),
+            "yes_price_sum": float(yes_prices.sum()),
+            "yes_price_count": int(yes_prices.size),
+            "no_price_sum": float(no_prices.sum()),
+            "no_price_count": int(no_prices.size),
+        }
+
+        if n:
+            mean = stats["total_pnl"] / n
+            dev = pnl - mean
+            dev2 = dev * dev
+            wins = pnl[pnl > 0]
+            losses = pnl[pnl < 0]
+
+            cumulative = np.cumsum(pnl)
+            running_peak = np.maximum.accumulate(cumulative)
+            p25, median, p75 = np.percentile(pnl, [25, 50, 75])
+
+            stats.update({
+                "m2": float(dev2.sum()),
+                "m3": float((dev2 * dev).sum()),
+                "m4": float((dev2 * dev2).sum()),
+                "win_count": int(wins.size),
+                "loss_count": int(losses.size),
+                "gross_profit": float(wins.sum()),
+                "gross_loss": float(losses.sum()),
+                "downside_sq": float((losses * losses).sum()),
+                "largest_win": float(wins.max()) if wins.size else 0.0,
+                "largest_loss": float(losses.min()) if losses.size else 0.0,
+                "max_drawdown": max(float((running_peak - cumulative).max()), 0.0),
+                "peak": float(running_peak[-1]),
+                "min": float(pnl.min()),
+                "max": float(pnl.max()),
+                "p25": float(p25),
+                "median": float(median),
+                "p75": float(p75),
+            })
+
+        return MakerMetrics._assemble(stats)
+
+    @staticmethod
+    def _assemble(s: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the metrics dictionary from reduced statistics.
+
+        Shared by the vectorized kernel and MetricsAccumulator, so both
+        report identically shaped and rounded results.
+        """
+        n_all = s["n_all"]
+        n = s["n"]
+        total_pnl = s["total_pnl"]
+        total_rebates = s["total_rebates"]
+        both_fills = s["both_fills"]
+
+        summary = {
+            "total_windows": n_all,
+            "windows_entered": n,
+            "entry_rate": n / n_all if n_all else 0,
+            "total_pnl": round(total_pnl, 4),
+            "total_rebates": round(total_rebates, 4),
+            "total_resolution_pnl": round(s["total_resolution"], 4),
+            "avg_pnl_per_entry": round(total_pnl / n, 4) if n else 0,
+            "rebate_pct_of_total": round(
+                total_rebates / total_pnl * 100, 2
+            ) if total_pnl != 0 else 0,
+        }
+
+        fills = {
+            "total_windows": n_all,
+            "windows_entered": n,
+            "entry_rate": round(n / n_all, 4) if n_all else 0,
+            "yes_fill_count": s["yes_fills"],
+            "no_fill_count": s["no_fills"],
+            "yes_fill_rate": round(s["yes_fills"] / n, 4) if n else 0,
+            "no_fill_rate": round(s["no_fills"] / n, 4) if n else 0,
+            "both_fill_rate": round(both_fills / n, 4) if n else 0,
+            "single_fill_rate": round(s["single_fills"] / n, 4) if n else 0,
+            "avg_fill_price_yes": round(
+                s["yes_price_sum"] / s["yes_price_count"], 4
+            ) if s["yes_price_count"] else 0,
+            "avg_fill_price_no": round(
+                s["no_price_sum"] / s["no_price_count"], 4
+            ) if s["no_price_count"] else 0,
+            "delta_neutral_windows": both_fills,
+            "delta_neutral_rate": round(both_fills / n, 4) if n else 0,
+        }
+
+        if n == 0:
+            return {
+                "summary": summary,
+                "pnl": MakerMetrics._calculate_pnl_breakdown([], []),
+                "fills": fills,
+                "risk": MakerMetrics._calculate_risk_metrics([]),
+                "distribution": MakerMetrics._calculate_distribution([]),
+            }
+
+        mean = total_pnl / n
+        variance = s["m2"] / n
+        std_dev = math.sqrt(variance) if variance > 0 else 0
+        win_count = s["win_count"]
+        loss_count = s["loss_count"]
+
+        pnl_breakdown = {
+            "total_pnl": round(total_pnl, 4),
+            "resolution_pnl": round(s["total_resolution"], 4),
+            "rebate_revenue": round(total_rebates, 4),
+            "avg_pnl_per_window": round(total_pnl / n_all, 4),
+            "avg_pnl_per_entry": round(mean, 4),
+            "pnl_std_dev": round(std_dev, 4),
+            "positive_pnl_windows": win_count,
+            "negative_pnl_windows": loss_count,
+            "breakeven_windows": n - win_count - loss_count,
+        }
+
+        gross_loss = abs(s["gross_loss"])
+        profit_factor = s["gross_profit"] / gross_loss if gross_loss > 0 else float('inf')
+        sharpe = mean / std_dev if std_dev > 0 else 0
+        if loss_count:
+            downside_dev = math.sqrt(s["downside_sq"] / n)
+            sortino = mean / downside_dev if downside_dev > 0 else 0
+        else:
+            sortino = float('inf') if mean > 0 else 0
+        peak = s["peak"]
+
+        risk = {
+            "sharpe_ratio": round(sharpe, 4),
+            "sortino_ratio": round(sortino, 4) if sortino != float('inf') else "inf",
+            "max_drawdown": round(s["max_drawdown"], 4),
+            "max_drawdown_pct": round(s["max_drawdown"] / peak * 100, 2) if peak > 0 else 0,
+            "win_rate": round(win_count / n, 4),
+            "profit_factor": round(profit_factor, 4) if profit_factor != float('inf') else "inf",
+            "avg_win": round(s["gross_profit"] / win_count, 4) if win_count else 0,
+            "avg_loss": round(s["gross_loss"] / loss_count, 4) if loss_count else 0,
+            "largest_win": round(s["largest_win"], 4) if win_count else 0,
+            "largest_loss": round(s["largest_loss"], 4) if loss_count else 0,
+            "win_count": win_count,
+            "loss_count": loss_count,
+            "expectancy": round(mean, 4),
+        }
+
+        std = math.sqrt(variance) if variance > 0 else 1
+        distribution = {
+            "min": round(s["min"], 4),
+            "max": round(s["max"], 4),
+            "median": round(s["median"], 4),
+            "percentile_25": round(s["p25"], 4),
+            "percentile_75": round(s["p75"], 4),
+            "iqr": round(s["p75"] - s["p25"], 4),
+            "skewness": round(s["m3"] / (n * std ** 3), 4),
+            "kurtosis": round(s["m4"] / (n * std ** 4) - 3, 4),
+        }
+
+        return {
+            "summary": summary,
+            "pnl": pnl_breakdown,
+            "fills": fills,
+            "risk": risk,
+            "distribution": distribution,
+        }
+
+    @staticmethod
+    def _calculate_python(results: List[WindowResult]) -> Dict[str, Any]:
+        """Pure-Python metrics, used when NumPy is unavailable."""
         if not results:
             return {
                 "total_windows": 0,
@@ -396,3 +671,264 @@ class MakerMetrics:
         ])
 
         return "\n".join(lines)
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate with the P² algorithm (Jain & Chlamtac).
+
+    Keeps five markers whose heights converge on the target quantile,
+    so memory and per-update cost are O(1). The first five observations
+    are answered exactly, with the same interpolation as the batch path.
+    """
+
+    def __init__(self, p: float):
+        """
+        Args:
+            p: Target quantile in [0, 1] (e.g. 0.5 for the median)
+        """
+        self.p = p
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float) -> None:
+        """Add one observation."""
+        h = self._heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        pos = self._positions
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = h[i] + step / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + step) * (h[i + 1] - h[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - step) * (h[i] - h[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if h[i - 1] < candidate < h[i + 1]:
+                    h[i] = candidate
+                else:
+                    h[i] += step * (h[i + step] - h[i]) / (pos[i + step] - pos[i])
+                pos[i] += step
+
+    def value(self) -> float:
+        """Current quantile estimate."""
+        h = self._heights
+        if not h:
+            return 0.0
+        if len(h) < 5 or self._positions[4] == 5:
+            k = (len(h) - 1) * self.p
+            f = math.floor(k)
+            c = math.ceil(k)
+            if f == c:
+                return h[int(k)]
+            return h[f] * (c - k) + h[c] * (k - f)
+        return h[2]
+
+
+class MetricsAccumulator:
+    """
+    Incremental MakerMetrics for the live bot and parameter sweeps.
+
+    Each update is O(1): moments use Welford/Terriberry recurrences,
+    drawdown tracks the running cumulative P&L and its peak, and the
+    quartiles are P² estimates. to_metrics() returns the same structure
+    as MakerMetrics.calculate (quartiles are approximate past five
+    entered windows; everything else matches).
+
+    Example:
+        >>> acc = MetricsAccumulator()
+        >>> for result in engine.results:
+        ...     acc.update(result)
+        >>> acc.to_metrics()["risk"]["max_drawdown"]
+    """
+
+    def __init__(self):
+        self.n_all = 0
+        self.n = 0
+        self.total_pnl = 0.0
+        self.total_rebates = 0.0
+        self.total_resolution = 0.0
+
+        # Fills
+        self.yes_fills = 0
+        self.no_fills = 0
+        self.both_fills = 0
+        self.single_fills = 0
+        self.yes_price_sum = 0.0
+        self.yes_price_count = 0
+        self.no_price_sum = 0.0
+        self.no_price_count = 0
+
+        # Moments (central sums around the running mean)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+        # Wins/losses
+        self.win_count = 0
+        self.loss_count = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.downside_sq = 0.0
+        self.largest_win = 0.0
+        self.largest_loss = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+        # Drawdown
+        self.cumulative = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+        self._quantiles = {q: P2Quantile(q) for q in (0.25, 0.5, 0.75)}
+
+    def update(self, result: WindowResult) -> None:
+        """Fold one window result into the running metrics."""
+        self.add(
+            entered=result.entered,
+            total_pnl=result.total_pnl,
+            resolution_pnl=result.resolution_pnl,
+            rebate_earned=result.rebate_earned,
+            yes_filled=result.yes_filled,
+            no_filled=result.no_filled,
+            yes_fill_price=result.yes_fill_price,
+            no_fill_price=result.no_fill_price,
+        )
+
+    def add(
+        self,
+        entered: bool,
+        total_pnl: float = 0.0,
+        resolution_pnl: float = 0.0,
+        rebate_earned: float = 0.0,
+        yes_filled: bool = False,
+        no_filled: bool = False,
+        yes_fill_price: float = 0.0,
+        no_fill_price: float = 0.0,
+    ) -> None:
+        """Fold one window, given as plain values, into the running metrics."""
+        self.n_all += 1
+        if not entered:
+            return
+
+        x = total_pnl
+        n1 = self.n
+        self.n += 1
+        n = self.n
+
+        self.total_pnl += x
+        self.total_rebates += rebate_earned
+        self.total_resolution += resolution_pnl
+
+        if yes_filled:
+            self.yes_fills += 1
+            if yes_fill_price > 0:
+                self.yes_price_sum += yes_fill_price
+                self.yes_price_count += 1
+        if no_filled:
+            self.no_fills += 1
+            if no_fill_price > 0:
+                self.no_price_sum += no_fill_price
+                self.no_price_count += 1
+        if yes_filled and no_filled:
+            self.both_fills += 1
+        elif yes_filled or no_filled:
+            self.single_fills += 1
+
+        # Higher-order Welford update
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += (
+            term1 * delta_n2 * (n * n - 3 * n + 3)
+            + 6 * delta_n2 * self.m2
+            - 4 * delta_n * self.m3
+        )
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+        if x > 0:
+            self.win_count += 1
+            self.gross_profit += x
+            self.largest_win = x if self.win_count == 1 else max(self.largest_win, x)
+        elif x < 0:
+            self.loss_count += 1
+            self.gross_loss += x
+            self.downside_sq += x * x
+            self.largest_loss = x if self.loss_count == 1 else min(self.largest_loss, x)
+
+        self.min = x if n == 1 else min(self.min, x)
+        self.max = x if n == 1 else max(self.max, x)
+
+        self.cumulative += x
+        self.peak = self.cumulative if n == 1 else max(self.peak, self.cumulative)
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.cumulative)
+
+        for estimator in self._quantiles.values():
+            estimator.add(x)
+
+    def to_metrics(self) -> Dict[str, Any]:
+        """Current metrics in the MakerMetrics.calculate format."""
+        if self.n_all == 0:
+            return {
+                "total_windows": 0,
+                "error": "No results to analyze"
+            }
+
+        return MakerMetrics._assemble({
+            "n_all": self.n_all,
+            "n": self.n,
+            "total_pnl": self.total_pnl,
+            "total_rebates": self.total_rebates,
+            "total_resolution": self.total_resolution,
+            "yes_fills": self.yes_fills,
+            "no_fills": self.no_fills,
+            "both_fills": self.both_fills,
+            "single_fills": self.single_fills,
+            "yes_price_sum": self.yes_price_sum,
+            "yes_price_count": self.yes_price_count,
+            "no_price_sum": self.no_price_sum,
+            "no_price_count": self.no_price_count,
+            "m2": self.m2,
+            "m3": self.m3,
+            "m4": self.m4,
+            "win_count": self.win_count,
+            "loss_count": self.loss_count,
+            "gross_profit": self.gross_profit,
+            "gross_loss": self.gross_loss,
+            "downside_sq": self.downside_sq,
+            "largest_win": self.largest_win,
+            "largest_loss": self.largest_loss,
+            "max_drawdown": self.max_drawdown,
+            "peak": self.peak,
+            "min": self.min,
+            "max": self.max,
+            "p25": self._quantiles[0.25].value(),
+            "median": self._quantiles[0.5].value(),
+            "p75": self._quantiles[0.75].value(),
+        })
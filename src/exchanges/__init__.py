@@ -5,6 +5,8 @@ This module provides exchange abstractions and implementations:
 - BaseExchange: Abstract base class for all exchanges
 - PaperExchange: Paper trading simulator for strategy testing
 - HyperliquidExchange: Hyperliquid perpetual futures (testnet/mainnet)
+- MarketDataCache: In-memory universe, mid and L2 book snapshot
+- MatchingEngine: Queue-position L2 matching for simulated fills
 
 Usage:
     from src.exchanges import HyperliquidExchange, OrderSide, OrderType
@@ -38,7 +40,9 @@ from .base import (
     RateLimitError,
 )
 from .hyperliquid import HyperliquidExchange
-from .paper import PaperExchange
+from .market_data import BookSnapshot, MarketDataCache
+from .matching import Fill, MatchingEngine, RestingOrder
+from .paper import PaperExchange, TradeLogWriter
 
 __all__ = [
     # Base classes and types
@@ -61,4 +65,12 @@ __all__ = [
     # Implementations
     "PaperExchange",
     "HyperliquidExchange",
+    # Market data
+    "MarketDataCache",
+    "BookSnapshot",
+    # Simulation
+    "MatchingEngine",
+    "Fill",
+    "RestingOrder",
+    "TradeLogWriter",
 ]
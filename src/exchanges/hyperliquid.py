@@ -4,11 +4,17 @@ Hyperliquid exchange implementation.
 This module provides a concrete implementation of the BaseExchange interface
 for Hyperliquid perpetual futures trading. Supports both testnet and mainnet,
 with automatic mock mode when credentials are not available.
+
+Market data is served from an in-memory snapshot: the universe is cached
+with a TTL, and mids/L2 books are kept current by WebSocket subscriptions,
+falling back to a single REST call when the snapshot is missing or stale.
+Order placement and cancellation can be batched through the bulk endpoints.
 """
 
 import asyncio
 import logging
 import os
+import time
 import uuid
 from datetime import datetime
 from decimal import Decimal
@@ -31,6 +37,7 @@ from .base import (
     PositionSide,
     RateLimitError,
 )
+from .market_data import BookSnapshot, MarketDataCache
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +89,8 @@ class HyperliquidExchange(BaseExchange):
     - Mock mode when HYPERLIQUID_PRIVATE_KEY is not set
     - Retry logic with exponential backoff
     - All standard exchange operations
+    - Cached universe and WebSocket-fed mids/L2 books
+    - Bulk order placement and cancellation
 
     Environment Variables:
         HYPERLIQUID_PRIVATE_KEY: Private key for signing transactions.
@@ -143,6 +152,9 @@ class HyperliquidExchange(BaseExchange):
         testnet: bool = True,
         private_key: Optional[str] = None,
         wallet_address: Optional[str] = None,
+        universe_ttl: float = 300.0,
+        use_websocket: bool = True,
+        max_quote_age: float = 5.0,
     ) -> None:
         """
         Initialize Hyperliquid exchange.
@@ -151,6 +163,10 @@ class HyperliquidExchange(BaseExchange):
             testnet: Use testnet environment (default True for safety).
             private_key: Private key for signing. Falls back to env var.
             wallet_address: Wallet address. Falls back to env var.
+            universe_ttl: Seconds to cache the market list.
+            use_websocket: Stream mids/L2 books instead of polling REST.
+            max_quote_age: Max age in seconds of a cached quote before
+                get_ticker/get_orderbook fall back to REST.
         """
         # Check for credentials
         self._private_key = private_key or os.environ.get("HYPERLIQUID_PRIVATE_KEY")
@@ -167,6 +183,13 @@ class HyperliquidExchange(BaseExchange):
         self._info_client = None
         self._exchange_client = None
 
+        # Market data snapshot (universe, mids, books)
+        self.market_data = MarketDataCache(universe_ttl=universe_ttl)
+        self._use_websocket = use_websocket
+        self.max_quote_age = max_quote_age
+        self._ws_active = False
+        self._subscriptions: dict[str, tuple[dict[str, Any], int]] = {}
+
         # Mock state for testing
         self._mock_orders: dict[str, Order] = {}
         self._mock_positions: dict[str, Position] = {}
@@ -215,7 +238,7 @@ class HyperliquidExchange(BaseExchange):
             base_url = constants.TESTNET_API_URL if self.is_testnet else constants.MAINNET_API_URL
 
             # Initialize info client (read-only, no auth needed)
-            self._info_client = Info(base_url=base_url, skip_ws=True)
+            self._info_client = Info(base_url=base_url, skip_ws=not self._use_websocket)
 
             # Initialize exchange client (requires auth for trading)
             if self._private_key:
@@ -230,6 +253,9 @@ class HyperliquidExchange(BaseExchange):
             self.is_connected = True
             logger.info(f"Connected to Hyperliquid {'testnet' if self.is_testnet else 'mainnet'}")
 
+            if self._use_websocket:
+                self._start_market_data_feed()
+
         except ImportError as e:
             raise ConnectionError(
                 f"Failed to import hyperliquid SDK: {e}. "
@@ -247,6 +273,15 @@ class HyperliquidExchange(BaseExchange):
         if not self.is_connected:
             return
 
+        if self._ws_active and self._info_client is not None:
+            try:
+                self._info_client.disconnect_websocket()
+            except Exception as e:
+                logger.warning(f"Error closing market data feed: {e}")
+        self._ws_active = False
+        self._subscriptions.clear()
+        self.market_data.clear_prices()
+
         self._info_client = None
         self._exchange_client = None
         self.is_connected = False
@@ -257,11 +292,98 @@ class HyperliquidExchange(BaseExchange):
         if not self.is_connected:
             raise ConnectionError("Not connected to Hyperliquid. Call connect() first.")
 
+    # =========================================================================
+    # Market data feed
+    # =========================================================================
+
+    def _start_market_data_feed(self) -> None:
+        """Subscribe to allMids; on failure, reads fall back to REST."""
+        try:
+            self._subscribe("allMids", {"type": "allMids"}, self._on_all_mids)
+            self._ws_active = True
+        except Exception as e:
+            self._ws_active = False
+            logger.warning(f"Market data WebSocket unavailable, using REST: {e}")
+
+    def _subscribe(self, key: str, subscription: dict[str, Any], callback) -> None:
+        """Register a WebSocket subscription once per key."""
+        if key in self._subscriptions:
+            return
+        subscription_id = self._info_client.subscribe(subscription, callback)
+        self._subscriptions[key] = (subscription, subscription_id)
+
+    def _on_all_mids(self, message: dict[str, Any]) -> None:
+        """WebSocket callback: merge an allMids push into the snapshot."""
+        mids = message.get("data", {}).get("mids", {})
+        # Spot pairs are keyed "@<index>"; only perps are traded here
+        self.market_data.update_mids(
+            {f"{coin}-PERP": px for coin, px in mids.items() if not coin.startswith("@")}
+        )
+
+    def _on_l2_book(self, message: dict[str, Any]) -> None:
+        """WebSocket callback: replace a book from an l2Book push."""
+        self._store_l2(message.get("data", {}))
+
+    def _store_l2(self, data: dict[str, Any]) -> Optional[BookSnapshot]:
+        """Parse an l2Book payload (WebSocket or REST) into the snapshot."""
+        coin = data.get("coin")
+        levels = data.get("levels") or [[], []]
+        if not coin or len(levels) < 2:
+            return None
+
+        def parse(side: list[dict[str, Any]]) -> list[tuple[Decimal, Decimal]]:
+            return [(Decimal(str(lvl["px"])), Decimal(str(lvl["sz"]))) for lvl in side]
+
+        return self.market_data.update_book(
+            f"{coin}-PERP",
+            bids=parse(levels[0]),
+            asks=parse(levels[1]),
+            exchange_time=data.get("time"),
+        )
+
+    def subscribe_orderbook(self, symbol: str) -> bool:
+        """
+        Stream L2 updates for a symbol into the snapshot.
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTC-PERP').
+
+        Returns:
+            True if a WebSocket subscription is active for the symbol.
+        """
+        self._ensure_connected()
+
+        if self.is_mock or not self._ws_active:
+            return False
+
+        coin = symbol.replace("-PERP", "")
+        try:
+            self._subscribe(
+                f"l2Book:{coin}", {"type": "l2Book", "coin": coin}, self._on_l2_book
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to {symbol} book: {e}")
+            return False
+
+    def _is_fresh(self, received_at: float) -> bool:
+        """Whether a cached quote is recent enough to serve."""
+        return time.time() - received_at <= self.max_quote_age
+
+    # =========================================================================
+    # Markets
+    # =========================================================================
+
     @_with_retry(max_retries=3)
-    async def get_markets(self) -> list[Market]:
+    async def get_markets(self, force_refresh: bool = False) -> list[Market]:
         """
         Fetch all available perpetual markets.
 
+        Served from the cache while it is within universe_ttl.
+
+        Args:
+            force_refresh: Refetch even if the cache is fresh.
+
         Returns:
             List of Market objects for all tradeable perpetuals.
 
@@ -270,8 +392,13 @@ class HyperliquidExchange(BaseExchange):
         """
         self._ensure_connected()
 
+        if not force_refresh and self.market_data.markets_fresh():
+            return self.market_data.get_markets()
+
         if self.is_mock:
-            return [Market(**m) for m in self.MOCK_MARKETS]
+            markets = [Market(**m) for m in self.MOCK_MARKETS]
+            self.market_data.set_markets(markets)
+            return markets
 
         try:
             # Fetch meta info from Hyperliquid
@@ -298,6 +425,7 @@ class HyperliquidExchange(BaseExchange):
                 )
                 markets.append(market)
 
+            self.market_data.set_markets(markets)
             return markets
 
         except Exception as e:
@@ -315,11 +443,11 @@ class HyperliquidExchange(BaseExchange):
         Returns:
             Market object if found, None otherwise.
         """
-        markets = await self.get_markets()
-        for market in markets:
-            if market.symbol == symbol:
-                return market
-        return None
+        self._ensure_connected()
+
+        if not self.market_data.markets_fresh():
+            await self.get_markets()
+        return self.market_data.get_market(symbol)
 
     @_with_retry(max_retries=3)
     async def get_balance(self, currency: Optional[str] = None) -> list[Balance]:
@@ -543,31 +671,14 @@ class HyperliquidExchange(BaseExchange):
             statuses = data.get("statuses", [{}])
             status_info = statuses[0] if statuses else {}
 
-            # Determine order status
-            if "filled" in status_info:
-                filled_info = status_info["filled"]
-                status = OrderStatus.FILLED
-                filled_qty = Decimal(str(filled_info.get("totalSz", quantity)))
-                avg_price = Decimal(str(filled_info.get("avgPx", price or 0)))
-            elif "resting" in status_info:
-                status = OrderStatus.OPEN
-                filled_qty = Decimal("0")
-                avg_price = None
-            else:
-                status = OrderStatus.PENDING
-                filled_qty = Decimal("0")
-                avg_price = None
-
-            order = Order(
-                order_id=str(status_info.get("oid", order_id)),
+            order = self._order_from_status(
+                status_info,
+                order_id=order_id,
                 symbol=symbol,
                 side=side,
                 order_type=order_type,
                 quantity=quantity,
                 price=price,
-                status=status,
-                filled_quantity=filled_qty,
-                average_fill_price=avg_price,
                 client_order_id=client_order_id,
                 reduce_only=reduce_only,
                 time_in_force=time_in_force,
@@ -584,6 +695,161 @@ class HyperliquidExchange(BaseExchange):
             logger.error(f"Failed to place order: {e}")
             raise OrderError(f"Failed to place order: {e}")
 
+    def _order_from_status(
+        self,
+        status_info: dict[str, Any],
+        order_id: str,
+        symbol: str,
+        side: OrderSide,
+        order_type: OrderType,
+        quantity: Decimal,
+        price: Optional[Decimal],
+        client_order_id: Optional[str],
+        reduce_only: bool,
+        time_in_force: str,
+        stop_price: Optional[Decimal] = None,
+        raw: Optional[dict[str, Any]] = None,
+    ) -> Order:
+        """Build an Order from one entry of an order response's statuses."""
+        if "filled" in status_info:
+            filled_info = status_info["filled"]
+            status = OrderStatus.FILLED
+            filled_qty = Decimal(str(filled_info.get("totalSz", quantity)))
+            avg_price = Decimal(str(filled_info.get("avgPx", price or 0)))
+            exchange_id = filled_info.get("oid", order_id)
+        elif "resting" in status_info:
+            status = OrderStatus.OPEN
+            filled_qty = Decimal("0")
+            avg_price = None
+            exchange_id = status_info["resting"].get("oid", order_id)
+        elif "error" in status_info:
+            status = OrderStatus.REJECTED
+            filled_qty = Decimal("0")
+            avg_price = None
+            exchange_id = order_id
+        else:
+            status = OrderStatus.PENDING
+            filled_qty = Decimal("0")
+            avg_price = None
+            exchange_id = status_info.get("oid", order_id)
+
+        return Order(
+            order_id=str(exchange_id),
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            status=status,
+            filled_quantity=filled_qty,
+            average_fill_price=avg_price,
+            client_order_id=client_order_id,
+            reduce_only=reduce_only,
+            time_in_force=time_in_force,
+            stop_price=stop_price,
+            raw=raw if raw is not None else status_info,
+        )
+
+    @_with_retry(max_retries=3)
+    async def place_orders(self, orders: list[dict[str, Any]]) -> list[Order]:
+        """
+        Place several limit orders in one signed request.
+
+        Each entry takes the keyword arguments of place_order (symbol, side,
+        order_type, quantity, price, reduce_only, client_order_id,
+        time_in_force). Market and stop orders are not batched; use
+        place_order for those.
+
+        Args:
+            orders: Order specifications.
+
+        Returns:
+            Orders in request order. Orders the exchange rejected have
+            status REJECTED and the error in raw.
+
+        Raises:
+            OrderError: If validation or the whole request fails.
+        """
+        self._ensure_connected()
+
+        if not orders:
+            return []
+
+        specs = []
+        for spec in orders:
+            order_type = spec.get("order_type", OrderType.LIMIT)
+            if order_type != OrderType.LIMIT:
+                raise OrderError(f"Bulk placement supports limit orders only, got {order_type}")
+            if spec.get("price") is None:
+                raise OrderError("Price required for limit orders")
+            specs.append({
+                "symbol": spec["symbol"],
+                "side": spec["side"],
+                "order_type": order_type,
+                "quantity": spec["quantity"],
+                "price": spec["price"],
+                "reduce_only": spec.get("reduce_only", False),
+                "client_order_id": spec.get("client_order_id"),
+                "time_in_force": spec.get("time_in_force", "GTC"),
+            })
+
+        if self.is_mock:
+            placed = []
+            for spec in specs:
+                placed.append(await self._mock_place_order(
+                    order_id=spec["client_order_id"] or str(uuid.uuid4()),
+                    symbol=spec["symbol"],
+                    side=spec["side"],
+                    order_type=spec["order_type"],
+                    quantity=spec["quantity"],
+                    price=spec["price"],
+                    reduce_only=spec["reduce_only"],
+                    time_in_force=spec["time_in_force"],
+                    stop_price=None,
+                ))
+            return placed
+
+        try:
+            tif_map = {"GTC": "Gtc", "IOC": "Ioc", "FOK": "Fok"}
+            requests = [
+                {
+                    "coin": spec["symbol"].replace("-PERP", ""),
+                    "is_buy": spec["side"] == OrderSide.BUY,
+                    "sz": float(spec["quantity"]),
+                    "limit_px": float(spec["price"]),
+                    "order_type": {"limit": {"tif": tif_map.get(spec["time_in_force"], "Gtc")}},
+                    "reduce_only": spec["reduce_only"],
+                }
+                for spec in specs
+            ]
+
+            result = await asyncio.to_thread(self._exchange_client.bulk_orders, requests)
+
+            if result.get("status") == "err":
+                raise OrderError(f"Bulk order failed: {result.get('response', 'Unknown error')}")
+
+            statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+            placed = []
+            for i, spec in enumerate(specs):
+                status_info = statuses[i] if i < len(statuses) else {}
+                order = self._order_from_status(
+                    status_info,
+                    order_id=spec["client_order_id"] or str(uuid.uuid4()),
+                    **spec,
+                )
+                if order.status == OrderStatus.REJECTED:
+                    logger.warning(f"Order rejected: {status_info.get('error')}")
+                placed.append(order)
+
+            logger.info(f"Bulk placed {len(placed)} orders")
+            return placed
+
+        except OrderError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to place orders: {e}")
+            raise OrderError(f"Failed to place orders: {e}")
+
     async def _mock_place_order(
         self,
         order_id: str,
@@ -754,6 +1020,98 @@ class HyperliquidExchange(BaseExchange):
         logger.info(f"[MOCK] Order cancelled: {order_id}")
         return order
 
+    @_with_retry(max_retries=3)
+    async def cancel_orders(self, orders: list[tuple[str, str]]) -> list[Order]:
+        """
+        Cancel several orders in one signed request.
+
+        Args:
+            orders: (order_id, symbol) pairs.
+
+        Returns:
+            Orders that were cancelled. Failures are logged and skipped,
+            matching cancel_all_orders.
+
+        Raises:
+            OrderError: If the whole request fails.
+        """
+        self._ensure_connected()
+
+        if not orders:
+            return []
+
+        if self.is_mock:
+            cancelled = []
+            for order_id, _ in orders:
+                try:
+                    cancelled.append(await self._mock_cancel_order(order_id))
+                except OrderError as e:
+                    logger.warning(f"Failed to cancel order {order_id}: {e}")
+            return cancelled
+
+        try:
+            requests = [
+                {"coin": symbol.replace("-PERP", ""), "oid": int(order_id)}
+                for order_id, symbol in orders
+            ]
+            result = await asyncio.to_thread(self._exchange_client.bulk_cancel, requests)
+
+            if result.get("status") == "err":
+                raise OrderError(f"Bulk cancel failed: {result.get('response', 'Unknown error')}")
+
+            statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+            cancelled = []
+            for i, (order_id, symbol) in enumerate(orders):
+                status_info = statuses[i] if i < len(statuses) else None
+                if status_info != "success":
+                    logger.warning(f"Failed to cancel order {order_id}: {status_info}")
+                    continue
+                cancelled.append(Order(
+                    order_id=order_id,
+                    symbol=symbol,
+                    side=OrderSide.BUY,  # Unknown
+                    order_type=OrderType.LIMIT,  # Unknown
+                    quantity=Decimal("0"),
+                    status=OrderStatus.CANCELLED,
+                    raw=result,
+                ))
+
+            logger.info(f"Bulk cancelled {len(cancelled)}/{len(orders)} orders")
+            return cancelled
+
+        except OrderError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to cancel orders: {e}")
+            raise OrderError(f"Failed to cancel orders: {e}")
+
+    async def cancel_all_orders(self, symbol: Optional[str] = None) -> list[Order]:
+        """
+        Cancel all open orders with a single bulk cancel.
+
+        Args:
+            symbol: Cancel only orders for this symbol, or None for all.
+
+        Returns:
+            List of cancelled orders.
+        """
+        open_orders = await self.get_open_orders(symbol)
+        if not open_orders:
+            return []
+
+        cancelled = await self.cancel_orders([(o.order_id, o.symbol) for o in open_orders])
+        if not self.is_mock:
+            # Keep the side/price/size we already know from the open-order list
+            known = {o.order_id: o for o in open_orders}
+            for order in cancelled:
+                original = known.get(order.order_id)
+                if original is not None:
+                    original.status = OrderStatus.CANCELLED
+                    order.side = original.side
+                    order.quantity = original.quantity
+                    order.price = original.price
+        return cancelled
+
     @_with_retry(max_retries=3)
     async def get_order(
         self,
@@ -921,11 +1279,16 @@ class HyperliquidExchange(BaseExchange):
         """
         Fetch current ticker/price data for a symbol.
 
+        Served from the streamed snapshot when it is within max_quote_age;
+        otherwise one REST all_mids call refreshes every symbol's mid.
+
         Args:
             symbol: Trading symbol.
 
         Returns:
-            Dictionary with price data (bid, ask, last, etc.).
+            Dictionary with price data (bid, ask, last, etc.), plus the
+            snapshot time ("timestamp", epoch seconds), its "age" in
+            seconds and "source" ("ws" or "rest").
         """
         self._ensure_connected()
 
@@ -939,21 +1302,82 @@ class HyperliquidExchange(BaseExchange):
             return mock_prices.get(symbol, {"bid": "100", "ask": "100", "last": "100"})
 
         try:
-            all_mids = await asyncio.to_thread(self._info_client.all_mids)
-            coin = symbol.replace("-PERP", "")
+            cached = self.market_data.get_mid(symbol)
+            source = "ws"
+            if cached is None or not self._ws_active or not self._is_fresh(cached[1]):
+                all_mids = await asyncio.to_thread(self._info_client.all_mids)
+                self.market_data.update_mids(
+                    {f"{coin}-PERP": px for coin, px in all_mids.items()
+                     if not coin.startswith("@")}
+                )
+                cached = self.market_data.get_mid(symbol)
+                source = "rest"
 
-            mid_price = all_mids.get(coin)
-            if mid_price:
-                return {
-                    "symbol": symbol,
-                    "mid": mid_price,
-                    "bid": str(float(mid_price) * 0.9999),
-                    "ask": str(float(mid_price) * 1.0001),
-                    "last": mid_price,
-                }
+            if cached is None:
+                return {}
 
-            return {}
+            mid, updated_at = cached
+            book = self.market_data.get_book(symbol)
+            if book is not None and book.best_bid and book.best_ask and self._is_fresh(
+                book.received_at
+            ):
+                bid, ask = str(book.best_bid), str(book.best_ask)
+            else:
+                bid, ask = str(float(mid) * 0.9999), str(float(mid) * 1.0001)
+
+            return {
+                "symbol": symbol,
+                "mid": str(mid),
+                "bid": bid,
+                "ask": ask,
+                "last": str(mid),
+                "timestamp": updated_at,
+                "age": time.time() - updated_at,
+                "source": source,
+            }
 
         except Exception as e:
             logger.error(f"Failed to fetch ticker: {e}")
             return {}
+
+    async def get_orderbook(self, symbol: str, depth: int = 20) -> dict[str, Any]:
+        """
+        Fetch the L2 order book for a symbol.
+
+        Served from the streamed snapshot when subscribed and within
+        max_quote_age; otherwise fetched with one REST l2_snapshot call.
+
+        Args:
+            symbol: Trading symbol.
+            depth: Max levels per side.
+
+        Returns:
+            Dictionary with "bids"/"asks" as (price, size) Decimal levels,
+            best first, plus "timestamp", "age" and "source".
+        """
+        self._ensure_connected()
+
+        if self.is_mock:
+            ticker = await self.get_ticker(symbol)
+            book = BookSnapshot(
+                symbol=symbol,
+                bids=[(Decimal(ticker["bid"]), Decimal("1"))],
+                asks=[(Decimal(ticker["ask"]), Decimal("1"))],
+            )
+            return {**book.to_dict(depth), "source": "mock"}
+
+        try:
+            book = self.market_data.get_book(symbol)
+            if book is not None and self._ws_active and self._is_fresh(book.received_at):
+                return {**book.to_dict(depth), "source": "ws"}
+
+            coin = symbol.replace("-PERP", "")
+            data = await asyncio.to_thread(self._info_client.l2_snapshot, coin)
+            book = self._store_l2(data)
+            if book is None:
+                return {}
+            return {**book.to_dict(depth), "source": "rest"}
+
+        except Exception as e:
+            logger.error(f"Failed to fetch order book: {e}")
+            return {}
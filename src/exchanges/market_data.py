@@ -0,0 +1,174 @@
+"""
+In-memory market data snapshot for exchange implementations.
+
+Holds the market universe (with a TTL and a symbol index), mid prices and
+L2 books so that reads on the hot path are dictionary lookups instead of
+REST round-trips. Writers are typically WebSocket callbacks running on the
+SDK's thread, so every access goes through a lock.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Optional
+
+from .base import Market
+
+
+@dataclass
+class BookSnapshot:
+    """
+    Level-2 order book snapshot.
+
+    Attributes:
+        symbol: Market symbol (e.g., 'BTC-PERP').
+        bids: (price, size) levels, best first.
+        asks: (price, size) levels, best first.
+        exchange_time: Exchange timestamp in milliseconds, if provided.
+        received_at: Local wall-clock time (epoch seconds) of the update.
+    """
+
+    symbol: str
+    bids: list[tuple[Decimal, Decimal]] = field(default_factory=list)
+    asks: list[tuple[Decimal, Decimal]] = field(default_factory=list)
+    exchange_time: Optional[int] = None
+    received_at: float = field(default_factory=time.time)
+
+    @property
+    def best_bid(self) -> Optional[Decimal]:
+        """Highest bid price, if any."""
+        return self.bids[0][0] if self.bids else None
+
+    @property
+    def best_ask(self) -> Optional[Decimal]:
+        """Lowest ask price, if any."""
+        return self.asks[0][0] if self.asks else None
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the snapshot was received."""
+        return (now if now is not None else time.time()) - self.received_at
+
+    def to_dict(self, depth: Optional[int] = None) -> dict[str, Any]:
+        """Serialize to the order book dict returned by exchanges."""
+        return {
+            "symbol": self.symbol,
+            "bids": self.bids[:depth] if depth else list(self.bids),
+            "asks": self.asks[:depth] if depth else list(self.asks),
+            "exchange_time": self.exchange_time,
+            "timestamp": self.received_at,
+            "age": self.age(),
+        }
+
+
+class MarketDataCache:
+    """
+    Thread-safe snapshot of markets, mids and L2 books.
+
+    Example:
+        >>> cache = MarketDataCache(universe_ttl=300)
+        >>> cache.set_markets(markets)
+        >>> cache.update_mids({"BTC-PERP": "50000"})
+        >>> price, updated_at = cache.get_mid("BTC-PERP")
+    """
+
+    def __init__(self, universe_ttl: float = 300.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            universe_ttl: Seconds before the market list must be refetched.
+        """
+        self.universe_ttl = universe_ttl
+
+        self._lock = threading.Lock()
+        self._markets: list[Market] = []
+        self._market_index: dict[str, Market] = {}
+        self._markets_loaded_at: Optional[float] = None
+
+        self._mids: dict[str, tuple[Decimal, float]] = {}
+        self._books: dict[str, BookSnapshot] = {}
+
+    # -------------------------------------------------------------------------
+    # Universe
+    # -------------------------------------------------------------------------
+
+    def set_markets(self, markets: list[Market]) -> None:
+        """Replace the market list and rebuild the symbol index."""
+        with self._lock:
+            self._markets = list(markets)
+            self._market_index = {m.symbol: m for m in self._markets}
+            self._markets_loaded_at = time.monotonic()
+
+    def markets_fresh(self) -> bool:
+        """Whether the market list is loaded and within its TTL."""
+        loaded_at = self._markets_loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at < self.universe_ttl
+
+    def get_markets(self) -> list[Market]:
+        """Cached market list (may be empty or stale; check markets_fresh)."""
+        with self._lock:
+            return list(self._markets)
+
+    def get_market(self, symbol: str) -> Optional[Market]:
+        """O(1) market lookup by symbol."""
+        return self._market_index.get(symbol)
+
+    def invalidate_markets(self) -> None:
+        """Force the next read to refetch the universe."""
+        self._markets_loaded_at = None
+
+    # -------------------------------------------------------------------------
+    # Prices
+    # -------------------------------------------------------------------------
+
+    def update_mids(
+        self,
+        mids: dict[str, Any],
+        received_at: Optional[float] = None,
+    ) -> None:
+        """
+        Merge mid prices into the snapshot.
+
+        Args:
+            mids: Symbol -> mid price (str, float or Decimal).
+            received_at: Wall-clock time of the update (default now).
+        """
+        stamp = received_at if received_at is not None else time.time()
+        parsed = {symbol: (Decimal(str(px)), stamp) for symbol, px in mids.items()}
+        with self._lock:
+            self._mids.update(parsed)
+
+    def get_mid(self, symbol: str) -> Optional[tuple[Decimal, float]]:
+        """Latest (mid, received_at) for a symbol, if known."""
+        return self._mids.get(symbol)
+
+    def update_book(
+        self,
+        symbol: str,
+        bids: list[tuple[Decimal, Decimal]],
+        asks: list[tuple[Decimal, Decimal]],
+        exchange_time: Optional[int] = None,
+        received_at: Optional[float] = None,
+    ) -> BookSnapshot:
+        """Replace the book for a symbol and return the new snapshot."""
+        book = BookSnapshot(
+            symbol=symbol,
+            bids=bids,
+            asks=asks,
+            exchange_time=exchange_time,
+            received_at=received_at if received_at is not None else time.time(),
+        )
+        with self._lock:
+            self._books[symbol] = book
+        return book
+
+    def get_book(self, symbol: str) -> Optional[BookSnapshot]:
+        """Latest book for a symbol, if known."""
+        return self._books.get(symbol)
+
+    def clear_prices(self) -> None:
+        """Drop all mids and books (e.g. after the feed disconnects)."""
+        with self._lock:
+            self._mids.clear()
+            self._books.clear()
@@ -0,0 +1,414 @@
+"""
+Queue-position matching engine for simulated exchanges.
+
+Keeps a per-symbol L2 book fed from recorded or live snapshots and trade
+prints, and decides when simulated orders fill:
+
+- Taker orders walk the opposite side of the book, consuming displayed
+  size level by level (so large orders pay the spread and the depth).
+- Resting orders join the back of the queue at their price level. They
+  fill only after enough volume trades at that level to clear the size
+  displayed ahead of them, or when the market trades through their price.
+- Book snapshots never grow the queue ahead of an order; a level that
+  shrinks without trades is treated as cancellations ahead of us.
+
+All quantities and prices are Decimals to match the exchange dataclasses.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from .base import OrderSide
+
+ZERO = Decimal("0")
+
+
+@dataclass
+class Fill:
+    """
+    A simulated execution.
+
+    Attributes:
+        order_id: Order that was filled.
+        symbol: Trading symbol.
+        side: Side of the filled order.
+        price: Execution price.
+        quantity: Executed quantity.
+        is_maker: True for resting-order fills, False for taker fills.
+    """
+
+    order_id: str
+    symbol: str
+    side: OrderSide
+    price: Decimal
+    quantity: Decimal
+    is_maker: bool
+
+
+@dataclass
+class RestingOrder:
+    """
+    A simulated order waiting in the book.
+
+    Attributes:
+        order_id: Order ID.
+        side: Buy or sell.
+        price: Limit price.
+        remaining: Unfilled quantity.
+        queue_ahead: Displayed size ahead of this order at its level.
+    """
+
+    order_id: str
+    side: OrderSide
+    price: Decimal
+    remaining: Decimal
+    queue_ahead: Decimal
+
+
+class _SymbolBook:
+    """Displayed levels plus our resting orders for one symbol."""
+
+    def __init__(self) -> None:
+        self.bids: dict[Decimal, Decimal] = {}
+        self.asks: dict[Decimal, Decimal] = {}
+        self.bid_prices: list[Decimal] = []  # ascending
+        self.ask_prices: list[Decimal] = []  # ascending
+
+        # Our resting orders: price -> FIFO list, with sorted price keys
+        self.resting_bids: dict[Decimal, list[RestingOrder]] = {}
+        self.resting_asks: dict[Decimal, list[RestingOrder]] = {}
+        self.resting_bid_prices: list[Decimal] = []
+        self.resting_ask_prices: list[Decimal] = []
+
+    @property
+    def best_bid(self) -> Optional[Decimal]:
+        return self.bid_prices[-1] if self.bid_prices else None
+
+    @property
+    def best_ask(self) -> Optional[Decimal]:
+        return self.ask_prices[0] if self.ask_prices else None
+
+    def resting(self, side: OrderSide) -> tuple[dict[Decimal, list[RestingOrder]], list[Decimal]]:
+        if side == OrderSide.BUY:
+            return self.resting_bids, self.resting_bid_prices
+        return self.resting_asks, self.resting_ask_prices
+
+
+class MatchingEngine:
+    """
+    L2 book simulator with queue-position fills.
+
+    Example:
+        >>> engine = MatchingEngine()
+        >>> engine.update_book("BTC-PERP", bids=[(49990, 2)], asks=[(50010, 1)])
+        >>> engine.add_order("a1", "BTC-PERP", OrderSide.BUY, Decimal("49990"), Decimal("1"))
+        >>> engine.on_trade("BTC-PERP", Decimal("49990"), Decimal("3"))
+        [Fill(order_id='a1', ...)]
+    """
+
+    def __init__(self) -> None:
+        self._books: dict[str, _SymbolBook] = {}
+        self._orders: dict[str, tuple[str, RestingOrder]] = {}
+
+    # -------------------------------------------------------------------------
+    # Market data
+    # -------------------------------------------------------------------------
+
+    def has_book(self, symbol: str) -> bool:
+        """Whether a snapshot has been loaded for the symbol."""
+        return symbol in self._books
+
+    def best_bid_ask(self, symbol: str) -> tuple[Optional[Decimal], Optional[Decimal]]:
+        """Best displayed bid and ask."""
+        book = self._books.get(symbol)
+        if book is None:
+            return None, None
+        return book.best_bid, book.best_ask
+
+    def mid(self, symbol: str) -> Optional[Decimal]:
+        """Mid price, or the one-sided best price if a side is empty."""
+        bid, ask = self.best_bid_ask(symbol)
+        if bid is not None and ask is not None:
+            return (bid + ask) / 2
+        return bid if bid is not None else ask
+
+    def update_book(
+        self,
+        symbol: str,
+        bids: Iterable[tuple],
+        asks: Iterable[tuple],
+    ) -> list[Fill]:
+        """
+        Replace the displayed book with a snapshot.
+
+        Args:
+            symbol: Trading symbol.
+            bids: (price, size) levels in any order.
+            asks: (price, size) levels in any order.
+
+        Returns:
+            Fills for resting orders the new book crossed.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _SymbolBook()
+
+        book.bids = {Decimal(str(p)): Decimal(str(s)) for p, s in bids if Decimal(str(s)) > 0}
+        book.asks = {Decimal(str(p)): Decimal(str(s)) for p, s in asks if Decimal(str(s)) > 0}
+        book.bid_prices = sorted(book.bids)
+        book.ask_prices = sorted(book.asks)
+
+        # Size that disappeared from a level can't still be ahead of us
+        for levels, displayed in (
+            (book.resting_bids, book.bids),
+            (book.resting_asks, book.asks),
+        ):
+            for price, queue in levels.items():
+                shown = displayed.get(price, ZERO)
+                for resting in queue:
+                    if resting.queue_ahead > shown:
+                        resting.queue_ahead = shown
+
+        fills = []
+        if book.resting_bid_prices and book.best_ask is not None:
+            fills += self._fill_through(symbol, book, OrderSide.BUY, book.best_ask)
+        if book.resting_ask_prices and book.best_bid is not None:
+            fills += self._fill_through(symbol, book, OrderSide.SELL, book.best_bid)
+        return fills
+
+    def on_trade(
+        self,
+        symbol: str,
+        price: Decimal,
+        size: Decimal,
+        aggressor: Optional[OrderSide] = None,
+    ) -> list[Fill]:
+        """
+        Apply a trade print to resting orders.
+
+        Orders priced better than the print fill in full; orders at the
+        print price fill with whatever volume exceeds their queue_ahead.
+
+        Args:
+            symbol: Trading symbol.
+            price: Trade price.
+            size: Trade size.
+            aggressor: Taker side if known; None checks both sides.
+
+        Returns:
+            Fills for resting orders.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+
+        price = Decimal(str(price))
+        size = Decimal(str(size))
+        fills = []
+        if aggressor in (None, OrderSide.SELL) and book.resting_bid_prices:
+            fills += self._fill_at_print(symbol, book, OrderSide.BUY, price, size)
+        if aggressor in (None, OrderSide.BUY) and book.resting_ask_prices:
+            fills += self._fill_at_print(symbol, book, OrderSide.SELL, price, size)
+        return fills
+
+    # -------------------------------------------------------------------------
+    # Orders
+    # -------------------------------------------------------------------------
+
+    def available(self, symbol: str, side: OrderSide, limit: Optional[Decimal] = None) -> Decimal:
+        """Displayed size a taker on `side` could hit, up to `limit`."""
+        book = self._books.get(symbol)
+        if book is None:
+            return ZERO
+        if side == OrderSide.BUY:
+            prices = book.ask_prices
+            if limit is not None:
+                prices = prices[: bisect_right(prices, limit)]
+            return sum((book.asks[p] for p in prices), ZERO)
+        prices = book.bid_prices
+        if limit is not None:
+            prices = prices[bisect_left(prices, limit):]
+        return sum((book.bids[p] for p in prices), ZERO)
+
+    def take(
+        self,
+        order_id: str,
+        symbol: str,
+        side: OrderSide,
+        quantity: Decimal,
+        limit: Optional[Decimal] = None,
+    ) -> list[Fill]:
+        """
+        Execute a taker order against displayed liquidity.
+
+        Consumed size is removed from the local book until the next
+        snapshot replaces it.
+
+        Args:
+            order_id: Order ID for the fills.
+            symbol: Trading symbol.
+            side: Taker side.
+            quantity: Quantity to execute.
+            limit: Worst acceptable price (None = market).
+
+        Returns:
+            Fills, best price first. May total less than `quantity`.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+
+        if side == OrderSide.BUY:
+            levels, prices = book.asks, book.ask_prices
+            walk = list(prices)
+            crosses = (lambda p: p <= limit) if limit is not None else (lambda p: True)
+        else:
+            levels, prices = book.bids, book.bid_prices
+            walk = list(reversed(prices))
+            crosses = (lambda p: p >= limit) if limit is not None else (lambda p: True)
+
+        fills = []
+        remaining = quantity
+        for price in walk:
+            if remaining <= 0 or not crosses(price):
+                break
+            traded = min(remaining, levels[price])
+            fills.append(Fill(order_id, symbol, side, price, traded, is_maker=False))
+            remaining -= traded
+            if traded == levels[price]:
+                del levels[price]
+                prices.remove(price)
+            else:
+                levels[price] -= traded
+        return fills
+
+    def add_order(
+        self,
+        order_id: str,
+        symbol: str,
+        side: OrderSide,
+        price: Decimal,
+        quantity: Decimal,
+    ) -> RestingOrder:
+        """
+        Rest an order at the back of its price level's queue.
+
+        Args:
+            order_id: Order ID.
+            symbol: Trading symbol (must have a book).
+            side: Buy or sell.
+            price: Limit price.
+            quantity: Quantity to rest.
+
+        Returns:
+            The resting order.
+        """
+        book = self._books[symbol]
+        displayed = book.bids if side == OrderSide.BUY else book.asks
+        levels, prices = book.resting(side)
+
+        queue = levels.get(price)
+        if queue is None:
+            queue = levels[price] = []
+            insort(prices, price)
+
+        ahead = displayed.get(price, ZERO) + sum((r.remaining for r in queue), ZERO)
+        resting = RestingOrder(order_id, side, price, quantity, ahead)
+        queue.append(resting)
+        self._orders[order_id] = (symbol, resting)
+        return resting
+
+    def cancel(self, order_id: str) -> Optional[RestingOrder]:
+        """Remove a resting order; returns it if it was resting."""
+        entry = self._orders.pop(order_id, None)
+        if entry is None:
+            return None
+        symbol, resting = entry
+        book = self._books[symbol]
+        levels, prices = book.resting(resting.side)
+        queue = levels[resting.price]
+        queue.remove(resting)
+        if not queue:
+            del levels[resting.price]
+            prices.remove(resting.price)
+        return resting
+
+    def get_resting(self, order_id: str) -> Optional[RestingOrder]:
+        """Resting order by ID, if still in the book."""
+        entry = self._orders.get(order_id)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Drop all books and resting orders."""
+        self._books.clear()
+        self._orders.clear()
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _crossed_prices(self, book: _SymbolBook, side: OrderSide, price: Decimal,
+                        inclusive: bool) -> list[Decimal]:
+        """Resting price levels on `side` that `price` trades through."""
+        _, prices = book.resting(side)
+        if side == OrderSide.BUY:
+            start = bisect_left(prices, price) if inclusive else bisect_right(prices, price)
+            return prices[start:]
+        end = bisect_right(prices, price) if inclusive else bisect_left(prices, price)
+        return prices[:end]
+
+    def _fill_through(self, symbol: str, book: _SymbolBook, side: OrderSide,
+                      price: Decimal) -> list[Fill]:
+        """Fill whole levels the opposite best price has reached."""
+        fills = []
+        for level in self._crossed_prices(book, side, price, inclusive=True):
+            fills += self._fill_level(symbol, book, side, level, None)
+        return fills
+
+    def _fill_at_print(self, symbol: str, book: _SymbolBook, side: OrderSide,
+                       price: Decimal, size: Decimal) -> list[Fill]:
+        """Fill levels traded through in full, then the print level by queue."""
+        levels, _ = book.resting(side)
+        fills = []
+        for level in self._crossed_prices(book, side, price, inclusive=False):
+            fills += self._fill_level(symbol, book, side, level, None)
+        if price in levels:
+            fills += self._fill_level(symbol, book, side, price, size)
+        return fills
+
+    def _fill_level(self, symbol: str, book: _SymbolBook, side: OrderSide,
+                    price: Decimal, volume: Optional[Decimal]) -> list[Fill]:
+        """
+        Fill orders at one level.
+
+        volume=None fills every order in full; otherwise each order fills
+        with the volume left after clearing its queue_ahead.
+        """
+        levels, prices = book.resting(side)
+        queue = levels[price]
+        fills = []
+        survivors = []
+        for resting in queue:
+            if volume is None:
+                qty = resting.remaining
+            else:
+                qty = min(resting.remaining, max(ZERO, volume - resting.queue_ahead))
+                resting.queue_ahead = max(ZERO, resting.queue_ahead - volume)
+
+            if qty > 0:
+                resting.remaining -= qty
+                fills.append(Fill(resting.order_id, symbol, side, price, qty, is_maker=True))
+
+            if resting.remaining > 0:
+                survivors.append(resting)
+            else:
+                self._orders.pop(resting.order_id, None)
+
+        if survivors:
+            levels[price] = survivors
+        else:
+            del levels[price]
+            prices.remove(price)
+        return fills
@@ -9,21 +9,26 @@ Useful for:
 
 Features:
 - Simulated order matching with instant fills
+- Optional L2 matching engine with queue-position fills (see update_book)
 - Position tracking with weighted average entry price
 - Realized and unrealized P&L calculation
-- Trade history logging to JSONL file
+- Trade history logging to JSONL file through a persistent buffered writer
 - Configurable initial balance and slippage
 - reset() method for backtesting iterations
 - set_price() method for external price updates
 """
 
+import atexit
 import json
 import logging
+import threading
+import time
 import uuid
+import weakref
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from .base import (
     Balance,
@@ -38,9 +43,105 @@ from .base import (
     Position,
     PositionSide,
 )
+from .matching import Fill, MatchingEngine
 
 logger = logging.getLogger(__name__)
 
+# Writers with a file or lines pending, flushed at interpreter exit
+_open_writers: "weakref.WeakSet[TradeLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_writers() -> None:
+    """Write out pending lines of every live TradeLogWriter."""
+    for writer in list(_open_writers):
+        writer.flush()
+
+
+class TradeLogWriter:
+    """
+    Append-only JSONL writer that keeps its file open.
+
+    Lines are buffered in memory and written in batches once
+    `flush_every` lines are pending or `flush_interval` seconds have
+    passed since the last flush. An idle timer flushes a partial batch
+    `flush_interval` seconds after its first line even if no further
+    writes arrive, and pending lines are flushed at interpreter exit.
+    Call flush() before reading the file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = 1000,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize writer.
+
+        Args:
+            path: Log file path (parent directories are created).
+            flush_every: Pending lines that trigger a flush.
+            flush_interval: Max seconds between flushes while writing.
+        """
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._file = None
+        self._pending: list[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self.lines_written = 0
+
+    def write(self, data: dict[str, Any]) -> None:
+        """Queue a record; flushes when the batch is full or old."""
+        line = json.dumps(data)
+        with self._lock:
+            self._pending.append(line)
+            if (
+                len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+            elif self._timer is None:
+                # Idle flush so a quiet period doesn't strand the batch
+                _open_writers.add(self)
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending records to disk."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", buffering=1 << 16)
+                    _open_writers.add(self)
+                self._file.write("\n".join(self._pending) + "\n")
+                self._file.flush()
+                self.lines_written += len(self._pending)
+            except Exception as e:
+                logger.warning(f"Failed to write to trade log: {e}")
+            self._pending.clear()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            _open_writers.discard(self)
+
 
 class PaperExchange(BaseExchange):
     """
@@ -50,6 +151,11 @@ class PaperExchange(BaseExchange):
     at the current price (or specified limit price). Tracks positions
     and calculates P&L in real-time.
 
+    Once an L2 snapshot has been loaded for a symbol with update_book(),
+    orders on that symbol go through the matching engine instead: market
+    and marketable limit orders walk the book, and the rest of a limit
+    order rests in the queue and fills from record_trade() prints.
+
     Attributes:
         initial_balance: Starting balance for paper trading.
         balance: Current available balance.
@@ -61,6 +167,7 @@ class PaperExchange(BaseExchange):
         slippage_bps: Slippage in basis points (100 bps = 1%).
         log_trades: Whether to log trades to file.
         log_path: Path to trade log file.
+        matching: L2 matching engine for symbols with book data.
     """
 
     def __init__(
@@ -71,6 +178,8 @@ class PaperExchange(BaseExchange):
         log_path: str = "data/paper_trades.jsonl",
         testnet: bool = True,
         mock_mode: bool = True,
+        log_flush_every: int = 1000,
+        log_flush_interval: float = 1.0,
     ) -> None:
         """
         Initialize paper trading exchange.
@@ -82,6 +191,8 @@ class PaperExchange(BaseExchange):
             log_path: Path to trade log file.
             testnet: Ignored for paper trading (always simulated).
             mock_mode: Ignored for paper trading (always mock).
+            log_flush_every: Buffered log lines before a write.
+            log_flush_interval: Max seconds between log writes.
         """
         super().__init__(testnet=True, mock_mode=True)
         self._name = "paper"
@@ -107,6 +218,14 @@ class PaperExchange(BaseExchange):
         self.slippage_bps = Decimal(str(slippage_bps))
         self.log_trades = log_trades
         self.log_path = Path(log_path)
+        self._log_writer = TradeLogWriter(
+            self.log_path,
+            flush_every=log_flush_every,
+            flush_interval=log_flush_interval,
+        )
+
+        # Book-driven matching (only for symbols with snapshots)
+        self.matching = MatchingEngine()
 
         # Default markets
         self._markets: list[Market] = [
@@ -163,6 +282,7 @@ class PaperExchange(BaseExchange):
         self.is_connected = False
         summary = self.get_pnl_summary()
         self._log_event("DISCONNECTED", summary)
+        self._log_writer.close()
         logger.info(f"Paper exchange disconnected. Final P&L: {summary['total_pnl']}")
 
     async def get_markets(self) -> list[Market]:
@@ -273,25 +393,16 @@ class PaperExchange(BaseExchange):
         if order_type == OrderType.LIMIT and price is None:
             raise OrderError("Limit orders require a price")
 
+        if self.matching.has_book(symbol):
+            return self._place_book_order(
+                symbol, side, order_type, quantity, price,
+                reduce_only, client_order_id, time_in_force,
+            )
+
         # Determine fill price
         fill_price = self._determine_fill_price(symbol, side, order_type, price)
 
-        # Check balance for opening/increasing position
-        # For perpetual futures, we use margin (leverage). Default to 10x leverage.
-        # This means we only need 10% of notional as margin.
-        leverage = Decimal("10")
-        required_margin = (quantity * fill_price) / leverage
-        if not reduce_only:
-            # Check if this increases position or opens new one
-            existing_pos = self.positions.get(symbol)
-            if existing_pos is None or (
-                (side == OrderSide.BUY and existing_pos.is_long)
-                or (side == OrderSide.SELL and existing_pos.is_short)
-            ):
-                if self.balance < required_margin:
-                    raise InsufficientBalanceError(
-                        f"Insufficient balance: {self.balance} < {required_margin}"
-                    )
+        self._check_margin(symbol, side, quantity, fill_price, reduce_only)
 
         # Generate order ID
         order_id = str(uuid.uuid4())[:8]
@@ -338,8 +449,8 @@ class PaperExchange(BaseExchange):
         """
         Cancel an order.
 
-        Since paper orders fill instantly, this is rarely used.
-        Provided for interface compatibility.
+        Only orders resting in a simulated book (see update_book) can
+        still be open; instantly filled orders can't be cancelled.
         """
         if order_id not in self.orders:
             raise OrderError(f"Order not found: {order_id}")
@@ -348,6 +459,7 @@ class PaperExchange(BaseExchange):
         if order.status == OrderStatus.FILLED:
             raise OrderError("Cannot cancel filled order")
 
+        self.matching.cancel(order_id)
         order.status = OrderStatus.CANCELLED
         order.updated_at = datetime.now(timezone.utc)
 
@@ -368,7 +480,7 @@ class PaperExchange(BaseExchange):
         """
         Get open orders.
 
-        Since paper orders fill instantly, this usually returns empty.
+        Only orders resting in a simulated book can be open.
         """
         open_orders = [o for o in self.orders.values() if o.is_open]
         if symbol:
@@ -404,6 +516,61 @@ class PaperExchange(BaseExchange):
                     pos.entry_price - self.current_prices[symbol]
                 ) * pos.quantity
 
+    def update_book(
+        self,
+        symbol: str,
+        bids: Iterable[tuple],
+        asks: Iterable[tuple],
+    ) -> list[Order]:
+        """
+        Load an L2 snapshot (recorded or live) for a symbol.
+
+        Enables book matching for the symbol, marks positions at the mid
+        and fills resting orders the new book crosses.
+
+        Args:
+            symbol: Trading symbol.
+            bids: (price, size) levels.
+            asks: (price, size) levels.
+
+        Returns:
+            Orders that received fills.
+        """
+        fills = self.matching.update_book(symbol, bids, asks)
+        mid = self.matching.mid(symbol)
+        if mid is not None:
+            self.set_price(symbol, mid)
+        return self._apply_fills(fills)
+
+    def record_trade(
+        self,
+        symbol: str,
+        price: Decimal | float | str,
+        size: Decimal | float | str,
+        aggressor: Optional[OrderSide] = None,
+    ) -> list[Order]:
+        """
+        Feed a trade print to the matching engine.
+
+        Resting orders at the print price fill once the volume traded
+        there exceeds the queue ahead of them; orders priced through the
+        print fill in full.
+
+        Args:
+            symbol: Trading symbol.
+            price: Trade price.
+            size: Trade size.
+            aggressor: Taker side if known.
+
+        Returns:
+            Orders that received fills.
+        """
+        return self._apply_fills(self.matching.on_trade(symbol, price, size, aggressor))
+
+    def flush_log(self) -> None:
+        """Write buffered log lines to disk."""
+        self._log_writer.flush()
+
     def get_trade_history(self) -> list[dict[str, Any]]:
         """Get complete trade history."""
         return self.trade_history.copy()
@@ -441,6 +608,8 @@ class PaperExchange(BaseExchange):
         self.orders.clear()
         self.trade_history.clear()
         self.current_prices.clear()
+        self.matching.clear()
+        self._log_writer.flush()
         self.is_connected = False
 
         logger.info("Paper exchange reset to initial state")
@@ -460,6 +629,123 @@ class PaperExchange(BaseExchange):
     # Private Methods
     # =========================================================================
 
+    def _check_margin(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: Decimal,
+        price: Decimal,
+        reduce_only: bool,
+    ) -> None:
+        """
+        Check balance for opening/increasing a position.
+
+        For perpetual futures, we use margin (leverage). Default to 10x leverage.
+        This means we only need 10% of notional as margin.
+        """
+        leverage = Decimal("10")
+        required_margin = (quantity * price) / leverage
+        if not reduce_only:
+            # Check if this increases position or opens new one
+            existing_pos = self.positions.get(symbol)
+            if existing_pos is None or (
+                (side == OrderSide.BUY and existing_pos.is_long)
+                or (side == OrderSide.SELL and existing_pos.is_short)
+            ):
+                if self.balance < required_margin:
+                    raise InsufficientBalanceError(
+                        f"Insufficient balance: {self.balance} < {required_margin}"
+                    )
+
+    def _place_book_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        order_type: OrderType,
+        quantity: Decimal,
+        price: Optional[Decimal],
+        reduce_only: bool,
+        client_order_id: Optional[str],
+        time_in_force: str,
+    ) -> Order:
+        """
+        Place an order against the symbol's simulated L2 book.
+
+        The marketable part fills against displayed liquidity. Market,
+        IOC and FOK remainders are cancelled; GTC limit remainders rest
+        at the back of the queue.
+        """
+        limit = Decimal(str(price)) if order_type == OrderType.LIMIT else None
+        best_bid, best_ask = self.matching.best_bid_ask(symbol)
+        reference = limit or (best_ask if side == OrderSide.BUY else best_bid)
+        if reference is None:
+            raise OrderError(f"No liquidity in {symbol} book for market order")
+
+        self._check_margin(symbol, side, quantity, reference, reduce_only)
+
+        now = datetime.now(timezone.utc)
+        order = Order(
+            order_id=str(uuid.uuid4())[:8],
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=limit,
+            status=OrderStatus.OPEN,
+            created_at=now,
+            updated_at=now,
+            client_order_id=client_order_id,
+            reduce_only=reduce_only,
+            time_in_force=time_in_force,
+        )
+        self.orders[order.order_id] = order
+
+        if time_in_force == "FOK" and self.matching.available(symbol, side, limit) < quantity:
+            order.status = OrderStatus.CANCELLED
+            return order
+
+        self._apply_fills(self.matching.take(order.order_id, symbol, side, quantity, limit))
+
+        remaining = order.remaining_quantity
+        if remaining > 0:
+            if limit is None or time_in_force in ("IOC", "FOK"):
+                order.status = OrderStatus.CANCELLED
+            else:
+                self.matching.add_order(order.order_id, symbol, side, limit, remaining)
+
+        return order
+
+    def _apply_fills(self, fills: list[Fill]) -> list[Order]:
+        """Apply engine fills to orders, positions and the trade log."""
+        touched: dict[str, Order] = {}
+        for fill in fills:
+            order = self.orders.get(fill.order_id)
+            if order is None:
+                continue
+
+            prior = order.filled_quantity
+            order.filled_quantity = prior + fill.quantity
+            order.average_fill_price = (
+                (order.average_fill_price or Decimal("0")) * prior + fill.price * fill.quantity
+            ) / order.filled_quantity
+            order.status = (
+                OrderStatus.FILLED
+                if order.filled_quantity >= order.quantity
+                else OrderStatus.PARTIALLY_FILLED
+            )
+            order.updated_at = datetime.now(timezone.utc)
+
+            self._update_position(order.symbol, order.side, fill.quantity, fill.price)
+            self._log_trade(
+                order,
+                quantity=fill.quantity,
+                price=fill.price,
+                liquidity="maker" if fill.is_maker else "taker",
+            )
+            touched[order.order_id] = order
+
+        return list(touched.values())
+
     def _determine_fill_price(
         self,
         symbol: str,
@@ -592,18 +878,26 @@ class PaperExchange(BaseExchange):
                     total += (pos.entry_price - current) * pos.quantity
         return total
 
-    def _log_trade(self, order: Order) -> None:
-        """Log a trade to history and optionally to file."""
+    def _log_trade(
+        self,
+        order: Order,
+        quantity: Optional[Decimal] = None,
+        price: Optional[Decimal] = None,
+        liquidity: Optional[str] = None,
+    ) -> None:
+        """Log a trade (or a partial fill) to history and optionally to file."""
         trade = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "order_id": order.order_id,
             "symbol": order.symbol,
             "side": order.side.value,
-            "quantity": str(order.quantity),
-            "price": str(order.average_fill_price),
+            "quantity": str(quantity if quantity is not None else order.quantity),
+            "price": str(price if price is not None else order.average_fill_price),
             "balance_after": str(self.balance),
             "realized_pnl": str(self.realized_pnl),
         }
+        if liquidity is not None:
+            trade["liquidity"] = liquidity
         self.trade_history.append(trade)
 
         if self.log_trades:
@@ -620,10 +914,5 @@ class PaperExchange(BaseExchange):
             self._write_to_log(entry)
 
     def _write_to_log(self, data: dict[str, Any]) -> None:
-        """Write data to log file."""
-        try:
-            self.log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(data) + "\n")
-        except Exception as e:
-            logger.warning(f"Failed to write to trade log: {e}")
+        """Queue data for the log file."""
+        self._log_writer.write(data)
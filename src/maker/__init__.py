@@ -9,14 +9,16 @@ This module provides tools for:
 - Risk monitoring with kill switch
 - 15-minute market discovery
 - Rebate tracking and analytics
+- Cycle latency tracing and on-demand profiling
 """
 
 from .delta_tracker import DeltaTracker, TrackedPosition
 from .paper_simulator import MakerPaperSimulator
 from .dual_order import DualOrderExecutor, OrderResult, DualOrderResult
-from .risk_limits import RiskMonitor, Alert
+from .risk_limits import RiskMonitor, Alert, KillSwitchWatcher
 from .market_finder import MarketFinder, Market15Min
 from .bot import MakerBot, BotState
+from .tracing import CycleTracer, SamplingProfiler
 
 # Optional imports that may not exist
 try:
@@ -41,9 +43,13 @@ __all__ = [
     # Risk management
     "RiskMonitor",
     "Alert",
+    "KillSwitchWatcher",
     # Market discovery
     "MarketFinder",
     "Market15Min",
+    # Observability
+    "CycleTracer",
+    "SamplingProfiler",
 ]
 
 # Add rebate monitor exports if available
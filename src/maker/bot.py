@@ -10,6 +10,7 @@ Key Features:
 - Position limits enforced
 - Delta tracking integration
 - Clean shutdown on Ctrl+C
+- Per-stage latency tracing and on-demand sampling profiler
 
 Example:
     >>> bot = MakerBot(paper_mode=True)
@@ -44,6 +45,7 @@ from .delta_tracker import DeltaTracker
 from .risk_limits import RiskMonitor
 from .paper_simulator import MakerPaperSimulator
 from .dual_order import DualOrderExecutor, DualOrderResult
+from .tracing import CycleTracer, SamplingProfiler
 
 from ..config import (
     PROJECT_ROOT,
@@ -210,8 +212,14 @@ class MakerBot:
             "max_delta_pct": max_delta_pct or MAX_DELTA_PCT,
         }
 
+        # Tracing and on-demand profiling
+        self.tracer = CycleTracer()
+        self.profiler = SamplingProfiler(output_dir=PROJECT_ROOT / "data" / "profiles")
+        self._profile_trigger_path = PROJECT_ROOT / ".profile"
+
         # Initialize components
         self.market_finder = MarketFinder(assets=self.assets)
+        self.market_finder.tracer = self.tracer
         self.delta_tracker = DeltaTracker(max_delta_pct=risk_config["max_delta_pct"])
         self.risk_monitor = RiskMonitor(config=risk_config, project_root=PROJECT_ROOT)
 
@@ -222,7 +230,7 @@ class MakerBot:
             max_concurrent_positions=self.max_concurrent,
             max_daily_loss=float(risk_config["max_daily_loss"]),
             log_trades=True,
-            log_path="data/maker_bot_trades.jsonl",
+            log_path=str(PROJECT_ROOT / "data" / "maker_bot_trades.jsonl"),
         )
 
         # Dual order executor (for live mode)
@@ -259,6 +267,7 @@ class MakerBot:
         except (ValueError, RuntimeError):
             # Signal handlers can only be set in main thread
             pass
+        self.profiler.install_signal_trigger()
 
     def _signal_handler(self, signum: int, frame: Any) -> None:
         """Handle shutdown signals."""
@@ -278,6 +287,9 @@ class MakerBot:
         6. Check for resolved markets
         7. Update state
 
+        Each stage runs inside a tracing span; the per-stage breakdown is
+        returned under "latency_ms" and kept in self.tracer.
+
         Returns:
             Dictionary with cycle results
         """
@@ -288,9 +300,15 @@ class MakerBot:
             "errors": [],
         }
 
+        self.tracer.start_cycle(cycle_result["cycle_number"])
+        self.profiler.check_signal_trigger()
+        self.profiler.check_trigger_file(self._profile_trigger_path)
+
         try:
             # 1. Check kill switch
-            if self.risk_monitor.check_kill_switch():
+            with self.tracer.span("kill_switch"):
+                kill_switch_active = self.risk_monitor.check_kill_switch()
+            if kill_switch_active:
                 cycle_result["actions"].append("HALTED: Kill switch active")
                 logger.warning("Kill switch is active - skipping cycle")
                 # Still update cycle state for halted cycles
@@ -309,7 +327,8 @@ class MakerBot:
                 return cycle_result
 
             # 2. Find active 15-minute markets
-            markets = self.market_finder.find_active_markets()
+            with self.tracer.span("discovery"):
+                markets = self.market_finder.find_active_markets()
             cycle_result["markets_found"] = len(markets)
 
             if not markets:
@@ -336,7 +355,8 @@ class MakerBot:
                         continue
 
                     # Check entry criteria
-                    entry_check = self._check_entry_criteria(market)
+                    with self.tracer.span("entry_checks"):
+                        entry_check = self._check_entry_criteria(market)
                     if not entry_check["pass"]:
                         cycle_result["actions"].append(
                             f"Skip {market.slug}: {entry_check['reason']}"
@@ -344,10 +364,11 @@ class MakerBot:
                         continue
 
                     # Check risk limits
-                    can_open, reason = self.risk_monitor.can_open_position(
-                        size=float(self.position_size * 2),  # Both legs
-                        market_id=market.condition_id,
-                    )
+                    with self.tracer.span("risk_checks"):
+                        can_open, reason = self.risk_monitor.can_open_position(
+                            size=float(self.position_size * 2),  # Both legs
+                            market_id=market.condition_id,
+                        )
 
                     if not can_open:
                         cycle_result["actions"].append(f"Risk blocked {market.slug}: {reason}")
@@ -355,7 +376,8 @@ class MakerBot:
                         continue
 
                     # 5. Place delta-neutral orders
-                    result = await self._place_delta_neutral_position(market)
+                    with self.tracer.span("order_placement"):
+                        result = await self._place_delta_neutral_position(market)
 
                     if result["success"]:
                         cycle_result["actions"].append(
@@ -373,7 +395,8 @@ class MakerBot:
                         break
 
             # 6. Check for resolved markets
-            resolved_results = await self._check_resolutions()
+            with self.tracer.span("resolutions"):
+                resolved_results = await self._check_resolutions()
             for res in resolved_results:
                 cycle_result["actions"].append(
                     f"Resolved {res['market_id']}: outcome={res['outcome']}, pnl={res['pnl']}"
@@ -399,6 +422,13 @@ class MakerBot:
             self.state.last_error = error_msg
             logger.error(error_msg, exc_info=True)
 
+        finally:
+            trace = self.tracer.end_cycle()
+            if trace is not None:
+                cycle_result["latency_ms"] = {"total": round(trace.total_ms, 3), **{
+                    name: round(ms, 3) for name, ms in trace.spans.items()
+                }}
+
         return cycle_result
 
     def _check_entry_criteria(self, market: Market15Min) -> dict[str, Any]:
@@ -512,14 +542,15 @@ class MakerBot:
                 if self._dual_executor is None:
                     return {"success": False, "error": "No dual executor configured"}
 
-                result: DualOrderResult = await self._dual_executor.place_delta_neutral(
-                    market=market.slug,
-                    yes_token_id=market.yes_token_id,
-                    no_token_id=market.no_token_id,
-                    size=size,
-                    yes_price=yes_price,
-                    no_price=no_price,
-                )
+                with self.tracer.span("api.place_delta_neutral"):
+                    result: DualOrderResult = await self._dual_executor.place_delta_neutral(
+                        market=market.slug,
+                        yes_token_id=market.yes_token_id,
+                        no_token_id=market.no_token_id,
+                        size=size,
+                        yes_price=yes_price,
+                        no_price=no_price,
+                    )
 
                 if result.success:
                     # Track in delta tracker
@@ -591,7 +622,8 @@ class MakerBot:
                     continue
 
                 # Try to get market state
-                market = self.market_finder.get_market_by_condition(market_id)
+                with self.tracer.span("api.get_market_by_condition"):
+                    market = self.market_finder.get_market_by_condition(market_id)
 
                 # Check if market has resolved (time-based for paper mode)
                 if market and market.seconds_to_resolution <= 0:
@@ -719,6 +751,7 @@ class MakerBot:
             "delta_status": self.delta_tracker.get_position_report(),
             "paper_stats": self.paper_simulator.get_stats() if self.paper_mode else None,
             "pending_resolutions": list(self._pending_resolutions.keys()),
+            "latency": self.tracer.get_breakdown(),
         }
 
     def activate_kill_switch(self, reason: str = "Manual activation") -> None:
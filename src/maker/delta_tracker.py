@@ -13,6 +13,10 @@ Example:
     ...     print("Rebalancing required!")
 
 Note:
+    Portfolio delta and exposure are running totals updated on each
+    add/fill/remove, so quote-path checks are O(1) regardless of how
+    many markets are open.
+
     Delta = sum of (yes_size - no_size) across all positions.
     For perfect delta-neutrality, delta should be 0.
     Alert threshold is configurable via max_delta_pct (default 5%).
@@ -22,7 +26,7 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +109,52 @@ class TrackedPosition:
         }
 
 
+@dataclass
+class PositionDiscrepancy:
+    """
+    One mismatch between the tracker and an exchange snapshot.
+
+    Attributes:
+        market_id: The market identifier.
+        kind: "size" (both sides hold it, sizes differ), "missing_in_tracker"
+              or "missing_in_exchange".
+        tracker_yes: Tracked YES size (0 if missing in tracker).
+        tracker_no: Tracked NO size (0 if missing in tracker).
+        exchange_yes: Exchange YES size (0 if missing in exchange).
+        exchange_no: Exchange NO size (0 if missing in exchange).
+    """
+
+    market_id: str
+    kind: str
+    tracker_yes: Decimal
+    tracker_no: Decimal
+    exchange_yes: Decimal
+    exchange_no: Decimal
+
+    @property
+    def yes_diff(self) -> Decimal:
+        """Absolute YES size difference."""
+        return abs(self.tracker_yes - self.exchange_yes)
+
+    @property
+    def no_diff(self) -> Decimal:
+        """Absolute NO size difference."""
+        return abs(self.tracker_no - self.exchange_no)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert discrepancy to dictionary representation."""
+        return {
+            "market_id": self.market_id,
+            "kind": self.kind,
+            "tracker_yes": str(self.tracker_yes),
+            "tracker_no": str(self.tracker_no),
+            "exchange_yes": str(self.exchange_yes),
+            "exchange_no": str(self.exchange_no),
+            "yes_diff": str(self.yes_diff),
+            "no_diff": str(self.no_diff),
+        }
+
+
 class DeltaTrackerError(Exception):
     """Raised when delta tracker operations fail."""
 
@@ -122,6 +172,8 @@ class DeltaTracker:
     Attributes:
         max_delta_pct: Maximum allowed delta as percentage of total exposure (default 5%).
         positions: Dictionary of tracked positions, keyed by market_id.
+            Mutate positions through add_position/record_fill/remove_position
+            so the running totals stay in sync (or call recompute_totals()).
 
     Example:
         >>> tracker = DeltaTracker(max_delta_pct=0.05)
@@ -143,6 +195,12 @@ class DeltaTracker:
         self.max_delta_pct = Decimal(str(max_delta_pct))
         self.positions: dict[str, TrackedPosition] = {}
 
+        # Running portfolio totals
+        self._total_delta = Decimal("0")
+        self._total_cost = Decimal("0")
+        self._total_yes_exposure = Decimal("0")
+        self._total_no_exposure = Decimal("0")
+
         logger.info(f"DeltaTracker initialized with max_delta_pct={max_delta_pct}")
 
     def add_position(
@@ -210,6 +268,7 @@ class DeltaTracker:
 
         # Store position
         self.positions[market_id] = position
+        self._apply_totals(position, 1)
 
         # Check if rebalancing is needed
         if self.needs_rebalance():
@@ -238,6 +297,7 @@ class DeltaTracker:
         position = self.positions.pop(market_id, None)
 
         if position is not None:
+            self._apply_totals(position, -1)
             logger.info(
                 f"Removed position {market_id}: delta was {position.delta}, "
                 f"portfolio delta now {self.get_delta()}"
@@ -247,6 +307,93 @@ class DeltaTracker:
 
         return position
 
+    def record_fill(
+        self,
+        market_id: str,
+        outcome: str,
+        size: float,
+        price: float,
+    ) -> TrackedPosition:
+        """
+        Apply a fill to an existing position, updating portfolio totals.
+
+        Args:
+            market_id: The market identifier.
+            outcome: "yes" or "no".
+            size: Filled size; positive for buys, negative for sells.
+            price: Fill price (0-1).
+
+        Returns:
+            The updated TrackedPosition.
+
+        Raises:
+            DeltaTrackerError: If the position is unknown or the fill is invalid.
+        """
+        position = self.positions.get(market_id)
+        if position is None:
+            raise DeltaTrackerError(f"No position for market {market_id}")
+
+        outcome = outcome.lower()
+        if outcome not in ("yes", "no"):
+            raise DeltaTrackerError(f"Outcome must be 'yes' or 'no', got {outcome}")
+
+        size_decimal = Decimal(str(size))
+        price_decimal = Decimal(str(price))
+
+        if not (Decimal("0") < price_decimal <= Decimal("1")):
+            raise DeltaTrackerError(f"Fill price must be between 0 and 1, got {price}")
+
+        current = position.yes_size if outcome == "yes" else position.no_size
+        new_size = current + size_decimal
+        if new_size < Decimal("0"):
+            raise DeltaTrackerError(
+                f"Fill would leave negative {outcome.upper()} size for {market_id}"
+            )
+
+        self._apply_totals(position, -1)
+
+        if outcome == "yes":
+            if size_decimal > 0:
+                # Buys move the average entry price; sells keep it
+                position.yes_price = (
+                    current * position.yes_price + size_decimal * price_decimal
+                ) / new_size
+            position.yes_size = new_size
+        else:
+            if size_decimal > 0:
+                position.no_price = (
+                    current * position.no_price + size_decimal * price_decimal
+                ) / new_size
+            position.no_size = new_size
+
+        position.total_cost = position.yes_exposure + position.no_exposure
+        position.last_updated = _utc_now()
+
+        self._apply_totals(position, 1)
+
+        logger.debug(
+            f"Fill {market_id} {outcome.upper()} {size_decimal}@{price_decimal}: "
+            f"position delta={position.delta}, portfolio delta={self._total_delta}"
+        )
+
+        return position
+
+    def _apply_totals(self, position: TrackedPosition, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a position's contribution to the totals."""
+        self._total_delta += sign * position.delta
+        self._total_cost += sign * position.total_cost
+        self._total_yes_exposure += sign * position.yes_exposure
+        self._total_no_exposure += sign * position.no_exposure
+
+    def recompute_totals(self) -> None:
+        """Rebuild running totals from scratch (after direct edits to positions)."""
+        self._total_delta = Decimal("0")
+        self._total_cost = Decimal("0")
+        self._total_yes_exposure = Decimal("0")
+        self._total_no_exposure = Decimal("0")
+        for position in self.positions.values():
+            self._apply_totals(position, 1)
+
     def get_position(self, market_id: str) -> Optional[TrackedPosition]:
         """
         Get a specific position by market_id.
@@ -269,11 +416,7 @@ class DeltaTracker:
         Returns:
             Total delta: sum of (yes_size - no_size) for all positions.
         """
-        total_delta = Decimal("0")
-        for position in self.positions.values():
-            total_delta += position.delta
-
-        return float(total_delta)
+        return float(self._total_delta)
 
     def get_total_exposure(self) -> float:
         """
@@ -282,11 +425,7 @@ class DeltaTracker:
         Returns:
             Total exposure: sum of total_cost for all positions.
         """
-        total_exposure = Decimal("0")
-        for position in self.positions.values():
-            total_exposure += position.total_cost
-
-        return float(total_exposure)
+        return float(self._total_cost)
 
     def get_yes_exposure(self) -> float:
         """
@@ -295,11 +434,7 @@ class DeltaTracker:
         Returns:
             Total YES exposure in dollars.
         """
-        total_yes = Decimal("0")
-        for position in self.positions.values():
-            total_yes += position.yes_exposure
-
-        return float(total_yes)
+        return float(self._total_yes_exposure)
 
     def get_no_exposure(self) -> float:
         """
@@ -308,11 +443,7 @@ class DeltaTracker:
         Returns:
             Total NO exposure in dollars.
         """
-        total_no = Decimal("0")
-        for position in self.positions.values():
-            total_no += position.no_exposure
-
-        return float(total_no)
+        return float(self._total_no_exposure)
 
     def needs_rebalance(self) -> bool:
         """
@@ -324,10 +455,7 @@ class DeltaTracker:
         if not self.positions:
             return False
 
-        delta = Decimal(str(self.get_delta()))
-        threshold = self._get_delta_threshold()
-
-        return abs(delta) > threshold
+        return abs(self._total_delta) > self._get_delta_threshold()
 
     def get_position_report(self) -> dict[str, Any]:
         """
@@ -380,6 +508,101 @@ class DeltaTracker:
             "is_portfolio_neutral": abs(delta) < Decimal("0.01"),
         }
 
+    def diff_snapshot(
+        self,
+        exchange_positions: dict[str, dict[str, float]],
+        tolerance: Decimal = Decimal("0.0001"),
+    ) -> list[PositionDiscrepancy]:
+        """
+        Diff a full exchange position snapshot against the tracker in one pass.
+
+        Args:
+            exchange_positions: {market_id: {"yes_size": X, "no_size": Y}}
+                                (see snapshot_from_rows for per-token rows).
+            tolerance: Size difference ignored as rounding noise.
+
+        Returns:
+            Discrepancies only; an empty list means fully reconciled.
+        """
+        zero = Decimal("0")
+        discrepancies: list[PositionDiscrepancy] = []
+
+        for market_id, exchange_pos in exchange_positions.items():
+            exchange_yes = Decimal(str(exchange_pos.get("yes_size", 0)))
+            exchange_no = Decimal(str(exchange_pos.get("no_size", 0)))
+            position = self.positions.get(market_id)
+
+            if position is None:
+                discrepancies.append(
+                    PositionDiscrepancy(
+                        market_id, "missing_in_tracker", zero, zero, exchange_yes, exchange_no
+                    )
+                )
+            elif (
+                abs(position.yes_size - exchange_yes) > tolerance
+                or abs(position.no_size - exchange_no) > tolerance
+            ):
+                discrepancies.append(
+                    PositionDiscrepancy(
+                        market_id,
+                        "size",
+                        position.yes_size,
+                        position.no_size,
+                        exchange_yes,
+                        exchange_no,
+                    )
+                )
+
+        # Only pay for the reverse set difference if some tracked market went unmatched
+        matched = len(exchange_positions) - sum(
+            1 for d in discrepancies if d.kind == "missing_in_tracker"
+        )
+        if matched < len(self.positions):
+            for market_id in self.positions.keys() - exchange_positions.keys():
+                position = self.positions[market_id]
+                discrepancies.append(
+                    PositionDiscrepancy(
+                        market_id,
+                        "missing_in_exchange",
+                        position.yes_size,
+                        position.no_size,
+                        zero,
+                        zero,
+                    )
+                )
+
+        return discrepancies
+
+    @staticmethod
+    def snapshot_from_rows(
+        rows: Iterable[dict[str, Any]],
+        market_key: str = "market_id",
+        outcome_key: str = "outcome",
+        size_key: str = "size",
+    ) -> dict[str, dict[str, Decimal]]:
+        """
+        Fold per-token exchange position rows into a diff_snapshot() input.
+
+        Args:
+            rows: Rows like {"market_id": ..., "outcome": "Yes", "size": 12.5}.
+            market_key: Row key holding the market identifier.
+            outcome_key: Row key holding the outcome ("yes"/"no", any case).
+            size_key: Row key holding the position size.
+
+        Returns:
+            {market_id: {"yes_size": X, "no_size": Y}}
+        """
+        snapshot: dict[str, dict[str, Decimal]] = {}
+        for row in rows:
+            outcome = str(row.get(outcome_key, "")).lower()
+            if outcome not in ("yes", "no"):
+                continue
+            entry = snapshot.setdefault(
+                row[market_key], {"yes_size": Decimal("0"), "no_size": Decimal("0")}
+            )
+            entry[f"{outcome}_size"] += Decimal(str(row.get(size_key, 0)))
+        return snapshot
+
     def reconcile_with_exchange(
         self, exchange_positions: dict[str, dict[str, float]]
     ) -> dict[str, Any]:
@@ -393,57 +616,30 @@ class DeltaTracker:
         Returns:
             Reconciliation report with discrepancies and status.
         """
-        discrepancies = []
-        missing_in_tracker = []
-        missing_in_exchange = []
-
-        # Check positions in tracker
-        for market_id, position in self.positions.items():
-            if market_id not in exchange_positions:
-                missing_in_exchange.append(
-                    {
-                        "market_id": market_id,
-                        "tracker_yes_size": str(position.yes_size),
-                        "tracker_no_size": str(position.no_size),
-                    }
-                )
-            else:
-                exchange_pos = exchange_positions[market_id]
-                exchange_yes = Decimal(str(exchange_pos.get("yes_size", 0)))
-                exchange_no = Decimal(str(exchange_pos.get("no_size", 0)))
-
-                # Check for discrepancies (allow small tolerance for rounding)
-                tolerance = Decimal("0.0001")
-                yes_diff = abs(position.yes_size - exchange_yes)
-                no_diff = abs(position.no_size - exchange_no)
-
-                if yes_diff > tolerance or no_diff > tolerance:
-                    discrepancies.append(
-                        {
-                            "market_id": market_id,
-                            "tracker_yes": str(position.yes_size),
-                            "tracker_no": str(position.no_size),
-                            "exchange_yes": str(exchange_yes),
-                            "exchange_no": str(exchange_no),
-                            "yes_diff": str(yes_diff),
-                            "no_diff": str(no_diff),
-                        }
-                    )
-
-        # Check for positions in exchange but not in tracker
-        for market_id in exchange_positions:
-            if market_id not in self.positions:
-                exchange_pos = exchange_positions[market_id]
-                missing_in_tracker.append(
-                    {
-                        "market_id": market_id,
-                        "exchange_yes_size": str(exchange_pos.get("yes_size", 0)),
-                        "exchange_no_size": str(exchange_pos.get("no_size", 0)),
-                    }
-                )
+        found = self.diff_snapshot(exchange_positions)
+
+        discrepancies = [d.to_dict() for d in found if d.kind == "size"]
+        missing_in_tracker = [
+            {
+                "market_id": d.market_id,
+                "exchange_yes_size": str(d.exchange_yes),
+                "exchange_no_size": str(d.exchange_no),
+            }
+            for d in found
+            if d.kind == "missing_in_tracker"
+        ]
+        missing_in_exchange = [
+            {
+                "market_id": d.market_id,
+                "tracker_yes_size": str(d.tracker_yes),
+                "tracker_no_size": str(d.tracker_no),
+            }
+            for d in found
+            if d.kind == "missing_in_exchange"
+        ]
 
         # Log discrepancies
-        if discrepancies or missing_in_tracker or missing_in_exchange:
+        if found:
             logger.warning(
                 f"Reconciliation found issues: {len(discrepancies)} discrepancies, "
                 f"{len(missing_in_tracker)} missing in tracker, "
@@ -453,9 +649,7 @@ class DeltaTracker:
             logger.info("Reconciliation successful: all positions match")
 
         return {
-            "reconciled": len(discrepancies) == 0
-            and len(missing_in_tracker) == 0
-            and len(missing_in_exchange) == 0,
+            "reconciled": not found,
             "total_checked": len(self.positions) + len(missing_in_tracker),
             "discrepancies": discrepancies,
             "missing_in_tracker": missing_in_tracker,
@@ -472,7 +666,7 @@ class DeltaTracker:
             - Suggested trade direction
             - Estimated trade size
         """
-        delta = Decimal(str(self.get_delta()))
+        delta = self._total_delta
         threshold = self._get_delta_threshold()
 
         if abs(delta) <= threshold:
@@ -515,12 +709,12 @@ class DeltaTracker:
         Returns:
             Absolute delta threshold (max_delta_pct * total_exposure).
         """
-        total_exposure = Decimal(str(self.get_total_exposure()))
-        return self.max_delta_pct * total_exposure
+        return self.max_delta_pct * self._total_cost
 
     def reset(self) -> None:
         """Clear all tracked positions."""
         self.positions.clear()
+        self.recompute_totals()
         logger.info("DeltaTracker reset: all positions cleared")
 
     def __len__(self) -> int:
@@ -14,6 +14,7 @@ API Discovery Notes:
 import time
 import json
 import logging
+from contextlib import nullcontext
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
@@ -109,6 +110,7 @@ class MarketFinder:
         self._cache: Dict[str, Market15Min] = {}
         self._last_fetch = 0
         self._cache_ttl = 10  # seconds
+        self.tracer = None  # Optional CycleTracer for API call spans
 
     @staticmethod
     def get_next_15m_timestamp() -> int:
@@ -154,7 +156,9 @@ class MarketFinder:
             url = f"{self.gamma_url}/markets"
             params = {"slug": slug}
 
-            response = requests.get(url, params=params, timeout=10)
+            span = self.tracer.span("api.gamma.market_by_slug") if self.tracer else nullcontext()
+            with span:
+                response = requests.get(url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -12,6 +12,9 @@ Features:
 - ROI and APY calculations
 - Daily, weekly, and total rebate summaries
 - Best performing market identification
+- Time-indexed attribution (bisect + volume prefix sums) with optional
+  eviction of expired trades into compact aggregates
+- Bulk ingest for replaying historical trades and USDC transfers
 
 Rebate Structure (Polymarket):
 - Maker rebates: Up to 3% at 50% probability, scaling with distance from 50%
@@ -43,11 +46,12 @@ Example:
 
 import json
 import logging
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +68,11 @@ def _parse_timestamp(ts: str | datetime) -> datetime:
     return datetime.fromisoformat(ts.replace("Z", "+00:00"))
 
 
+def _hour_bucket(ts: float) -> int:
+    """Start of the UTC hour containing a Unix timestamp."""
+    return int(ts // 3600) * 3600
+
+
 @dataclass
 class RecordedTrade:
     """
@@ -190,6 +199,20 @@ class RebateTracker:
     Configuration:
         rebate_attribution_window: Time window for attributing rebates to trades.
         expected_rebate_rate: Expected rebate rate for estimation (default 0.1%).
+        auto_evict: Drop trades and rebates once they fall out of the
+            attribution window (relative to the latest event seen). On by
+            default so a long-running tracker stays bounded.
+
+    Indexing:
+        Trades are kept in a time-sorted index with running volume prefix
+        sums, so attributing a rebate is a bisect plus a walk over only
+        the eligible trades, and period volume/rebate totals are O(log n).
+        Evicted records survive as per-market totals (market_stats) and
+        hourly volume/rebate buckets with prefix sums, so period stats
+        stay O(log n) while memory stays bounded by the attribution
+        window. Evicted trade ids are kept (bucketed by hour) for
+        evicted_id_grace_hours past the window to reject replays, then
+        dropped with their bucket.
 
     Example:
         >>> tracker = RebateTracker()
@@ -201,6 +224,8 @@ class RebateTracker:
         self,
         rebate_attribution_window_hours: int = 24,
         expected_rebate_rate: float = 0.001,
+        auto_evict: bool = True,
+        evicted_id_grace_hours: int = 24,
     ):
         """
         Initialize the rebate tracker.
@@ -210,9 +235,16 @@ class RebateTracker:
                                              rebates to trades (default 24).
             expected_rebate_rate: Expected maker rebate rate for estimation
                                   (default 0.1% = 0.001).
+            auto_evict: Evict expired trades/rebates on every new event
+                        (default True; pass False to keep full history in memory).
+            evicted_id_grace_hours: Hours past the attribution window for
+                                    which evicted trade ids are still
+                                    rejected as duplicates (default 24).
         """
         self.rebate_attribution_window = timedelta(hours=rebate_attribution_window_hours)
         self.expected_rebate_rate = Decimal(str(expected_rebate_rate))
+        self.auto_evict = auto_evict
+        self.evicted_id_grace = timedelta(hours=evicted_id_grace_hours)
 
         # Storage
         self.trades: dict[str, RecordedTrade] = {}
@@ -224,6 +256,8 @@ class RebateTracker:
         self._total_rebates = Decimal("0")
         self._rebate_counter = 0
 
+        self._reset_indexes()
+
         logger.info(
             f"RebateTracker initialized: "
             f"attribution_window={rebate_attribution_window_hours}h, "
@@ -252,7 +286,19 @@ class RebateTracker:
         Raises:
             RebateTrackerError: If trade_id already exists.
         """
-        if trade_id in self.trades:
+        trade = self._add_trade(trade_id, market, size, timestamp)
+        logger.info(f"Recorded trade {trade_id}: {market}, size=${trade.size}")
+        return trade
+
+    def _add_trade(
+        self,
+        trade_id: str,
+        market: str,
+        size: float | str | Decimal,
+        timestamp: Optional[datetime],
+    ) -> RecordedTrade:
+        """Validate, store and index a trade (no logging)."""
+        if trade_id in self.trades or trade_id in self._evicted_trade_ids:
             raise RebateTrackerError(f"Trade {trade_id} already recorded")
 
         size_decimal = Decimal(str(size))
@@ -269,6 +315,7 @@ class RebateTracker:
 
         # Store trade
         self.trades[trade_id] = trade
+        self._index_trade(trade)
 
         # Update volume tracking
         self._total_volume += size_decimal
@@ -276,7 +323,7 @@ class RebateTracker:
         # Update market stats
         self._update_market_stats_for_trade(trade)
 
-        logger.info(f"Recorded trade {trade_id}: {market}, size=${size_decimal}")
+        self._advance_clock(trade.timestamp)
 
         return trade
 
@@ -309,6 +356,16 @@ class RebateTracker:
             ...     "tx_hash": "0x123..."
             ... })
         """
+        rebate = self._add_rebate(usdc_transfer)
+        if rebate is not None:
+            logger.info(
+                f"Detected rebate {rebate.rebate_id}: ${rebate.amount}, "
+                f"attributed to {len(rebate.attributed_trades)} trades"
+            )
+        return rebate
+
+    def _add_rebate(self, usdc_transfer: dict) -> Optional[RebateEvent]:
+        """Validate, attribute and store a rebate (info logging left to callers)."""
         # Validate transfer data
         if "amount" not in usdc_transfer:
             logger.warning("USDC transfer missing 'amount' field")
@@ -351,18 +408,96 @@ class RebateTracker:
         self._attribute_rebate_to_trades(rebate)
 
         # Store rebate
-        self.rebates.append(rebate)
+        self._index_rebate(rebate)
 
         # Update totals
         self._total_rebates += amount
 
-        logger.info(
-            f"Detected rebate {rebate_id}: ${amount}, "
-            f"attributed to {len(rebate.attributed_trades)} trades"
-        )
+        self._advance_clock(timestamp)
 
         return rebate
 
+    def bulk_ingest(
+        self,
+        trades: Iterable[dict] = (),
+        transfers: Iterable[dict] = (),
+        evict: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Replay historical trades and USDC transfers in one go.
+
+        Both streams are merged in timestamp order (trades first on ties,
+        so a trade and the rebate that pays it in the same second still
+        link up) and attributed exactly as if they had arrived live.
+        With evict=True, expired records are folded into aggregates as
+        the replay clock advances, so months of history replay in memory
+        bounded by the attribution window.
+
+        Args:
+            trades: Dicts with trade_id, market, size and timestamp.
+            transfers: USDC transfer dicts as accepted by detect_rebate.
+            evict: Evict expired records during the replay.
+
+        Returns:
+            Summary with counts of ingested, skipped and evicted records.
+        """
+        events: list[tuple[float, int, int, dict]] = []
+        skipped = 0
+
+        for seq, trade in enumerate(trades):
+            try:
+                ts = _parse_timestamp(trade["timestamp"])
+            except (KeyError, ValueError, TypeError, AttributeError):
+                skipped += 1
+                continue
+            events.append((ts.timestamp(), 0, seq, {**trade, "timestamp": ts}))
+
+        for seq, transfer in enumerate(transfers):
+            try:
+                ts = _parse_timestamp(transfer["timestamp"])
+            except (KeyError, ValueError, TypeError, AttributeError):
+                skipped += 1
+                continue
+            events.append((ts.timestamp(), 1, seq, {**transfer, "timestamp": ts}))
+
+        events.sort(key=lambda e: e[:3])
+
+        trades_added = 0
+        rebates_added = 0
+        evicted_before = self._evicted_trade_count + self._evicted_rebate_count
+
+        for _, kind, _, record in events:
+            if kind == 0:
+                try:
+                    self._add_trade(
+                        str(record["trade_id"]),
+                        record["market"],
+                        record["size"],
+                        record["timestamp"],
+                    )
+                    trades_added += 1
+                except (KeyError, RebateTrackerError, ArithmeticError, ValueError):
+                    skipped += 1
+            else:
+                if self._add_rebate(record) is not None:
+                    rebates_added += 1
+                else:
+                    skipped += 1
+
+            if evict and not self.auto_evict:
+                self.evict_expired()
+
+        summary = {
+            "trades": trades_added,
+            "rebates": rebates_added,
+            "skipped": skipped,
+            "evicted": (
+                self._evicted_trade_count + self._evicted_rebate_count - evicted_before
+            ),
+        }
+        logger.info(f"Bulk ingest complete: {summary}")
+        return summary
+
     def _attribute_rebate_to_trades(self, rebate: RebateEvent) -> None:
         """
         Attribute a rebate to recent trades within the attribution window.
@@ -374,24 +509,22 @@ class RebateTracker:
         """
         # Find trades within attribution window
         cutoff_time = rebate.timestamp - self.rebate_attribution_window
-        eligible_trades = [
-            t
-            for t in self.trades.values()
-            if t.timestamp >= cutoff_time and t.timestamp <= rebate.timestamp
-        ]
+        lo = bisect_left(self._trade_times, cutoff_time.timestamp())
+        hi = bisect_right(self._trade_times, rebate.timestamp.timestamp())
 
-        if not eligible_trades:
+        if lo >= hi:
             logger.debug(f"No eligible trades found for rebate {rebate.rebate_id}")
             return
 
-        # Calculate total volume of eligible trades
-        total_eligible_volume = sum(t.size for t in eligible_trades)
+        # Total volume of eligible trades from the prefix sums
+        total_eligible_volume = self._volume_prefix[hi] - self._volume_prefix[lo]
 
         if total_eligible_volume == Decimal("0"):
             return
 
         # Attribute rebate proportionally
-        for trade in eligible_trades:
+        for trade_id in self._trade_order[lo:hi]:
+            trade = self.trades[trade_id]
             proportion = trade.size / total_eligible_volume
             attributed_amount = (rebate.amount * proportion).quantize(Decimal("0.000001"))
 
@@ -406,6 +539,198 @@ class RebateTracker:
             # Update market stats
             self._update_market_rebate_stats(trade.market, attributed_amount)
 
+    def _reset_indexes(self) -> None:
+        """Clear the time indexes and eviction aggregates."""
+        # Trades sorted by time, with volume prefix sums (len n + 1)
+        self._trade_times: list[float] = []
+        self._trade_order: list[str] = []
+        self._volume_prefix: list[Decimal] = [Decimal("0")]
+
+        # Rebates sorted by time (parallel to self.rebates)
+        self._rebate_times: list[float] = []
+        self._rebate_prefix: list[Decimal] = [Decimal("0")]
+
+        # Evicted records, folded into sorted hourly buckets with prefix
+        # sums (len n + 1), so period totals are a bisect
+        self._evicted_volume_hours: list[int] = []
+        self._evicted_volume_prefix: list[Decimal] = [Decimal("0")]
+        self._evicted_rebate_hours: list[int] = []
+        self._evicted_rebate_prefix: list[Decimal] = [Decimal("0")]
+
+        # Recently evicted trade ids (id -> hour bucket, bucket -> ids),
+        # pruned once a bucket falls out of window + grace
+        self._evicted_trade_ids: dict[str, int] = {}
+        self._evicted_ids_by_hour: dict[int, list[str]] = {}
+        self._evicted_trade_count = 0
+        self._evicted_rebate_count = 0
+
+        self._clock: Optional[datetime] = None
+
+    def _index_trade(self, trade: RecordedTrade) -> None:
+        """Insert a trade into the time index, keeping prefix sums valid."""
+        ts = trade.timestamp.timestamp()
+        pos = bisect_right(self._trade_times, ts)
+        self._trade_times.insert(pos, ts)
+        self._trade_order.insert(pos, trade.trade_id)
+
+        if pos == len(self._trade_times) - 1:
+            # In-order arrival: O(1)
+            self._volume_prefix.append(self._volume_prefix[-1] + trade.size)
+        else:
+            # Out-of-order: rebuild prefix sums from the insertion point
+            self._volume_prefix.insert(pos + 1, Decimal("0"))
+            for i in range(pos, len(self._trade_order)):
+                self._volume_prefix[i + 1] = (
+                    self._volume_prefix[i] + self.trades[self._trade_order[i]].size
+                )
+
+    def _index_rebate(self, rebate: RebateEvent) -> None:
+        """Insert a rebate into self.rebates in time order."""
+        ts = rebate.timestamp.timestamp()
+        pos = bisect_right(self._rebate_times, ts)
+        self._rebate_times.insert(pos, ts)
+        self.rebates.insert(pos, rebate)
+
+        if pos == len(self._rebate_times) - 1:
+            self._rebate_prefix.append(self._rebate_prefix[-1] + rebate.amount)
+        else:
+            self._rebate_prefix.insert(pos + 1, Decimal("0"))
+            for i in range(pos, len(self.rebates)):
+                self._rebate_prefix[i + 1] = self._rebate_prefix[i] + self.rebates[i].amount
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild time indexes from self.trades and self.rebates."""
+        trades = sorted(self.trades.values(), key=lambda t: t.timestamp)
+        self._trade_times = [t.timestamp.timestamp() for t in trades]
+        self._trade_order = [t.trade_id for t in trades]
+        self._volume_prefix = [Decimal("0")]
+        for t in trades:
+            self._volume_prefix.append(self._volume_prefix[-1] + t.size)
+
+        self.rebates.sort(key=lambda r: r.timestamp)
+        self._rebate_times = [r.timestamp.timestamp() for r in self.rebates]
+        self._rebate_prefix = [Decimal("0")]
+        for r in self.rebates:
+            self._rebate_prefix.append(self._rebate_prefix[-1] + r.amount)
+
+    @staticmethod
+    def _fold_bucket(
+        hours: list[int], prefix: list[Decimal], bucket: int, amount: Decimal
+    ) -> None:
+        """Add amount to an hourly bucket, keeping hours sorted and prefix sums valid."""
+        if hours and hours[-1] == bucket:
+            prefix[-1] += amount
+            return
+        if not hours or bucket > hours[-1]:
+            # Eviction is monotonic, so this is the usual path: O(1)
+            hours.append(bucket)
+            prefix.append(prefix[-1] + amount)
+            return
+
+        # Late trade evicted into an older bucket: shift the suffix
+        pos = bisect_left(hours, bucket)
+        if hours[pos] != bucket:
+            hours.insert(pos, bucket)
+            prefix.insert(pos + 1, prefix[pos])
+        for i in range(pos + 1, len(prefix)):
+            prefix[i] += amount
+
+    @staticmethod
+    def _bucket_items(hours: list[int], prefix: list[Decimal]) -> dict[str, str]:
+        """Per-bucket amounts from a prefix-sum index, for serialization."""
+        return {str(h): str(prefix[i + 1] - prefix[i]) for i, h in enumerate(hours)}
+
+    def _remember_evicted_id(self, trade_id: str, bucket: int) -> None:
+        """Keep an evicted trade id for duplicate detection."""
+        self._evicted_trade_ids[trade_id] = bucket
+        self._evicted_ids_by_hour.setdefault(bucket, []).append(trade_id)
+
+    def _prune_evicted_ids(self, horizon: float) -> None:
+        """Drop evicted trade ids whose hour bucket ends before horizon."""
+        for bucket in [b for b in self._evicted_ids_by_hour if b + 3600 <= horizon]:
+            for trade_id in self._evicted_ids_by_hour.pop(bucket):
+                if self._evicted_trade_ids.get(trade_id) == bucket:
+                    del self._evicted_trade_ids[trade_id]
+
+    def _advance_clock(self, timestamp: datetime) -> None:
+        """Track the latest event time and evict if configured."""
+        if self._clock is None or timestamp > self._clock:
+            self._clock = timestamp
+        if self.auto_evict:
+            self.evict_expired()
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Fold trades and rebates older than the attribution window into aggregates.
+
+        Evicted trades no longer receive attribution and are not returned
+        by get_trade(); their volume and rebates remain in totals,
+        market_stats and period statistics (at hourly granularity).
+        Their ids are still rejected by record_trade() until they are
+        evicted_id_grace past the window.
+
+        Args:
+            now: Reference time (default: latest event time seen).
+
+        Returns:
+            Number of records evicted.
+        """
+        reference = now or self._clock
+        if reference is None:
+            return 0
+        horizon = (reference - self.rebate_attribution_window).timestamp()
+
+        # Trades: evict the sorted prefix older than the horizon
+        k = bisect_left(self._trade_times, horizon)
+        for i in range(k):
+            trade = self.trades.pop(self._trade_order[i])
+            bucket = _hour_bucket(self._trade_times[i])
+            self._fold_bucket(
+                self._evicted_volume_hours, self._evicted_volume_prefix, bucket, trade.size
+            )
+            self._remember_evicted_id(trade.trade_id, bucket)
+        if k:
+            del self._trade_times[:k]
+            del self._trade_order[:k]
+            del self._volume_prefix[:k]  # Remaining prefix stays absolute
+            self._evicted_trade_count += k
+
+        # Rebates
+        j = bisect_left(self._rebate_times, horizon)
+        for i in range(j):
+            bucket = _hour_bucket(self._rebate_times[i])
+            self._fold_bucket(
+                self._evicted_rebate_hours,
+                self._evicted_rebate_prefix,
+                bucket,
+                self.rebates[i].amount,
+            )
+        if j:
+            del self._rebate_times[:j]
+            del self.rebates[:j]
+            del self._rebate_prefix[:j]
+            self._evicted_rebate_count += j
+
+        self._prune_evicted_ids(horizon - self.evicted_id_grace.total_seconds())
+
+        return k + j
+
+    def _volume_since(self, start: datetime) -> Decimal:
+        """Trade volume with timestamp >= start (retained + evicted buckets)."""
+        ts = start.timestamp()
+        lo = bisect_left(self._trade_times, ts)
+        volume = self._volume_prefix[-1] - self._volume_prefix[lo]
+        lo = bisect_left(self._evicted_volume_hours, ts)
+        return volume + self._evicted_volume_prefix[-1] - self._evicted_volume_prefix[lo]
+
+    def _rebates_since(self, start: datetime) -> Decimal:
+        """Rebate amount with timestamp >= start (retained + evicted buckets)."""
+        ts = start.timestamp()
+        lo = bisect_left(self._rebate_times, ts)
+        amount = self._rebate_prefix[-1] - self._rebate_prefix[lo]
+        lo = bisect_left(self._evicted_rebate_hours, ts)
+        return amount + self._evicted_rebate_prefix[-1] - self._evicted_rebate_prefix[lo]
+
     def _update_market_stats_for_trade(self, trade: RecordedTrade) -> None:
         """Update market statistics when a trade is recorded."""
         market = trade.market
@@ -446,25 +771,11 @@ class RebateTracker:
         day_ago = now - timedelta(days=1)
         week_ago = now - timedelta(days=7)
 
-        # Calculate daily rebates
-        daily_rebates = sum(
-            r.amount for r in self.rebates if r.timestamp >= day_ago
-        )
-
-        # Calculate weekly rebates
-        weekly_rebates = sum(
-            r.amount for r in self.rebates if r.timestamp >= week_ago
-        )
-
-        # Calculate daily volume
-        daily_volume = sum(
-            t.size for t in self.trades.values() if t.timestamp >= day_ago
-        )
-
-        # Calculate weekly volume
-        weekly_volume = sum(
-            t.size for t in self.trades.values() if t.timestamp >= week_ago
-        )
+        # Daily and weekly totals from the time indexes
+        daily_rebates = self._rebates_since(day_ago)
+        weekly_rebates = self._rebates_since(week_ago)
+        daily_volume = self._volume_since(day_ago)
+        weekly_volume = self._volume_since(week_ago)
 
         # Calculate average rebate rate
         avg_rebate_rate = Decimal("0")
@@ -478,10 +789,10 @@ class RebateTracker:
 
         return {
             # Totals
-            "total_trades": len(self.trades),
+            "total_trades": len(self.trades) + self._evicted_trade_count,
             "total_volume": str(self._total_volume),
             "total_rebates": str(self._total_rebates),
-            "rebate_events": len(self.rebates),
+            "rebate_events": len(self.rebates) + self._evicted_rebate_count,
             # Rates
             "avg_rebate_rate": str(avg_rebate_rate.quantize(Decimal("0.000001"))),
             "avg_rebate_rate_pct": str(
@@ -523,14 +834,10 @@ class RebateTracker:
         period_start = now - timedelta(days=period_days)
 
         # Calculate rebates in period
-        period_rebates = sum(
-            r.amount for r in self.rebates if r.timestamp >= period_start
-        )
+        period_rebates = self._rebates_since(period_start)
 
         # Calculate volume in period (capital deployed)
-        period_volume = sum(
-            t.size for t in self.trades.values() if t.timestamp >= period_start
-        )
+        period_volume = self._volume_since(period_start)
 
         if period_volume == Decimal("0"):
             return 0.0
@@ -660,6 +967,19 @@ class RebateTracker:
             "trades": [t.to_dict() for t in self.trades.values()],
             "rebates": [r.to_dict() for r in self.rebates],
             "market_stats": {m: s.to_dict() for m, s in self.market_stats.items()},
+            "evicted": {
+                "trade_count": self._evicted_trade_count,
+                "rebate_count": self._evicted_rebate_count,
+                "trade_ids_by_hour": {
+                    str(h): ids for h, ids in sorted(self._evicted_ids_by_hour.items())
+                },
+                "volume_by_hour": self._bucket_items(
+                    self._evicted_volume_hours, self._evicted_volume_prefix
+                ),
+                "rebates_by_hour": self._bucket_items(
+                    self._evicted_rebate_hours, self._evicted_rebate_prefix
+                ),
+            },
         }
 
         try:
@@ -725,6 +1045,31 @@ class RebateTracker:
                     avg_rebate_rate=Decimal(stats_data["avg_rebate_rate"]),
                 )
 
+            # Rebuild indexes and restore eviction aggregates
+            self._reset_indexes()
+            self._rebuild_indexes()
+            evicted = state.get("evicted", {})
+            self._evicted_trade_count = evicted.get("trade_count", 0)
+            self._evicted_rebate_count = evicted.get("rebate_count", 0)
+            for h, ids in evicted.get("trade_ids_by_hour", {}).items():
+                for trade_id in ids:
+                    self._remember_evicted_id(trade_id, int(h))
+            for h, v in sorted(
+                (int(h), Decimal(v)) for h, v in evicted.get("volume_by_hour", {}).items()
+            ):
+                self._fold_bucket(
+                    self._evicted_volume_hours, self._evicted_volume_prefix, h, v
+                )
+            for h, v in sorted(
+                (int(h), Decimal(v)) for h, v in evicted.get("rebates_by_hour", {}).items()
+            ):
+                self._fold_bucket(
+                    self._evicted_rebate_hours, self._evicted_rebate_prefix, h, v
+                )
+            latest = [t.timestamp for t in self.trades.values()]
+            latest += [r.timestamp for r in self.rebates]
+            self._clock = max(latest) if latest else None
+
             logger.info(f"RebateTracker state loaded from {filepath}")
             return True
 
@@ -743,6 +1088,7 @@ class RebateTracker:
         self._total_volume = Decimal("0")
         self._total_rebates = Decimal("0")
         self._rebate_counter = 0
+        self._reset_indexes()
         logger.info("RebateTracker reset: all data cleared")
 
     def __len__(self) -> int:
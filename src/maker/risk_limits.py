@@ -5,7 +5,9 @@ This module provides comprehensive risk controls specifically designed for the
 delta-neutral maker rebates strategy with strict capital preservation.
 
 Features:
-- File-based kill switch for emergency stop
+- File-based kill switch for emergency stop, watched via inotify
+  (polling fallback) and held as an in-memory flag
+- O(1) running exposure aggregates for per-quote pre-trade checks
 - Position size limits ($100 per market, max 3 concurrent)
 - Daily loss tracking with $30 limit
 - Alert system for delta, balance, and execution issues
@@ -43,9 +45,15 @@ Example:
     ...     print("Emergency stop activated!")
 """
 
+import ctypes
+import ctypes.util
+import errno
 import json
 import logging
 import os
+import struct
+import sys
+import time
 from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from decimal import Decimal
@@ -65,6 +73,161 @@ def _utc_today() -> date:
     return datetime.now(timezone.utc).date()
 
 
+# inotify constants (linux/inotify.h)
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Load libc for inotify, or None where it isn't available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError if missing
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+class KillSwitchWatcher:
+    """
+    In-memory view of the kill switch file.
+
+    On Linux the parent directory is watched with inotify and the flag
+    is only re-checked when an event names the kill switch file, so
+    reading the flag is a non-blocking read() that returns EAGAIN rather
+    than a path lookup. Elsewhere (or if inotify can't be set up) the
+    file is stat'ed at most once per poll_interval.
+
+    Attributes:
+        path: Kill switch file being watched.
+        mode: "inotify" or "poll".
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.25) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            path: Kill switch file path.
+            poll_interval: Seconds between stats in polling mode.
+        """
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._last_poll = 0.0
+        self.mode = "poll"
+
+        self._start_inotify()
+        self._active = self.path.exists()
+        self._last_poll = time.monotonic()
+
+    def _start_inotify(self) -> None:
+        """Watch the parent directory, leaving polling mode on failure."""
+        if _libc is None:
+            return
+
+        fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            logger.debug(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return
+
+        wd = _libc.inotify_add_watch(fd, os.fsencode(self.path.parent), _WATCH_MASK)
+        if wd < 0:
+            logger.debug(f"inotify_add_watch failed: {os.strerror(ctypes.get_errno())}")
+            os.close(fd)
+            return
+
+        self._fd = fd
+        self.mode = "inotify"
+
+    def _fall_back_to_polling(self) -> None:
+        """Drop the inotify watch (e.g. the directory went away)."""
+        self.close()
+        self.mode = "poll"
+        self._last_poll = 0.0
+
+    def _drain_events(self) -> bool:
+        """
+        Read pending inotify events.
+
+        Returns:
+            True if any event concerned the kill switch file.
+        """
+        relevant = False
+        name = os.fsencode(self.path.name)
+
+        while True:
+            try:
+                buf = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return relevant
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                self._fall_back_to_polling()
+                return True
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                event_name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                    self._fall_back_to_polling()
+                    return True
+                if mask & _IN_Q_OVERFLOW or event_name == name:
+                    relevant = True
+
+    @property
+    def active(self) -> bool:
+        """Whether the kill switch file exists (cached)."""
+        if self._fd is not None:
+            if self._drain_events():
+                self._active = self.path.exists()
+        else:
+            now = time.monotonic()
+            if now - self._last_poll >= self.poll_interval:
+                self._active = self.path.exists()
+                self._last_poll = now
+        return self._active
+
+    def set(self, active: bool) -> None:
+        """Record a change made by this process (skips waiting for the event)."""
+        self._active = active
+        self._last_poll = time.monotonic()
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def __del__(self) -> None:
+        self.close()
+
+
 @dataclass
 class Alert:
     """
@@ -109,8 +272,15 @@ class RiskMonitor:
         max_total_exposure: Maximum total exposure (default $300).
         max_delta_pct: Maximum delta percentage (default 5%).
         kill_switch_file: Path to kill switch file (default .kill_switch).
+        kill_switch_poll_interval: Seconds between kill switch stats when
+            inotify is unavailable (default 0.25).
         balance_alert_drop_pct: Balance drop % for alert (default 10%).
 
+    Exposure, open-position count and daily P&L are running aggregates
+    updated on open/close/P&L events, and the kill switch is an
+    in-memory flag, so can_open_position() is cheap enough to run on
+    every quote update.
+
     Attributes:
         config: Configuration dictionary.
         is_halted: Whether trading is currently halted.
@@ -139,6 +309,7 @@ class RiskMonitor:
             "max_total_exposure": 300.0,
             "max_delta_pct": 0.05,
             "kill_switch_file": ".kill_switch",
+            "kill_switch_poll_interval": 0.25,
             "balance_alert_drop_pct": 0.10,
         }
 
@@ -154,6 +325,7 @@ class RiskMonitor:
 
         # Kill switch path
         self.project_root = Path(project_root) if project_root else Path.cwd()
+        self._kill_switch_watcher: Optional[KillSwitchWatcher] = None
         self._kill_switch_path = self.project_root / self.config["kill_switch_file"]
 
         # State tracking
@@ -167,6 +339,7 @@ class RiskMonitor:
 
         # Position tracking (market_id -> notional value)
         self._positions: dict[str, Decimal] = {}
+        self._total_exposure = Decimal("0")  # Running sum of abs(notional)
 
         # Balance tracking
         self._initial_balance: Optional[Decimal] = None
@@ -185,6 +358,20 @@ class RiskMonitor:
             f"max_position=${self._max_position_size}, max_concurrent={self._max_concurrent}"
         )
 
+    @property
+    def _kill_switch_path(self) -> Path:
+        """Kill switch file path."""
+        return self._kill_switch_watcher.path
+
+    @_kill_switch_path.setter
+    def _kill_switch_path(self, path: Path) -> None:
+        """Re-point the watcher when the kill switch path changes."""
+        if self._kill_switch_watcher is not None:
+            self._kill_switch_watcher.close()
+        self._kill_switch_watcher = KillSwitchWatcher(
+            Path(path), poll_interval=float(self.config["kill_switch_poll_interval"])
+        )
+
     @property
     def is_halted(self) -> bool:
         """Check if trading is halted (including kill switch)."""
@@ -205,10 +392,14 @@ class RiskMonitor:
         in the project root directory. This provides an emergency stop
         mechanism that can be triggered externally.
 
+        The file is watched rather than stat'ed on every call (see
+        KillSwitchWatcher); external changes show up on the next call
+        with inotify, or within kill_switch_poll_interval otherwise.
+
         Returns:
             True if kill switch is active, False otherwise.
         """
-        return self._kill_switch_path.exists()
+        return self._kill_switch_watcher.active
 
     def activate_kill_switch(self, reason: str = "Manual activation") -> None:
         """
@@ -224,6 +415,7 @@ class RiskMonitor:
             with open(self._kill_switch_path, "w") as f:
                 f.write(f"Kill switch activated at {_utc_now().isoformat()}\n")
                 f.write(f"Reason: {reason}\n")
+            self._kill_switch_watcher.set(True)
 
             self._add_alert(
                 level="CRITICAL",
@@ -245,6 +437,7 @@ class RiskMonitor:
         try:
             if self._kill_switch_path.exists():
                 os.remove(self._kill_switch_path)
+                self._kill_switch_watcher.set(False)
                 self._add_alert(
                     level="INFO",
                     category="KILL_SWITCH",
@@ -252,6 +445,7 @@ class RiskMonitor:
                 )
                 logger.info("Kill switch DEACTIVATED")
                 return True
+            self._kill_switch_watcher.set(False)
             return True
         except IOError as e:
             logger.error(f"Failed to remove kill switch file: {e}")
@@ -351,8 +545,7 @@ class RiskMonitor:
             )
 
         # Total exposure limit
-        current_exposure = sum(abs(v) for v in self._positions.values())
-        new_exposure = current_exposure + size_decimal
+        new_exposure = self._total_exposure + size_decimal
 
         if new_exposure > self._max_total_exposure:
             return (
@@ -378,10 +571,9 @@ class RiskMonitor:
         """
         size_decimal = Decimal(str(size))
 
-        if market_id in self._positions:
-            self._positions[market_id] += size_decimal
-        else:
-            self._positions[market_id] = size_decimal
+        previous = self._positions.get(market_id, Decimal("0"))
+        self._positions[market_id] = previous + size_decimal
+        self._total_exposure += abs(previous + size_decimal) - abs(previous)
 
         logger.info(f"Position opened: {market_id}, size=${size_decimal}")
 
@@ -402,7 +594,7 @@ class RiskMonitor:
             pnl: Optional profit/loss from the position.
         """
         if market_id in self._positions:
-            del self._positions[market_id]
+            self._total_exposure -= abs(self._positions.pop(market_id))
             logger.info(f"Position closed: {market_id}")
 
             if pnl is not None:
@@ -514,9 +706,8 @@ class RiskMonitor:
 
     def _check_delta_alert(self, delta: float) -> None:
         """Internal helper to check delta and generate alerts."""
-        current_exposure = sum(abs(v) for v in self._positions.values())
-        if current_exposure > 0:
-            self.check_delta(delta, float(current_exposure))
+        if self._total_exposure > 0:
+            self.check_delta(delta, float(self._total_exposure))
 
     def record_execution_failure(self, reason: str) -> None:
         """
@@ -549,7 +740,7 @@ class RiskMonitor:
         """
         self._check_daily_reset()
 
-        current_exposure = sum(abs(v) for v in self._positions.values())
+        current_exposure = self._total_exposure
         open_positions = len(self._positions)
 
         # Calculate daily loss remaining
@@ -565,6 +756,7 @@ class RiskMonitor:
             "halt_reason": self.halt_reason,
             "kill_switch_active": self.check_kill_switch(),
             "kill_switch_path": str(self._kill_switch_path),
+            "kill_switch_watch_mode": self._kill_switch_watcher.mode,
             # Daily limits
             "date": str(self._current_date),
             "daily_pnl": float(self._daily_pnl),
@@ -703,6 +895,7 @@ class RiskMonitor:
             self._daily_pnl = Decimal(str(state["daily_pnl"]))
             self._current_date = date.fromisoformat(state["current_date"])
             self._positions = {k: Decimal(str(v)) for k, v in state["positions"].items()}
+            self._total_exposure = sum((abs(v) for v in self._positions.values()), Decimal("0"))
             self._is_halted = state["is_halted"]
             self._halt_reason = state.get("halt_reason")
             self._daily_pnl_history = state.get("daily_pnl_history", [])
@@ -713,6 +906,10 @@ class RiskMonitor:
             logger.error(f"Failed to load risk monitor state: {e}")
             return False
 
+    def close(self) -> None:
+        """Release the kill switch watcher."""
+        self._kill_switch_watcher.close()
+
     def __repr__(self) -> str:
         status = "HALTED" if self.is_halted else "ACTIVE"
         return (
@@ -0,0 +1,443 @@
+"""
+Lightweight tracing and on-demand profiling for the maker bot.
+
+Provides:
+- CycleTracer: named timing spans around each stage of a trading cycle
+  and each outbound API call, with per-cycle breakdowns kept in a ring
+  buffer and cumulative latency histograms for export
+- SamplingProfiler: a wall-clock stack sampler that can be triggered by
+  a signal or a trigger file on a live process and writes folded stacks
+  (the input format of flamegraph.pl / speedscope / inferno)
+
+Example:
+    >>> tracer = CycleTracer()
+    >>> tracer.start_cycle(1)
+    >>> with tracer.span("discovery"):
+    ...     markets = finder.find_active_markets()
+    >>> trace = tracer.end_cycle()
+    >>> trace.spans["discovery"]  # milliseconds
+
+Profiling a running bot for 30 seconds:
+    $ kill -USR1 <pid>              # signal trigger
+    $ echo 30 > .profile            # or file trigger, checked every cycle
+"""
+
+import logging
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _utc_now() -> datetime:
+    """Get current UTC time as timezone-aware datetime."""
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class CycleTrace:
+    """
+    Latency breakdown for one trading cycle.
+
+    Attributes:
+        cycle_number: Cycle this trace belongs to.
+        started_at: When the cycle started.
+        total_ms: Wall time of the whole cycle.
+        spans: Span name -> summed duration in milliseconds.
+        counts: Span name -> number of times the span was entered.
+    """
+
+    cycle_number: int
+    started_at: datetime
+    total_ms: float = 0.0
+    spans: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert trace to dictionary."""
+        return {
+            "cycle_number": self.cycle_number,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round(self.total_ms, 3),
+            "spans": {name: round(ms, 3) for name, ms in self.spans.items()},
+            "counts": dict(self.counts),
+        }
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Buckets are cumulative on export (Prometheus `le` semantics), so
+    they can be scraped as-is or merged across processes by addition.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        """Record one observation in milliseconds."""
+        for i, upper in enumerate(self.buckets):
+            if ms <= upper:
+                self._counts[i] += 1
+                break
+        else:
+            self._counts[-1] += 1
+
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Cumulative (le, count) pairs including +Inf."""
+        result = []
+        running = 0
+        for upper, n in zip(self.buckets, self._counts):
+            running += n
+            result.append((f"{upper:g}", running))
+        result.append(("+Inf", running + self._counts[-1]))
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert histogram to dictionary."""
+        return {
+            "buckets": dict(self.cumulative()),
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class CycleTracer:
+    """
+    Collects timing spans for the maker bot's trading cycles.
+
+    Spans entered between start_cycle() and end_cycle() are summed into
+    that cycle's CycleTrace; every span also feeds a per-name histogram,
+    including spans outside a cycle. The tracer is single-writer (the
+    bot's event loop), so spans take no locks.
+
+    Attributes:
+        history: Ring buffer of the most recent CycleTraces.
+        histograms: Span name -> LatencyHistogram ("cycle" is the total).
+    """
+
+    def __init__(
+        self,
+        history_size: int = 500,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_MS,
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            history_size: Number of recent cycle traces to keep
+            buckets: Histogram bucket upper bounds in milliseconds
+        """
+        self.history: deque[CycleTrace] = deque(maxlen=history_size)
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._buckets = buckets
+        self._current: Optional[CycleTrace] = None
+        self._cycle_start = 0.0
+
+    def _observe(self, name: str, ms: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(self._buckets)
+        histogram.observe(ms)
+
+    def start_cycle(self, cycle_number: int) -> None:
+        """Begin collecting spans for a new cycle."""
+        self._current = CycleTrace(cycle_number=cycle_number, started_at=_utc_now())
+        self._cycle_start = time.perf_counter()
+
+    def end_cycle(self) -> Optional[CycleTrace]:
+        """
+        Finish the current cycle and push it into the ring buffer.
+
+        Returns:
+            The completed trace, or None if no cycle was started
+        """
+        trace = self._current
+        if trace is None:
+            return None
+
+        trace.total_ms = (time.perf_counter() - self._cycle_start) * 1000
+        self._observe("cycle", trace.total_ms)
+        self.history.append(trace)
+        self._current = None
+        return trace
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code.
+
+        Works around `await` expressions too, since it only reads the
+        clock on entry and exit.
+
+        Args:
+            name: Span name, e.g. "discovery" or "api.gamma.market_by_slug"
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self._observe(name, ms)
+            trace = self._current
+            if trace is not None:
+                trace.spans[name] = trace.spans.get(name, 0.0) + ms
+                trace.counts[name] = trace.counts.get(name, 0) + 1
+
+    def recent(self, n: int = 10) -> list[dict[str, Any]]:
+        """Most recent n cycle traces, newest last."""
+        return [t.to_dict() for t in list(self.history)[-n:]]
+
+    def get_breakdown(self) -> dict[str, dict[str, float]]:
+        """
+        Per-span latency percentiles over the cycles in the ring buffer.
+
+        Returns:
+            Span name -> {"p50", "p95", "p99", "max", "mean"} in milliseconds
+        """
+        samples: dict[str, list[float]] = {}
+        for trace in self.history:
+            samples.setdefault("cycle", []).append(trace.total_ms)
+            for name, ms in trace.spans.items():
+                samples.setdefault(name, []).append(ms)
+
+        breakdown = {}
+        for name, values in samples.items():
+            values.sort()
+            n = len(values)
+            breakdown[name] = {
+                "p50": round(values[int(0.50 * (n - 1))], 3),
+                "p95": round(values[int(0.95 * (n - 1))], 3),
+                "p99": round(values[int(0.99 * (n - 1))], 3),
+                "max": round(values[-1], 3),
+                "mean": round(sum(values) / n, 3),
+            }
+        return breakdown
+
+    def get_histograms(self) -> dict[str, dict[str, Any]]:
+        """All span histograms as dictionaries."""
+        return {name: h.to_dict() for name, h in sorted(self.histograms.items())}
+
+    def to_prometheus(self, metric: str = "maker_bot_span_latency_ms") -> str:
+        """
+        Render histograms in the Prometheus text exposition format.
+
+        Args:
+            metric: Metric family name
+
+        Returns:
+            Exposition text with one series per span name
+        """
+        lines = [
+            f"# HELP {metric} Maker bot span latency in milliseconds.",
+            f"# TYPE {metric} histogram",
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            for le, count in histogram.cumulative():
+                lines.append(f'{metric}_bucket{{span="{name}",le="{le}"}} {count}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {histogram.sum_ms:.3f}')
+            lines.append(f'{metric}_count{{span="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for a live process.
+
+    Samples every thread's Python stack at a fixed interval from a
+    background thread via sys._current_frames(), then writes folded
+    stacks ("frame;frame;frame count" per line). Nothing is installed
+    in the hot path, so it can be switched on in production.
+
+    Example:
+        >>> profiler = SamplingProfiler(output_dir=Path("data/profiles"))
+        >>> profiler.install_signal_trigger()  # kill -USR1 <pid>
+        >>> profiler.check_signal_trigger()  # call periodically
+        >>> profiler.check_trigger_file(Path(".profile"))  # call periodically
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        interval: float = 0.005,
+        default_duration: float = 30.0,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory for .folded profile files
+            interval: Seconds between samples
+            default_duration: Seconds to profile when the trigger gives none
+        """
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.default_duration = default_duration
+        self.last_output: Optional[Path] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._signalled = threading.Event()
+        self._written = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a profile is currently being collected."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None) -> bool:
+        """
+        Start sampling in the background.
+
+        Args:
+            duration: Seconds to sample (default: default_duration)
+
+        Returns:
+            False if a profile is already running
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(duration or self.default_duration,),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+        logger.info(f"Sampling profiler started for {duration or self.default_duration}s")
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Path]:
+        """Block until the running profile is written; returns its path."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.last_output
+
+    def _run(self, duration: float) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stacks[self._fold(names.get(thread_id, str(thread_id)), frame)] += 1
+            time.sleep(self.interval)
+
+        self.last_output = self._write(stacks)
+
+    @staticmethod
+    def _fold(thread_name: str, frame: Any) -> str:
+        """Render a frame chain root-first as a folded stack line."""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{Path(code.co_filename).name}:{code.co_name}")
+            frame = frame.f_back
+        parts.append(thread_name)
+        return ";".join(reversed(parts))
+
+    def _write(self, stacks: Counter) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Millisecond stamp plus a per-profiler sequence so back-to-back
+        # captures never overwrite each other
+        self._written += 1
+        stamp = _utc_now().strftime("%Y%m%dT%H%M%S.%f")[:-3]
+        path = self.output_dir / f"profile_{stamp}_{self._written}.folded"
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"Sampling profile written: {path} ({sum(stacks.values())} samples)")
+        return path
+
+    def install_signal_trigger(self, signum: Optional[int] = None) -> bool:
+        """
+        Request a profile when the process receives a signal.
+
+        The handler only sets a flag; check_signal_trigger() starts the
+        profile from the bot loop, since start() takes a lock that the
+        interrupted thread may already hold.
+
+        Args:
+            signum: Signal number (default: SIGUSR1)
+
+        Returns:
+            True if the handler was installed
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+            if signum is None:
+                return False  # Not available on this platform
+
+        try:
+            signal.signal(signum, lambda *_: self._signalled.set())
+            return True
+        except (ValueError, RuntimeError):
+            # Signal handlers can only be set in main thread
+            return False
+
+    def check_signal_trigger(self) -> bool:
+        """
+        Start a profile if the signal handler has fired since the last check.
+
+        Returns:
+            True if a profile was started
+        """
+        if not self._signalled.is_set():
+            return False
+        self._signalled.clear()
+        return self.start()
+
+    def check_trigger_file(self, path: Path) -> bool:
+        """
+        Start a profile if the trigger file exists, then remove it.
+
+        The file may contain the number of seconds to profile.
+
+        Args:
+            path: Trigger file path
+
+        Returns:
+            True if a profile was started
+        """
+        if not path.exists():
+            return False
+
+        try:
+            text = path.read_text().strip()
+            path.unlink()
+        except OSError:
+            return False
+
+        try:
+            duration = float(text) if text else None
+        except ValueError:
+            duration = None
+        return self.start(duration)
@@ -1,4 +1,18 @@
 """Trading execution modules."""
-from .balance_checker import BalanceChecker, get_usdc_balance, check_sufficient_funds
+from .balance_checker import (
+    BalanceChecker,
+    WalletBalances,
+    get_usdc_balance,
+    check_sufficient_funds,
+)
+from .rate_limiter import EndpointRateLimiter, RateLimitTimeout, get_shared_limiter
 
-__all__ = ["BalanceChecker", "get_usdc_balance", "check_sufficient_funds"]
+__all__ = [
+    "BalanceChecker",
+    "WalletBalances",
+    "get_usdc_balance",
+    "check_sufficient_funds",
+    "EndpointRateLimiter",
+    "RateLimitTimeout",
+    "get_shared_limiter",
+]
@@ -9,15 +9,20 @@ Features:
 - 30-second caching to avoid excessive RPC calls
 - Thread-safe implementation
 - Fallback to zero balance on errors
+- USDC and conditional-token (ERC1155) balances for any number of
+  wallets in a single Multicall3 eth_call
+- Optional event-driven mode: cached balances follow our own fills and
+  Transfer logs, and the chain is only re-read to reconcile drift
 
 USDC on Polygon: 0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174
 """
 import os
 import time
 import threading
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from eth_abi import decode as abi_decode, encode as abi_encode
 from web3 import Web3
 from web3.exceptions import Web3Exception
 
@@ -26,12 +31,28 @@ from web3.exceptions import Web3Exception
 USDC_CONTRACT_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 USDC_DECIMALS = 6
 
+# Polymarket Conditional Tokens (ERC1155) on Polygon; shares use 6 decimals
+CTF_CONTRACT_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+CTF_DECIMALS = 6
+
+# Multicall3 (same address on every chain it's deployed to)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
 # Public Polygon RPC endpoint
 POLYGON_RPC_URL = "https://polygon-rpc.com"
 
 # Cache TTL in seconds
 BALANCE_CACHE_TTL = 30
 
+# In event-driven mode, re-read the chain this often to correct drift
+RECONCILE_INTERVAL = 300
+
+# Balance moves from our own fills remembered to skip their Transfer logs
+MAX_TRACKED_FILL_MOVES = 10_000
+
+# Most public Polygon RPCs reject eth_getLogs ranges wider than this
+MAX_LOG_BLOCK_SPAN = 1_000
+
 # Minimal ERC20 ABI for balanceOf
 ERC20_BALANCE_ABI = [
     {
@@ -43,6 +64,39 @@ ERC20_BALANCE_ABI = [
     }
 ]
 
+# Function selectors and event topics
+_BALANCE_OF = Web3.keccak(text="balanceOf(address)")[:4]
+_BALANCE_OF_BATCH = Web3.keccak(text="balanceOfBatch(address[],uint256[])")[:4]
+_AGGREGATE3 = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+_GET_BLOCK_NUMBER = Web3.keccak(text="getBlockNumber()")[:4]
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+TRANSFER_SINGLE_TOPIC = Web3.keccak(
+    text="TransferSingle(address,address,address,uint256,uint256)"
+)
+TRANSFER_BATCH_TOPIC = Web3.keccak(
+    text="TransferBatch(address,address,address,uint256[],uint256[])"
+)
+
+
+@dataclass
+class WalletBalances:
+    """USDC and conditional-token balances of one wallet."""
+
+    address: str
+    usdc: float = 0.0
+    tokens: Dict[str, float] = field(default_factory=dict)
+    block_number: Optional[int] = None
+
+
+def _topic_address(topic: bytes) -> str:
+    """Checksummed address from a 32-byte indexed topic."""
+    return Web3.to_checksum_address(bytes(topic)[-20:])
+
+
+def _address_topic(address: str) -> str:
+    """32-byte indexed topic (hex) for an address."""
+    return "0x" + "00" * 12 + address[2:].lower()
+
 
 @dataclass
 class Balance:
@@ -76,6 +130,11 @@ class BalanceChecker:
         rpc_url: str = POLYGON_RPC_URL,
         cache_ttl: int = BALANCE_CACHE_TTL,
         usdc_address: str = USDC_CONTRACT_ADDRESS,
+        ctf_address: str = CTF_CONTRACT_ADDRESS,
+        multicall_address: str = MULTICALL3_ADDRESS,
+        event_driven: bool = False,
+        reconcile_interval: int = RECONCILE_INTERVAL,
+        web3: Optional[Web3] = None,
     ):
         """
         Initialize the balance checker.
@@ -84,27 +143,48 @@ class BalanceChecker:
             rpc_url: Polygon RPC endpoint URL
             cache_ttl: Cache time-to-live in seconds (default 30)
             usdc_address: USDC contract address on Polygon
+            ctf_address: Conditional Tokens (ERC1155) contract address
+            multicall_address: Multicall3 contract address
+            event_driven: Keep cached balances current from fills and
+                Transfer logs; re-read the chain every reconcile_interval
+            reconcile_interval: Seconds between reconciling reads in
+                event-driven mode (default 300)
+            web3: Pre-built Web3 instance (e.g. pointed at a local node)
         """
         self.rpc_url = rpc_url
         self.cache_ttl = cache_ttl
         self.usdc_address = Web3.to_checksum_address(usdc_address)
+        self.ctf_address = Web3.to_checksum_address(ctf_address)
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+        self.event_driven = event_driven
+        self.reconcile_interval = reconcile_interval
 
         # Initialize Web3 connection
-        self._web3: Optional[Web3] = None
+        self._web3: Optional[Web3] = web3
         self._contract = None
         self._init_error: str = ""
 
-        # Cache storage: {address: (balance, timestamp)}
-        self._cache: dict[str, tuple[float, float]] = {}
+        # Cache storage in raw units: {address: (usdc, timestamp)} and
+        # {address: {token_id: (shares, timestamp)}}. Timestamps are the
+        # last chain read; event updates change values, not timestamps.
+        self._cache: dict[str, tuple[int, float]] = {}
+        self._token_cache: dict[str, dict[str, tuple[int, float]]] = {}
         self._cache_lock = threading.Lock()
 
+        # Event-driven bookkeeping
+        # Fill moves already applied, keyed (tx_hash, wallet, token_id or
+        # None for USDC, raw delta); insertion-ordered so the oldest go first
+        self._applied_moves: dict[tuple[str, str, Optional[str], int], None] = {}
+        self._last_log_block: Optional[int] = None
+
         # Initialize connection
         self._init_web3()
 
     def _init_web3(self):
         """Initialize Web3 connection and contract."""
         try:
-            self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            if self._web3 is None:
+                self._web3 = Web3(Web3.HTTPProvider(self.rpc_url))
 
             # Verify connection
             if not self._web3.is_connected():
@@ -131,6 +211,11 @@ class BalanceChecker:
         """Get the last initialization error message."""
         return self._init_error
 
+    @property
+    def _max_age(self) -> float:
+        """How long a chain read stays valid."""
+        return self.reconcile_interval if self.event_driven else self.cache_ttl
+
     def _get_cached_balance(self, address: str) -> Optional[float]:
         """
         Get cached balance if still valid.
@@ -143,9 +228,9 @@ class BalanceChecker:
         """
         with self._cache_lock:
             if address in self._cache:
-                balance, timestamp = self._cache[address]
-                if time.time() - timestamp < self.cache_ttl:
-                    return balance
+                raw, timestamp = self._cache[address]
+                if time.time() - timestamp < self._max_age:
+                    return raw / (10**USDC_DECIMALS)
         return None
 
     def _set_cached_balance(self, address: str, balance: float):
@@ -157,12 +242,13 @@ class BalanceChecker:
             balance: Balance value in USDC
         """
         with self._cache_lock:
-            self._cache[address] = (balance, time.time())
+            self._cache[address] = (round(balance * 10**USDC_DECIMALS), time.time())
 
     def clear_cache(self):
         """Clear all cached balances."""
         with self._cache_lock:
             self._cache.clear()
+            self._token_cache.clear()
 
     def get_raw_balance(self, address: str) -> int:
         """
@@ -218,14 +304,8 @@ class BalanceChecker:
             if cached is not None:
                 return Balance(available=cached, locked=0.0, total=cached)
 
-            # Query from chain
-            raw_balance = self.get_raw_balance(checksum_address)
-
-            # Convert from 6 decimals to float
-            balance_usdc = raw_balance / (10**USDC_DECIMALS)
-
-            # Cache the result
-            self._set_cached_balance(checksum_address, balance_usdc)
+            # Query from chain (refreshes the cache)
+            balance_usdc = self.fetch_balances([checksum_address])[checksum_address].usdc
 
             # Return Balance object (locked=0 since we can't determine locked amount)
             return Balance(available=balance_usdc, locked=0.0, total=balance_usdc)
@@ -234,6 +314,331 @@ class BalanceChecker:
             print(f"[BalanceChecker] Error getting balance: {str(e)}")
             return Balance(available=0.0, locked=0.0, total=0.0)
 
+    def fetch_balances(
+        self,
+        addresses: Iterable[str],
+        token_ids: Iterable[str] = (),
+        block_identifier="latest",
+    ) -> Dict[str, WalletBalances]:
+        """
+        Read USDC and conditional-token balances in one Multicall3 eth_call.
+
+        Each wallet contributes one USDC `balanceOf` and (if token_ids is
+        non-empty) one ERC1155 `balanceOfBatch`, all aggregated into a
+        single request. Reads at "latest" also fetch the block number via
+        Multicall3 `getBlockNumber` in the same call. Results refresh the
+        cache.
+
+        Args:
+            addresses: Wallet addresses
+            token_ids: Conditional token IDs (decimal strings)
+            block_identifier: Block to read at (default latest)
+
+        Returns:
+            Checksummed address -> WalletBalances
+
+        Raises:
+            ValueError: If an address is invalid
+            Web3Exception: If the checker isn't ready or the call fails
+        """
+        if not self.is_ready():
+            raise Web3Exception(f"Balance checker not ready: {self._init_error}")
+
+        wallets = []
+        for address in addresses:
+            if not Web3.is_address(address):
+                raise ValueError(f"Invalid Ethereum address: {address}")
+            wallets.append(Web3.to_checksum_address(address))
+        wallets = list(dict.fromkeys(wallets))
+        tokens = list(dict.fromkeys(str(t) for t in token_ids))
+        if not wallets:
+            return {}
+
+        block_number = block_identifier if isinstance(block_identifier, int) else None
+        with_block_number = block_identifier == "latest"
+
+        calls: List[Tuple[str, bool, bytes]] = []
+        if with_block_number:
+            calls.append((self.multicall_address, True, _GET_BLOCK_NUMBER))
+        for wallet in wallets:
+            calls.append(
+                (self.usdc_address, True, _BALANCE_OF + abi_encode(["address"], [wallet]))
+            )
+            if tokens:
+                calls.append(
+                    (
+                        self.ctf_address,
+                        True,
+                        _BALANCE_OF_BATCH + abi_encode(
+                            ["address[]", "uint256[]"],
+                            [[wallet] * len(tokens), [int(t) for t in tokens]],
+                        ),
+                    )
+                )
+
+        data = _AGGREGATE3 + abi_encode(["(address,bool,bytes)[]"], [calls])
+        raw = self._web3.eth.call({"to": self.multicall_address, "data": data}, block_identifier)
+        (results,) = abi_decode(["(bool,bytes)[]"], bytes(raw))
+        if with_block_number:
+            ok, payload = results[0]
+            if not ok:
+                raise Web3Exception("Multicall3 getBlockNumber failed")
+            (block_number,) = abi_decode(["uint256"], payload)
+            results = results[1:]
+
+        per_wallet = 2 if tokens else 1
+        now = time.time()
+        balances: Dict[str, WalletBalances] = {}
+
+        with self._cache_lock:
+            for i, wallet in enumerate(wallets):
+                ok, payload = results[i * per_wallet]
+                if not ok:
+                    raise Web3Exception(f"USDC balanceOf failed for {wallet}")
+                (usdc_raw,) = abi_decode(["uint256"], payload)
+                self._cache[wallet] = (usdc_raw, now)
+
+                token_balances: Dict[str, float] = {}
+                if tokens:
+                    ok, payload = results[i * per_wallet + 1]
+                    if not ok:
+                        raise Web3Exception(f"CTF balanceOfBatch failed for {wallet}")
+                    (shares,) = abi_decode(["uint256[]"], payload)
+                    wallet_tokens = self._token_cache.setdefault(wallet, {})
+                    for token_id, share_raw in zip(tokens, shares):
+                        wallet_tokens[token_id] = (share_raw, now)
+                        token_balances[token_id] = share_raw / (10**CTF_DECIMALS)
+
+                balances[wallet] = WalletBalances(
+                    address=wallet,
+                    usdc=usdc_raw / (10**USDC_DECIMALS),
+                    tokens=token_balances,
+                    block_number=block_number,
+                )
+
+            if self.event_driven and block_number is not None:
+                # Logs up to this block are already reflected in the read
+                self._last_log_block = max(self._last_log_block or 0, block_number)
+
+        return balances
+
+    def get_wallet_balances(
+        self, address: str, token_ids: Iterable[str] = ()
+    ) -> Optional[WalletBalances]:
+        """
+        Cached USDC and token balances for one wallet.
+
+        Anything missing or stale is re-read with a single multicall.
+
+        Args:
+            address: Wallet address
+            token_ids: Conditional token IDs to include
+
+        Returns:
+            WalletBalances, or None on error
+        """
+        try:
+            if not Web3.is_address(address):
+                print(f"[BalanceChecker] Invalid address: {address}")
+                return None
+            wallet = Web3.to_checksum_address(address)
+            tokens = [str(t) for t in token_ids]
+
+            now = time.time()
+            with self._cache_lock:
+                cached_usdc = self._cache.get(wallet)
+                cached_tokens = self._token_cache.get(wallet, {})
+                fresh = cached_usdc is not None and now - cached_usdc[1] < self._max_age
+                fresh = fresh and all(
+                    t in cached_tokens and now - cached_tokens[t][1] < self._max_age
+                    for t in tokens
+                )
+                if fresh:
+                    return WalletBalances(
+                        address=wallet,
+                        usdc=cached_usdc[0] / (10**USDC_DECIMALS),
+                        tokens={t: cached_tokens[t][0] / (10**CTF_DECIMALS) for t in tokens},
+                    )
+
+            return self.fetch_balances([wallet], tokens)[wallet]
+
+        except Exception as e:
+            print(f"[BalanceChecker] Error getting wallet balances: {str(e)}")
+            return None
+
+    def apply_fill(
+        self,
+        address: str,
+        usdc_delta: float = 0.0,
+        token_id: Optional[str] = None,
+        token_delta: float = 0.0,
+        tx_hash: Optional[str] = None,
+    ):
+        """
+        Update cached balances from one of our own fills (event-driven mode).
+
+        Only wallets and tokens already in the cache are adjusted; anything
+        else is picked up by the next read.
+
+        Args:
+            address: Wallet address
+            usdc_delta: USDC change (negative when buying)
+            token_id: Conditional token traded, if any
+            token_delta: Share change (positive when buying)
+            tx_hash: Settlement transaction; the Transfer logs in it that
+                carry exactly these moves are then skipped by
+                apply_transfer_logs. Other logs in the same transaction
+                (fees, other wallets or tokens) still apply.
+        """
+        wallet = Web3.to_checksum_address(address)
+        usdc_raw = round(usdc_delta * 10**USDC_DECIMALS)
+        token_raw = round(token_delta * 10**CTF_DECIMALS)
+        with self._cache_lock:
+            if tx_hash:
+                tx_key = tx_hash.lower()
+                if usdc_raw:
+                    self._applied_moves[(tx_key, wallet, None, usdc_raw)] = None
+                if token_id is not None and token_raw:
+                    self._applied_moves[(tx_key, wallet, str(token_id), token_raw)] = None
+                while len(self._applied_moves) > MAX_TRACKED_FILL_MOVES:
+                    del self._applied_moves[next(iter(self._applied_moves))]
+            self._adjust_usdc(wallet, usdc_raw)
+            if token_id is not None:
+                self._adjust_token(wallet, str(token_id), token_raw)
+
+    def _adjust_usdc(self, wallet: str, delta: int):
+        """Shift a cached USDC balance (lock must be held)."""
+        if wallet in self._cache:
+            raw, timestamp = self._cache[wallet]
+            self._cache[wallet] = (max(0, raw + delta), timestamp)
+
+    def _adjust_token(self, wallet: str, token_id: str, delta: int):
+        """Shift a cached token balance (lock must be held)."""
+        tokens = self._token_cache.get(wallet)
+        if tokens is not None and token_id in tokens:
+            raw, timestamp = tokens[token_id]
+            tokens[token_id] = (max(0, raw + delta), timestamp)
+
+    def apply_transfer_logs(self, logs: Iterable[dict]) -> int:
+        """
+        Update cached balances from USDC Transfer and CTF TransferSingle/Batch logs.
+
+        Args:
+            logs: Log entries as returned by eth_getLogs
+
+        Returns:
+            Number of logs that changed a cached balance
+        """
+        applied = 0
+        with self._cache_lock:
+            for log in logs:
+                tx_hash = log.get("transactionHash")
+                tx_key = None
+                if tx_hash is not None:
+                    tx_key = (
+                        tx_hash if isinstance(tx_hash, str) else "0x" + bytes(tx_hash).hex()
+                    ).lower()
+
+                emitter = Web3.to_checksum_address(log["address"])
+                topics = [bytes(t) for t in log["topics"]]
+                data = log["data"]
+                data = bytes.fromhex(data[2:]) if isinstance(data, str) else bytes(data)
+                if not topics:
+                    continue
+
+                if emitter == self.usdc_address and topics[0] == TRANSFER_TOPIC:
+                    sender, receiver = _topic_address(topics[1]), _topic_address(topics[2])
+                    (value,) = abi_decode(["uint256"], data)
+                    moves = [(sender, None, -value), (receiver, None, value)]
+                elif emitter == self.ctf_address and topics[0] == TRANSFER_SINGLE_TOPIC:
+                    sender, receiver = _topic_address(topics[2]), _topic_address(topics[3])
+                    token, value = abi_decode(["uint256", "uint256"], data)
+                    moves = [(sender, str(token), -value), (receiver, str(token), value)]
+                elif emitter == self.ctf_address and topics[0] == TRANSFER_BATCH_TOPIC:
+                    sender, receiver = _topic_address(topics[2]), _topic_address(topics[3])
+                    token_list, values = abi_decode(["uint256[]", "uint256[]"], data)
+                    moves = []
+                    for token, value in zip(token_list, values):
+                        moves += [(sender, str(token), -value), (receiver, str(token), value)]
+                else:
+                    continue
+
+                touched = False
+                for wallet, token, delta in moves:
+                    if tx_key is not None:
+                        move = (tx_key, wallet, token, delta)
+                        if move in self._applied_moves:
+                            # Already applied by apply_fill
+                            del self._applied_moves[move]
+                            continue
+                    if token is None and wallet in self._cache:
+                        self._adjust_usdc(wallet, delta)
+                        touched = True
+                    elif token is not None and token in self._token_cache.get(wallet, {}):
+                        self._adjust_token(wallet, token, delta)
+                        touched = True
+                applied += touched
+
+        return applied
+
+    def sync_transfer_logs(self, to_block="latest") -> int:
+        """
+        Pull and apply Transfer logs since the last chain read (event-driven mode).
+
+        Only logs sent from or to a cached wallet are requested: one query
+        per direction and contract, filtered on the padded address topics,
+        over at most MAX_LOG_BLOCK_SPAN blocks per call.
+
+        Args:
+            to_block: Last block to include (default latest)
+
+        Returns:
+            Number of logs that changed a cached balance
+        """
+        if not self.is_ready() or self._last_log_block is None:
+            return 0
+
+        latest = self._web3.eth.block_number if to_block == "latest" else int(to_block)
+        if latest <= self._last_log_block:
+            return 0
+
+        with self._cache_lock:
+            wallets = sorted(set(self._cache) | set(self._token_cache))
+        if not wallets:
+            self._last_log_block = latest
+            return 0
+
+        padded = [_address_topic(w) for w in wallets]
+        ctf_topics = [TRANSFER_SINGLE_TOPIC, TRANSFER_BATCH_TOPIC]
+        filters = [
+            (self.usdc_address, [TRANSFER_TOPIC, padded]),  # from
+            (self.usdc_address, [TRANSFER_TOPIC, None, padded]),  # to
+            (self.ctf_address, [ctf_topics, None, padded]),  # from
+            (self.ctf_address, [ctf_topics, None, None, padded]),  # to
+        ]
+
+        applied = 0
+        while self._last_log_block < latest:
+            start = self._last_log_block + 1
+            end = min(latest, start + MAX_LOG_BLOCK_SPAN - 1)
+
+            # Transfers between two tracked wallets match both directions
+            logs = {}
+            for address, topics in filters:
+                for log in self._web3.eth.get_logs({
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "address": address,
+                    "topics": topics,
+                }):
+                    logs[(bytes(log["transactionHash"]), log["logIndex"])] = log
+
+            ordered = sorted(logs.values(), key=lambda l: (l["blockNumber"], l["logIndex"]))
+            applied += self.apply_transfer_logs(ordered)
+            self._last_log_block = end
+
+        return applied
+
     def has_sufficient_balance(self, address: str, required_amount: float) -> bool:
         """
         Check if address has sufficient balance for a trade.
@@ -10,8 +10,9 @@ Supports:
 - Balance checks
 
 Safety Features:
-- 5s timeout on all API calls
+- 5s deadline on all API calls (run on a persistent worker pool)
 - Retry with exponential backoff (3 attempts)
+- Host-wide token-bucket rate limiting per endpoint class
 - Kill switch file check (.kill_switch)
 - Slippage warning logging (>1%)
 
@@ -23,6 +24,8 @@ import os
 import time
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Dict, List, Optional, Tuple, Callable, Any
 from dataclasses import dataclass
 from datetime import datetime
@@ -40,6 +43,7 @@ from tenacity import (
 
 from ..config import DATA_DIR
 from .balance_checker import BalanceChecker, get_usdc_balance, check_sufficient_funds
+from .rate_limiter import EndpointRateLimiter, RateLimitTimeout, get_shared_limiter
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -75,6 +79,70 @@ RETRY_MAX_WAIT = 2.0  # seconds
 # Slippage threshold for warnings
 SLIPPAGE_WARNING_THRESHOLD = 0.01  # 1%
 
+# Persistent worker pool for blocking CLOB calls (shared by all executors)
+API_POOL_SIZE = 8
+
+# Timed-out calls still holding pool workers before the pool is replaced
+API_POOL_MAX_STUCK = API_POOL_SIZE // 2
+
+# Pause applied to an endpoint class after an HTTP 429
+RATE_LIMIT_PAUSE = 1.0
+
+_api_pool: Optional[ThreadPoolExecutor] = None
+_api_pool_stuck = 0
+_api_pool_lock = threading.Lock()
+
+
+def _get_api_pool() -> ThreadPoolExecutor:
+    """Get the shared API worker pool, creating it on first use."""
+    global _api_pool
+    with _api_pool_lock:
+        if _api_pool is None:
+            _api_pool = ThreadPoolExecutor(
+                max_workers=API_POOL_SIZE, thread_name_prefix="clob-api"
+            )
+        return _api_pool
+
+
+def shutdown_api_pool(wait: bool = False) -> None:
+    """Shut down the shared API worker pool (recreated on next use)."""
+    global _api_pool, _api_pool_stuck
+    with _api_pool_lock:
+        if _api_pool is not None:
+            _api_pool.shutdown(wait=wait)
+            _api_pool = None
+            _api_pool_stuck = 0
+
+
+def _release_when_done(pool: ThreadPoolExecutor, future) -> None:
+    """
+    Track a timed-out call that is still running on `pool`.
+
+    A hung call can't be interrupted and keeps its worker. Once
+    API_POOL_MAX_STUCK workers are held that way, the pool is retired
+    (its threads exit as their calls return) and the next call gets a
+    fresh one, so later calls never queue behind hung ones.
+    """
+    global _api_pool, _api_pool_stuck
+    with _api_pool_lock:
+        if pool is not _api_pool:
+            return
+        _api_pool_stuck += 1
+        if _api_pool_stuck >= API_POOL_MAX_STUCK:
+            logger.warning(f"{_api_pool_stuck} CLOB calls hung past their deadline; replacing API worker pool")
+            _api_pool = None
+            _api_pool_stuck = 0
+            pool.shutdown(wait=False)
+            return
+
+    def _released(_):
+        global _api_pool_stuck
+        with _api_pool_lock:
+            if pool is _api_pool:
+                _api_pool_stuck -= 1
+
+    future.add_done_callback(_released)
+
 
 class OrderType(Enum):
     """Order types."""
@@ -218,7 +286,12 @@ class LiveExecutor:
     CLOB_BASE_URL = "https://clob.polymarket.com"
     CHAIN_ID = 137  # Polygon
 
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[EndpointRateLimiter] = None):
+        """
+        Args:
+            rate_limiter: Endpoint-class limiter (defaults to the host-wide
+                shared limiter, so all executors split one budget)
+        """
         # Load credentials from environment
         self.private_key = os.getenv("POLYMARKET_PRIVATE_KEY", "")
         self.funder = os.getenv("POLYMARKET_FUNDER", "")
@@ -229,8 +302,7 @@ class LiveExecutor:
         self._client = None
 
         # Rate limiting
-        self._last_request_time = 0
-        self._min_request_interval = 0.1  # 100ms between requests
+        self._rate_limiter = rate_limiter or get_shared_limiter()
 
         # Order tracking
         self.pending_orders: Dict[str, Dict] = {}
@@ -304,15 +376,17 @@ class LiveExecutor:
         """Get last error message."""
         return self._last_error
 
-    def _rate_limit(self):
-        """Apply rate limiting."""
-        now = time.time()
-        elapsed = now - self._last_request_time
-
-        if elapsed < self._min_request_interval:
-            time.sleep(self._min_request_interval - elapsed)
+    def _rate_limit(self, endpoint_class: str = "read", timeout: Optional[float] = None):
+        """
+        Apply rate limiting for an endpoint class.
 
-        self._last_request_time = time.time()
+        Raises:
+            APITimeoutError: If no token is available before the deadline
+        """
+        try:
+            self._rate_limiter.acquire(endpoint_class, timeout=timeout)
+        except RateLimitTimeout as e:
+            raise APITimeoutError(str(e)) from e
 
     def _check_kill_switch(self) -> bool:
         """
@@ -331,15 +405,23 @@ class LiveExecutor:
         func: Callable[..., Any],
         *args,
         operation_name: str = "API call",
+        endpoint_class: str = "read",
+        timeout: float = API_TIMEOUT,
         **kwargs
     ) -> Any:
         """
         Call an API function with timeout and retry logic.
 
+        Each attempt takes a token from the endpoint class's bucket and
+        runs on the shared worker pool with a `timeout` deadline covering
+        both the rate-limit wait and the call itself.
+
         Args:
             func: The API function to call
             *args: Positional arguments for the function
             operation_name: Name of the operation for logging
+            endpoint_class: Rate-limit bucket ("order", "cancel" or "read")
+            timeout: Per-attempt deadline in seconds
             **kwargs: Keyword arguments for the function
 
         Returns:
@@ -349,8 +431,6 @@ class LiveExecutor:
             APITimeoutError: If all retry attempts timeout
             Exception: If the API call fails after all retries
         """
-        import threading
-
         @retry(
             stop=stop_after_attempt(MAX_RETRY_ATTEMPTS),
             wait=wait_exponential(
@@ -361,31 +441,23 @@ class LiveExecutor:
             reraise=True,
         )
         def _execute_with_retry():
-            # Use threading for timeout (works on all platforms)
-            result = [None]
-            exception = [None]
-
-            def target():
-                try:
-                    result[0] = func(*args, **kwargs)
-                except Exception as e:
-                    exception[0] = e
-
-            thread = threading.Thread(target=target)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=API_TIMEOUT)
-
-            if thread.is_alive():
-                # Timeout occurred
+            deadline = time.monotonic() + timeout
+            self._rate_limit(endpoint_class, timeout=timeout)
+
+            pool = _get_api_pool()
+            future = pool.submit(func, *args, **kwargs)
+            try:
+                return future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                if not future.cancel():
+                    _release_when_done(pool, future)
                 raise APITimeoutError(
-                    f"{operation_name} timed out after {API_TIMEOUT}s"
+                    f"{operation_name} timed out after {timeout}s"
                 )
-
-            if exception[0] is not None:
-                raise exception[0]
-
-            return result[0]
+            except Exception as e:
+                if getattr(e, "status_code", None) == 429:
+                    self._rate_limiter.pause(endpoint_class, RATE_LIMIT_PAUSE)
+                raise
 
         try:
             return _execute_with_retry()
@@ -470,8 +542,6 @@ class LiveExecutor:
                 message=f"Executor not ready: {self._last_error}"
             )
 
-        self._rate_limit()
-
         # Normalize side
         side_upper = side.upper()
         if side_upper not in ["BUY", "SELL"]:
@@ -520,7 +590,8 @@ class LiveExecutor:
                 self._client.create_and_post_order,
                 order_args,
                 options,
-                operation_name="place_order"
+                operation_name="place_order",
+                endpoint_class="order"
             )
 
             # Check if order was successful
@@ -598,14 +669,13 @@ class LiveExecutor:
                 message=f"Executor not ready: {self._last_error}"
             )
 
-        self._rate_limit()
-
         try:
             # Use retry wrapper for API call
             result = self._call_api_with_retry(
                 self._client.cancel,
                 order_id,
-                operation_name="cancel_order"
+                operation_name="cancel_order",
+                endpoint_class="cancel"
             )
 
             # Update tracking
@@ -724,7 +794,8 @@ class LiveExecutor:
         try:
             result = self._call_api_with_retry(
                 self._client.cancel_all,
-                operation_name="cancel_all_orders"
+                operation_name="cancel_all_orders",
+                endpoint_class="cancel"
             )
             return result.get("canceled", 0) if result else 0
         except APITimeoutError as e:
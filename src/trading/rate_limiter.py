@@ -0,0 +1,376 @@
+"""
+Host-wide Token-Bucket Rate Limiter for CLOB API Calls
+
+Replaces the fixed per-executor sleep between requests with token
+buckets keyed by endpoint class (order placement, cancels, reads).
+Buckets live in small memory-mapped files guarded by flock, so every
+executor in every process on the host draws from the same budget and
+the bot can run at the real API limit instead of a conservative pause.
+
+Features:
+- One bucket per endpoint class, each with its own rate and burst
+- Cross-process sharing via mmap'ed state files (tmpfs when available)
+- Per-acquire deadlines, so a throttled call fails fast instead of hanging
+- Shared pause after a 429, so one process's rate-limit hit slows them all
+- In-process fallback where fcntl/mmap aren't available
+
+Usage:
+    limiter = get_shared_limiter()
+    limiter.acquire("order", timeout=5.0)
+    client.create_and_post_order(...)
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+# Default (rate per second, burst) per endpoint class. Kept below the
+# published CLOB limits so bursts from several processes stay inside them.
+DEFAULT_ENDPOINT_RATES: Dict[str, Tuple[float, float]] = {
+    "order": (20.0, 40.0),
+    "cancel": (20.0, 40.0),
+    "read": (10.0, 20.0),
+}
+
+# Directory for shared bucket files (override with CLOB_RATE_LIMIT_DIR)
+RATE_LIMIT_DIR_ENV = "CLOB_RATE_LIMIT_DIR"
+
+# Shared state: tokens, last refill, paused-until (CLOCK_MONOTONIC seconds)
+_STATE = struct.Struct("ddd")
+
+# Longest pause a shared state file may legitimately hold (seconds); a
+# file on persistent storage can outlive a reboot, which resets the clock
+MAX_SHARED_PAUSE = 300.0
+
+
+class RateLimitTimeout(Exception):
+    """Raised when tokens can't be acquired before the deadline."""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe in-process token bucket.
+
+    Example:
+        bucket = TokenBucket(rate=10, capacity=20)
+        bucket.acquire(timeout=5.0)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Max burst size (defaults to one second of tokens)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._lock = threading.Lock()
+        self._state = (self.capacity, time.monotonic(), 0.0)
+
+        # Stats
+        self.total_acquired = 0.0
+        self.total_wait = 0.0
+        self.pauses = 0
+
+    def _read_state(self) -> Tuple[float, float, float]:
+        return self._state
+
+    def _write_state(self, state: Tuple[float, float, float]):
+        self._state = state
+
+    def _locked(self):
+        return self._lock
+
+    def _take(self, tokens: float) -> float:
+        """
+        Take tokens if available.
+
+        Returns:
+            0 on success, otherwise seconds until they could be available
+        """
+        with self._locked():
+            available, last, paused_until = self._read_state()
+            now = time.monotonic()
+
+            if now < paused_until:
+                return paused_until - now
+
+            available = min(self.capacity, available + max(0.0, now - last) * self.rate)
+            if available >= tokens:
+                self._write_state((available - tokens, now, paused_until))
+                return 0.0
+
+            self._write_state((available, now, paused_until))
+            return (tokens - available) / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now, without blocking."""
+        if self._take(tokens) == 0.0:
+            self.total_acquired += tokens
+            return True
+        return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Block until tokens are available and take them.
+
+        Args:
+            tokens: Cost of the request
+            timeout: Give up after this many seconds (None = wait forever)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If the deadline would pass before tokens arrive
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Request of {tokens} tokens exceeds capacity {self.capacity}")
+
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+
+        while True:
+            delay = self._take(tokens)
+            now = time.monotonic()
+            if delay == 0.0:
+                waited = now - start
+                self.total_acquired += tokens
+                self.total_wait += waited
+                return waited
+
+            if deadline is not None and now + delay > deadline:
+                raise RateLimitTimeout(
+                    f"Rate limit: {delay:.2f}s wait exceeds remaining deadline "
+                    f"{max(0.0, deadline - now):.2f}s"
+                )
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429)."""
+        with self._locked():
+            available, last, paused_until = self._read_state()
+            now = time.monotonic()
+            resume = max(paused_until, now + seconds)
+            # Start refilling from empty once the pause ends
+            self._write_state((0.0, resume, resume))
+        self.pauses += 1
+
+    def get_stats(self) -> Dict:
+        """Counters for monitoring."""
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "acquired": self.total_acquired,
+            "total_wait": round(self.total_wait, 3),
+            "pauses": self.pauses,
+        }
+
+
+class _FileLock:
+    """flock on a file descriptor plus a thread lock (flock is per open file)."""
+
+    def __init__(self, fd: int):
+        self._fd = fd
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a memory-mapped file.
+
+    Every process that opens the same path shares one budget. Refill uses
+    CLOCK_MONOTONIC, which is host-wide, so timestamps written by one
+    process are valid in another. CLOCK_MONOTONIC restarts at boot, so
+    state from before a reboot (a timestamp in the future, or a pause
+    longer than `max_pause`) is discarded when the file is opened.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rate: float,
+        capacity: Optional[float] = None,
+        max_pause: float = MAX_SHARED_PAUSE,
+    ):
+        """
+        Args:
+            path: State file (created if missing)
+            rate: Refill rate in tokens per second
+            capacity: Max burst size
+            max_pause: Longest pause accepted from an existing state file
+        """
+        if fcntl is None:
+            raise OSError("fcntl is not available on this platform")
+
+        super().__init__(rate, capacity)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file_lock = _FileLock(self._fd)
+
+        with self._file_lock:
+            if os.fstat(self._fd).st_size < _STATE.size:
+                os.ftruncate(self._fd, _STATE.size)
+                os.pwrite(self._fd, _STATE.pack(self.capacity, time.monotonic(), 0.0), 0)
+            else:
+                available, last, paused_until = _STATE.unpack(os.pread(self._fd, _STATE.size, 0))
+                now = time.monotonic()
+                if not (0.0 <= available <= self.capacity and last <= now
+                        and paused_until <= now + max_pause):
+                    os.pwrite(self._fd, _STATE.pack(self.capacity, now, 0.0), 0)
+
+        self._map = mmap.mmap(self._fd, _STATE.size)
+
+    def _read_state(self) -> Tuple[float, float, float]:
+        return _STATE.unpack_from(self._map, 0)
+
+    def _write_state(self, state: Tuple[float, float, float]):
+        _STATE.pack_into(self._map, 0, *state)
+
+    def _locked(self):
+        return self._file_lock
+
+    def close(self):
+        """Release the mapping and file descriptor."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            os.close(self._fd)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class EndpointRateLimiter:
+    """
+    Token buckets keyed by endpoint class.
+
+    Example:
+        limiter = EndpointRateLimiter(shared_dir="/dev/shm/clob")
+        limiter.acquire("cancel", timeout=5.0)
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        shared_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            rates: endpoint class -> (rate per second, burst); merged over defaults
+            shared_dir: Directory for shared state files (None = in-process only)
+        """
+        self.rates = {**DEFAULT_ENDPOINT_RATES, **(rates or {})}
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint_class: str) -> TokenBucket:
+        bucket = self._buckets.get(endpoint_class)
+        if bucket is not None:
+            return bucket
+
+        with self._lock:
+            if endpoint_class in self._buckets:
+                return self._buckets[endpoint_class]
+            if endpoint_class not in self.rates:
+                raise KeyError(f"Unknown endpoint class: {endpoint_class}")
+
+            rate, burst = self.rates[endpoint_class]
+            bucket = None
+            if self.shared_dir is not None:
+                try:
+                    bucket = SharedTokenBucket(
+                        self.shared_dir / f"{endpoint_class}.bucket", rate, burst
+                    )
+                except OSError:
+                    bucket = None
+            if bucket is None:
+                bucket = TokenBucket(rate, burst)
+
+            self._buckets[endpoint_class] = bucket
+            return bucket
+
+    def acquire(
+        self,
+        endpoint_class: str,
+        tokens: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Take tokens from an endpoint class's bucket.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If tokens can't be had before the deadline
+        """
+        return self._bucket(endpoint_class).acquire(tokens, timeout=timeout)
+
+    def pause(self, endpoint_class: str, seconds: float):
+        """Pause an endpoint class everywhere after a rate-limit response."""
+        self._bucket(endpoint_class).pause(seconds)
+
+    def is_shared(self, endpoint_class: str) -> bool:
+        """Whether the endpoint class's bucket is shared across processes."""
+        return isinstance(self._bucket(endpoint_class), SharedTokenBucket)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-endpoint-class counters."""
+        return {name: bucket.get_stats() for name, bucket in self._buckets.items()}
+
+
+def _default_shared_dir() -> str:
+    """Host-wide location for bucket files (tmpfs when available)."""
+    configured = os.getenv(RATE_LIMIT_DIR_ENV)
+    if configured:
+        return configured
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "polymarket_clob_rate_limit")
+
+
+_shared_limiter: Optional[EndpointRateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_limiter() -> EndpointRateLimiter:
+    """
+    Process-wide limiter backed by host-wide shared buckets.
+
+    Returns:
+        The same EndpointRateLimiter for every caller in this process
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = EndpointRateLimiter(shared_dir=_default_shared_dir())
+        return _shared_limiter
@@ -0,0 +1,344 @@
+"""
+Tests for the multicall-batched, event-updated BalanceChecker.
+
+Tests cover:
+- USDC and ERC1155 balances for many wallets in one eth_call
+- Cache reuse and TTL / reconcile-interval expiry
+- Event-driven updates from fills and Transfer logs
+- Skipping logs for fills already applied
+
+Unit tests run against an in-process fake node that implements
+Multicall3 aggregate3, ERC20 balanceOf and ERC1155 balanceOfBatch.
+Set EVM_TEST_RPC_URL, EVM_TEST_USDC, EVM_TEST_CTF, EVM_TEST_WALLET and
+EVM_TEST_TOKEN_ID (plus EVM_TEST_MULTICALL if not at the canonical
+address) to also run against a local anvil/hardhat node with the
+contracts deployed.
+"""
+
+import os
+
+import pytest
+from eth_abi import decode as abi_decode, encode as abi_encode
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+from src.trading.balance_checker import (
+    MAX_LOG_BLOCK_SPAN,
+    MULTICALL3_ADDRESS,
+    TRANSFER_BATCH_TOPIC,
+    TRANSFER_SINGLE_TOPIC,
+    TRANSFER_TOPIC,
+    BalanceChecker,
+)
+
+USDC = Web3.to_checksum_address("0x" + "11" * 20)
+CTF = Web3.to_checksum_address("0x" + "22" * 20)
+ALICE = Web3.to_checksum_address("0x" + "aa" * 20)
+BOB = Web3.to_checksum_address("0x" + "bb" * 20)
+YES, NO = "1001", "1002"
+
+_BALANCE_OF = Web3.keccak(text="balanceOf(address)")[:4]
+_BALANCE_OF_BATCH = Web3.keccak(text="balanceOfBatch(address[],uint256[])")[:4]
+_AGGREGATE3 = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+_GET_BLOCK_NUMBER = Web3.keccak(text="getBlockNumber()")[:4]
+
+
+class FakeChain(JSONBaseProvider):
+    """Minimal JSON-RPC node with USDC, CTF and Multicall3 state."""
+
+    def __init__(self):
+        super().__init__()
+        self.usdc = {ALICE: 500_000_000, BOB: 10_000_000}
+        self.ctf = {(ALICE, int(YES)): 40_000_000, (ALICE, int(NO)): 0}
+        self.block = 100
+        self.logs = []
+        self.log_queries = []
+        self.calls = []
+
+    def _call(self, target, data):
+        selector, args = data[:4], data[4:]
+        if target == MULTICALL3_ADDRESS and selector == _GET_BLOCK_NUMBER:
+            return abi_encode(["uint256"], [self.block])
+        if target == USDC and selector == _BALANCE_OF:
+            (owner,) = abi_decode(["address"], args)
+            return abi_encode(["uint256"], [self.usdc.get(Web3.to_checksum_address(owner), 0)])
+        if target == CTF and selector == _BALANCE_OF_BATCH:
+            owners, ids = abi_decode(["address[]", "uint256[]"], args)
+            values = [
+                self.ctf.get((Web3.to_checksum_address(o), i), 0) for o, i in zip(owners, ids)
+            ]
+            return abi_encode(["uint256[]"], [values])
+        raise AssertionError(f"unexpected call to {target}")
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        if method == "web3_clientVersion":
+            result = "fake/1.0"
+        elif method == "eth_chainId":
+            result = "0x89"
+        elif method == "eth_blockNumber":
+            result = hex(self.block)
+        elif method == "eth_call":
+            tx = params[0]
+            assert Web3.to_checksum_address(tx["to"]) == MULTICALL3_ADDRESS
+            data = bytes.fromhex(tx["data"][2:])
+            assert data[:4] == _AGGREGATE3
+            (calls,) = abi_decode(["(address,bool,bytes)[]"], data[4:])
+            results = [(True, self._call(Web3.to_checksum_address(t), d)) for t, _, d in calls]
+            result = "0x" + abi_encode(["(bool,bytes)[]"], [results]).hex()
+        elif method == "eth_getLogs":
+            query = params[0]
+            self.log_queries.append(query)
+            lo, hi = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+            result = [
+                log for log in self.logs
+                if lo <= int(log["blockNumber"], 16) <= hi
+                and log["address"] in self._hex_list(query["address"])
+                and self._topics_match(log["topics"], query["topics"])
+            ]
+        else:
+            raise AssertionError(f"unexpected RPC {method}")
+        return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+    @staticmethod
+    def _hex_list(values):
+        values = values if isinstance(values, list) else [values]
+        return [Web3.to_hex(v).lower() if isinstance(v, bytes) else v.lower() for v in values]
+
+    def _topics_match(self, topics, wanted):
+        for i, options in enumerate(wanted):
+            if options is None:
+                continue
+            if i >= len(topics) or topics[i].lower() not in self._hex_list(options):
+                return False
+        return True
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def _topic(address):
+    return "0x" + "00" * 12 + address[2:].lower()
+
+
+def _log(emitter, topics, data, block, tx="0x" + "01" * 32, index=0):
+    return {
+        "address": emitter.lower(),
+        "topics": topics,
+        "data": "0x" + data.hex(),
+        "blockNumber": hex(block),
+        "transactionHash": tx,
+        "transactionIndex": "0x0",
+        "blockHash": "0x" + "00" * 32,
+        "logIndex": hex(index),
+        "removed": False,
+    }
+
+
+@pytest.fixture
+def chain():
+    return FakeChain()
+
+
+@pytest.fixture
+def checker(chain):
+    return BalanceChecker(usdc_address=USDC, ctf_address=CTF, web3=Web3(chain))
+
+
+@pytest.fixture
+def event_checker(chain):
+    return BalanceChecker(
+        usdc_address=USDC, ctf_address=CTF, web3=Web3(chain), event_driven=True
+    )
+
+
+class TestMulticallBatching:
+    """Tests for single-request balance reads."""
+
+    def test_many_wallets_one_call(self, checker, chain):
+        """Test USDC and token balances for two wallets cost one eth_call."""
+        balances = checker.fetch_balances([ALICE, BOB], [YES, NO])
+
+        assert chain.calls.count("eth_call") == 1
+        assert "eth_blockNumber" not in chain.calls
+        assert balances[ALICE].usdc == 500.0
+        assert balances[ALICE].tokens == {YES: 40.0, NO: 0.0}
+        assert balances[BOB].usdc == 10.0
+        assert balances[ALICE].block_number == 100
+
+    def test_wallet_balances_served_from_cache(self, checker, chain):
+        """Test cached wallets and tokens don't hit the node again."""
+        checker.fetch_balances([ALICE], [YES])
+        chain.calls.clear()
+
+        balances = checker.get_wallet_balances(ALICE, [YES])
+        assert balances.tokens == {YES: 40.0}
+        assert checker.get_balance(ALICE).available == 500.0
+        assert chain.calls == []
+
+        # Uncached token forces one more batched read
+        checker.get_wallet_balances(ALICE, [YES, NO])
+        assert chain.calls.count("eth_call") == 1
+
+    def test_ttl_expiry(self, checker, chain):
+        """Test stale entries are re-read."""
+        checker.cache_ttl = 0
+        checker.get_balance(ALICE)
+        checker.get_balance(ALICE)
+
+        assert chain.calls.count("eth_call") == 2
+
+
+class TestEventDrivenMode:
+    """Tests for fill and log driven cache updates."""
+
+    def test_fill_updates_cache_without_rpc(self, event_checker, chain):
+        """Test a fill adjusts USDC and shares in place."""
+        event_checker.fetch_balances([ALICE], [YES])
+        chain.calls.clear()
+
+        event_checker.apply_fill(ALICE, usdc_delta=-27.5, token_id=YES, token_delta=50)
+
+        balances = event_checker.get_wallet_balances(ALICE, [YES])
+        assert balances.usdc == 472.5
+        assert balances.tokens[YES] == 90.0
+        assert chain.calls == []
+
+    def test_transfer_logs_applied(self, event_checker, chain):
+        """Test USDC Transfer and CTF TransferSingle/Batch logs move balances."""
+        event_checker.fetch_balances([ALICE, BOB], [YES, NO])
+        chain.block = 102
+        chain.logs = [
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(ALICE), _topic(BOB)],
+                 abi_encode(["uint256"], [5_000_000]), 101, tx="0x" + "0a" * 32),
+            _log(CTF, ["0x" + TRANSFER_SINGLE_TOPIC.hex(), _topic(BOB), _topic(BOB),
+                       _topic(ALICE)],
+                 abi_encode(["uint256", "uint256"], [int(NO), 7_000_000]), 102,
+                 tx="0x" + "0b" * 32),
+            _log(CTF, ["0x" + TRANSFER_BATCH_TOPIC.hex(), _topic(ALICE), _topic(ALICE),
+                       _topic(BOB)],
+                 abi_encode(["uint256[]", "uint256[]"], [[int(YES)], [10_000_000]]), 102,
+                 tx="0x" + "0c" * 32),
+        ]
+
+        applied = event_checker.sync_transfer_logs()
+
+        assert applied == 3
+        alice = event_checker.get_wallet_balances(ALICE, [YES, NO])
+        assert alice.usdc == 495.0
+        assert alice.tokens == {YES: 30.0, NO: 7.0}
+        assert event_checker.get_balance(BOB).available == 15.0
+        assert chain.calls.count("eth_call") == 1
+
+        # Already-synced blocks aren't re-applied
+        assert event_checker.sync_transfer_logs() == 0
+
+    def test_fill_logs_not_double_counted(self, event_checker, chain):
+        """Test logs for a fill's transaction are skipped."""
+        event_checker.fetch_balances([ALICE], [YES])
+        fill_tx = "0x" + "0f" * 32
+        event_checker.apply_fill(ALICE, usdc_delta=-5.0, tx_hash=fill_tx)
+        chain.block = 101
+        chain.logs = [
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(ALICE), _topic(BOB)],
+                 abi_encode(["uint256"], [5_000_000]), 101, tx=fill_tx),
+        ]
+
+        assert event_checker.sync_transfer_logs() == 0
+        assert event_checker.get_balance(ALICE).available == 495.0
+
+    def test_other_moves_in_fill_tx_still_applied(self, event_checker, chain):
+        """Test only the fill's own moves are skipped, not the whole transaction."""
+        event_checker.fetch_balances([ALICE, BOB], [YES])
+        fill_tx = "0x" + "0f" * 32
+        event_checker.apply_fill(
+            ALICE, usdc_delta=-5.0, token_id=YES, token_delta=10, tx_hash=fill_tx
+        )
+        chain.block = 101
+        chain.logs = [
+            # The fill itself: USDC out, shares in
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(ALICE), _topic(BOB)],
+                 abi_encode(["uint256"], [5_000_000]), 101, tx=fill_tx),
+            _log(CTF, ["0x" + TRANSFER_SINGLE_TOPIC.hex(), _topic(BOB), _topic(BOB),
+                       _topic(ALICE)],
+                 abi_encode(["uint256", "uint256"], [int(YES), 10_000_000]), 101,
+                 tx=fill_tx, index=1),
+            # A fee in the same transaction that apply_fill didn't cover
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(ALICE), _topic(BOB)],
+                 abi_encode(["uint256"], [100_000]), 101, tx=fill_tx, index=2),
+        ]
+
+        assert event_checker.sync_transfer_logs() == 3
+        alice = event_checker.get_wallet_balances(ALICE, [YES])
+        assert alice.usdc == 494.9
+        assert alice.tokens == {YES: 50.0}
+        # Bob's side of every log is applied
+        assert event_checker.get_balance(BOB).available == 15.1
+
+    def test_log_queries_filtered_to_tracked_wallets(self, event_checker, chain):
+        """Test logs are requested per direction for cached wallets, in capped spans."""
+        carol = Web3.to_checksum_address("0x" + "cc" * 20)
+        event_checker.fetch_balances([ALICE])
+        chain.block = 100 + 2 * MAX_LOG_BLOCK_SPAN + 5
+        chain.logs = [
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(BOB), _topic(carol)],
+                 abi_encode(["uint256"], [9_000_000]), 150, tx="0x" + "0d" * 32),
+            _log(USDC, ["0x" + TRANSFER_TOPIC.hex(), _topic(BOB), _topic(ALICE)],
+                 abi_encode(["uint256"], [2_000_000]), chain.block, tx="0x" + "0e" * 32),
+        ]
+
+        assert event_checker.sync_transfer_logs() == 1
+        assert event_checker.get_balance(ALICE).available == 502.0
+
+        # Three spans, four queries each; every query names a tracked wallet
+        assert len(chain.log_queries) == 12
+        for query in chain.log_queries:
+            span = int(query["toBlock"], 16) - int(query["fromBlock"], 16) + 1
+            assert span <= MAX_LOG_BLOCK_SPAN
+            assert query["topics"][-1] == [_topic(ALICE)]
+            assert all(t is None for t in query["topics"][1:-1])
+
+    def test_reconcile_interval_forces_read(self, event_checker, chain):
+        """Test cached values are re-read once the reconcile interval passes."""
+        event_checker.fetch_balances([ALICE])
+        event_checker.apply_fill(ALICE, usdc_delta=-1.0)
+        event_checker.reconcile_interval = 0
+
+        assert event_checker.get_balance(ALICE).available == 500.0
+
+
+_LOCAL_NODE = os.getenv("EVM_TEST_RPC_URL")
+
+
+@pytest.mark.skipif(not _LOCAL_NODE, reason="EVM_TEST_RPC_URL not set")
+class TestLocalNode:
+    """Multicall results match direct contract calls on a local EVM node."""
+
+    def test_matches_direct_calls(self):
+        checker = BalanceChecker(
+            rpc_url=_LOCAL_NODE,
+            usdc_address=os.environ["EVM_TEST_USDC"],
+            ctf_address=os.environ["EVM_TEST_CTF"],
+            multicall_address=os.getenv("EVM_TEST_MULTICALL", MULTICALL3_ADDRESS),
+        )
+        wallet = os.environ["EVM_TEST_WALLET"]
+        token_id = os.environ["EVM_TEST_TOKEN_ID"]
+        assert checker.is_ready(), checker.get_error()
+
+        balances = checker.fetch_balances([wallet], [token_id])[
+            Web3.to_checksum_address(wallet)
+        ]
+
+        w3 = checker._web3
+        usdc_raw = abi_decode(["uint256"], w3.eth.call({
+            "to": checker.usdc_address,
+            "data": _BALANCE_OF + abi_encode(["address"], [wallet]),
+        }))[0]
+        (shares_raw,) = abi_decode(["uint256[]"], w3.eth.call({
+            "to": checker.ctf_address,
+            "data": _BALANCE_OF_BATCH + abi_encode(
+                ["address[]", "uint256[]"], [[wallet], [int(token_id)]]
+            ),
+        }))
+        assert balances.usdc == usdc_raw / 10**6
+        assert balances.tokens[token_id] == shares_raw[0] / 10**6
@@ -7,6 +7,7 @@ Tests cover:
 - Delta threshold monitoring
 - Rebalancing detection
 - Position reconciliation with exchange
+- Incremental portfolio totals and fills
 - Exposure calculations (YES, NO, total)
 - Edge cases and error handling
 """
@@ -18,6 +19,7 @@ import pytest
 from src.maker.delta_tracker import (
     DeltaTracker,
     DeltaTrackerError,
+    PositionDiscrepancy,
     TrackedPosition,
 )
 
@@ -558,6 +560,102 @@ class TestReconciliation:
         assert len(result["missing_in_exchange"]) == 1
 
 
+class TestIncrementalTotals:
+    """Tests for running portfolio totals and fills."""
+
+    def _assert_totals_match_walk(self, tracker):
+        positions = tracker.positions.values()
+        assert tracker.get_delta() == float(sum((p.delta for p in positions), Decimal("0")))
+        assert tracker.get_total_exposure() == float(
+            sum((p.total_cost for p in positions), Decimal("0"))
+        )
+        assert tracker.get_yes_exposure() == float(
+            sum((p.yes_exposure for p in positions), Decimal("0"))
+        )
+        assert tracker.get_no_exposure() == float(
+            sum((p.no_exposure for p in positions), Decimal("0"))
+        )
+
+    def test_fill_updates_totals(self, tracker):
+        """Test buys and sells keep totals equal to a full walk."""
+        tracker.add_position("market-1", 50, 50, {"yes": 0.50, "no": 0.50})
+        tracker.add_position("market-2", 30, 30, {"yes": 0.60, "no": 0.40})
+
+        tracker.record_fill("market-1", "yes", 10, 0.56)
+        tracker.record_fill("market-2", "NO", -5, 0.45)
+
+        assert tracker.get_delta() == pytest.approx(15.0)
+        position = tracker.get_position("market-1")
+        assert position.yes_price == Decimal("30.6") / Decimal("60")
+        assert tracker.get_position("market-2").no_price == Decimal("0.40")
+        self._assert_totals_match_walk(tracker)
+
+        tracker.remove_position("market-1")
+        self._assert_totals_match_walk(tracker)
+
+    def test_fill_validation(self, tracker):
+        """Test invalid fills leave totals untouched."""
+        tracker.add_position("market-1", 50, 50, {"yes": 0.50, "no": 0.50})
+
+        with pytest.raises(DeltaTrackerError):
+            tracker.record_fill("market-2", "yes", 10, 0.5)
+        with pytest.raises(DeltaTrackerError):
+            tracker.record_fill("market-1", "maybe", 10, 0.5)
+        with pytest.raises(DeltaTrackerError):
+            tracker.record_fill("market-1", "no", -60, 0.5)
+
+        assert tracker.get_delta() == 0.0
+        assert tracker.get_total_exposure() == 50.0
+
+    def test_recompute_after_direct_edit(self, tracker):
+        """Test recompute_totals resyncs after editing positions directly."""
+        tracker.add_position("market-1", 50, 50, {"yes": 0.50, "no": 0.50})
+        tracker.positions["market-1"].yes_size = Decimal("70")
+
+        tracker.recompute_totals()
+
+        assert tracker.get_delta() == 20.0
+
+
+class TestSnapshotDiff:
+    """Tests for one-pass snapshot reconciliation."""
+
+    def test_diff_lists_only_discrepancies(self, tracker):
+        """Test the diff is compact and covers every mismatch kind."""
+        for i in range(100):
+            tracker.add_position(f"market-{i}", 10, 10, {"yes": 0.5, "no": 0.5})
+        snapshot = {f"market-{i}": {"yes_size": 10, "no_size": 10} for i in range(1, 100)}
+        snapshot["market-7"] = {"yes_size": 12, "no_size": 10}
+        snapshot["market-x"] = {"yes_size": 1, "no_size": 0}
+
+        diff = tracker.diff_snapshot(snapshot)
+
+        kinds = {d.market_id: d.kind for d in diff}
+        assert kinds == {
+            "market-7": "size",
+            "market-x": "missing_in_tracker",
+            "market-0": "missing_in_exchange",
+        }
+        size_diff = next(d for d in diff if d.kind == "size")
+        assert isinstance(size_diff, PositionDiscrepancy)
+        assert size_diff.yes_diff == Decimal("2")
+
+    def test_snapshot_from_rows(self, tracker):
+        """Test per-token rows fold into a reconcilable snapshot."""
+        tracker.add_position("market-1", 50, 50, {"yes": 0.50, "no": 0.50})
+        rows = [
+            {"market_id": "market-1", "outcome": "Yes", "size": 30},
+            {"market_id": "market-1", "outcome": "Yes", "size": 20},
+            {"market_id": "market-1", "outcome": "No", "size": 50},
+            {"market_id": "market-1", "outcome": "Other", "size": 1},
+        ]
+
+        snapshot = DeltaTracker.snapshot_from_rows(rows)
+
+        assert snapshot == {"market-1": {"yes_size": Decimal("50"), "no_size": Decimal("50")}}
+        assert tracker.diff_snapshot(snapshot) == []
+
+
 class TestRebalancingSuggestion:
     """Tests for rebalancing suggestions."""
 
@@ -811,6 +811,237 @@ class TestHyperliquidLiveMode:
             assert orders[1].side == OrderSide.SELL
 
 
+# =============================================================================
+# Test Market Data Snapshot and Bulk Orders
+# =============================================================================
+
+
+class TestHyperliquidMarketData:
+    """Tests for the cached universe, streamed quotes and bulk endpoints."""
+
+    @pytest.fixture
+    async def streaming_exchange(self):
+        """Live-mode exchange connected to mocked SDK clients."""
+        import sys
+
+        info = MagicMock()
+        info.meta.return_value = {
+            "universe": [
+                {"name": "BTC", "szDecimals": 4, "maxLeverage": 50},
+                {"name": "ETH", "szDecimals": 3, "maxLeverage": 50},
+            ]
+        }
+        info.all_mids.return_value = {"BTC": "50000", "ETH": "3000", "@1": "1.0"}
+        info.subscribe.side_effect = lambda sub, cb: len(info.subscribe.call_args_list)
+        client = MagicMock()
+        mock_constants = MagicMock()
+        mock_constants.TESTNET_API_URL = "https://api.hyperliquid-testnet.xyz"
+
+        with patch.dict(
+            os.environ,
+            {"HYPERLIQUID_PRIVATE_KEY": "0x1234", "HYPERLIQUID_WALLET_ADDRESS": "0xabcd"},
+        ):
+            exchange = HyperliquidExchange(testnet=True)
+
+        with patch.dict(sys.modules, {
+            'hyperliquid.info': MagicMock(Info=MagicMock(return_value=info)),
+            'hyperliquid.exchange': MagicMock(Exchange=MagicMock(return_value=client)),
+            'hyperliquid.utils': MagicMock(constants=mock_constants),
+        }):
+            await exchange.connect()
+
+        exchange.info, exchange.client = info, client
+        return exchange
+
+    def _callback(self, exchange, sub_type):
+        for args, _ in exchange.info.subscribe.call_args_list:
+            if args[0]["type"] == sub_type:
+                return args[1]
+        raise AssertionError(f"no {sub_type} subscription")
+
+    @pytest.mark.asyncio
+    async def test_universe_cached_with_index(self, streaming_exchange):
+        markets = await streaming_exchange.get_markets()
+        eth = await streaming_exchange.get_market("ETH-PERP")
+        missing = await streaming_exchange.get_market("DOGE-PERP")
+
+        assert [m.symbol for m in markets] == ["BTC-PERP", "ETH-PERP"]
+        assert eth.quantity_precision == 3
+        assert missing is None
+        assert streaming_exchange.info.meta.call_count == 1
+
+        await streaming_exchange.get_markets(force_refresh=True)
+        assert streaming_exchange.info.meta.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_universe_ttl_expiry(self, streaming_exchange):
+        streaming_exchange.market_data.universe_ttl = 0
+        await streaming_exchange.get_markets()
+        await streaming_exchange.get_markets()
+
+        assert streaming_exchange.info.meta.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ticker_served_from_stream(self, streaming_exchange):
+        on_mids = self._callback(streaming_exchange, "allMids")
+        on_mids({"channel": "allMids", "data": {"mids": {"BTC": "51000", "@1": "1.0"}}})
+
+        ticker = await streaming_exchange.get_ticker("BTC-PERP")
+
+        assert ticker["mid"] == "51000"
+        assert ticker["source"] == "ws"
+        assert ticker["age"] < 1.0
+        streaming_exchange.info.all_mids.assert_not_called()
+        assert streaming_exchange.market_data.get_mid("@1-PERP") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_ticker_refreshes_all_mids_once(self, streaming_exchange):
+        on_mids = self._callback(streaming_exchange, "allMids")
+        on_mids({"channel": "allMids", "data": {"mids": {"BTC": "51000"}}})
+        streaming_exchange.max_quote_age = 0
+
+        btc = await streaming_exchange.get_ticker("BTC-PERP")
+        streaming_exchange.max_quote_age = 5.0
+        eth = await streaming_exchange.get_ticker("ETH-PERP")
+
+        assert btc["mid"] == "50000"
+        assert btc["source"] == "rest"
+        assert eth["mid"] == "3000"
+        assert eth["source"] == "ws"
+        assert streaming_exchange.info.all_mids.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_orderbook_from_stream(self, streaming_exchange):
+        assert streaming_exchange.subscribe_orderbook("BTC-PERP") is True
+        assert streaming_exchange.subscribe_orderbook("BTC-PERP") is True
+        on_book = self._callback(streaming_exchange, "l2Book")
+        on_book({"channel": "l2Book", "data": {
+            "coin": "BTC",
+            "time": 1700000000000,
+            "levels": [
+                [{"px": "49999", "sz": "1.5", "n": 2}, {"px": "49998", "sz": "3", "n": 1}],
+                [{"px": "50001", "sz": "0.5", "n": 1}],
+            ],
+        }})
+        self._callback(streaming_exchange, "allMids")(
+            {"channel": "allMids", "data": {"mids": {"BTC": "50000"}}}
+        )
+
+        book = await streaming_exchange.get_orderbook("BTC-PERP", depth=1)
+        ticker = await streaming_exchange.get_ticker("BTC-PERP")
+
+        assert book["source"] == "ws"
+        assert book["bids"] == [(Decimal("49999"), Decimal("1.5"))]
+        assert book["asks"] == [(Decimal("50001"), Decimal("0.5"))]
+        assert (ticker["bid"], ticker["ask"]) == ("49999", "50001")
+        assert streaming_exchange.info.subscribe.call_count == 2
+        streaming_exchange.info.l2_snapshot.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_orderbook_rest_fallback(self, streaming_exchange):
+        streaming_exchange.info.l2_snapshot.return_value = {
+            "coin": "ETH",
+            "time": 1700000000000,
+            "levels": [[{"px": "2999", "sz": "2", "n": 1}], [{"px": "3001", "sz": "4", "n": 1}]],
+        }
+
+        book = await streaming_exchange.get_orderbook("ETH-PERP")
+
+        assert book["source"] == "rest"
+        assert book["bids"][0] == (Decimal("2999"), Decimal("2"))
+        streaming_exchange.info.l2_snapshot.assert_called_once_with("ETH")
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_feed(self, streaming_exchange):
+        info = streaming_exchange.info
+        await streaming_exchange.disconnect()
+
+        info.disconnect_websocket.assert_called_once()
+        assert streaming_exchange.market_data.get_mid("BTC-PERP") is None
+
+    @pytest.mark.asyncio
+    async def test_place_orders_single_request(self, streaming_exchange):
+        streaming_exchange.client.bulk_orders.return_value = {
+            "status": "ok",
+            "response": {"type": "order", "data": {"statuses": [
+                {"resting": {"oid": 101}},
+                {"filled": {"totalSz": "0.5", "avgPx": "3001", "oid": 102}},
+                {"error": "Order must have minimum value of $10."},
+            ]}},
+        }
+
+        orders = await streaming_exchange.place_orders([
+            {"symbol": "BTC-PERP", "side": OrderSide.BUY, "quantity": Decimal("0.1"),
+             "price": Decimal("49000")},
+            {"symbol": "ETH-PERP", "side": OrderSide.BUY, "quantity": Decimal("0.5"),
+             "price": Decimal("3005"), "time_in_force": "IOC"},
+            {"symbol": "ETH-PERP", "side": OrderSide.SELL, "quantity": Decimal("0.001"),
+             "price": Decimal("4000")},
+        ])
+
+        streaming_exchange.client.bulk_orders.assert_called_once()
+        requests = streaming_exchange.client.bulk_orders.call_args[0][0]
+        assert requests[0]["coin"] == "BTC"
+        assert requests[1]["order_type"] == {"limit": {"tif": "Ioc"}}
+        assert [o.status for o in orders] == [
+            OrderStatus.OPEN, OrderStatus.FILLED, OrderStatus.REJECTED
+        ]
+        assert orders[0].order_id == "101"
+        assert orders[1].average_fill_price == Decimal("3001")
+
+    @pytest.mark.asyncio
+    async def test_place_orders_rejects_market(self, streaming_exchange):
+        with patch("asyncio.sleep", new_callable=AsyncMock), pytest.raises(OrderError):
+            await streaming_exchange.place_orders([
+                {"symbol": "BTC-PERP", "side": OrderSide.BUY, "order_type": OrderType.MARKET,
+                 "quantity": Decimal("0.1")},
+            ])
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_single_request(self, streaming_exchange):
+        streaming_exchange.info.open_orders.return_value = [
+            {"oid": 11, "coin": "BTC", "side": "B", "sz": "0.1", "limitPx": "45000"},
+            {"oid": 12, "coin": "ETH", "side": "A", "sz": "1.0", "limitPx": "3500"},
+        ]
+        streaming_exchange.client.bulk_cancel.return_value = {
+            "status": "ok",
+            "response": {"type": "cancel", "data": {"statuses": [
+                "success", {"error": "Order was never placed, already canceled, or filled."},
+            ]}},
+        }
+
+        cancelled = await streaming_exchange.cancel_all_orders()
+
+        streaming_exchange.client.bulk_cancel.assert_called_once_with(
+            [{"coin": "BTC", "oid": 11}, {"coin": "ETH", "oid": 12}]
+        )
+        assert [o.order_id for o in cancelled] == ["11"]
+        assert cancelled[0].price == Decimal("45000")
+        streaming_exchange.client.cancel.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_mock_mode(self):
+        with patch.dict(os.environ, {}, clear=True):
+            exchange = HyperliquidExchange(testnet=True)
+        await exchange.connect()
+
+        placed = await exchange.place_orders([
+            {"symbol": "BTC-PERP", "side": OrderSide.BUY, "quantity": Decimal("0.01"),
+             "price": Decimal("45000")},
+            {"symbol": "ETH-PERP", "side": OrderSide.SELL, "quantity": Decimal("1"),
+             "price": Decimal("3500")},
+        ])
+        cancelled = await exchange.cancel_orders(
+            [(o.order_id, o.symbol) for o in placed] + [("missing", "BTC-PERP")]
+        )
+        book = await exchange.get_orderbook("BTC-PERP")
+
+        assert len(cancelled) == 2
+        assert await exchange.get_open_orders() == []
+        assert book["bids"][0][0] == Decimal("49990")
+        assert exchange.subscribe_orderbook("BTC-PERP") is False
+
+
 # =============================================================================
 # Test Retry Logic
 # =============================================================================
@@ -0,0 +1,246 @@
+"""
+Tests for the pooled, conditional, disk-cached Gamma transport.
+
+Tests cover:
+- Keep-alive connection reuse
+- ETag revalidation of stale entries
+- Coalescing identical in-flight requests
+- Permanent caching of closed/resolved markets
+- Content-addressed disk cache shared across instances
+- Concurrent fan-out in GammaClient.get_btc_eth_15m_markets
+
+Runs against a local HTTP/1.1 fake Gamma server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.api.gamma import GammaClient
+from src.api.gamma_transport import (
+    GammaHTTPError,
+    GammaTransport,
+    is_final_market,
+    is_single_market_endpoint,
+)
+
+OPEN_MARKET = {"conditionId": "0xopen", "slug": "open", "closed": False}
+CLOSED_MARKET = {"conditionId": "0xclosed", "slug": "closed", "closed": True}
+
+
+class FakeGammaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.client_ports.add(self.client_address[1])
+        time.sleep(server.delay)
+
+        url = urlparse(self.path)
+        if url.path == "/markets/slug/open":
+            payload = OPEN_MARKET
+        elif url.path == "/markets/slug/closed":
+            payload = CLOSED_MARKET
+        elif url.path == "/events":
+            payload = [CLOSED_MARKET]
+        elif url.path == "/markets":
+            query = parse_qs(url.query).get("q", [""])[0]
+            payload = [
+                {"conditionId": f"0x{query.split()[0].lower()}", "question": query},
+                {"conditionId": "0xshared", "question": "shared"},
+            ]
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(payload).encode()
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_gamma():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGammaHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.client_ports = set()
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def transport(fake_gamma, tmp_path):
+    transport = GammaTransport(
+        f"http://127.0.0.1:{fake_gamma.server_address[1]}", cache_dir=str(tmp_path)
+    )
+    yield transport
+    transport.close()
+
+
+class TestConnectionReuse:
+    """Tests for keep-alive pooling."""
+
+    def test_sequential_requests_share_connection(self, fake_gamma, transport):
+        """Test uncached requests reuse one socket."""
+        for i in range(5):
+            transport.get("/markets", {"q": f"BTC {i}"})
+
+        assert len(fake_gamma.requests) == 5
+        assert len(fake_gamma.client_ports) == 1
+        assert transport.pool.connections_opened == 1
+
+    def test_http_error_raised(self, transport):
+        """Test non-2xx responses raise and aren't cached."""
+        with pytest.raises(GammaHTTPError) as exc:
+            transport.get("/nope")
+        assert exc.value.status == 404
+
+
+class TestResponseCache:
+    """Tests for TTLs, revalidation and permanent entries."""
+
+    def test_fresh_entry_served_from_cache(self, fake_gamma, transport):
+        """Test a fresh response costs no request."""
+        first = transport.get("/markets/slug/open")
+        second = transport.get("/markets/slug/open")
+
+        assert first == second == OPEN_MARKET
+        assert len(fake_gamma.requests) == 1
+        assert transport.stats["cache_hits"] == 1
+
+    def test_stale_entry_revalidated(self, fake_gamma, transport):
+        """Test a stale entry sends If-None-Match and accepts a 304."""
+        transport.ttls["/markets/slug/"] = 0
+        transport.get("/markets/slug/open")
+        result = transport.get("/markets/slug/open")
+
+        assert result == OPEN_MARKET
+        assert len(fake_gamma.requests) == 2
+        assert transport.stats["not_modified"] == 1
+
+    def test_closed_market_cached_permanently(self, fake_gamma, transport):
+        """Test closed markets ignore the endpoint TTL."""
+        transport.ttls["/markets/slug/"] = 0
+        transport.get("/markets/slug/closed")
+        transport.get("/markets/slug/closed")
+
+        assert fake_gamma.requests == ["/markets/slug/closed"]
+
+    def test_closed_list_keeps_endpoint_ttl(self, fake_gamma, transport):
+        """Test an all-closed list response still expires with its endpoint."""
+        transport.ttls["/events"] = 0
+        transport.get("/events", {"closed": "true"})
+        transport.get("/events", {"closed": "true"})
+
+        assert len(fake_gamma.requests) == 2
+        assert transport.stats["not_modified"] == 1
+
+    def test_single_market_endpoints(self):
+        """Test only by-id and by-slug market lookups count as single markets."""
+        assert is_single_market_endpoint("/markets/12345")
+        assert is_single_market_endpoint("/markets/slug/btc-updown-15m-1700000000")
+        assert not is_single_market_endpoint("/markets")
+        assert not is_single_market_endpoint("/markets/slug/")
+        assert not is_single_market_endpoint("/events/12345")
+        assert not is_single_market_endpoint("/public-search")
+
+    def test_disk_cache_shared_across_instances(self, fake_gamma, transport, tmp_path):
+        """Test a new transport reuses entries and identical bodies share a blob."""
+        transport.get("/markets/slug/closed")
+        transport.get("/markets/slug/open")
+        transport.get("/markets/slug/open", {"ref": "x"})
+
+        other = GammaTransport(
+            f"http://127.0.0.1:{fake_gamma.server_address[1]}", cache_dir=str(tmp_path)
+        )
+        assert other.get("/markets/slug/closed") == CLOSED_MARKET
+        assert len(fake_gamma.requests) == 3
+        assert len(list((tmp_path / "entries").iterdir())) == 3
+        assert len(list((tmp_path / "blobs").iterdir())) == 2
+
+    def test_is_final_market(self):
+        """Test closed/resolved detection for single and list payloads."""
+        assert is_final_market(CLOSED_MARKET)
+        assert is_final_market({"umaResolutionStatus": "resolved"})
+        assert is_final_market([CLOSED_MARKET, CLOSED_MARKET])
+        assert not is_final_market([CLOSED_MARKET, OPEN_MARKET])
+        assert not is_final_market([])
+
+
+class TestCoalescing:
+    """Tests for sharing in-flight requests."""
+
+    def test_identical_requests_share_one_call(self, fake_gamma, tmp_path):
+        """Test concurrent callers for one URL make a single request."""
+        fake_gamma.delay = 0.2
+        transport = GammaTransport(f"http://127.0.0.1:{fake_gamma.server_address[1]}")
+        results = []
+
+        def fetch():
+            results.append(transport.get("/markets/slug/open"))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        transport.close()
+
+        assert results == [OPEN_MARKET] * 8
+        assert len(fake_gamma.requests) == 1
+        assert transport.stats["coalesced"] == 7
+
+
+class TestGammaClientFanOut:
+    """Tests for concurrent multi-query methods."""
+
+    def test_15m_markets_queries_run_concurrently(self, fake_gamma, tmp_path):
+        """Test the 12 search queries overlap and results are deduplicated."""
+        fake_gamma.delay = 0.1
+        client = GammaClient(cache_dir=str(tmp_path))
+        client.transport = GammaTransport(
+            f"http://127.0.0.1:{fake_gamma.server_address[1]}", cache_dir=str(tmp_path)
+        )
+
+        start = time.monotonic()
+        markets = client.get_btc_eth_15m_markets()
+        elapsed = time.monotonic() - start
+
+        assert len(fake_gamma.requests) == 12
+        assert elapsed < 0.6
+        assert {m["conditionId"] for m in markets} == {
+            "0xbtc", "0xeth", "0xbitcoin", "0xethereum", "0xshared"
+        }
+
+        # Second call is served from cache
+        client.get_btc_eth_15m_markets()
+        assert len(fake_gamma.requests) == 12
+        client.close()
@@ -21,7 +21,7 @@ from src.backtest.maker.models import (
     OrderSide,
 )
 from src.backtest.maker.fill_simulator import FillSimulator, FillResult
-from src.backtest.maker.metrics import MakerMetrics
+from src.backtest.maker.metrics import MakerMetrics, MetricsAccumulator, WindowArrays
 from src.backtest.maker.engine import MakerBacktestEngine, create_test_windows
 
 
@@ -472,6 +472,100 @@ class TestMakerMetrics:
         assert abs(metrics["fills"]["both_fill_rate"] - 1/3) < 0.01  # 1 out of 3 entered
 
 
+def _random_results(n, seed=7):
+    """Random mix of entered/skipped windows with fills and P&L."""
+    import random
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        entered = rng.random() < 0.8
+        pnl = round(rng.gauss(0.05, 1.0), 4) if entered else 0.0
+        if entered and rng.random() < 0.1:
+            pnl = 0.0
+        results.append(WindowResult(
+            market_id=str(i),
+            entered=entered,
+            total_pnl=pnl,
+            resolution_pnl=pnl - 0.1 if entered else 0.0,
+            rebate_earned=0.1 if entered else 0.0,
+            yes_filled=entered and rng.random() < 0.7,
+            no_filled=entered and rng.random() < 0.6,
+            yes_fill_price=round(rng.uniform(0.3, 0.7), 3),
+            no_fill_price=round(rng.uniform(0.3, 0.7), 3),
+        ))
+    return results
+
+
+def _assert_metrics_close(actual, expected, skip=()):
+    for section, values in expected.items():
+        for key, value in values.items():
+            if (section, key) in skip:
+                continue
+            got = actual[section][key]
+            if isinstance(value, str):
+                assert got == value, (section, key)
+            else:
+                assert got == pytest.approx(value, abs=2e-4), (section, key)
+
+
+class TestVectorizedMetrics:
+    """Vectorized kernel and streaming accumulator match the Python path."""
+
+    @pytest.mark.parametrize("n", [1, 3, 5, 200])
+    def test_kernel_matches_python(self, n):
+        results = _random_results(n)
+
+        expected = MakerMetrics._calculate_python(results)
+        actual = MakerMetrics.calculate(results)
+
+        _assert_metrics_close(actual, expected)
+
+    def test_kernel_no_entries(self):
+        results = [WindowResult(market_id="1"), WindowResult(market_id="2")]
+
+        expected = MakerMetrics._calculate_python(results)
+        actual = MakerMetrics.calculate(results)
+
+        assert actual == expected
+
+    def test_kernel_from_arrays(self):
+        results = _random_results(50)
+        arrays = WindowArrays.from_results(results)
+
+        assert arrays.size == 50
+        assert MakerMetrics.calculate_arrays(arrays) == MakerMetrics.calculate(results)
+
+    def test_accumulator_matches_batch(self):
+        results = _random_results(500)
+        acc = MetricsAccumulator()
+        for r in results:
+            acc.update(r)
+
+        expected = MakerMetrics._calculate_python(results)
+        quartiles = {
+            ("distribution", k) for k in ("median", "percentile_25", "percentile_75", "iqr")
+        }
+        _assert_metrics_close(acc.to_metrics(), expected, skip=quartiles)
+
+        # P² quartiles are estimates; should land near the exact values
+        dist = acc.to_metrics()["distribution"]
+        assert dist["median"] == pytest.approx(expected["distribution"]["median"], abs=0.15)
+        assert dist["percentile_25"] == pytest.approx(
+            expected["distribution"]["percentile_25"], abs=0.15
+        )
+
+    def test_accumulator_exact_for_few_windows(self):
+        results = _random_results(4)
+        acc = MetricsAccumulator()
+        for r in results:
+            acc.update(r)
+
+        _assert_metrics_close(acc.to_metrics(), MakerMetrics._calculate_python(results))
+
+    def test_accumulator_empty(self):
+        assert MetricsAccumulator().to_metrics()["total_windows"] == 0
+
+
 # =============================================================================
 # Test Full Engine
 # =============================================================================
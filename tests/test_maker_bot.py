@@ -15,7 +15,6 @@ import pytest
 from decimal import Decimal
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
-import tempfile
 import os
 
 # Import the bot and components
@@ -56,10 +55,9 @@ def mock_market_list(mock_market):
 
 
 @pytest.fixture
-def temp_project_root():
-    """Create a temporary directory for project root (for kill switch file)."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_project_root(tmp_path):
+    """Temporary project root (kill switch file and paper trade log)."""
+    return tmp_path
 
 
 @pytest.fixture
@@ -444,6 +442,29 @@ class TestFullCycle:
 
             assert bot.state.last_cycle_time is not None
 
+    def test_cycle_records_stage_latency(self, paper_bot):
+        """Test that each cycle stage is traced."""
+        paper_bot.market_finder.find_active_markets = MagicMock(return_value=[])
+
+        result = asyncio.run(paper_bot.run_cycle())
+
+        assert "total" in result["latency_ms"]
+        assert "kill_switch" in result["latency_ms"]
+        assert "discovery" in result["latency_ms"]
+        assert len(paper_bot.tracer.history) == 1
+        assert "cycle" in paper_bot.get_status()["latency"]
+
+    def test_profile_trigger_file(self, paper_bot, temp_project_root):
+        """Test that the trigger file starts the sampling profiler."""
+        paper_bot.market_finder.find_active_markets = MagicMock(return_value=[])
+        paper_bot._profile_trigger_path.write_text("0.05")
+
+        asyncio.run(paper_bot.run_cycle())
+
+        assert not paper_bot._profile_trigger_path.exists()
+        output = paper_bot.profiler.wait(timeout=2.0)
+        assert output is not None and output.exists()
+
 
 # =============================================================================
 # Test: Entry Criteria
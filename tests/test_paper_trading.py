@@ -12,11 +12,14 @@ Tests cover:
 - Balance updates
 - Reset functionality
 - Edge cases
+- Queue-position matching against L2 books and trade prints
+- Buffered trade log writer
 """
 
 import asyncio
 import json
 import tempfile
+import time
 from decimal import Decimal
 from pathlib import Path
 
@@ -30,7 +33,7 @@ from src.exchanges.base import (
     OrderType,
     PositionSide,
 )
-from src.exchanges.paper import PaperExchange
+from src.exchanges.paper import PaperExchange, TradeLogWriter, _flush_open_writers
 
 
 @pytest.fixture
@@ -712,7 +715,8 @@ class TestTradeLogging:
             quantity=Decimal("1"),
         )
 
-        # Read log file
+        # Read log file (writes are buffered)
+        paper_exchange.flush_log()
         with open(paper_exchange.log_path) as f:
             lines = f.readlines()
 
@@ -1044,3 +1048,267 @@ class TestCancelAllOrders:
 
         cancelled = await paper_exchange.cancel_all_orders()
         assert len(cancelled) == 0  # All orders are filled, nothing to cancel
+
+
+class TestBookMatching:
+    """Tests for queue-position matching against an L2 book."""
+
+    @pytest.fixture
+    def book_exchange(self):
+        exchange = PaperExchange(initial_balance=Decimal("100000"), log_trades=False)
+        exchange.update_book(
+            "BTC-PERP",
+            bids=[("49990", "2"), ("49980", "5")],
+            asks=[("50010", "1"), ("50020", "3")],
+        )
+        return exchange
+
+    @pytest.mark.asyncio
+    async def test_market_order_walks_book(self, book_exchange):
+        """Test market orders consume depth and pay a VWAP."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.MARKET,
+            quantity=Decimal("2"),
+        )
+
+        assert order.status == OrderStatus.FILLED
+        assert order.average_fill_price == Decimal("50015")
+        assert book_exchange.positions["BTC-PERP"].quantity == Decimal("2")
+
+    @pytest.mark.asyncio
+    async def test_market_order_beyond_depth_cancels_rest(self, book_exchange):
+        """Test unfilled market remainder is cancelled."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.SELL,
+            order_type=OrderType.MARKET,
+            quantity=Decimal("0.1"),
+        )
+        big = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.MARKET,
+            quantity=Decimal("5"),
+        )
+
+        assert order.average_fill_price == Decimal("49990")
+        assert big.status == OrderStatus.CANCELLED
+        assert big.filled_quantity == Decimal("4")
+
+    @pytest.mark.asyncio
+    async def test_limit_order_rests_until_queue_clears(self, book_exchange):
+        """Test a passive order fills only after the queue ahead trades."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("49990"),
+        )
+        assert order.status == OrderStatus.OPEN
+        assert book_exchange.matching.get_resting(order.order_id).queue_ahead == Decimal("2")
+
+        assert book_exchange.record_trade("BTC-PERP", "49990", "1.5", OrderSide.SELL) == []
+        filled = book_exchange.record_trade("BTC-PERP", "49990", "1", OrderSide.SELL)
+
+        assert filled == [order]
+        assert order.status == OrderStatus.PARTIALLY_FILLED
+        assert order.filled_quantity == Decimal("0.5")
+
+        book_exchange.record_trade("BTC-PERP", "49990", "1", OrderSide.SELL)
+        assert order.status == OrderStatus.FILLED
+        assert order.average_fill_price == Decimal("49990")
+        assert await book_exchange.get_open_orders() == []
+
+    @pytest.mark.asyncio
+    async def test_buy_aggressor_does_not_fill_bids(self, book_exchange):
+        """Test prints on the other side leave the order untouched."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("49990"),
+        )
+
+        book_exchange.record_trade("BTC-PERP", "49990", "10", OrderSide.BUY)
+
+        assert order.status == OrderStatus.OPEN
+
+    @pytest.mark.asyncio
+    async def test_trade_through_fills_in_full(self, book_exchange):
+        """Test a print below the bid fills the whole order at its limit."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("49990"),
+        )
+
+        book_exchange.record_trade("BTC-PERP", "49985", "0.01")
+
+        assert order.status == OrderStatus.FILLED
+        assert order.average_fill_price == Decimal("49990")
+
+    @pytest.mark.asyncio
+    async def test_shrinking_level_advances_queue(self, book_exchange):
+        """Test cancellations ahead (level shrinks) move the order up."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("49990"),
+        )
+
+        book_exchange.update_book(
+            "BTC-PERP", bids=[("49990", "0.5")], asks=[("50010", "1")]
+        )
+        book_exchange.record_trade("BTC-PERP", "49990", "1", OrderSide.SELL)
+
+        assert order.filled_quantity == Decimal("0.5")
+
+    @pytest.mark.asyncio
+    async def test_crossing_book_fills_resting(self, book_exchange):
+        """Test a snapshot whose ask reaches the bid fills the order."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("49990"),
+        )
+
+        filled = book_exchange.update_book(
+            "BTC-PERP", bids=[("49970", "1")], asks=[("49985", "2")]
+        )
+
+        assert filled == [order]
+        assert order.average_fill_price == Decimal("49990")
+        assert book_exchange.current_prices["BTC-PERP"] == Decimal("49977.5")
+
+    @pytest.mark.asyncio
+    async def test_marketable_limit_rests_remainder(self, book_exchange):
+        """Test a crossing limit takes liquidity then rests the rest."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("2"),
+            price=Decimal("50010"),
+        )
+
+        assert order.status == OrderStatus.PARTIALLY_FILLED
+        assert order.filled_quantity == Decimal("1")
+        assert book_exchange.matching.get_resting(order.order_id).remaining == Decimal("1")
+
+        cancelled = await book_exchange.cancel_order(order.order_id)
+        assert cancelled.status == OrderStatus.CANCELLED
+        assert book_exchange.matching.get_resting(order.order_id) is None
+
+    @pytest.mark.asyncio
+    async def test_fok_without_depth_cancels(self, book_exchange):
+        """Test FOK orders don't partially fill."""
+        order = await book_exchange.place_order(
+            symbol="BTC-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("2"),
+            price=Decimal("50010"),
+            time_in_force="FOK",
+        )
+
+        assert order.status == OrderStatus.CANCELLED
+        assert order.filled_quantity == Decimal("0")
+
+    @pytest.mark.asyncio
+    async def test_symbols_without_book_fill_instantly(self, book_exchange):
+        """Test symbols without snapshots keep the instant-fill behaviour."""
+        order = await book_exchange.place_order(
+            symbol="ETH-PERP",
+            side=OrderSide.BUY,
+            order_type=OrderType.LIMIT,
+            quantity=Decimal("1"),
+            price=Decimal("3000"),
+        )
+
+        assert order.status == OrderStatus.FILLED
+
+    @pytest.mark.asyncio
+    async def test_order_event_throughput(self, book_exchange):
+        """Test the engine sustains well over 10k order events per second."""
+        start = time.perf_counter()
+        events = 0
+        for i in range(2000):
+            order = await book_exchange.place_order(
+                symbol="BTC-PERP",
+                side=OrderSide.BUY,
+                order_type=OrderType.LIMIT,
+                quantity=Decimal("0.01"),
+                price=Decimal("49900") + i % 50,
+            )
+            await book_exchange.cancel_order(order.order_id)
+            events += 2
+        elapsed = time.perf_counter() - start
+
+        assert events / elapsed > 10_000
+
+
+class TestTradeLogWriter:
+    """Tests for the persistent buffered log writer."""
+
+    def test_batches_until_flush(self, tmp_path):
+        """Test lines are held until the batch fills."""
+        path = tmp_path / "log.jsonl"
+        writer = TradeLogWriter(path, flush_every=3, flush_interval=60)
+
+        writer.write({"n": 1})
+        writer.write({"n": 2})
+        assert not path.exists()
+
+        writer.write({"n": 3})
+        assert [json.loads(l)["n"] for l in path.read_text().splitlines()] == [1, 2, 3]
+        writer.close()
+
+    def test_interval_flush_and_close(self, tmp_path):
+        """Test old batches are flushed and close writes the remainder."""
+        path = tmp_path / "log.jsonl"
+        writer = TradeLogWriter(path, flush_every=1000, flush_interval=0)
+
+        writer.write({"n": 1})
+        assert len(path.read_text().splitlines()) == 1
+
+        writer.flush_interval = 60
+        writer.write({"n": 2})
+        writer.close()
+        assert len(path.read_text().splitlines()) == 2
+        assert writer.lines_written == 2
+
+    def test_idle_batch_is_flushed(self, tmp_path):
+        """Test a partial batch reaches disk without further writes."""
+        path = tmp_path / "log.jsonl"
+        writer = TradeLogWriter(path, flush_every=1000, flush_interval=0.05)
+
+        writer.write({"n": 1})
+        writer.write({"n": 2})
+        assert not path.exists()
+
+        deadline = time.monotonic() + 2
+        while writer.lines_written < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(path.read_text().splitlines()) == 2
+        writer.close()
+
+    def test_pending_lines_flushed_at_exit(self, tmp_path):
+        """Test the exit hook writes out lines still in memory."""
+        path = tmp_path / "log.jsonl"
+        writer = TradeLogWriter(path, flush_every=1000, flush_interval=60)
+        writer.write({"n": 1})
+
+        _flush_open_writers()
+
+        assert len(path.read_text().splitlines()) == 1
+        writer.close()
@@ -0,0 +1,219 @@
+"""
+Tests for the CLOB endpoint rate limiter and LiveExecutor API calls.
+
+Tests cover:
+- Token bucket burst, pacing and deadlines
+- Shared buckets splitting one budget across instances/processes
+- Shared pause after a rate-limit response
+- LiveExecutor calls on the persistent worker pool with deadlines
+"""
+
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src.trading import executor as executor_module
+from src.trading import rate_limiter as rate_limiter_module
+from src.trading.executor import APITimeoutError, LiveExecutor
+from src.trading.rate_limiter import (
+    EndpointRateLimiter,
+    RateLimitTimeout,
+    SharedTokenBucket,
+    TokenBucket,
+)
+
+
+def _drain(path, rate, burst, count, queue):
+    """Child process: take `count` tokens from a shared bucket."""
+    bucket = SharedTokenBucket(path, rate, burst)
+    for _ in range(count):
+        bucket.acquire()
+    queue.put(time.monotonic())
+
+
+@pytest.fixture
+def bare_executor(monkeypatch):
+    """LiveExecutor without client initialization, disk access or retry waits."""
+    monkeypatch.setattr(executor_module, "RETRY_MIN_WAIT", 0.0)
+    monkeypatch.setattr(executor_module, "RETRY_MAX_WAIT", 0.0)
+    monkeypatch.setattr(executor_module, "RATE_LIMIT_PAUSE", 0.01)
+    executor = LiveExecutor.__new__(LiveExecutor)
+    executor._rate_limiter = EndpointRateLimiter(rates={"read": (1000.0, 1000.0)})
+    return executor
+
+
+class TestTokenBucket:
+    """Tests for the in-process bucket."""
+
+    def test_burst_then_paced(self):
+        """Test burst tokens are free and the rest are paced."""
+        bucket = TokenBucket(rate=100, capacity=5)
+
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        assert 0.07 <= elapsed < 0.5
+
+    def test_deadline_raises(self):
+        """Test acquire gives up instead of sleeping past the deadline."""
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.acquire()
+
+        with pytest.raises(RateLimitTimeout):
+            bucket.acquire(timeout=0.1)
+
+    def test_pause_blocks_tokens(self):
+        """Test a pause empties the bucket until it ends."""
+        bucket = TokenBucket(rate=1000, capacity=10)
+        bucket.pause(0.1)
+
+        assert not bucket.try_acquire()
+        time.sleep(0.12)
+        assert bucket.try_acquire()
+
+
+class TestSharedTokenBucket:
+    """Tests for the mmap-backed bucket."""
+
+    def test_instances_share_budget(self, tmp_path):
+        """Test two handles on one file draw from one burst."""
+        path = tmp_path / "order.bucket"
+        first = SharedTokenBucket(path, rate=1, capacity=3)
+        second = SharedTokenBucket(path, rate=1, capacity=3)
+
+        assert first.try_acquire()
+        assert second.try_acquire()
+        assert first.try_acquire()
+        assert not second.try_acquire()
+
+    def test_pause_is_shared(self, tmp_path):
+        """Test a 429 pause in one handle blocks the other."""
+        path = tmp_path / "cancel.bucket"
+        first = SharedTokenBucket(path, rate=1000, capacity=10)
+        second = SharedTokenBucket(path, rate=1000, capacity=10)
+
+        first.pause(5.0)
+
+        with pytest.raises(RateLimitTimeout):
+            second.acquire(timeout=0.05)
+
+    @pytest.mark.parametrize("last, paused_for", [(1e6, 0.0), (0.0, 1e6)])
+    def test_state_from_before_reboot_is_discarded(self, tmp_path, last, paused_for):
+        """Test a future refill time or an overlong pause resets the file."""
+        path = tmp_path / "read.bucket"
+        now = time.monotonic()
+        path.write_bytes(rate_limiter_module._STATE.pack(0.0, now + last, now + paused_for))
+
+        bucket = SharedTokenBucket(path, rate=1, capacity=2)
+
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+
+    def test_processes_share_budget(self, tmp_path):
+        """Test separate processes are paced by one bucket."""
+        path = tmp_path / "read.bucket"
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        start = time.monotonic()
+        workers = [
+            ctx.Process(target=_drain, args=(path, 100.0, 10.0, 20, queue)) for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        finished = max(queue.get(timeout=1) for _ in workers)
+
+        # 40 tokens, 10 burst, 30 more at 100/s across both processes
+        assert finished - start >= 0.28
+
+
+class TestEndpointRateLimiter:
+    """Tests for endpoint-class keyed buckets."""
+
+    def test_classes_are_independent(self, tmp_path):
+        """Test exhausting one class leaves others untouched."""
+        limiter = EndpointRateLimiter(
+            rates={"order": (1.0, 1.0), "read": (1.0, 1.0)}, shared_dir=str(tmp_path)
+        )
+        limiter.acquire("order")
+
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire("order", timeout=0.05)
+        assert limiter.acquire("read", timeout=0.05) == pytest.approx(0.0, abs=0.01)
+        assert limiter.is_shared("order")
+
+    def test_unknown_class(self):
+        """Test unknown endpoint classes are rejected."""
+        with pytest.raises(KeyError):
+            EndpointRateLimiter().acquire("websocket")
+
+
+class TestExecutorApiCalls:
+    """Tests for LiveExecutor._call_api_with_retry."""
+
+    def test_calls_reuse_pool_threads(self, bare_executor):
+        """Test repeated calls don't spawn a thread per call."""
+        bare_executor._call_api_with_retry(lambda: None, operation_name="warmup")
+        threads_before = threading.active_count()
+
+        names = {
+            bare_executor._call_api_with_retry(
+                lambda: threading.current_thread().name, operation_name="name"
+            )
+            for _ in range(50)
+        }
+
+        assert threading.active_count() <= threads_before + executor_module.API_POOL_SIZE
+        assert all(name.startswith("clob-api") for name in names)
+        assert len(names) <= executor_module.API_POOL_SIZE
+
+    def test_deadline_raises_timeout(self, bare_executor):
+        """Test a slow call fails with APITimeoutError after retries."""
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.3)
+
+        with pytest.raises(APITimeoutError):
+            bare_executor._call_api_with_retry(slow, operation_name="slow", timeout=0.05)
+        assert len(calls) == executor_module.MAX_RETRY_ATTEMPTS
+
+    def test_hung_calls_do_not_starve_the_pool(self, bare_executor):
+        """Test calls stay healthy after more hung calls than pool workers."""
+        release = threading.Event()
+
+        def hung():
+            release.wait(5)
+
+        try:
+            for _ in range(executor_module.API_POOL_SIZE):
+                with pytest.raises(APITimeoutError):
+                    bare_executor._call_api_with_retry(hung, operation_name="hung", timeout=0.02)
+
+            started = time.monotonic()
+            assert bare_executor._call_api_with_retry(lambda: "ok", operation_name="healthy") == "ok"
+            assert time.monotonic() - started < 0.5
+        finally:
+            release.set()
+
+    def test_rate_limited_response_pauses_class(self, bare_executor):
+        """Test a 429 from the client pauses that endpoint class."""
+
+        class PolyApiException(Exception):
+            status_code = 429
+
+        def throttled():
+            raise PolyApiException("Too Many Requests")
+
+        with pytest.raises(PolyApiException):
+            bare_executor._call_api_with_retry(
+                throttled, operation_name="throttled", endpoint_class="read"
+            )
+        assert bare_executor._rate_limiter.get_stats()["read"]["pauses"] == 3
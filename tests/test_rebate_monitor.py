@@ -8,6 +8,7 @@ Tests cover:
 - Per-market statistics
 - Best performing market identification
 - State persistence (save/load)
+- Indexed attribution, eviction and bulk ingest
 - Edge cases and error handling
 
 IMPORTANT: All tests use mocks/fixtures - no external API calls.
@@ -27,6 +28,7 @@ from src.maker.rebate_monitor import (
     RebateTracker,
     RebateTrackerError,
     RecordedTrade,
+    _hour_bucket,
 )
 
 
@@ -47,6 +49,12 @@ def tracker_with_short_window():
     return RebateTracker(rebate_attribution_window_hours=1)
 
 
+@pytest.fixture
+def tracker_with_full_history():
+    """Create a short-window tracker that keeps expired trades in memory."""
+    return RebateTracker(rebate_attribution_window_hours=1, auto_evict=False)
+
+
 @pytest.fixture
 def populated_tracker(tracker):
     """Create a tracker with some trades and rebates."""
@@ -309,9 +317,9 @@ class TestRebateAttribution:
         assert trade1.attributed_rebate == Decimal("1.000000")
         assert trade2.attributed_rebate == Decimal("0.500000")
 
-    def test_attribution_respects_time_window(self, tracker_with_short_window):
+    def test_attribution_respects_time_window(self, tracker_with_full_history):
         """Test that attribution respects the time window."""
-        tracker = tracker_with_short_window
+        tracker = tracker_with_full_history
         now = datetime.now(timezone.utc)
 
         # Trade outside window (2 hours ago)
@@ -935,6 +943,160 @@ class TestMarketStatsDataclass:
         assert result["trade_count"] == 2
 
 
+# =============================================================================
+# Test Indexed Attribution
+# =============================================================================
+
+
+class TestIndexedAttribution:
+    """Tests for the time index, eviction and bulk ingest."""
+
+    def test_out_of_order_trades_attributed_by_window(self, tracker_with_full_history):
+        """Test bisect window over trades recorded out of time order."""
+        tracker = tracker_with_full_history
+        base = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+        tracker.record_trade("late", "btc-updown-15m", 300.0, base - timedelta(minutes=10))
+        tracker.record_trade("old", "btc-updown-15m", 500.0, base - timedelta(hours=2))
+        tracker.record_trade("early", "eth-updown-15m", 100.0, base - timedelta(minutes=50))
+
+        rebate = tracker.detect_rebate({"amount": 4.0, "timestamp": base.isoformat()})
+
+        assert set(rebate.attributed_trades) == {"late", "early"}
+        assert tracker.get_trade("late").attributed_rebate == Decimal("3.000000")
+        assert tracker.get_trade("early").attributed_rebate == Decimal("1.000000")
+        assert tracker.get_trade("old").attributed_rebate == Decimal("0")
+
+    def test_eviction_keeps_aggregates(self, tracker_with_full_history):
+        """Test evicted trades still count toward totals and period stats."""
+        tracker = tracker_with_full_history
+        now = datetime.now(timezone.utc)
+        tracker.record_trade("old", "btc-updown-15m", 200.0, now - timedelta(hours=5))
+        tracker.record_trade("new", "btc-updown-15m", 100.0, now - timedelta(minutes=5))
+        tracker.detect_rebate(
+            {"amount": 1.0, "timestamp": (now - timedelta(hours=5)).isoformat()}
+        )
+
+        before = tracker.get_rebate_stats()
+        evicted = tracker.evict_expired(now)
+        after = tracker.get_rebate_stats()
+
+        assert evicted == 2
+        assert tracker.get_trade("old") is None
+        assert len(tracker.rebates) == 0
+        for key in ("total_trades", "total_volume", "total_rebates", "rebate_events",
+                    "daily_volume", "daily_rebates", "weekly_volume"):
+            assert after[key] == before[key]
+        assert tracker.market_stats["btc-updown-15m"].total_volume == Decimal("300")
+
+        with pytest.raises(RebateTrackerError):
+            tracker.record_trade("old", "btc-updown-15m", 1.0)
+
+    def test_auto_evict_bounds_memory(self):
+        """Test the default tracker keeps only trades inside the window."""
+        tracker = RebateTracker(rebate_attribution_window_hours=1)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(300):
+            tracker.record_trade(f"t{i}", "btc-updown-15m", 10.0, base + timedelta(minutes=i))
+
+        assert len(tracker.trades) == 61
+        assert tracker.get_rebate_stats()["total_trades"] == 300
+        assert tracker._total_volume == Decimal("3000")
+
+    def test_evicted_ids_expire_after_grace(self):
+        """Test evicted trade ids are only kept for window + grace."""
+        tracker = RebateTracker(
+            rebate_attribution_window_hours=1, auto_evict=True, evicted_id_grace_hours=2
+        )
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(600):
+            tracker.record_trade(f"t{i}", "btc-updown-15m", 10.0, base + timedelta(minutes=i))
+
+        # Clock is at 9:59; ids from buckets ending before 6:59 are dropped
+        assert len(tracker._evicted_ids_by_hour) <= 4
+        with pytest.raises(RebateTrackerError):
+            tracker.record_trade("t500", "btc-updown-15m", 1.0, base + timedelta(minutes=500))
+        tracker.record_trade("t0", "btc-updown-15m", 1.0, base + timedelta(minutes=599))
+
+    def test_evicted_buckets_answer_period_sums(self):
+        """Test period sums over evicted buckets, including late arrivals."""
+        tracker = RebateTracker(rebate_attribution_window_hours=1)
+        now = datetime.now(timezone.utc)
+        sizes = {h: 10.0 + h for h in range(2, 200, 3)}
+        for h, size in sizes.items():
+            tracker.record_trade(f"t{h}", "btc-updown-15m", size, now - timedelta(hours=h))
+        tracker.evict_expired(now)
+        tracker.record_trade("late", "btc-updown-15m", 7.0, now - timedelta(hours=100))
+        tracker.evict_expired(now)
+
+        sizes[100] = 7.0
+        for hours in (1, 24, 50, 150, 1000):
+            start = now - timedelta(hours=hours)
+            expected = sum(
+                Decimal(str(size)) for h, size in sizes.items()
+                if _hour_bucket((now - timedelta(hours=h)).timestamp()) >= start.timestamp()
+            )
+            assert tracker._volume_since(start) == expected
+
+    def test_bulk_ingest_matches_sequential(self):
+        """Test bulk ingest attributes the same as live detection."""
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        trades = [
+            {
+                "trade_id": f"t{i}",
+                "market": "btc-updown-15m" if i % 2 else "eth-updown-15m",
+                "size": 10 + i,
+                "timestamp": (base + timedelta(minutes=7 * i)).isoformat(),
+            }
+            for i in range(60)
+        ]
+        transfers = [
+            {"amount": 0.5, "timestamp": (base + timedelta(minutes=45 * j + 3)).isoformat()}
+            for j in range(9)
+        ]
+
+        sequential = RebateTracker(rebate_attribution_window_hours=1, auto_evict=False)
+        events = [(t["timestamp"], 0, t) for t in trades]
+        events += [(r["timestamp"], 1, r) for r in transfers]
+        for _, kind, event in sorted(events, key=lambda e: e[:2]):
+            if kind == 0:
+                sequential.record_trade(
+                    event["trade_id"], event["market"], event["size"],
+                    datetime.fromisoformat(event["timestamp"]),
+                )
+            else:
+                sequential.detect_rebate(event)
+
+        bulk = RebateTracker(rebate_attribution_window_hours=1, auto_evict=False)
+        summary = bulk.bulk_ingest(
+            trades=reversed(trades), transfers=transfers + [{"timestamp": "bad"}], evict=False
+        )
+
+        assert summary == {"trades": 60, "rebates": 9, "skipped": 1, "evicted": 0}
+        for trade_id, trade in sequential.trades.items():
+            assert bulk.get_trade(trade_id).attributed_rebate == trade.attributed_rebate
+        for market, stats in sequential.market_stats.items():
+            assert bulk.market_stats[market].total_rebates == stats.total_rebates
+
+    def test_state_round_trip_with_evictions(self, tracker_with_short_window, tmp_path):
+        """Test evicted aggregates survive save/load."""
+        tracker = tracker_with_short_window
+        now = datetime.now(timezone.utc)
+        tracker.record_trade("old", "btc-updown-15m", 200.0, now - timedelta(hours=3))
+        tracker.record_trade("new", "btc-updown-15m", 100.0, now - timedelta(minutes=3))
+        tracker.evict_expired(now)
+        filepath = tmp_path / "state.json"
+        tracker.save_state(filepath)
+
+        restored = RebateTracker(rebate_attribution_window_hours=1)
+        assert restored.load_state(filepath)
+
+        stats = restored.get_rebate_stats()
+        assert stats["total_trades"] == 2
+        assert Decimal(stats["daily_volume"]) == Decimal("300")
+        restored.detect_rebate({"amount": 1.0, "timestamp": now.isoformat()})
+        assert restored.get_trade("new").attributed_rebate == Decimal("1.000000")
+
+
 # =============================================================================
 # Test Edge Cases
 # =============================================================================
@@ -3,6 +3,8 @@ Comprehensive tests for Maker Rebates Risk Monitoring System.
 
 Tests cover:
 - Kill switch activation and deactivation
+- Kill switch watcher (inotify and polling)
+- Running exposure aggregates
 - Position size limits
 - Concurrent position limits
 - Total exposure limits
@@ -17,7 +19,9 @@ Tests cover:
 """
 
 import json
+import sys
 import tempfile
+import time
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
@@ -25,7 +29,7 @@ from unittest.mock import patch
 
 import pytest
 
-from src.maker.risk_limits import Alert, RiskMonitor
+from src.maker.risk_limits import Alert, KillSwitchWatcher, RiskMonitor
 
 
 @pytest.fixture
@@ -444,6 +448,96 @@ class TestExecutionFailures:
         assert risk_monitor._execution_failures == 0
 
 
+class TestKillSwitchWatcher:
+    """Tests for the cached kill switch flag."""
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_inotify_sees_external_file(self, risk_monitor):
+        """Test a file created by another process is seen on the next check."""
+        watcher = risk_monitor._kill_switch_watcher
+        assert watcher.mode == "inotify"
+        assert not risk_monitor.check_kill_switch()
+
+        risk_monitor._kill_switch_path.write_text("external")
+        assert risk_monitor.check_kill_switch()
+
+        risk_monitor._kill_switch_path.unlink()
+        assert not risk_monitor.check_kill_switch()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_unrelated_files_do_not_restat(self, tmp_path):
+        """Test events for other files leave the cached flag alone."""
+        watcher = KillSwitchWatcher(tmp_path / ".kill_switch")
+        (tmp_path / "other.txt").write_text("x")
+
+        with patch.object(type(watcher.path), "exists", side_effect=AssertionError):
+            assert watcher.active is False
+        watcher.close()
+
+    def test_polling_fallback_interval(self, tmp_path):
+        """Test polling mode stats at most once per interval."""
+        path = tmp_path / ".kill_switch"
+        watcher = KillSwitchWatcher(path, poll_interval=0.05)
+        watcher.close()
+        watcher.mode = "poll"
+
+        path.write_text("x")
+        assert watcher.active is False  # within interval: cached
+        time.sleep(0.06)
+        assert watcher.active is True
+
+    def test_path_reassignment_rewatches(self, risk_monitor, tmp_path):
+        """Test re-pointing the kill switch path follows the new file."""
+        risk_monitor._kill_switch_path = tmp_path / ".kill_switch"
+        (tmp_path / ".kill_switch").write_text("x")
+        time.sleep(0.3)  # Longer than the default poll interval
+
+        assert risk_monitor.check_kill_switch()
+
+    def test_missing_directory_falls_back_to_polling(self, tmp_path):
+        """Test an unwatchable directory degrades to polling."""
+        watcher = KillSwitchWatcher(tmp_path / "missing" / ".kill_switch")
+
+        assert watcher.mode == "poll"
+        assert watcher.active is False
+
+
+class TestExposureAggregates:
+    """Tests for running exposure totals."""
+
+    def test_total_tracks_open_add_close(self, risk_monitor):
+        """Test the running total matches a full recompute."""
+        risk_monitor.record_position_opened("market-1", 40.0)
+        risk_monitor.record_position_opened("market-2", 60.0)
+        risk_monitor.record_position_opened("market-1", 20.0)
+        risk_monitor.record_position_closed("market-2")
+
+        assert risk_monitor._total_exposure == Decimal("60.0")
+        assert risk_monitor.get_risk_report()["current_exposure"] == 60.0
+
+    def test_total_restored_from_state(self, risk_monitor, tmp_path):
+        """Test load_state rebuilds the running total."""
+        risk_monitor.record_position_opened("market-1", 40.0)
+        risk_monitor.record_position_opened("market-2", 35.5)
+        filepath = tmp_path / "risk.json"
+        risk_monitor.save_state(filepath)
+
+        restored = RiskMonitor(project_root=tmp_path)
+        assert restored.load_state(filepath)
+        assert restored._total_exposure == Decimal("75.5")
+
+    def test_pre_trade_check_skips_filesystem(self, risk_monitor):
+        """Test can_open_position does not stat the kill switch file."""
+        risk_monitor._kill_switch_watcher.close()
+        risk_monitor._kill_switch_watcher.mode = "poll"
+        risk_monitor._kill_switch_watcher.poll_interval = 60
+
+        with patch.object(type(risk_monitor._kill_switch_path), "exists", side_effect=AssertionError):
+            for _ in range(100):
+                can_open, _ = risk_monitor.can_open_position(size=10.0, market_id="m")
+                assert can_open
+
+
 class TestRiskReport:
     """Tests for risk reporting."""
 
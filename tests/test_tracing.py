@@ -0,0 +1,154 @@
+"""
+Tests for maker bot cycle tracing and sampling profiler.
+
+Tests cover:
+- Span accumulation into per-cycle traces
+- Ring buffer bound
+- Cumulative histograms and Prometheus export
+- Folded-stack profile output
+"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from src.maker.tracing import CycleTracer, LatencyHistogram, SamplingProfiler
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_cumulative_buckets(self):
+        histogram = LatencyHistogram(buckets=(1, 10, 100))
+        for ms in (0.5, 5, 5, 50, 500):
+            histogram.observe(ms)
+
+        assert histogram.cumulative() == [("1", 1), ("10", 3), ("100", 4), ("+Inf", 5)]
+        assert histogram.count == 5
+        assert histogram.max_ms == 500
+
+
+class TestCycleTracer:
+    """Tests for CycleTracer."""
+
+    def test_spans_summed_per_cycle(self):
+        tracer = CycleTracer()
+        tracer.start_cycle(1)
+        for _ in range(3):
+            with tracer.span("entry_checks"):
+                pass
+        with tracer.span("discovery"):
+            time.sleep(0.01)
+        trace = tracer.end_cycle()
+
+        assert trace.counts == {"entry_checks": 3, "discovery": 1}
+        assert trace.spans["discovery"] >= 10
+        assert trace.total_ms >= trace.spans["discovery"]
+        assert tracer.histograms["entry_checks"].count == 3
+        assert tracer.histograms["cycle"].count == 1
+
+    def test_span_recorded_on_exception(self):
+        tracer = CycleTracer()
+        tracer.start_cycle(1)
+        with pytest.raises(RuntimeError):
+            with tracer.span("order_placement"):
+                raise RuntimeError("boom")
+        trace = tracer.end_cycle()
+
+        assert trace.counts["order_placement"] == 1
+
+    def test_ring_buffer_bounded(self):
+        tracer = CycleTracer(history_size=5)
+        for i in range(12):
+            tracer.start_cycle(i)
+            tracer.end_cycle()
+
+        assert len(tracer.history) == 5
+        assert tracer.history[0].cycle_number == 7
+        assert tracer.histograms["cycle"].count == 12
+
+    def test_breakdown_percentiles(self):
+        tracer = CycleTracer()
+        tracer.start_cycle(1)
+        tracer.end_cycle()
+
+        breakdown = tracer.get_breakdown()
+        assert set(breakdown["cycle"]) == {"p50", "p95", "p99", "max", "mean"}
+
+    def test_prometheus_export(self):
+        tracer = CycleTracer(buckets=(1, 10))
+        with tracer.span("discovery"):
+            pass
+
+        text = tracer.to_prometheus()
+        assert "# TYPE maker_bot_span_latency_ms histogram" in text
+        assert 'maker_bot_span_latency_ms_bucket{span="discovery",le="+Inf"} 1' in text
+        assert 'maker_bot_span_latency_ms_count{span="discovery"} 1' in text
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    def test_writes_folded_stacks(self, tmp_path):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker, name="busy", daemon=True)
+        worker.start()
+        try:
+            profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001)
+            assert profiler.start(0.1) is True
+            assert profiler.start(0.1) is False  # Already running
+            output = profiler.wait(timeout=2.0)
+        finally:
+            stop.set()
+
+        lines = output.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any(line.startswith("busy;") and "busy_worker" in line for line in lines)
+
+    def test_trigger_file(self, tmp_path):
+        trigger = tmp_path / ".profile"
+        profiler = SamplingProfiler(output_dir=tmp_path / "profiles", interval=0.001)
+
+        assert profiler.check_trigger_file(trigger) is False
+
+        trigger.write_text("0.05")
+        assert profiler.check_trigger_file(trigger) is True
+        assert not trigger.exists()
+        assert profiler.wait(timeout=2.0).exists()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 not available")
+    def test_signal_only_requests_a_profile(self, tmp_path):
+        profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001, default_duration=0.05)
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            assert profiler.install_signal_trigger() is True
+            assert profiler.check_signal_trigger() is False
+
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert profiler.is_running is False  # Handler never takes the lock
+
+            assert profiler.check_signal_trigger() is True
+            assert profiler.wait(timeout=2.0).exists()
+            assert profiler.check_signal_trigger() is False
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+
+    def test_back_to_back_profiles_keep_both_files(self, tmp_path):
+        profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001)
+        outputs = []
+        for _ in range(2):
+            assert profiler.start(0.01) is True
+            outputs.append(profiler.wait(timeout=2.0))
+
+        assert outputs[0] != outputs[1]
+        assert len(list(tmp_path.glob("*.folded"))) == 2